@@ -0,0 +1,83 @@
+"""Measure `/start` user upserts against an in-memory Datastore with simulated latency.
+
+Most updates come from existing users, and the same user often sends several updates in
+a row, which is what the update mix below approximates.
+
+Usage: python -m benchmarks.datastore_upserts [--updates 500] [--users 100] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import time
+
+from google.cloud.datastore import Entity
+
+from pdf_bot.account import AccountRepository
+from pdf_bot.consts import LANGUAGE, USER
+from pdf_bot.datastore import MemoryDatastoreClient
+
+LANGUAGE_CODE = "en_GB"
+
+
+def _legacy_upsert_user(client: MemoryDatastoreClient, user_id: int, language_code: str) -> None:
+    # What `AccountRepository.upsert_user` used to run on the event loop
+    with client.transaction():
+        key = client.key(USER, user_id)
+        db_user = client.get(key)
+
+        if db_user is None:
+            db_user = Entity(key)
+        if LANGUAGE not in db_user:
+            db_user[LANGUAGE] = language_code
+
+        client.put(db_user)
+
+
+async def _run_legacy(client: MemoryDatastoreClient, user_ids: list[int]) -> None:
+    async def handle(user_id: int) -> None:
+        _legacy_upsert_user(client, user_id, LANGUAGE_CODE)
+
+    await asyncio.gather(*[handle(x) for x in user_ids])
+
+
+async def _run_async(client: MemoryDatastoreClient, user_ids: list[int]) -> None:
+    repository = AccountRepository(client)
+    await asyncio.gather(*[repository.upsert_user(x, LANGUAGE_CODE) for x in user_ids])
+
+
+def _create_client(num_users: int, latency: float) -> MemoryDatastoreClient:
+    client = MemoryDatastoreClient()
+    for user_id in range(num_users):
+        entity = Entity(client.key(USER, user_id))
+        entity[LANGUAGE] = LANGUAGE_CODE
+        client.put(entity)
+
+    client.latency = latency
+    client.num_reads = client.num_writes = 0
+    return client
+
+
+def main(num_updates: int, num_users: int, latency: float) -> None:
+    # Users send a few updates each, and one in ten of them is a new user
+    user_ids = [(i // 3) % (num_users + num_users // 10) for i in range(num_updates)]
+
+    for name, run in [("before", _run_legacy), ("after", _run_async)]:
+        client = _create_client(num_users, latency)
+        start = time.perf_counter()
+        asyncio.run(run(client, user_ids))
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"{name:6}: {num_updates / elapsed:8.1f} updates/s, "
+            f"{client.num_reads} reads, {client.num_writes} writes"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    main(args.updates, args.users, args.latency)
@@ -0,0 +1,96 @@
+"""Measure the cost of `LanguageService.set_app_language` per update.
+
+The catalogs are compiled from `locale/` into a temporary directory, the same as the
+Docker build does, and each update is assumed to translate messages in several services.
+
+Usage: python -m benchmarks.gettext_translations [--updates 10000] [--calls-per-update 5]
+"""
+
+import argparse
+import gettext
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+from babel.messages.mofile import write_mo
+from babel.messages.pofile import read_po
+
+from pdf_bot.language import LanguageRepository, LanguageService
+from pdf_bot.settings import Settings
+
+LOCALE_DIR = Path(__file__).parents[1] / "locale"
+DOMAIN = "pdf_bot"
+
+
+def _compile_catalogs(out_dir: Path) -> list[str]:
+    langs = []
+    for po_path in sorted(LOCALE_DIR.glob(f"*/LC_MESSAGES/{DOMAIN}.po")):
+        lang = po_path.parents[1].name
+        mo_path = out_dir / lang / "LC_MESSAGES" / f"{DOMAIN}.mo"
+        mo_path.parent.mkdir(parents=True)
+
+        with po_path.open("rb") as f:
+            catalog = read_po(f, locale=lang)
+        with mo_path.open("wb") as f:
+            write_mo(f, catalog)
+        langs.append(lang)
+
+    return langs
+
+
+def _uncached_translator(lang: str) -> Callable[[str], str]:
+    # What `set_app_language` used to do on every call
+    return gettext.translation(DOMAIN, localedir="locale", languages=[lang]).gettext
+
+
+def _benchmark(
+    get_translator: Callable[[str], Callable[[str], str]],
+    langs: list[str],
+    num_updates: int,
+    calls_per_update: int,
+) -> float:
+    start = time.perf_counter()
+    for i in range(num_updates):
+        lang = langs[i % len(langs)]
+        for _ in range(calls_per_update):
+            get_translator(lang)("Select your language")
+    return (time.perf_counter() - start) / num_updates
+
+
+def main(num_updates: int, calls_per_update: int) -> None:
+    with TemporaryDirectory() as dir_name:
+        dir_path = Path(dir_name)
+        os.chdir(dir_path)
+        # Skip the catalogs that gettext can't resolve, e.g. sr_SP isn't a known locale
+        langs = [
+            x
+            for x in _compile_catalogs(dir_path / "locale")
+            if gettext.find(DOMAIN, "locale", [x]) is not None
+        ]
+
+        service = LanguageService(MagicMock(spec=LanguageRepository), Settings.model_construct())
+        context = MagicMock()
+        update = MagicMock()
+
+        def get_service_translator(lang: str) -> Callable[[str], str]:
+            context.user_data = {"language_code": lang}
+            return service.set_app_language(update, context)
+
+        before = _benchmark(_uncached_translator, langs, num_updates, calls_per_update)
+        after = _benchmark(get_service_translator, langs, num_updates, calls_per_update)
+
+    print(f"{len(langs)} locales, {calls_per_update} translator lookups per update")
+    print(f"before: {before * 1e6:8.1f} µs per update")
+    print(f"after:  {after * 1e6:8.1f} µs per update ({before / after:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=10_000)
+    parser.add_argument("--calls-per-update", type=int, default=5)
+    args = parser.parse_args()
+
+    main(args.updates, args.calls_per_update)
@@ -0,0 +1,151 @@
+"""Compare the Ghostscript and rasterize grayscale engines of `PdfService`.
+
+Both engines need their command line tools, Ghostscript and poppler, to be installed. A
+sample corpus of text, vector and scanned documents is generated unless a directory of
+PDF files is given.
+
+Usage: python -m benchmarks.grayscale_engines [--corpus DIR] [--pages 20] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import io
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Literal, cast
+
+import img2pdf
+import pikepdf
+from loguru import logger
+from pdf2image.exceptions import PDFInfoNotInstalledError
+from PIL import Image
+
+from pdf_bot.cli import CLIService, CLIServiceError
+from pdf_bot.executor import ExecutorService
+from pdf_bot.io import IOService
+from pdf_bot.pdf import PdfService
+from pdf_bot.settings import Settings
+from pdf_bot.telegram_internal import TelegramService
+
+ENGINES: tuple[Literal["ghostscript", "rasterize"], ...] = ("ghostscript", "rasterize")
+
+
+class _LocalTelegramService:
+    """Serves local files in place of Telegram downloads."""
+
+    def __init__(self, files: dict[str, Path]) -> None:
+        self.files = files
+
+    @asynccontextmanager
+    async def download_pdf_file(self, file_id: str) -> AsyncGenerator[Path, None]:
+        yield self.files[file_id]
+
+
+def _create_corpus(dir_path: Path, num_pages: int) -> dict[str, Path]:
+    files = {name: dir_path / f"{name}.pdf" for name in ("text", "vector", "scanned")}
+
+    with pikepdf.new() as pdf:
+        for i in range(num_pages):
+            page = pdf.add_blank_page(page_size=(595, 842))
+            lines = "".join(
+                f"{j % 3 / 2} 0.2 {1 - j % 3 / 2} rg 0 -14 Td "
+                f"(Page {i + 1} line {j + 1} in colour) Tj "
+                for j in range(50)
+            )
+            page.Resources = pikepdf.Dictionary(
+                Font=pikepdf.Dictionary(
+                    F1=pikepdf.Dictionary(
+                        Type=pikepdf.Name.Font,
+                        Subtype=pikepdf.Name.Type1,
+                        BaseFont=pikepdf.Name.Helvetica,
+                    )
+                )
+            )
+            page.Contents = pikepdf.Stream(pdf, f"BT /F1 11 Tf 72 794 Td {lines}ET".encode())
+        pdf.save(files["text"])
+
+    with pikepdf.new() as pdf:
+        for _ in range(num_pages):
+            page = pdf.add_blank_page(page_size=(595, 842))
+            shapes = "".join(
+                f"{x / 10} {y / 10} 0.5 rg {x * 59} {y * 84} 50 70 re f "
+                for x in range(10)
+                for y in range(10)
+            )
+            page.Contents = pikepdf.Stream(pdf, shapes.encode())
+        pdf.save(files["vector"])
+
+    images = []
+    for i in range(num_pages):
+        # A colour A4 page scanned at 150 DPI
+        bands = (
+            Image.linear_gradient("L"),
+            Image.linear_gradient("L").rotate(90 * (i % 4)),
+            Image.radial_gradient("L"),
+        )
+        image = Image.merge("RGB", bands).resize((1240, 1754))
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", dpi=(150, 150))
+        images.append(buffer.getvalue())
+    files["scanned"].write_bytes(cast(bytes, img2pdf.convert(images)))
+
+    return files
+
+
+async def _benchmark(pdf_service: PdfService, file_id: str, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        async with pdf_service.grayscale_pdf(file_id) as out_path:
+            best = min(best, time.perf_counter() - start)
+            size = out_path.stat().st_size
+    return best, size
+
+
+async def main(corpus: Path | None, num_pages: int, repeat: int) -> None:
+    with TemporaryDirectory() as dir_name:
+        if corpus is None:
+            files = _create_corpus(Path(dir_name), num_pages)
+        else:
+            files = {x.stem: x for x in sorted(corpus.glob("*.pdf"))}
+
+        telegram_service = cast(TelegramService, _LocalTelegramService(files))
+        print(f"{len(files)} files, best of {repeat} runs")
+        print(f"{'file':<16}{'input':>10}" + "".join(f"{x:>24}" for x in ENGINES))
+
+        for name, path in files.items():
+            results = []
+            for engine in ENGINES:
+                settings = Settings.model_construct(grayscale_engine=engine)
+                executor_service = ExecutorService(settings)
+                pdf_service = PdfService(
+                    CLIService(settings), IOService(), telegram_service, executor_service, settings
+                )
+
+                try:
+                    elapsed, size = await _benchmark(pdf_service, name, repeat)
+                    results.append(f"{elapsed:>9.2f}s {size / 1024:>10.0f} KiB")
+                except (CLIServiceError, OSError, PDFInfoNotInstalledError):
+                    # The engine's command line tool failed or isn't installed
+                    results.append(f"{'failed':>24}")
+                finally:
+                    executor_service.shutdown()
+
+            input_size = f"{path.stat().st_size / 1024:.0f} KiB"
+            print(f"{name:<16}{input_size:>10}" + "".join(f"{x:>24}" for x in results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, default=None)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    asyncio.run(main(args.corpus, args.pages, args.repeat))
@@ -0,0 +1,171 @@
+"""Compare recompressing images with pikepdf to compressing with Ghostscript.
+
+Both compress images to the resolution of the medium compression level. Ghostscript needs
+to be installed. A sample corpus of scanned and mixed documents is generated unless a
+directory of PDF files is given.
+
+Images are recompressed in killable worker processes. "pikepdf" reuses warm workers,
+while "pikepdf cold" starts new ones for each run, which includes the cost of spawning
+them. The overhead of a single killable job is measured with a new and a warm worker.
+
+Usage: python -m benchmarks.image_recompression [--corpus DIR] [--pages 20] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import zlib
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pikepdf
+from loguru import logger
+from PIL import Image, ImageFilter
+
+from pdf_bot.cli import CLIService, CLIServiceError
+from pdf_bot.executor import ExecutorService, WorkerPool
+from pdf_bot.pdf import CompressLevel, PdfCompressor
+from pdf_bot.settings import Settings
+
+Engine = Callable[[Path, Path], Awaitable[object]]
+
+
+def _create_corpus(dir_path: Path, num_pages: int) -> dict[str, Path]:
+    files = {name: dir_path / f"{name}.pdf" for name in ("scanned", "mixed")}
+
+    for name, path in files.items():
+        with pikepdf.new() as pdf:
+            for i in range(num_pages):
+                # A grayscale A4 page scanned at 300 DPI, with text on every other page of
+                # the mixed document
+                scan = Image.effect_noise((2480, 3508), 32 + i % 8).filter(
+                    ImageFilter.GaussianBlur(2)
+                )
+                image = pdf.make_stream(
+                    zlib.compress(scan.tobytes()),
+                    Type=pikepdf.Name.XObject,
+                    Subtype=pikepdf.Name.Image,
+                    Width=scan.width,
+                    Height=scan.height,
+                    ColorSpace=pikepdf.Name.DeviceGray,
+                    BitsPerComponent=8,
+                    Filter=pikepdf.Name.FlateDecode,
+                )
+
+                page = pdf.add_blank_page(page_size=(595, 842))
+                page.Resources = pikepdf.Dictionary(
+                    XObject=pikepdf.Dictionary(Im0=image),
+                    Font=pikepdf.Dictionary(
+                        F1=pikepdf.Dictionary(
+                            Type=pikepdf.Name.Font,
+                            Subtype=pikepdf.Name.Type1,
+                            BaseFont=pikepdf.Name.Helvetica,
+                        )
+                    ),
+                )
+                content = b"q 595 0 0 842 0 0 cm /Im0 Do Q"
+                if name == "mixed" and i % 2 == 0:
+                    content += b" BT /F1 11 Tf 72 794 Td (Page text) Tj ET"
+                page.Contents = pdf.make_stream(content)
+            pdf.save(path)
+
+    return files
+
+
+async def _benchmark(engine: Engine, path: Path, out_path: Path, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await engine(path, out_path)
+        best = min(best, time.perf_counter() - start)
+    return best, out_path.stat().st_size
+
+
+async def _measure_killable_overhead(settings: Settings, repeat: int) -> tuple[float, float]:
+    """Measure the time of an empty killable job, with a new worker and with a warm one."""
+    cold = warm = float("inf")
+    for _ in range(repeat):
+        executor_service = ExecutorService(settings)
+        try:
+            start = time.perf_counter()
+            await executor_service.run_killable(WorkerPool.heavy, os.getpid)
+            cold = min(cold, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await executor_service.run_killable(WorkerPool.heavy, os.getpid)
+            warm = min(warm, time.perf_counter() - start)
+        finally:
+            executor_service.shutdown()
+    return cold, warm
+
+
+async def main(corpus: Path | None, num_pages: int, repeat: int) -> None:
+    settings = Settings.model_construct()
+    cli_service = CLIService(settings)
+    executor_service = ExecutorService(settings)
+    compressor = PdfCompressor(cli_service, executor_service, settings)
+
+    async def recompress_with_new_workers(input_path: Path, out_path: Path) -> None:
+        cold_executor_service = ExecutorService(settings)
+        cold_compressor = PdfCompressor(cli_service, cold_executor_service, settings)
+        try:
+            await cold_compressor._recompress_images(  # noqa: SLF001
+                input_path, out_path, CompressLevel.medium
+            )
+        finally:
+            cold_executor_service.shutdown()
+
+    engines: dict[str, Engine] = {
+        "pikepdf": lambda x, y: compressor._recompress_images(  # noqa: SLF001
+            x, y, CompressLevel.medium
+        ),
+        "pikepdf cold": recompress_with_new_workers,
+        "ghostscript": lambda x, y: cli_service.compress_pdf(x, y, "ebook"),
+    }
+
+    with TemporaryDirectory() as dir_name:
+        dir_path = Path(dir_name)
+        if corpus is None:
+            files = _create_corpus(dir_path, num_pages)
+        else:
+            files = {x.stem: x for x in sorted(corpus.glob("*.pdf"))}
+
+        cold, warm = await _measure_killable_overhead(settings, repeat)
+        print(
+            f"Killable job overhead: {cold * 1000:.0f} ms with a new worker, "
+            f"{warm * 1000:.1f} ms with a warm one"
+        )
+        print(f"{len(files)} files, best of {repeat} runs")
+        print(f"{'file':<16}{'input':>12}" + "".join(f"{x:>24}" for x in engines))
+
+        try:
+            for name, path in files.items():
+                results = []
+                for engine_name, engine in engines.items():
+                    out_path = dir_path / f"{name}_{engine_name}.pdf"
+                    try:
+                        elapsed, size = await _benchmark(engine, path, out_path, repeat)
+                        results.append(f"{elapsed:>9.2f}s {size / 1024:>10.0f} KiB")
+                    except (CLIServiceError, OSError):
+                        # The engine's command line tool failed or isn't installed, or no
+                        # images were recompressed
+                        results.append(f"{'failed':>24}")
+
+                input_size = f"{path.stat().st_size / 1024:.0f} KiB"
+                print(f"{name:<16}{input_size:>12}" + "".join(f"{x:>24}" for x in results))
+        finally:
+            executor_service.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, default=None)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    asyncio.run(main(args.corpus, args.pages, args.repeat))
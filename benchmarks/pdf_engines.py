@@ -0,0 +1,127 @@
+"""Compare the pypdf and pikepdf engines of `PdfService` on a generated document.
+
+Usage: python -m benchmarks.pdf_engines [--pages 2000] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Literal, cast
+
+import pikepdf
+from loguru import logger
+
+from pdf_bot.cli import CLIService
+from pdf_bot.executor import ExecutorService
+from pdf_bot.io import IOService
+from pdf_bot.pdf import PdfService, ScaleByData, ScaleToData
+from pdf_bot.settings import Settings
+from pdf_bot.telegram_internal import TelegramService
+
+PdfOperation = Callable[[PdfService], AbstractAsyncContextManager[Path]]
+
+SOURCE_FILE_ID = "source"
+WATERMARK_FILE_ID = "watermark"
+ENCRYPTED_FILE_ID = "encrypted"
+PASSWORD = "password"  # noqa: S105
+ENGINES: tuple[Literal["pypdf", "pikepdf"], ...] = ("pypdf", "pikepdf")
+
+OPERATIONS: dict[str, PdfOperation] = {
+    "add_watermark": lambda x: x.add_watermark_to_pdf(SOURCE_FILE_ID, WATERMARK_FILE_ID),
+    "decrypt": lambda x: x.decrypt_pdf(ENCRYPTED_FILE_ID, PASSWORD),
+    "encrypt": lambda x: x.encrypt_pdf(SOURCE_FILE_ID, PASSWORD),
+    "rotate": lambda x: x.rotate_pdf(SOURCE_FILE_ID, 90),
+    "scale_by": lambda x: x.scale_pdf_by_factor(SOURCE_FILE_ID, ScaleByData(0.5, 0.5)),
+    "scale_to": lambda x: x.scale_pdf_to_dimension(SOURCE_FILE_ID, ScaleToData(300, 400)),
+    "split": lambda x: x.split_pdf(SOURCE_FILE_ID, "::2"),
+}
+
+
+class _LocalTelegramService:
+    """Serves local files in place of Telegram downloads."""
+
+    def __init__(self, files: dict[str, Path]) -> None:
+        self.files = files
+
+    @asynccontextmanager
+    async def download_pdf_file(self, file_id: str) -> AsyncGenerator[Path, None]:
+        yield self.files[file_id]
+
+
+def _create_files(dir_path: Path, num_pages: int) -> dict[str, Path]:
+    files = {
+        SOURCE_FILE_ID: dir_path / "source.pdf",
+        WATERMARK_FILE_ID: dir_path / "watermark.pdf",
+        ENCRYPTED_FILE_ID: dir_path / "encrypted.pdf",
+    }
+
+    with pikepdf.new() as pdf:
+        for i in range(num_pages):
+            page = pdf.add_blank_page(page_size=(595, 842))
+            content = f"BT /F1 24 Tf 72 720 Td (Page {i + 1}) Tj ET".encode()
+            page.Contents = pikepdf.Stream(pdf, content)
+        pdf.save(files[SOURCE_FILE_ID])
+        pdf.save(
+            files[ENCRYPTED_FILE_ID],
+            encryption=pikepdf.Encryption(user=PASSWORD, owner=PASSWORD),
+        )
+
+    with pikepdf.new() as pdf:
+        page = pdf.add_blank_page(page_size=(595, 842))
+        page.Contents = pikepdf.Stream(pdf, b"0.5 g 100 100 395 642 re f")
+        pdf.save(files[WATERMARK_FILE_ID])
+
+    return files
+
+
+async def _benchmark(pdf_service: PdfService, operation: PdfOperation, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        async with operation(pdf_service):
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def main(num_pages: int, repeat: int) -> None:
+    with TemporaryDirectory() as dir_name:
+        files = _create_files(Path(dir_name), num_pages)
+        telegram_service = cast(TelegramService, _LocalTelegramService(files))
+        print(f"{num_pages} pages, best of {repeat} runs")
+        print(f"{'operation':<16}{'pypdf':>12}{'pikepdf':>12}{'speedup':>10}")
+
+        for name, operation in OPERATIONS.items():
+            timings = []
+            for engine in ENGINES:
+                settings = Settings.model_construct(pdf_engine=engine)
+                executor_service = ExecutorService(settings)
+                pdf_service = PdfService(
+                    CLIService(settings), IOService(), telegram_service, executor_service, settings
+                )
+
+                try:
+                    elapsed = await _benchmark(pdf_service, operation, repeat)
+                finally:
+                    executor_service.shutdown()
+                timings.append(elapsed)
+
+            pypdf_time, pikepdf_time = timings
+            print(
+                f"{name:<16}{pypdf_time:>11.3f}s{pikepdf_time:>11.3f}s"
+                f"{pypdf_time / pikepdf_time:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    asyncio.run(main(args.pages, args.repeat))
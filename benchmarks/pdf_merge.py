@@ -0,0 +1,160 @@
+"""Compare merging PDF files with the pypdf and pikepdf engines of `PdfService`.
+
+Every generated file embeds the same font file and logo, as files exported by the same
+tool do, along with images of its own. Each engine runs in a fresh process, so that its
+peak RSS isn't affected by the other one.
+
+Usage: python -m benchmarks.pdf_merge [--files 50] [--pages 10]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import time
+import zlib
+from collections.abc import AsyncGenerator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Literal, cast
+
+import pikepdf
+from loguru import logger
+
+from pdf_bot.cli import CLIService
+from pdf_bot.executor import ExecutorService
+from pdf_bot.io import IOService
+from pdf_bot.models import FileData
+from pdf_bot.pdf import PdfService
+from pdf_bot.settings import Settings
+from pdf_bot.telegram_internal import TelegramService
+
+ENGINES: tuple[Literal["pypdf", "pikepdf"], ...] = ("pypdf", "pikepdf")
+
+
+class _LocalTelegramService:
+    """Serves local files in place of Telegram downloads."""
+
+    @asynccontextmanager
+    async def download_files(self, file_ids: list[str]) -> AsyncGenerator[list[Path], None]:
+        yield [Path(x) for x in file_ids]
+
+
+def _create_files(dir_path: Path, num_files: int, num_pages: int) -> list[Path]:
+    font_data = zlib.compress(os.urandom(256 * 1024))
+    logo_data = zlib.compress(os.urandom(200 * 200 * 3))
+    paths = []
+
+    for i in range(num_files):
+        path = dir_path / f"file_{i}.pdf"
+        with pikepdf.new() as pdf:
+            font = pikepdf.Dictionary(
+                Type=pikepdf.Name.Font,
+                Subtype=pikepdf.Name.TrueType,
+                BaseFont=pikepdf.Name.Shared,
+                FontDescriptor=pdf.make_indirect(
+                    pikepdf.Dictionary(
+                        Type=pikepdf.Name.FontDescriptor,
+                        FontName=pikepdf.Name.Shared,
+                        FontFile2=pdf.make_stream(font_data, Filter=pikepdf.Name.FlateDecode),
+                    )
+                ),
+            )
+            logo = pdf.make_stream(
+                logo_data,
+                Type=pikepdf.Name.XObject,
+                Subtype=pikepdf.Name.Image,
+                Width=200,
+                Height=200,
+                ColorSpace=pikepdf.Name.DeviceRGB,
+                BitsPerComponent=8,
+                Filter=pikepdf.Name.FlateDecode,
+            )
+
+            for j in range(num_pages):
+                image = pdf.make_stream(
+                    zlib.compress(os.urandom(100 * 100 * 3)),
+                    Type=pikepdf.Name.XObject,
+                    Subtype=pikepdf.Name.Image,
+                    Width=100,
+                    Height=100,
+                    ColorSpace=pikepdf.Name.DeviceRGB,
+                    BitsPerComponent=8,
+                    Filter=pikepdf.Name.FlateDecode,
+                )
+                page = pdf.add_blank_page(page_size=(595, 842))
+                page.Resources = pikepdf.Dictionary(
+                    Font=pikepdf.Dictionary(F1=font),
+                    XObject=pikepdf.Dictionary(Logo=logo, Im0=image),
+                )
+                content = (
+                    f"q 100 0 0 100 40 700 cm /Logo Do Q q 200 0 0 200 200 400 cm /Im0 Do Q "
+                    f"BT /F1 24 Tf 72 360 Td (File {i + 1} page {j + 1}) Tj ET"
+                )
+                page.Contents = pdf.make_stream(content.encode())
+            pdf.save(path)
+        paths.append(path)
+
+    return paths
+
+
+def _merge(engine: Literal["pypdf", "pikepdf"], paths: list[Path]) -> tuple[float, int, int, int]:
+    """Merge the files in this process.
+
+    Returns:
+        The time, the output size, and the peak RSS before and after merging.
+    """
+    logger.remove()
+    settings = Settings.model_construct(pdf_engine=engine)
+    executor_service = ExecutorService(settings)
+    telegram_service = cast(TelegramService, _LocalTelegramService())
+    pdf_service = PdfService(
+        CLIService(settings), IOService(), telegram_service, executor_service, settings
+    )
+    file_data_list = [FileData(str(x), x.name) for x in paths]
+    # The peak RSS is in KiB on Linux
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    async def merge() -> tuple[float, int]:
+        start = time.perf_counter()
+        async with pdf_service.merge_pdfs(file_data_list) as out_path:
+            return time.perf_counter() - start, out_path.stat().st_size
+
+    try:
+        elapsed, size = asyncio.run(merge())
+    finally:
+        executor_service.shutdown()
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return elapsed, size, base_rss, peak_rss
+
+
+def main(num_files: int, num_pages: int) -> None:
+    with TemporaryDirectory() as dir_name:
+        paths = _create_files(Path(dir_name), num_files, num_pages)
+        input_size = sum(x.stat().st_size for x in paths)
+        print(f"{num_files} files of {num_pages} pages, {input_size / 1024**2:.1f} MiB in total")
+        print(f"{'engine':<10}{'time':>10}{'peak RSS':>14}{'merge RSS':>14}{'output':>14}")
+
+        context = multiprocessing.get_context("spawn")
+        for engine in ENGINES:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                elapsed, size, base_rss, peak_rss = executor.submit(_merge, engine, paths).result()
+            print(
+                f"{engine:<10}{elapsed:>9.2f}s{peak_rss / 1024**2:>10.1f} MiB"
+                f"{(peak_rss - base_rss) / 1024**2:>10.1f} MiB{size / 1024**2:>10.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=10)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    main(args.files, args.pages)
@@ -6,8 +6,11 @@ from dependency_injector.wiring import Provide, inject
 from loguru import logger
 from telegram.ext import Application as TelegramApp
 
+from pdf_bot.analytics import AnalyticsService
 from pdf_bot.containers import Application
+from pdf_bot.download_cache import DownloadCacheService
 from pdf_bot.error import ErrorHandler
+from pdf_bot.executor import ExecutorService
 from pdf_bot.log import MyLogHandler
 from pdf_bot.settings import Settings
 from pdf_bot.telegram_handler import AbstractTelegramHandler
@@ -42,12 +45,29 @@ def main(
         telegram_app.run_polling()
 
 
+@inject
+async def post_shutdown(
+    _telegram_app: TelegramApp,
+    analytics_service: AnalyticsService = Provide[Application.services.analytics],
+    executor_service: ExecutorService = Provide[Application.services.executor],
+    download_cache_service: DownloadCacheService = Provide[Application.services.download_cache],
+) -> None:
+    await analytics_service.shutdown()
+    executor_service.shutdown()
+    download_cache_service.shutdown()
+
+
 if __name__ == "__main__":
     app = Application()
     app.wire(modules=[__name__])
 
     _telegram_app = (
-        TelegramApp.builder().bot(app.core.telegram_bot()).concurrent_updates(True).build()
+        TelegramApp.builder()
+        .bot(app.core.telegram_bot())
+        .persistence(app.core.persistence())
+        .concurrent_updates(True)
+        .post_shutdown(post_shutdown)
+        .build()
     )
 
     # Dependency injectior only initialises the classes if they are referenced. Since
@@ -62,7 +82,7 @@ if __name__ == "__main__":
         if isinstance(provider, Singleton):
             handler = provider()
             if isinstance(handler, AbstractTelegramHandler):
-                _telegram_app.add_handlers(handler.handlers)
+                _telegram_app.add_handlers(handler.handlers, group=handler.GROUP)
             elif isinstance(handler, ErrorHandler):
                 _telegram_app.add_error_handler(handler.callback)
 
@@ -1,11 +1,13 @@
 from google.cloud.datastore import Client, Entity
 
 from pdf_bot.consts import LANGUAGE, USER
+from pdf_bot.datastore import WriteCoalescer
 
 
 class AccountRepository:
     def __init__(self, datastore_client: Client) -> None:
         self.datastore_client = datastore_client
+        self._user_writes: WriteCoalescer[int, str, bool] = WriteCoalescer(self._upsert_user)
 
     def get_user(self, user_id: int) -> Entity | None:
         key = self.datastore_client.key(USER, user_id)
@@ -13,14 +15,29 @@ class AccountRepository:
 
         return entity
 
-    def upsert_user(self, user_id: int, language_code: str) -> None:
+    async def upsert_user(self, user_id: int, language_code: str) -> bool:
+        """Create the user with the language, unless the user already has one.
+
+        Returns:
+            Whether the language was written
+        """
+        return await self._user_writes.write(user_id, language_code)
+
+    def _upsert_user(self, user_id: int, language_code: str) -> bool:
+        # Most users already exist, so check without a transaction first
+        db_user = self.get_user(user_id)
+        if db_user is not None and LANGUAGE in db_user:
+            return False
+
         with self.datastore_client.transaction():
             key = self.datastore_client.key(USER, user_id)
             db_user = self.datastore_client.get(key)
 
             if db_user is None:
                 db_user = Entity(key)
-            if LANGUAGE not in db_user:
-                db_user[LANGUAGE] = language_code
+            elif LANGUAGE in db_user:
+                return False
 
+            db_user[LANGUAGE] = language_code
             self.datastore_client.put(db_user)
+            return True
@@ -1,4 +1,5 @@
 from telegram import User
+from telegram.ext import ContextTypes
 
 from pdf_bot.account.account_repository import AccountRepository
 from pdf_bot.language import LanguageService
@@ -13,7 +14,7 @@ class AccountService:
         self.account_repository = account_repository
         self.language_service = language_service
 
-    def create_user(self, telegram_user: User) -> None:
+    async def create_user(self, telegram_user: User, context: ContextTypes.DEFAULT_TYPE) -> None:
         user_lang_code = telegram_user.language_code
         lang_code = self._LANGUAGE_CODE
 
@@ -22,4 +23,6 @@ class AccountService:
             if code is not None:
                 lang_code = code
 
-        self.account_repository.upsert_user(telegram_user.id, lang_code)
+        # Existing users keep the language that they have set
+        if await self.account_repository.upsert_user(telegram_user.id, lang_code):
+            self.language_service.set_new_user_language(telegram_user.id, context, lang_code)
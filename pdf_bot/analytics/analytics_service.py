@@ -1,26 +1,65 @@
-from typing import cast
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any, cast
 from uuid import UUID
 
 from loguru import logger
-from requests.exceptions import HTTPError
+from requests.exceptions import RequestException
 from telegram import Message, Update, User
 from telegram.ext import ContextTypes
 
 from pdf_bot.language import LanguageService
+from pdf_bot.settings import Settings
 
 from .analytics_repository import AnalyticsRepository
 from .models import EventAction, TaskType
 
 
+@dataclass
+class _ClientEvents:
+    user_properties: dict[str, Any]
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+
 class AnalyticsService:
+    """Send analytics events to Google Analytics in the background.
+
+    Events are buffered and grouped by client, then sent with the Measurement Protocol
+    once `analytics_batch_size` events are buffered or every `analytics_flush_interval`
+    seconds. Events are dropped and counted when the buffer is full, so a slow endpoint
+    can't hold up updates or use up memory.
+    """
+
+    # The Measurement Protocol accepts at most 25 events per request
+    _MAX_EVENTS_PER_REQUEST = 25
+
     def __init__(
         self,
         analytics_repository: AnalyticsRepository,
         language_service: LanguageService,
+        settings: Settings | dict[str, Any],
     ) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
         self.analytics_repository = analytics_repository
         self.language_service = language_service
 
+        self.batch_size = settings.analytics_batch_size
+        self.flush_interval = settings.analytics_flush_interval
+        self.max_buffer_size = settings.analytics_max_buffer_size
+        self.num_dropped_events = 0
+
+        self._buffer: dict[str, _ClientEvents] = {}
+        self._num_buffered = 0
+        self._num_dropped_since_flush = 0
+        self._flush_event = asyncio.Event()
+        self._worker: asyncio.Task[None] | None = None
+        self._stopping = False
+
     def send_event(
         self,
         update: Update,
@@ -28,22 +67,76 @@ class AnalyticsService:
         task_type: TaskType,
         action: EventAction,
     ) -> None:
+        if self._num_buffered >= self.max_buffer_size:
+            self.num_dropped_events += 1
+            self._num_dropped_since_flush += 1
+            return
+
         lang = self.language_service.get_user_language(update, context)
         msg = cast(Message, update.effective_message)
         msg_user = cast(User, msg.from_user)
 
-        event = {
-            "client_id": str(UUID(int=msg_user.id)),
-            "user_properties": {"bot_language": {"value": lang}},
-            "events": [
-                {
-                    "name": task_type.value,
-                    "params": {"action": action.value},
+        client_id = str(UUID(int=msg_user.id))
+        client_events = self._buffer.setdefault(client_id, _ClientEvents({}))
+        client_events.user_properties = {"bot_language": {"value": lang}}
+        client_events.events.append({"name": task_type.value, "params": {"action": action.value}})
+        self._num_buffered += 1
+
+        if self._num_buffered >= self.batch_size:
+            self._flush_event.set()
+        self._start_worker()
+
+    async def flush(self) -> None:
+        buffer, self._buffer = self._buffer, {}
+        self._num_buffered = 0
+
+        if self._num_dropped_since_flush > 0:
+            logger.warning(
+                "Analytics buffer was full, dropped {count} events",
+                count=self._num_dropped_since_flush,
+            )
+            self._num_dropped_since_flush = 0
+
+        for client_id, client_events in buffer.items():
+            events = client_events.events
+            for i in range(0, len(events), self._MAX_EVENTS_PER_REQUEST):
+                payload = {
+                    "client_id": client_id,
+                    "user_properties": client_events.user_properties,
+                    "events": events[i : i + self._MAX_EVENTS_PER_REQUEST],
                 }
-            ],
-        }
 
-        try:
-            self.analytics_repository.send_event(event)
-        except HTTPError:
-            logger.exception("Failed to send analytics")
+                try:
+                    await asyncio.to_thread(self.analytics_repository.send_event, payload)
+                except RequestException:
+                    logger.exception("Failed to send analytics")
+
+    async def shutdown(self) -> None:
+        """Stop the background worker and send the remaining events."""
+        self._stopping = True
+        self._flush_event.set()
+
+        if self._worker is not None:
+            await self._worker
+            self._worker = None
+        await self.flush()
+
+    def _start_worker(self) -> None:
+        if self._stopping or (self._worker is not None and not self._worker.done()):
+            return
+
+        # Events are only buffered until there's a running event loop to send them from
+        with suppress(RuntimeError):
+            self._worker = asyncio.get_running_loop().create_task(self._run_worker())
+
+    async def _run_worker(self) -> None:
+        while not self._stopping:
+            with suppress(TimeoutError):
+                async with asyncio.timeout(self.flush_interval):
+                    await self._flush_event.wait()
+
+            self._flush_event.clear()
+            try:
+                await self.flush()
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to flush analytics")
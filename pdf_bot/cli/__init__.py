@@ -1,4 +1,4 @@
 from .cli_service import CLIService
-from .exceptions import CLIServiceError
+from .exceptions import CLINonZeroExitStatusError, CLIServiceError, CLITimeoutError
 
-__all__ = ["CLIService", "CLIServiceError"]
+__all__ = ["CLIService", "CLINonZeroExitStatusError", "CLIServiceError", "CLITimeoutError"]
@@ -1,35 +1,125 @@
+import asyncio
 import shlex
+from contextlib import suppress
 from gettext import gettext as _
 from pathlib import Path
-from subprocess import PIPE, Popen
+from subprocess import PIPE
+from typing import Any, Literal
 
 from loguru import logger
 
-from pdf_bot.cli.exceptions import CLINonZeroExitStatusError
+from pdf_bot.cli.exceptions import CLINonZeroExitStatusError, CLITimeoutError
+from pdf_bot.settings import Settings
+
+GhostscriptPreset = Literal["default", "ebook", "screen"]
 
 
 class CLIService:
-    def compress_pdf(self, input_path: Path, output_path: Path) -> None:
+    """Run external command line tools as asyncio subprocesses.
+
+    Each binary has its own concurrency limit, commands that exceed the timeout or whose
+    caller is cancelled are killed, and only the tail of stdout and stderr is kept.
+    """
+
+    _READ_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, settings: Settings | dict[str, Any]) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
+        self.timeout = settings.cli_timeout
+        self.max_concurrency = settings.cli_max_concurrency
+        self.output_limit = settings.cli_output_limit
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def compress_pdf(
+        self, input_path: Path, output_path: Path, preset: GhostscriptPreset = "default"
+    ) -> None:
         command = (
-            "gs -sDEVICE=pdfwrite -dCompatibilityLevel=1.4 -dPDFSETTINGS=/default "
+            f"gs -sDEVICE=pdfwrite -dCompatibilityLevel=1.4 -dPDFSETTINGS=/{preset} "
             f'-dNOPAUSE -dQUIET -dBATCH -sOutputFile="{output_path}" "{input_path}"'
         )
-        self._run_command(command)
+        await self._run_command(command)
+
+    async def grayscale_pdf(self, input_path: Path, output_path: Path) -> None:
+        # Convert the colour spaces of text, vector graphics and images in place, so that
+        # the pages are kept as they are rather than being rasterized
+        command = (
+            "gs -sDEVICE=pdfwrite -sColorConversionStrategy=Gray "
+            "-dProcessColorModel=/DeviceGray -dCompatibilityLevel=1.4 "
+            "-dAutoRotatePages=/None -dNOPAUSE -dQUIET -dBATCH "
+            f'-sOutputFile="{output_path}" "{input_path}"'
+        )
+        await self._run_command(command)
 
-    def extract_pdf_images(self, input_path: Path, output_path: Path) -> None:
+    async def extract_pdf_images(self, input_path: Path, output_path: Path) -> None:
         command = f'pdfimages -png "{input_path}" "{output_path}/images"'
-        self._run_command(command)
+        await self._run_command(command)
+
+    async def extract_pdf_text(
+        self, input_path: Path, output_path: Path, first_page: int, last_page: int
+    ) -> None:
+        # Pages are separated by form feeds in the output
+        command = (
+            f"pdftotext -f {first_page} -l {last_page} -enc UTF-8 "
+            f'"{input_path}" "{output_path}"'
+        )
+        await self._run_command(command)
 
-    @staticmethod
-    def _run_command(command: str) -> None:
-        proc = Popen(shlex.split(command), stdout=PIPE, stderr=PIPE, shell=False)
-        out, err = proc.communicate()
+    async def _run_command(self, command: str) -> None:
+        args = shlex.split(command)
+        async with self._get_semaphore(args[0]):
+            proc = await asyncio.create_subprocess_exec(*args, stdout=PIPE, stderr=PIPE)
+            try:
+                async with asyncio.timeout(self.timeout):
+                    out, err, _returncode = await asyncio.gather(
+                        self._read_stream(proc.stdout),
+                        self._read_stream(proc.stderr),
+                        proc.wait(),
+                    )
+            except TimeoutError as e:
+                logger.error(
+                    "Command timed out after {timeout}s:\n{command}",
+                    timeout=self.timeout,
+                    command=command,
+                )
+                raise CLITimeoutError(_("Process took too long to complete")) from e
+            finally:
+                # Also reached when the caller is cancelled, so don't leave the process
+                # running in the background
+                if proc.returncode is None:
+                    with suppress(ProcessLookupError):
+                        proc.kill()
+                    await proc.wait()
 
         if proc.returncode != 0:
             logger.error(
                 "Command:\n{command}\n\nStdout:\n{stdout}\n\nStderr:\n{stderr}",
                 command=command,
-                stdout=out.decode("utf-8"),
-                stderr=err.decode("utf-8"),
+                stdout=out.decode("utf-8", errors="replace"),
+                stderr=err.decode("utf-8", errors="replace"),
             )
             raise CLINonZeroExitStatusError(_("Failed to complete process"))
+
+    async def _read_stream(self, stream: asyncio.StreamReader | None) -> bytes:
+        # Keep draining the stream so that the process doesn't block on a full pipe, but
+        # only hold on to the last `output_limit` bytes
+        buffer = bytearray()
+        if stream is None:
+            return bytes(buffer)
+
+        while chunk := await stream.read(self._READ_CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) > self.output_limit:
+                del buffer[: -self.output_limit]
+
+        return bytes(buffer)
+
+    def _get_semaphore(self, binary: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(binary)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[binary] = semaphore
+        return semaphore
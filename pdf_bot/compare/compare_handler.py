@@ -34,5 +34,7 @@ class CompareHandler(AbstractTelegramHandler):
                     MessageHandler(TEXT_FILTER, self.compare_service.check_text),
                 ],
                 allow_reentry=True,
+                name="compare",
+                persistent=True,
             )
         ]
@@ -1,3 +1,4 @@
+from contextlib import AsyncExitStack
 from typing import cast
 
 from pdf_diff import NoDifferenceError
@@ -6,6 +7,7 @@ from telegram.ext import ContextTypes, ConversationHandler
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.consts import BACK, CANCEL
+from pdf_bot.job_scheduler import JobScheduler, JobTimeoutError
 from pdf_bot.language import LanguageService
 from pdf_bot.pdf import PdfService
 from pdf_bot.telegram_internal import (
@@ -25,10 +27,12 @@ class CompareService:
         pdf_service: PdfService,
         telegram_service: TelegramService,
         language_service: LanguageService,
+        job_scheduler: JobScheduler,
     ) -> None:
         self.pdf_service = pdf_service
         self.telegram_service = telegram_service
         self.language_service = language_service
+        self.job_scheduler = job_scheduler
 
     async def ask_first_pdf(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         _ = self.language_service.set_app_language(update, context)
@@ -83,12 +87,18 @@ class CompareService:
         await msg.reply_text(_("Comparing your PDF files"), reply_markup=ReplyKeyboardRemove())
 
         try:
-            async with self.pdf_service.compare_pdfs(file_id, doc.file_id) as out_path:
+            async with AsyncExitStack() as stack:
+                async with self.job_scheduler.time_budget(TaskType.compare_pdf):
+                    out_path = await stack.enter_async_context(
+                        self.pdf_service.compare_pdfs(file_id, doc.file_id)
+                    )
                 await self.telegram_service.send_file(
                     update, context, out_path, TaskType.compare_pdf
                 )
         except NoDifferenceError:
             await msg.reply_text(_("There are no text differences between your PDF files"))
+        except JobTimeoutError as e:
+            await msg.reply_text(_(str(e)))
 
         return ConversationHandler.END
 
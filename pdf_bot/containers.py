@@ -12,14 +12,22 @@ from pdf_bot.cli import CLIService
 from pdf_bot.command import CommandService, MyCommandHandler
 from pdf_bot.compare import CompareHandler, CompareService
 from pdf_bot.datastore import MyDatastoreClient
+from pdf_bot.download_cache import DownloadCacheService
 from pdf_bot.error import ErrorCallbackQueryHandler, ErrorHandler, ErrorService
+from pdf_bot.executor import ExecutorService
 from pdf_bot.feedback import FeedbackHandler, FeedbackRepository, FeedbackService
 from pdf_bot.file import FileHandler, FileService
 from pdf_bot.image import ImageService
 from pdf_bot.image_handler import BatchImageHandler, BatchImageService
 from pdf_bot.image_processor import BeautifyImageProcessor, ImageTaskProcessor, ImageToPdfProcessor
 from pdf_bot.io import IOService
-from pdf_bot.language import LanguageHandler, LanguageRepository, LanguageService
+from pdf_bot.job_scheduler import JobScheduler
+from pdf_bot.language import (
+    LanguageHandler,
+    LanguagePreloadHandler,
+    LanguageRepository,
+    LanguageService,
+)
 from pdf_bot.log import InterceptLoggingHandler, MyLogHandler
 from pdf_bot.merge import MergeHandler, MergeService
 from pdf_bot.payment import PaymentHandler, PaymentService
@@ -41,6 +49,8 @@ from pdf_bot.pdf_processor import (
     ScalePdfProcessor,
     SplitPdfProcessor,
 )
+from pdf_bot.persistence import BotPersistence
+from pdf_bot.result_cache import ResultCacheService
 from pdf_bot.settings import Settings
 from pdf_bot.telegram_internal import TelegramService
 from pdf_bot.text import TextHandler, TextRepository, TextService
@@ -72,6 +82,7 @@ class Core(containers.DeclarativeContainer):
         request=_bot_request,
         rate_limiter=_bot_rate_limiter,
     )
+    persistence = providers.Singleton(BotPersistence, settings=settings)
 
     intercept_logging_handler = providers.Singleton(InterceptLoggingHandler)
     log_handler = providers.Singleton(
@@ -100,11 +111,7 @@ class Repositories(containers.DeclarativeContainer):
     analytics = providers.Singleton(AnalyticsRepository, api_client=clients.api, settings=_settings)
     feedback = providers.Singleton(FeedbackRepository, slack_client=clients.slack)
     language = providers.Singleton(LanguageRepository, datastore_client=clients.datastore)
-    text = providers.Singleton(
-        TextRepository,
-        api_client=clients.api,
-        google_fonts_token=_settings.google_fonts_token,
-    )
+    text = providers.Singleton(TextRepository, api_client=clients.api, settings=_settings)
 
 
 class Services(containers.DeclarativeContainer):
@@ -112,10 +119,16 @@ class Services(containers.DeclarativeContainer):
     core = providers.DependenciesContainer()
     repositories = providers.DependenciesContainer()
 
-    cli = providers.Singleton(CLIService)
+    cli = providers.Singleton(CLIService, settings=_settings)
+    download_cache = providers.Singleton(DownloadCacheService, settings=_settings)
+    result_cache = providers.Singleton(ResultCacheService, settings=_settings)
+    executor = providers.Singleton(ExecutorService, settings=_settings)
+    job_scheduler = providers.Singleton(JobScheduler, settings=_settings)
     io = providers.Singleton(IOService)
 
-    language = providers.Singleton(LanguageService, language_repository=repositories.language)
+    language = providers.Singleton(
+        LanguageService, language_repository=repositories.language, settings=_settings
+    )
 
     account = providers.Singleton(
         AccountService,
@@ -126,6 +139,7 @@ class Services(containers.DeclarativeContainer):
         AnalyticsService,
         analytics_repository=repositories.analytics,
         language_service=language,
+        settings=_settings,
     )
     command = providers.Singleton(
         CommandService, account_service=account, language_service=language
@@ -133,25 +147,38 @@ class Services(containers.DeclarativeContainer):
     error = providers.Singleton(ErrorService, language_service=language)
     telegram = providers.Singleton(
         TelegramService,
-        io_service=io,
         language_service=language,
         analytics_service=analytics,
+        download_cache_service=download_cache,
+        result_cache_service=result_cache,
         bot=core.telegram_bot,
     )
 
     image = providers.Singleton(
-        ImageService, cli_service=cli, io_service=io, telegram_service=telegram
+        ImageService,
+        cli_service=cli,
+        io_service=io,
+        telegram_service=telegram,
+        executor_service=executor,
+    )
+    pdf = providers.Singleton(
+        PdfService,
+        cli_service=cli,
+        io_service=io,
+        telegram_service=telegram,
+        executor_service=executor,
+        settings=_settings,
     )
-    pdf = providers.Singleton(PdfService, cli_service=cli, io_service=io, telegram_service=telegram)
 
     _image_task = providers.Singleton(ImageTaskProcessor, language_service=language)
-    _pdf_task = providers.Singleton(PdfTaskProcessor, language_service=language)
+    _pdf_task = providers.Singleton(PdfTaskProcessor, language_service=language, pdf_service=pdf)
     file = providers.Singleton(
         FileService,
         telegram_service=telegram,
         language_service=language,
         image_task_processor=_image_task,
         pdf_task_processor=_pdf_task,
+        pdf_service=pdf,
     )
 
     compare = providers.Singleton(
@@ -159,6 +186,7 @@ class Services(containers.DeclarativeContainer):
         pdf_service=pdf,
         telegram_service=telegram,
         language_service=language,
+        job_scheduler=job_scheduler,
     )
     feedback = providers.Singleton(
         FeedbackService,
@@ -203,6 +231,8 @@ class Services(containers.DeclarativeContainer):
         io_service=io,
         telegram_service=telegram,
         language_service=language,
+        executor_service=executor,
+        job_scheduler=job_scheduler,
     )
 
 
@@ -214,84 +244,98 @@ class Processors(containers.DeclarativeContainer):
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     crop = providers.Singleton(
         CropPdfProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     decrypt = providers.Singleton(
         DecryptPdfProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     encrypt = providers.Singleton(
         EncryptPdfProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     extract_image = providers.Singleton(
         ExtractPdfImageProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     extract_text = providers.Singleton(
         ExtractPdfTextProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     grayscale = providers.Singleton(
         GrayscalePdfProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     ocr = providers.Singleton(
         OcrPdfProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     pdf_to_image = providers.Singleton(
         PdfToImageProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     preview_pdf = providers.Singleton(
         PreviewPdfProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     rename = providers.Singleton(
         RenamePdfProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     rotate = providers.Singleton(
         RotatePdfProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     scale = providers.Singleton(
         ScalePdfProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     split = providers.Singleton(
         SplitPdfProcessor,
         pdf_service=services.pdf,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
 
     beautify = providers.Singleton(
@@ -299,12 +343,14 @@ class Processors(containers.DeclarativeContainer):
         image_service=services.image,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
     image_to_pdf = providers.Singleton(
         ImageToPdfProcessor,
         image_service=services.image,
         telegram_service=services.telegram,
         language_service=services.language,
+        job_scheduler=services.job_scheduler,
     )
 
 
@@ -313,6 +359,9 @@ class Handlers(containers.DeclarativeContainer):
     services = providers.DependenciesContainer()
 
     error = providers.Singleton(ErrorHandler, language_service=services.language)
+    language_preload = providers.Singleton(
+        LanguagePreloadHandler, language_service=services.language
+    )
 
     # Make sure payment handler comes first as it contains handlers that need to be
     # priortised
@@ -1,3 +1,5 @@
 from .datastore_client import MyDatastoreClient
+from .memory_datastore_client import MemoryDatastoreClient
+from .write_coalescer import WriteCoalescer
 
-__all__ = ["MyDatastoreClient"]
+__all__ = ["MemoryDatastoreClient", "MyDatastoreClient", "WriteCoalescer"]
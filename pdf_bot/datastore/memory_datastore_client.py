@@ -0,0 +1,61 @@
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from google.auth.credentials import AnonymousCredentials
+from google.cloud.datastore import Client, Entity, Key
+
+
+class MemoryDatastoreClient(Client):
+    """In-memory stand-in for the Datastore client, for tests and local benchmarks.
+
+    Only the lookups, writes and transactions used by the repositories are supported, and
+    transactions don't isolate anything. Each request sleeps for `latency` seconds to
+    simulate the network round trip.
+    """
+
+    _PROJECT = "memory"
+
+    def __init__(self, latency: float = 0) -> None:
+        super().__init__(project=self._PROJECT, credentials=AnonymousCredentials())
+        self.latency = latency
+        self.entities: dict[Key, Entity] = {}
+        self.num_reads = 0
+        self.num_writes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Key, *_args: Any, **_kwargs: Any) -> Entity | None:
+        entities = self.get_multi([key])
+        return entities[0] if entities else None
+
+    def get_multi(self, keys: Iterable[Key], *_args: Any, **_kwargs: Any) -> list[Entity]:
+        self._wait()
+        with self._lock:
+            self.num_reads += 1
+            return [self._copy(self.entities[x]) for x in keys if x in self.entities]
+
+    def put(self, entity: Entity, *_args: Any, **_kwargs: Any) -> None:
+        self.put_multi([entity])
+
+    def put_multi(self, entities: Iterable[Entity], *_args: Any, **_kwargs: Any) -> None:
+        self._wait()
+        with self._lock:
+            self.num_writes += 1
+            for entity in entities:
+                self.entities[entity.key] = self._copy(entity)
+
+    @contextmanager
+    def transaction(self, **_kwargs: Any) -> Iterator[None]:
+        yield
+
+    def _wait(self) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    @staticmethod
+    def _copy(entity: Entity) -> Entity:
+        copy = Entity(entity.key, exclude_from_indexes=tuple(entity.exclude_from_indexes))
+        copy.update(entity)
+        return copy
@@ -0,0 +1,55 @@
+import asyncio
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+R = TypeVar("R")
+
+
+class WriteCoalescer(Generic[K, V, R]):
+    """Run blocking writes off the event loop, combining writes for the same key.
+
+    While a write for a key is running, further writes for it are queued and only the
+    latest value is written once it finishes. Callers return once their value, or a newer
+    one for the same key, has been written, with the result of that write.
+    """
+
+    def __init__(self, write: Callable[[K, V], R]) -> None:
+        self._write = write
+        self._pending: dict[K, V] = {}
+        self._waiters: dict[K, list[asyncio.Future[R]]] = {}
+        self._tasks: dict[K, asyncio.Task[None]] = {}
+
+    async def write(self, key: K, value: V) -> R:
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        self._pending[key] = value
+        self._waiters.setdefault(key, []).append(future)
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(self._run(key))
+
+        # Shield the write so that it still completes if this caller is cancelled
+        return await asyncio.shield(future)
+
+    async def _run(self, key: K) -> None:
+        waiters: list[asyncio.Future[R]] = []
+        try:
+            while key in self._pending:
+                value = self._pending.pop(key)
+                waiters = self._waiters.pop(key)
+                result = await asyncio.to_thread(self._write, key, value)
+                for waiter in waiters:
+                    waiter.set_result(result)
+                waiters = []
+        except Exception as e:  # noqa: BLE001
+            # The queued value is dropped as its callers receive the same error
+            self._pending.pop(key, None)
+            for waiter in [*waiters, *self._waiters.pop(key, [])]:
+                waiter.set_exception(e)
+        except BaseException:
+            self._pending.pop(key, None)
+            for waiter in [*waiters, *self._waiters.pop(key, [])]:
+                waiter.cancel()
+            raise
+        finally:
+            del self._tasks[key]
@@ -0,0 +1,4 @@
+from .download_cache_service import DownloadCacheService
+from .models import CacheStats
+
+__all__ = ["CacheStats", "DownloadCacheService"]
@@ -0,0 +1,205 @@
+import asyncio
+import shutil
+import tempfile
+from collections import Counter, OrderedDict
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from pdf_bot.settings import Settings
+
+from .models import CacheStats
+
+DownloadFunc = Callable[[Path], Awaitable[Any]]
+
+
+@dataclass
+class _CacheEntry:
+    path: Path
+    size: int
+
+
+class DownloadCacheService:
+    """On-disk LRU cache of downloaded Telegram files keyed by `file_unique_id`.
+
+    Cached paths are shared between callers, so they must be treated as read only. An
+    entry is pinned while a caller holds it and is only evicted once it is released.
+    Entries are kept per suffix, so callers always get a path with the suffix they asked
+    for.
+    """
+
+    _PARTIAL_SUFFIX = ".part"
+
+    def __init__(self, settings: Settings | dict[str, Any]) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
+        self.max_size = settings.download_cache_max_size
+        self._cache_dir = settings.download_cache_dir
+        self._temp_dir: Path | None = None
+
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._pins: Counter[str] = Counter()
+        self._inflight: dict[str, asyncio.Future[_CacheEntry]] = {}
+        self._total_size = 0
+        self._stats = CacheStats()
+        self._loaded = False
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            num_entries=len(self._entries),
+            total_size=self._total_size,
+        )
+
+    @asynccontextmanager
+    async def get_or_download(
+        self, key: str, download: DownloadFunc, suffix: str = ""
+    ) -> AsyncGenerator[Path, None]:
+        # Entries are named after their keys and suffixes, which is also how they're
+        # loaded back from disk
+        name = f"{key}{suffix}"
+        entry = await self._acquire(name, download)
+        try:
+            yield entry.path
+        finally:
+            self._release(name)
+
+    def shutdown(self) -> None:
+        """Remove the cache directory if it's a temporary one."""
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = self._cache_dir = None
+            self._entries.clear()
+            self._total_size = 0
+            self._loaded = False
+
+    async def _acquire(self, key: str, download: DownloadFunc) -> _CacheEntry:
+        self._load_existing_entries()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._stats.hits += 1
+            self._entries.move_to_end(key)
+            self._pins[key] += 1
+            return entry
+
+        # Another caller is already downloading this file, so wait for it instead of
+        # downloading it again. The entry is pinned before waiting so that it can't be
+        # evicted before this caller gets to use it.
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._pins[key] += 1
+            try:
+                entry = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                self._release(key)
+                if not inflight.cancelled():
+                    raise
+
+                # The caller that was downloading the file got cancelled, so try again
+                return await self._acquire(key, download)
+            except BaseException:
+                self._release(key)
+                raise
+
+            self._stats.hits += 1
+            return entry
+
+        self._stats.misses += 1
+        self._pins[key] += 1
+        future: asyncio.Future[_CacheEntry] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            entry = await self._download(key, download)
+        except asyncio.CancelledError:
+            future.cancel()
+            self._release(key)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case no other callers are waiting
+            future.exception()
+            self._release(key)
+            raise
+        finally:
+            del self._inflight[key]
+
+        self._add_entry(key, entry)
+        future.set_result(entry)
+        self._evict()
+
+        return entry
+
+    async def _download(self, key: str, download: DownloadFunc) -> _CacheEntry:
+        path = self._get_cache_dir() / key
+        partial_path = path.with_name(f"{path.name}{self._PARTIAL_SUFFIX}")
+
+        try:
+            await download(partial_path)
+            partial_path.replace(path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+
+        return _CacheEntry(path, path.stat().st_size)
+
+    def _release(self, key: str) -> None:
+        self._pins[key] -= 1
+        if self._pins[key] <= 0:
+            del self._pins[key]
+        self._evict()
+
+    def _evict(self) -> None:
+        for key in list(self._entries):
+            if self._total_size <= self.max_size:
+                break
+            if key in self._pins:
+                continue
+
+            entry = self._entries.pop(key)
+            self._total_size -= entry.size
+            self._stats.evictions += 1
+
+            with suppress(OSError):
+                entry.path.unlink(missing_ok=True)
+
+    def _add_entry(self, key: str, entry: _CacheEntry) -> None:
+        self._entries[key] = entry
+        self._total_size += entry.size
+
+    def _get_cache_dir(self) -> Path:
+        if self._cache_dir is None:
+            self._cache_dir = self._temp_dir = Path(tempfile.mkdtemp(prefix="download_cache_"))
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        return self._cache_dir
+
+    def _load_existing_entries(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+
+        cache_dir = self._get_cache_dir()
+        paths = sorted(
+            (x for x in cache_dir.iterdir() if x.is_file()), key=lambda x: x.stat().st_mtime
+        )
+
+        for path in paths:
+            if path.suffix == self._PARTIAL_SUFFIX:
+                path.unlink(missing_ok=True)
+                continue
+
+            self._add_entry(path.name, _CacheEntry(path, path.stat().st_size))
+
+        if self._entries:
+            logger.info("Loaded {count} files into the download cache", count=len(self._entries))
+        self._evict()
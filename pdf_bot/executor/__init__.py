@@ -0,0 +1,4 @@
+from .executor_service import ExecutorService, ReportFunc
+from .models import WorkerPool
+
+__all__ = ["ExecutorService", "ReportFunc", "WorkerPool"]
@@ -0,0 +1,279 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.util import Finalize
+from typing import Any, Concatenate, ParamSpec, TypeVar, cast
+
+from loguru import logger
+
+from pdf_bot.settings import Settings
+
+from .models import WorkerPool
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+ReportFunc = Callable[[Any], None]
+ProgressHandler = Callable[[Any], Awaitable[None]]
+
+# Kinds of messages sent from killable worker processes
+_RESULT = 0
+_ERROR = 1
+_PROGRESS = 2
+
+
+@dataclass(frozen=True)
+class _PoolConfig:
+    size: int
+    use_processes: bool
+
+
+@dataclass(eq=False)
+class _KillableWorker:
+    process: BaseProcess
+    conn: Connection
+    num_jobs: int = 0
+
+
+class ExecutorService:
+    """Run blocking operations off the event loop in bounded worker pools.
+
+    Each `WorkerPool` has its own executor, so a burst of heavy jobs can't starve the
+    light ones. Executors are created lazily on first use. Functions submitted to a
+    pool backed by processes must be picklable, i.e. defined at module level.
+
+    Work that may never finish should use `run_killable` instead, which runs it in a
+    worker process of its own that is killed once its caller is cancelled. Killable
+    workers are kept warm and reused for later jobs, as long as they finish normally.
+    """
+
+    def __init__(self, settings: Settings | dict[str, Any]) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
+        self._pool_configs = {
+            WorkerPool.light: _PoolConfig(settings.executor_light_pool_size, False),
+            WorkerPool.heavy: _PoolConfig(
+                settings.executor_heavy_pool_size, settings.executor_heavy_use_processes
+            ),
+            WorkerPool.ocr: _PoolConfig(
+                settings.executor_ocr_pool_size, settings.executor_ocr_use_processes
+            ),
+        }
+        self._executors: dict[WorkerPool, Executor] = {}
+        self._killable_semaphores = {
+            pool: asyncio.Semaphore(config.size) for pool, config in self._pool_configs.items()
+        }
+        self._killable_max_jobs = settings.executor_killable_worker_max_jobs
+        self._idle_killable_workers: dict[WorkerPool, list[_KillableWorker]] = {
+            pool: [] for pool in self._pool_configs
+        }
+
+        # Killable workers aren't daemonic, so make sure that they're stopped before the
+        # interpreter waits for them to exit, even if `shutdown` isn't called
+        self._killable_workers: set[_KillableWorker] = set()
+        Finalize(self, _stop_workers, args=(self._killable_workers,), exitpriority=10)
+
+    async def run(
+        self, pool: WorkerPool, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor(pool)
+        return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+    async def run_killable(
+        self, pool: WorkerPool, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Run `func` in a worker process and kill it if the caller is cancelled.
+
+        At most the pool's size of these jobs run at once. The function, its arguments
+        and its result must be picklable. The process may start processes of its own,
+        which are killed along with it.
+        """
+        return cast(T, await self._run_killable(pool, None, func, args, kwargs))
+
+    async def run_killable_with_progress(
+        self,
+        pool: WorkerPool,
+        on_progress: ProgressHandler,
+        func: Callable[Concatenate[ReportFunc, P], T],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> T:
+        """Same as `run_killable`, but `func` is also passed a function to report progress.
+
+        Each value reported by the worker process is passed to `on_progress` in the
+        event loop. Reported values must be picklable.
+        """
+        return cast(T, await self._run_killable(pool, on_progress, func, args, kwargs))
+
+    async def _run_killable(
+        self,
+        pool: WorkerPool,
+        on_progress: ProgressHandler | None,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict[str, Any],
+    ) -> Any:
+        async with self._killable_semaphores[pool]:
+            worker = self._get_killable_worker(pool)
+            try:
+                worker.conn.send((func, args, kwargs, on_progress is not None))
+            except BaseException:
+                # Nothing is sent if the job can't be pickled, so the worker is still idle
+                self._idle_killable_workers[pool].append(worker)
+                raise
+
+            worker.num_jobs += 1
+            kind: int | None = None
+            try:
+                # Receiving blocks, but it returns as soon as the process exits
+                kind, result = await asyncio.to_thread(_receive, worker.conn)
+                while kind == _PROGRESS:
+                    await self._report_progress(cast(ProgressHandler, on_progress), result)
+                    kind, result = await asyncio.to_thread(_receive, worker.conn)
+            finally:
+                # Workers are only reused once they've finished their job
+                if kind in (_RESULT, _ERROR) and worker.num_jobs < self._killable_max_jobs:
+                    self._idle_killable_workers[pool].append(worker)
+                else:
+                    if worker.process.is_alive():
+                        logger.info("Killing worker process {pid}", pid=worker.process.pid)
+                    await asyncio.to_thread(self._stop_killable_worker, worker)
+
+        if kind is None:
+            msg = f"Worker process exited unexpectedly with code {worker.process.exitcode}"
+            raise ChildProcessError(msg)
+        if kind == _ERROR:
+            raise result
+        return result
+
+    def _get_killable_worker(self, pool: WorkerPool) -> _KillableWorker:
+        idle_workers = self._idle_killable_workers[pool]
+        while idle_workers:
+            worker = idle_workers.pop()
+            if worker.process.is_alive():
+                return worker
+            self._stop_killable_worker(worker)
+
+        ctx = multiprocessing.get_context("spawn")
+        conn, child_conn = ctx.Pipe()
+        # Daemonic processes can't start processes of their own, such as a
+        # multiprocessing pool, so the process is killed and joined explicitly instead
+        process = ctx.Process(target=_serve_in_process, args=(child_conn,), daemon=False)
+        process.start()
+        child_conn.close()
+
+        worker = _KillableWorker(process, conn)
+        self._killable_workers.add(worker)
+        return worker
+
+    def _stop_killable_worker(self, worker: _KillableWorker) -> None:
+        self._killable_workers.discard(worker)
+        _stop_worker(worker)
+
+    @staticmethod
+    async def _report_progress(on_progress: ProgressHandler, value: Any) -> None:
+        # Failing to report progress shouldn't fail the work itself
+        try:
+            await on_progress(value)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to report worker progress")
+
+    def shutdown(self, wait: bool = True) -> None:
+        for pool, executor in self._executors.items():
+            logger.info("Shutting down {pool} worker pool", pool=pool.value)
+            executor.shutdown(wait=wait, cancel_futures=True)
+        self._executors.clear()
+
+        for idle_workers in self._idle_killable_workers.values():
+            idle_workers.clear()
+        _stop_workers(self._killable_workers)
+
+    def _get_executor(self, pool: WorkerPool) -> Executor:
+        executor = self._executors.get(pool)
+        if executor is not None:
+            return executor
+
+        config = self._pool_configs[pool]
+        if config.use_processes:
+            # Forking a process that runs an event loop and other threads is unsafe, so
+            # always spawn fresh interpreters for the workers
+            executor = ProcessPoolExecutor(
+                max_workers=config.size, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            executor = ThreadPoolExecutor(
+                max_workers=config.size, thread_name_prefix=f"{pool.value}_worker"
+            )
+
+        self._executors[pool] = executor
+        return executor
+
+
+def _serve_in_process(conn: Connection) -> None:
+    """Run the jobs received from `conn` one at a time until it's closed."""
+    # Lead a process group of our own, so that the processes that we start can be killed
+    # along with us
+    os.setpgid(0, 0)
+
+    while True:
+        try:
+            func, args, kwargs, report_progress = conn.recv()
+        except EOFError:
+            break
+
+        if report_progress:
+            args = (partial(_send_progress, conn), *args)
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:  # noqa: BLE001
+            conn.send((_ERROR, e))
+        else:
+            conn.send((_RESULT, result))
+
+    conn.close()
+
+
+def _stop_workers(workers: set[_KillableWorker]) -> None:
+    for worker in list(workers):
+        workers.discard(worker)
+        _stop_worker(worker)
+
+
+def _stop_worker(worker: _KillableWorker) -> None:
+    _kill_process_group(worker.process)
+    worker.process.join()
+    worker.conn.close()
+
+
+def _kill_process_group(proc: BaseProcess) -> None:
+    """Kill the worker process and any processes that it started and left behind."""
+    try:
+        os.killpg(cast(int, proc.pid), signal.SIGKILL)
+    except ProcessLookupError:
+        # The process hasn't led its group yet, or the group has already exited
+        proc.kill()
+
+
+def _send_progress(sender: Connection, value: Any) -> None:
+    sender.send((_PROGRESS, value))
+
+
+def _receive(receiver: Connection) -> tuple[int | None, Any]:
+    try:
+        kind, result = receiver.recv()
+    except (EOFError, ConnectionResetError):
+        # The connection is reset rather than closed if the process dies with data unread
+        return None, None
+    return kind, result
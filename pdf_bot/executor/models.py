@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class WorkerPool(Enum):
+    # Short page level operations, such as rotating or encrypting a PDF file
+    light = "light"
+    # Long running operations, such as rasterising or rendering a PDF file
+    heavy = "heavy"
+    # OCR jobs, which spawn their own workers and are kept in a separate pool
+    ocr = "ocr"
@@ -31,5 +31,7 @@ class FeedbackHandler(AbstractTelegramHandler):
                     ]
                 },
                 fallbacks=[CommandHandler("cancel", self.telegram_service.cancel_conversation)],
+                name="feedback",
+                persistent=True,
             )
         ]
@@ -39,5 +39,7 @@ class FileHandler(AbstractTelegramHandler):
                     CommandHandler("cancel", self.telegram_service.cancel_conversation),
                 ],
                 allow_reentry=True,
+                name="file",
+                persistent=True,
             )
         ]
@@ -7,6 +7,7 @@ from telegram.ext import ContextTypes, ConversationHandler
 from pdf_bot.image_processor import ImageTaskProcessor
 from pdf_bot.language import LanguageService
 from pdf_bot.models import FileData
+from pdf_bot.pdf import PdfService
 from pdf_bot.pdf_processor import PdfTaskProcessor
 from pdf_bot.telegram_internal import TelegramService
 
@@ -18,11 +19,13 @@ class FileService:
         language_service: LanguageService,
         image_task_processor: ImageTaskProcessor,
         pdf_task_processor: PdfTaskProcessor,
+        pdf_service: PdfService,
     ) -> None:
         self.telegram_service = telegram_service
         self.image_task_processor = image_task_processor
         self.pdf_task_processor = pdf_task_processor
         self.language_service = language_service
+        self.pdf_service = pdf_service
 
     async def check_pdf(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str | int:
         file_data = await self._get_file_data(update, context)
@@ -30,6 +33,10 @@ class FileService:
             return ConversationHandler.END
         self.telegram_service.cache_file_data(context, file_data)
 
+        # Probe the file once here without waiting for it, so that the tasks are listed
+        # straight away, while later menus hide the tasks that can't apply to it and those
+        # tasks fail fast
+        self.pdf_service.probe_pdf(file_data.id)
         return await self.pdf_task_processor.ask_task(update, context)
 
     async def check_image(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int | str:
@@ -1,19 +1,23 @@
-import shutil
 from abc import ABC, abstractmethod
 from collections.abc import AsyncGenerator, Callable, Coroutine, Sequence
-from contextlib import asynccontextmanager, suppress
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager, suppress
+from dataclasses import asdict
+from functools import partial
 from pathlib import Path
 from typing import Any, ClassVar, cast
 
-from telegram import Message, Update
-from telegram.error import BadRequest
+from loguru import logger
+from telegram import Message, Update, User
+from telegram.error import BadRequest, TelegramError
 from telegram.ext import BaseHandler, ContextTypes, ConversationHandler
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import CallbackQueryDataTypeError
 from pdf_bot.file_processor.errors import DuplicateClassError
+from pdf_bot.job_scheduler import JobLane, JobScheduler, JobTimeoutError
 from pdf_bot.language import LanguageService
 from pdf_bot.models import FileData, FileTaskResult, TaskData
+from pdf_bot.result_cache import ResultCacheService
 from pdf_bot.telegram_internal import TelegramGetUserDataError, TelegramService
 
 from .file_task_mixin import FileTaskMixin
@@ -31,10 +35,12 @@ class AbstractFileProcessor(FileTaskMixin, ABC):
         self,
         telegram_service: TelegramService,
         language_service: LanguageService,
+        job_scheduler: JobScheduler,
         bypass_init_check: bool = False,
     ) -> None:
         self.telegram_service = telegram_service
         self.language_service = language_service
+        self.job_scheduler = job_scheduler
 
         cls_name = self.__class__.__name__
         if not bypass_init_check and cls_name in self._FILE_PROCESSORS:
@@ -70,6 +76,19 @@ class AbstractFileProcessor(FileTaskMixin, ABC):
     async def process_file_task(self, file_data: FileData) -> AsyncGenerator[FileTaskResult, None]:
         yield FileTaskResult(Path())
 
+    @property
+    def cache_result(self) -> bool:
+        """Whether results can be shared with other requests for the same file.
+
+        Processors that produce results specific to the user, such as ones that are
+        protected by a password, should disable this.
+        """
+        return True
+
+    @property
+    def job_lane(self) -> JobLane:
+        return JobLane.heavy
+
     @property
     def generic_error_types(self) -> set[type[Exception]]:
         return set()
@@ -124,18 +143,35 @@ class AbstractFileProcessor(FileTaskMixin, ABC):
         self, update: Update, context: ContextTypes.DEFAULT_TYPE, file_data: FileData
     ) -> str | int | None:
         try:
-            async with self.process_file_task(file_data) as result:
+            result_key = await self._get_result_key(file_data)
+            if result_key is not None and await self.telegram_service.send_cached_result(
+                update, context, result_key, self.task_type
+            ):
+                return None
+
+            user = cast(User, update.effective_user)
+            async with AsyncExitStack() as stack:
+                job = await stack.enter_async_context(
+                    self.job_scheduler.schedule(
+                        user.id, self.job_lane, partial(self._send_queue_position, update, context)
+                    )
+                )
+                async with self.job_scheduler.time_budget(self.task_type):
+                    result = await stack.enter_async_context(
+                        self._create_file_task(update, context, file_data)
+                    )
+
+                # The file has been processed, so let the next job start while it's sent
+                job.release()
+
                 if result.message is not None:
                     await self.telegram_service.send_message(update, context, result.message)
 
-                out_path = final_path = result.path
-                final_path = out_path
-
-                if out_path.is_dir():
-                    shutil.make_archive(str(out_path), "zip", out_path)
-                    final_path = out_path.with_suffix(".zip")
-
-                await self.telegram_service.send_file(update, context, final_path, self.task_type)
+                message = await self.telegram_service.send_file(
+                    update, context, result.path, self.task_type
+                )
+                if result_key is not None and message is not None:
+                    await self.telegram_service.cache_result(result_key, message, result.message)
         except Exception as e:
             handlers = self._get_error_handlers()
             error_handler: ErrorHandlerType | None = None
@@ -148,6 +184,48 @@ class AbstractFileProcessor(FileTaskMixin, ABC):
             raise
         return None
 
+    def _create_file_task(
+        self, _update: Update, _context: ContextTypes.DEFAULT_TYPE, file_data: FileData
+    ) -> AbstractAsyncContextManager[FileTaskResult]:
+        """Create the task that processes the file.
+
+        Processors override this to interact with the chat while the file is processed.
+        """
+        return self.process_file_task(file_data)
+
+    async def _get_result_key(self, file_data: FileData) -> str | None:
+        if not self.cache_result:
+            return None
+
+        try:
+            file_unique_id = await self.telegram_service.get_file_unique_id(file_data.id)
+        except TelegramError:
+            logger.exception("Failed to get file unique ID")
+            return None
+
+        # The task parameters are stored in the file data alongside the file ID and name,
+        # and the data type is included as different types can share the same fields
+        params = {
+            key: value for key, value in asdict(file_data).items() if key not in {"id", "name"}
+        }
+        params["data_type"] = type(file_data).__name__
+
+        return ResultCacheService.build_key(file_unique_id, self.task_type, params)
+
+    async def _send_queue_position(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE, position: int
+    ) -> None:
+        _ = self.language_service.set_app_language(update, context)
+        msg = cast(Message, update.effective_message)
+
+        with suppress(TelegramError):
+            await msg.reply_text(
+                _(
+                    "Your file is number {position} in the queue, "
+                    "it'll be processed as soon as possible"
+                ).format(position=position)
+            )
+
     async def _process_previous_message(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -165,8 +243,9 @@ class AbstractFileProcessor(FileTaskMixin, ABC):
     def _get_error_handlers(
         self,
     ) -> dict[type[Exception], ErrorHandlerType]:
+        error_types: set[type[Exception]] = {JobTimeoutError, *self.generic_error_types}
         handlers: dict[type[Exception], ErrorHandlerType] = {
-            x: self._handle_generic_error for x in self.generic_error_types
+            x: self._handle_generic_error for x in error_types
         }
         handlers.update(self.custom_error_handlers)
         return handlers
@@ -46,6 +46,9 @@ class FileTaskMixin:
 
             file = msg.document or msg.photo[-1]
 
+        file_id = file_data.id if file_data is not None else file.file_id
+        tasks = await self.filter_tasks(file_id, tasks)
+
         def get_callback_data(data_type: type[FileData]) -> FileData:
             if file_data is not None:
                 return data_type(file_data.id, file_data.name)
@@ -70,3 +73,7 @@ class FileTaskMixin:
         )
 
         return self.WAIT_FILE_TASK
+
+    async def filter_tasks(self, _file_id: str, tasks: Sequence[TaskData]) -> Sequence[TaskData]:
+        """Get the tasks that can apply to the file, which are all of them by default."""
+        return tasks
@@ -7,6 +7,7 @@ import noteshrink
 from img2pdf import Rotation
 
 from pdf_bot.cli import CLIService
+from pdf_bot.executor import ExecutorService, WorkerPool
 from pdf_bot.io import IOService
 from pdf_bot.models import FileData
 from pdf_bot.telegram_internal import TelegramService
@@ -18,10 +19,12 @@ class ImageService:
         cli_service: CLIService,
         io_service: IOService,
         telegram_service: TelegramService,
+        executor_service: ExecutorService,
     ) -> None:
         self.cli_service = cli_service
         self.io_service = io_service
         self.telegram_service = telegram_service
+        self.executor_service = executor_service
 
     @asynccontextmanager
     async def beautify_and_convert_images_to_pdf(
@@ -30,8 +33,12 @@ class ImageService:
         file_ids = self._get_file_ids(file_data_list)
         async with self.telegram_service.download_files(file_ids) as file_paths:
             with self.io_service.create_temp_pdf_file("Beautified") as out_path:
-                noteshrink.notescan_main(
-                    file_paths, basename=f"{out_path.stem}_page", pdfname=out_path
+                await self.executor_service.run(
+                    WorkerPool.heavy,
+                    noteshrink.notescan_main,
+                    file_paths,
+                    basename=f"{out_path.stem}_page",
+                    pdfname=out_path,
                 )
                 yield out_path
 
@@ -43,8 +50,12 @@ class ImageService:
         async with self.telegram_service.download_files(file_ids) as file_paths:
             file_path_strs = [str(x) for x in file_paths]
             with self.io_service.create_temp_pdf_file("Converted") as out_path:
+                image_bytes = await self.executor_service.run(
+                    WorkerPool.heavy, img2pdf.convert, file_path_strs, rotation=Rotation.ifvalid
+                )
+
                 with out_path.open("wb") as f:
-                    f.write(img2pdf.convert(file_path_strs, rotation=Rotation.ifvalid))
+                    f.write(image_bytes)
                 yield out_path
 
     @staticmethod
@@ -34,5 +34,7 @@ class BatchImageHandler(AbstractTelegramHandler):
                 },
                 fallbacks=[CommandHandler("cancel", self.telegram_service.cancel_conversation)],
                 allow_reentry=True,
+                name="batch_image",
+                persistent=True,
             )
         ]
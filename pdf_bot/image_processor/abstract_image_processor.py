@@ -3,6 +3,7 @@ from typing import ClassVar
 from pdf_bot.file_processor import AbstractFileProcessor
 from pdf_bot.file_processor.errors import DuplicateClassError
 from pdf_bot.image import ImageService
+from pdf_bot.job_scheduler import JobScheduler
 from pdf_bot.language import LanguageService
 from pdf_bot.models import TaskData
 from pdf_bot.telegram_internal import TelegramService
@@ -16,6 +17,7 @@ class AbstractImageProcessor(AbstractFileProcessor):
         image_service: ImageService,
         telegram_service: TelegramService,
         language_service: LanguageService,
+        job_scheduler: JobScheduler,
         bypass_init_check: bool = False,
     ) -> None:
         self.image_service = image_service
@@ -25,7 +27,7 @@ class AbstractImageProcessor(AbstractFileProcessor):
             raise DuplicateClassError(cls_name)
         self._IMAGE_PROCESSORS[cls_name] = self
 
-        super().__init__(telegram_service, language_service, bypass_init_check)
+        super().__init__(telegram_service, language_service, job_scheduler, bypass_init_check)
 
     @classmethod
     def get_task_data_list(cls) -> list[TaskData]:
@@ -1,3 +1,15 @@
+from .exceptions import FileSplitError, IOServiceError, ZipArchiveTooLargeError
+from .file_splitter import split_dir, split_pdf, split_zip
 from .io_service import IOService
+from .zip_archive_writer import ZipArchiveWriter
 
-__all__ = ["IOService"]
+__all__ = [
+    "IOService",
+    "IOServiceError",
+    "FileSplitError",
+    "ZipArchiveTooLargeError",
+    "ZipArchiveWriter",
+    "split_dir",
+    "split_pdf",
+    "split_zip",
+]
@@ -0,0 +1,12 @@
+class IOServiceError(Exception):
+    pass
+
+
+class ZipArchiveTooLargeError(IOServiceError):
+    pass
+
+
+class FileSplitError(IOServiceError):
+    def __init__(self, name: str, max_size: int, *args: object) -> None:
+        msg = f"{name} is larger than {max_size} bytes and can't be split further"
+        super().__init__(msg, *args)
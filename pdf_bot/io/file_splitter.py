@@ -0,0 +1,115 @@
+import math
+import zipfile
+from itertools import pairwise
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from pypdf import PdfReader, PdfWriter
+
+from .exceptions import FileSplitError, ZipArchiveTooLargeError
+from .zip_archive_writer import ZipArchiveWriter
+
+# Aim for parts a bit smaller than the limit, as pages that share resources, such as
+# fonts, each get their own copy of them once they are split up
+_PDF_PART_SIZE_RATIO = 0.9
+
+
+def split_pdf(path: Path, out_dir: Path, max_size: int) -> list[Path]:
+    """Split the PDF file by page ranges into parts that are no larger than `max_size`.
+
+    Raises:
+        FileSplitError: if a single page is larger than `max_size`
+    """
+    reader = PdfReader(path)
+    num_pages = len(reader.pages)
+    num_parts = min(
+        num_pages, max(1, math.ceil(path.stat().st_size / (max_size * _PDF_PART_SIZE_RATIO)))
+    )
+
+    # Split the pages evenly, then keep halving any part that is still too large
+    bounds = [round(i * num_pages / num_parts) for i in range(num_parts + 1)]
+    page_ranges = list(pairwise(bounds))
+    parts: list[Path] = []
+
+    while page_ranges:
+        start, end = page_ranges.pop(0)
+        part_path = out_dir / f"{path.stem}_pages_{start + 1}-{end}.pdf"
+
+        writer = PdfWriter()
+        for page in reader.pages[start:end]:
+            writer.add_page(page)
+        writer.write(part_path)
+
+        if part_path.stat().st_size <= max_size:
+            parts.append(part_path)
+            continue
+
+        part_path.unlink()
+        if end - start == 1:
+            page_name = f"Page {end}"
+            raise FileSplitError(page_name, max_size)
+
+        middle = (start + end) // 2
+        page_ranges[:0] = [(start, middle), (middle, end)]
+
+    return parts
+
+
+def split_dir(dir_path: Path, out_dir: Path, max_size: int, name: str | None = None) -> list[Path]:
+    """Write the files in the directory into ZIP volumes that are no larger than `max_size`.
+
+    Each volume is a complete ZIP archive. A single volume is named `<name>.zip`, and
+    multiple volumes are named `<name>_part<number>.zip`.
+
+    Raises:
+        FileSplitError: if a single file doesn't fit into a volume
+    """
+    if name is None:
+        name = dir_path.name
+
+    volumes: list[Path] = []
+    writer: ZipArchiveWriter | None = None
+
+    try:
+        for path in sorted(dir_path.rglob("*")):
+            if not path.is_file():
+                continue
+
+            arcname = path.relative_to(dir_path).as_posix()
+            if writer is not None and not writer.fits(path, arcname):
+                writer.close()
+                writer = None
+
+            if writer is None:
+                volume_path = out_dir / f"{name}_part{len(volumes) + 1}.zip"
+                writer = ZipArchiveWriter(volume_path, max_size)
+                volumes.append(volume_path)
+
+            writer.write(path, arcname)
+    except ZipArchiveTooLargeError as e:
+        raise FileSplitError(path.name, max_size) from e
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if len(volumes) <= 1:
+        archive_path = out_dir / f"{name}.zip"
+        if volumes:
+            volumes[0].replace(archive_path)
+        else:
+            ZipArchiveWriter(archive_path).close()
+        return [archive_path]
+
+    return volumes
+
+
+def split_zip(path: Path, out_dir: Path, max_size: int) -> list[Path]:
+    """Split the ZIP archive into ZIP volumes that are no larger than `max_size`.
+
+    Raises:
+        FileSplitError: if a single entry doesn't fit into a volume
+    """
+    with TemporaryDirectory(dir=out_dir) as dir_name:
+        with zipfile.ZipFile(path) as archive:
+            archive.extractall(dir_name)
+        return split_dir(Path(dir_name), out_dir, max_size, path.stem)
@@ -51,6 +51,11 @@ class IOService:
         with self.create_temp_file(prefix=prefix, suffix=".png") as out_path:
             yield out_path
 
+    @contextmanager
+    def create_temp_zip_file(self, prefix: str) -> Generator[Path, None, None]:
+        with self.create_temp_file(prefix=prefix, suffix=".zip") as out_path:
+            yield out_path
+
     @contextmanager
     def create_temp_txt_file(self, prefix: str) -> Generator[Path, None, None]:
         with self.create_temp_file(prefix=prefix, suffix=".txt") as out_path:
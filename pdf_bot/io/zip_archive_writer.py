@@ -0,0 +1,99 @@
+import zipfile
+from pathlib import Path
+from types import TracebackType
+
+from .exceptions import ZipArchiveTooLargeError
+
+
+class ZipArchiveWriter:
+    """Write files into a ZIP archive one entry at a time.
+
+    Files that are already compressed, such as PNG and JPEG images, are stored as is. If
+    `max_size` is set, the size of the archive is checked as it grows and
+    `ZipArchiveTooLargeError` is raised as soon as it goes over the limit.
+    """
+
+    STORED_SUFFIXES = frozenset({".png", ".jpg", ".jpeg"})
+
+    # Sizes of the fixed parts of a local file header, a central directory file header
+    # and the end of central directory record
+    _LOCAL_HEADER_SIZE = 30
+    _CENTRAL_DIR_HEADER_SIZE = 46
+    _END_OF_CENTRAL_DIR_SIZE = 22
+
+    # Deflate adds up to 5 bytes for every block of incompressible data
+    _DEFLATE_BLOCK_SIZE = 16 * 1024
+    _DEFLATE_BLOCK_OVERHEAD = 5
+
+    def __init__(self, path: Path, max_size: int | None = None) -> None:
+        self.path = path
+        self.max_size = max_size
+
+        self._file = path.open("wb")
+        self._archive = zipfile.ZipFile(self._file, "w", zipfile.ZIP_DEFLATED)
+        self._central_dir_size = self._END_OF_CENTRAL_DIR_SIZE
+
+    def __enter__(self) -> "ZipArchiveWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """The size the archive will have once it is closed."""
+        return self._file.tell() + self._central_dir_size
+
+    def fits(self, file_path: Path, arcname: str) -> bool:
+        """Check if the file fits into the archive even if it doesn't compress at all."""
+        if self.max_size is None:
+            return True
+
+        file_size = file_path.stat().st_size
+        if file_path.suffix.lower() not in self.STORED_SUFFIXES:
+            num_blocks = file_size // self._DEFLATE_BLOCK_SIZE + 1
+            file_size += num_blocks * self._DEFLATE_BLOCK_OVERHEAD
+
+        name_size = len(arcname.encode())
+        entry_size = (
+            self._LOCAL_HEADER_SIZE + self._CENTRAL_DIR_HEADER_SIZE + 2 * name_size + file_size
+        )
+        return self.size + entry_size <= self.max_size
+
+    def write(self, file_path: Path, arcname: str | None = None) -> None:
+        if file_path.suffix.lower() in self.STORED_SUFFIXES:
+            # The size of a stored entry is known up front, so check it before writing
+            self._check_size(file_path.stat().st_size)
+            compress_type = zipfile.ZIP_STORED
+        else:
+            compress_type = zipfile.ZIP_DEFLATED
+
+        self._archive.write(file_path, arcname, compress_type=compress_type)
+
+        info = self._archive.infolist()[-1]
+        self._central_dir_size += (
+            self._CENTRAL_DIR_HEADER_SIZE
+            + len(info.filename.encode())
+            + len(info.extra)
+            + len(info.comment)
+        )
+        self._check_size()
+
+    def write_dir(self, dir_path: Path) -> None:
+        """Write all the files in the directory, with names relative to it."""
+        for path in sorted(dir_path.rglob("*")):
+            if path.is_file():
+                self.write(path, path.relative_to(dir_path).as_posix())
+
+    def close(self) -> None:
+        self._archive.close()
+        self._file.close()
+
+    def _check_size(self, extra_size: int = 0) -> None:
+        if self.max_size is not None and self.size + extra_size > self.max_size:
+            raise ZipArchiveTooLargeError
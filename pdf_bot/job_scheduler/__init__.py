@@ -0,0 +1,5 @@
+from .exceptions import JobSchedulerError, JobTimeoutError
+from .job_scheduler import JobScheduler, ScheduledJob
+from .models import JobLane
+
+__all__ = ["JobLane", "JobScheduler", "JobSchedulerError", "JobTimeoutError", "ScheduledJob"]
@@ -0,0 +1,6 @@
+class JobSchedulerError(Exception):
+    pass
+
+
+class JobTimeoutError(JobSchedulerError):
+    pass
@@ -0,0 +1,182 @@
+import asyncio
+from collections import Counter
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from gettext import gettext as _
+from typing import Any
+
+from loguru import logger
+
+from pdf_bot.analytics import TaskType
+from pdf_bot.settings import Settings
+
+from .exceptions import JobTimeoutError
+from .models import JobLane
+
+QueuedCallback = Callable[[int], Awaitable[Any]]
+
+
+@dataclass
+class _Waiter:
+    user_id: int
+    lane: JobLane
+    future: asyncio.Future[None] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class ScheduledJob:
+    def __init__(self, release: Callable[[], None]) -> None:
+        self._release = release
+        self._released = False
+
+    def release(self) -> None:
+        """Free the job's slot, e.g. once its result only needs to be sent."""
+        if not self._released:
+            self._released = True
+            self._release()
+
+
+class JobScheduler:
+    """Admit jobs under a global cap, a cap per `JobLane` and a cap per user.
+
+    Jobs that can't start straight away wait in a queue. When a slot frees up, the next
+    job is taken from the users with the fewest running jobs, in the order that they were
+    queued, so a user with a backlog of jobs can't starve the others.
+
+    Each `TaskType` also has a time budget, see `time_budget`.
+    """
+
+    def __init__(self, settings: Settings | dict[str, Any]) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
+        self.max_concurrency = settings.job_max_concurrency
+        self.max_jobs_per_user = settings.job_max_jobs_per_user
+        self.lane_limits = {
+            JobLane.light: settings.job_light_max_concurrency,
+            JobLane.heavy: settings.job_heavy_max_concurrency,
+        }
+        self.task_timeout = settings.task_timeout
+        self.task_timeouts = settings.task_timeouts
+
+        self._num_running = 0
+        self._lane_jobs: Counter[JobLane] = Counter()
+        self._user_jobs: Counter[int] = Counter()
+        self._waiters: list[_Waiter] = []
+
+    @property
+    def num_running(self) -> int:
+        return self._num_running
+
+    @property
+    def num_waiting(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def schedule(
+        self, user_id: int, lane: JobLane, on_queued: QueuedCallback | None = None
+    ) -> AsyncGenerator[ScheduledJob, None]:
+        """Wait for a slot to run a job in.
+
+        Args:
+            user_id: the ID of the user that the job belongs to
+            lane: the lane to run the job in
+            on_queued: called with the job's position in its lane if it has to wait
+
+        Yields:
+            The job, which holds the slot until it's released or the context exits
+        """
+        await self._acquire(user_id, lane, on_queued)
+        job = ScheduledJob(lambda: self._release(user_id, lane))
+        try:
+            yield job
+        finally:
+            job.release()
+
+    def get_timeout(self, task_type: TaskType) -> float:
+        return self.task_timeouts.get(task_type.value, self.task_timeout)
+
+    @asynccontextmanager
+    async def time_budget(self, task_type: TaskType) -> AsyncGenerator[None, None]:
+        """Cancel the work in the context once the task's time budget runs out.
+
+        Work that runs in a subprocess or through `ExecutorService.run_killable` is killed
+        when it's cancelled, while work in a worker thread can only be abandoned.
+
+        Raises:
+            JobTimeoutError: if the time budget runs out
+        """
+        timeout = self.get_timeout(task_type)
+        cm = asyncio.timeout(timeout)
+
+        try:
+            async with cm:
+                yield
+        except TimeoutError as e:
+            if not cm.expired():
+                raise
+
+            logger.warning(
+                "{task} took longer than {timeout}s", task=task_type.value, timeout=timeout
+            )
+            raise JobTimeoutError(_("Your file took too long to process")) from e
+
+    async def _acquire(self, user_id: int, lane: JobLane, on_queued: QueuedCallback | None) -> None:
+        # Waiting jobs are started as soon as they can be, so there are none that could
+        # run ahead of this one
+        if self._can_start(user_id, lane):
+            self._start(user_id, lane)
+            return
+
+        waiter = _Waiter(user_id, lane)
+        self._waiters.append(waiter)
+
+        try:
+            if on_queued is not None:
+                position = sum(1 for x in self._waiters if x.lane == lane)
+                await on_queued(position)
+            await waiter.future
+        except BaseException:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was given to this job just before it was cancelled
+                self._release(user_id, lane)
+            else:
+                waiter.future.cancel()
+                self._waiters.remove(waiter)
+            raise
+
+    def _release(self, user_id: int, lane: JobLane) -> None:
+        self._num_running -= 1
+        self._lane_jobs[lane] -= 1
+        self._user_jobs[user_id] -= 1
+        if self._user_jobs[user_id] <= 0:
+            del self._user_jobs[user_id]
+
+        self._start_waiters()
+
+    def _start_waiters(self) -> None:
+        while True:
+            waiters = [x for x in self._waiters if self._can_start(x.user_id, x.lane)]
+            if not waiters:
+                return
+
+            waiter = min(waiters, key=lambda x: self._user_jobs[x.user_id])
+            self._waiters.remove(waiter)
+            self._start(waiter.user_id, waiter.lane)
+            waiter.future.set_result(None)
+
+    def _can_start(self, user_id: int, lane: JobLane) -> bool:
+        return (
+            self._num_running < self.max_concurrency
+            and self._lane_jobs[lane] < self.lane_limits[lane]
+            and self._user_jobs[user_id] < self.max_jobs_per_user
+        )
+
+    def _start(self, user_id: int, lane: JobLane) -> None:
+        self._num_running += 1
+        self._lane_jobs[lane] += 1
+        self._user_jobs[user_id] += 1
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class JobLane(Enum):
+    # Quick jobs, such as renaming or rotating a file
+    light = "light"
+    # Long running jobs, such as OCR, compressing or rasterising a file
+    heavy = "heavy"
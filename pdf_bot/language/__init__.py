@@ -1,10 +1,14 @@
+from .language_cache import LanguageCache
 from .language_handler import LanguageHandler
+from .language_preload_handler import LanguagePreloadHandler
 from .language_repository import LanguageRepository
 from .language_service import LanguageService
 from .models import LanguageData, SetLanguageData
 
 __all__ = [
+    "LanguageCache",
     "LanguageHandler",
+    "LanguagePreloadHandler",
     "LanguageRepository",
     "LanguageService",
     "LanguageData",
@@ -0,0 +1,47 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LanguageCacheEntry:
+    # None if the user hasn't set a language
+    language: str | None
+    expires_at: float
+
+
+class LanguageCache:
+    """LRU cache of user languages, where each entry expires after a TTL.
+
+    Users without a language are cached as negative entries with their own, usually
+    shorter, TTL, so that they don't hit the database on every update either.
+    """
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[int, LanguageCacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: int) -> LanguageCacheEntry | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+
+        self._entries.move_to_end(user_id)
+        return entry
+
+    def set(self, user_id: int, language: str | None) -> None:
+        ttl = self.ttl if language is not None else self.negative_ttl
+        self._entries[user_id] = LanguageCacheEntry(language, time.monotonic() + ttl)
+        self._entries.move_to_end(user_id)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -0,0 +1,18 @@
+from telegram import Update
+from telegram.ext import BaseHandler, TypeHandler
+
+from pdf_bot.telegram_handler import AbstractTelegramHandler
+
+from .language_service import LanguageService
+
+
+class LanguagePreloadHandler(AbstractTelegramHandler):
+    # Runs before the handlers in the default group, for every update
+    GROUP = -1
+
+    def __init__(self, language_service: LanguageService) -> None:
+        self.language_service = language_service
+
+    @property
+    def handlers(self) -> list[BaseHandler]:
+        return [TypeHandler(Update, self.language_service.preload_user_language)]
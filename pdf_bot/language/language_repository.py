@@ -1,35 +1,74 @@
+from collections.abc import Iterable
+
 from google.cloud.datastore import Client, Entity
 
 from pdf_bot.consts import LANGUAGE, USER
+from pdf_bot.datastore import WriteCoalescer
 
 
 class LanguageRepository:
     EN_GB_CODE = "en_GB"
     EN_CODE = "en"
 
+    # Maximum number of keys that Datastore accepts in a single lookup
+    _MAX_GET_MULTI_KEYS = 1000
+
     def __init__(self, datastore_client: Client) -> None:
         self.datastore_client = datastore_client
+        self._language_writes: WriteCoalescer[int, str, None] = WriteCoalescer(
+            self._upsert_language
+        )
 
     def get_language(self, user_id: int) -> str:
-        user_key = self.datastore_client.key(USER, user_id)
-        user = self.datastore_client.get(key=user_key)
-        lang: str
-
-        if user is None or LANGUAGE not in user:
+        lang = self.get_languages([user_id])[user_id]
+        if lang is None:
             return self.EN_GB_CODE
+        return lang
 
-        lang = user[LANGUAGE]
+    def get_languages(self, user_ids: Iterable[int]) -> dict[int, str | None]:
+        """Look up the languages of several users with as few requests as possible.
 
-        # This check is for backwards compatibility
-        if lang == self.EN_CODE:
-            return self.EN_GB_CODE
-        return lang
+        Returns:
+            The language of each user, or None if the user hasn't set one.
+        """
+        user_ids = list(user_ids)
+        langs: dict[int, str | None] = dict.fromkeys(user_ids)
+
+        for i in range(0, len(user_ids), self._MAX_GET_MULTI_KEYS):
+            keys = [
+                self.datastore_client.key(USER, x)
+                for x in user_ids[i : i + self._MAX_GET_MULTI_KEYS]
+            ]
+            for user in self.datastore_client.get_multi(keys):
+                langs[user.key.id] = self._get_entity_language(user)
+
+        return langs
+
+    async def upsert_language(self, user_id: int, language_code: str) -> None:
+        await self._language_writes.write(user_id, language_code)
+
+    def _upsert_language(self, user_id: int, language_code: str) -> None:
+        user_key = self.datastore_client.key(USER, user_id)
+
+        # Skip the transaction and the write if the language hasn't changed
+        user = self.datastore_client.get(key=user_key)
+        if user is not None and user.get(LANGUAGE) == language_code:
+            return
 
-    def upsert_language(self, user_id: int, language_code: str) -> None:
         with self.datastore_client.transaction():
-            user_key = self.datastore_client.key(USER, user_id)
             user = self.datastore_client.get(key=user_key)
             if user is None:
                 user = Entity(user_key)
             user[LANGUAGE] = language_code
             self.datastore_client.put(user)
+
+    def _get_entity_language(self, user: Entity) -> str | None:
+        if LANGUAGE not in user:
+            return None
+
+        lang: str = user[LANGUAGE]
+
+        # This check is for backwards compatibility
+        if lang == self.EN_CODE:
+            return self.EN_GB_CODE
+        return lang
@@ -1,18 +1,23 @@
+import asyncio
 import gettext
 from collections.abc import Callable
 from contextlib import suppress
-from typing import cast
+from typing import Any, cast
 
 from telegram import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message, Update
 from telegram.ext import ContextTypes
 
 from pdf_bot.errors import CallbackQueryDataTypeError, UserIdError
+from pdf_bot.settings import Settings
 
+from .language_cache import LanguageCache
 from .language_repository import LanguageRepository
 from .models import LanguageData
 
 
 class LanguageService:
+    _DOMAIN = "pdf_bot"
+    _LOCALE_DIR = "locale"
     _LANGUAGE_CODE = "language_code"
     _KEYBOARD_SIZE = 2
 
@@ -62,8 +67,27 @@ class LanguageService:
         key=lambda x: x.long_code,
     )
 
-    def __init__(self, language_repository: LanguageRepository) -> None:
+    def __init__(
+        self, language_repository: LanguageRepository, settings: Settings | dict[str, Any]
+    ) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
         self.language_repository = language_repository
+        self.cache = LanguageCache(
+            settings.language_cache_max_size,
+            settings.language_cache_ttl,
+            settings.language_cache_negative_ttl,
+        )
+
+        # Translators are shared by all updates in the same language, as looking up and
+        # opening the catalog on every call is relatively expensive
+        self._translators: dict[str, Callable[[str], str]] = {}
+
+        self._pending_loads: dict[int, asyncio.Future[str | None]] = {}
+        self._load_task: asyncio.Task[None] | None = None
 
     def get_language_code_from_short_code(self, short_code: str) -> str | None:
         for data in self._LANGUAGE_DATA_LIST:
@@ -94,12 +118,57 @@ class LanguageService:
                 return lang
 
         user_id = self._get_user_id(update)
-        lang = self.language_repository.get_language(user_id)
+        entry = self.cache.get(user_id)
+        if entry is not None:
+            cached_lang = entry.language
+        else:
+            # Blocking fallback for updates that weren't preloaded
+            cached_lang = self.language_repository.get_languages([user_id])[user_id]
+            self.cache.set(user_id, cached_lang)
 
+        lang = cached_lang or LanguageRepository.EN_GB_CODE
         if user_data is not None:
             user_data[self._LANGUAGE_CODE] = lang
         return lang
 
+    async def preload_user_language(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Load the user's language into `user_data` before the update is handled.
+
+        This lets `get_user_language` answer from memory. Lookups that miss the cache
+        within the same event loop iteration are combined into a single database request.
+        """
+        user_data = context.user_data
+        if user_data is None or user_data.get(self._LANGUAGE_CODE) is not None:
+            return
+
+        try:
+            user_id = self._get_user_id(update)
+        except UserIdError:
+            return
+
+        lang = await self._load_language(user_id)
+        user_data[self._LANGUAGE_CODE] = lang or LanguageRepository.EN_GB_CODE
+
+    def set_new_user_language(
+        self, user_id: int, context: ContextTypes.DEFAULT_TYPE, language_code: str
+    ) -> None:
+        """Use the language that a user has just been created with.
+
+        Only call this once the language has actually been written for the user. It's
+        written to the cache and `user_data`, which may hold the default language from
+        before the user was created. Users that are known to have set a language already
+        keep it.
+        """
+        entry = self.cache.get(user_id)
+        if entry is not None and entry.language is not None:
+            return
+
+        self.cache.set(user_id, language_code)
+        if context.user_data is not None:
+            context.user_data[self._LANGUAGE_CODE] = language_code
+
     async def update_user_language(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -110,7 +179,8 @@ class LanguageService:
         if not isinstance(data, LanguageData):
             raise CallbackQueryDataTypeError(data)
 
-        self.language_repository.upsert_language(query.from_user.id, data.long_code)
+        await self.language_repository.upsert_language(query.from_user.id, data.long_code)
+        self.cache.set(query.from_user.id, data.long_code)
         if context.user_data is not None:
             context.user_data[self._LANGUAGE_CODE] = data.long_code
 
@@ -123,9 +193,51 @@ class LanguageService:
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> Callable[[str], str]:
         lang = self.get_user_language(update, context)
-        t = gettext.translation("pdf_bot", localedir="locale", languages=[lang])
+        return self._get_translator(lang)
+
+    def _get_translator(self, lang: str) -> Callable[[str], str]:
+        translator = self._translators.get(lang)
+        if translator is None:
+            t = gettext.translation(self._DOMAIN, localedir=self._LOCALE_DIR, languages=[lang])
+            translator = self._translators[lang] = t.gettext
+        return translator
+
+    async def _load_language(self, user_id: int) -> str | None:
+        entry = self.cache.get(user_id)
+        if entry is not None:
+            return entry.language
+
+        future = self._pending_loads.get(user_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_loads[user_id] = future
+            if self._load_task is None:
+                self._load_task = asyncio.create_task(self._load_pending_languages())
+
+        # Shield the shared future so that a cancelled caller doesn't cancel the others
+        return await asyncio.shield(future)
+
+    async def _load_pending_languages(self) -> None:
+        # Let the other updates of this loop iteration queue their lookups first
+        await asyncio.sleep(0)
+        futures, self._pending_loads = self._pending_loads, {}
+        self._load_task = None
+
+        try:
+            langs = await asyncio.to_thread(self.language_repository.get_languages, list(futures))
+        except Exception as e:  # noqa: BLE001
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark the exception as retrieved in case the caller was cancelled
+                    future.exception()
+            return
 
-        return t.gettext
+        for user_id, future in futures.items():
+            lang = langs.get(user_id)
+            self.cache.set(user_id, lang)
+            if not future.done():
+                future.set_result(lang)
 
     async def _answer_query_and_drop_data(
         self, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery
@@ -29,5 +29,7 @@ class MergeHandler(AbstractTelegramHandler):
                 },
                 fallbacks=[CommandHandler("cancel", self.telegram_service.cancel_conversation)],
                 allow_reentry=True,
+                name="merge",
+                persistent=True,
             )
         ]
@@ -1,3 +1,4 @@
+from .compressor import PdfCompressor
 from .exceptions import (
     PdfDecryptError,
     PdfEncryptedError,
@@ -6,8 +7,19 @@ from .exceptions import (
     PdfReadError,
     PdfServiceError,
 )
-from .models import CompressResult, FontData, ScaleByData, ScaleData, ScaleToData
+from .models import (
+    CompressLevel,
+    CompressResult,
+    CompressStrategy,
+    FontData,
+    PdfProbe,
+    ScaleByData,
+    ScaleData,
+    ScaleToData,
+)
 from .pdf_service import PdfService
+from .prober import PdfProber
+from .text_extractor import PdfTextExtractor
 
 __all__ = [
     "PdfService",
@@ -17,7 +29,13 @@ __all__ = [
     "PdfServiceError",
     "PdfReadError",
     "PdfServiceError",
+    "CompressLevel",
     "CompressResult",
+    "CompressStrategy",
+    "PdfCompressor",
+    "PdfTextExtractor",
+    "PdfProbe",
+    "PdfProber",
     "FontData",
     "ScaleData",
     "ScaleByData",
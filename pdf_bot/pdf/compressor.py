@@ -0,0 +1,235 @@
+import asyncio
+from gettext import gettext as _
+from pathlib import Path
+from typing import Any
+
+import pikepdf
+from loguru import logger
+
+from pdf_bot.cli import CLIService, CLIServiceError
+from pdf_bot.executor import ExecutorService, WorkerPool
+from pdf_bot.pdf.exceptions import PdfServiceError
+from pdf_bot.pdf.image_recompressor import (
+    RecompressedImage,
+    find_images,
+    recompress_images,
+    replace_images,
+)
+from pdf_bot.pdf.models import CompressLevel, CompressStrategy
+from pdf_bot.settings import Settings
+
+_LEVEL_STRATEGIES = {
+    CompressLevel.low: (CompressStrategy.lossless,),
+    CompressLevel.medium: (
+        CompressStrategy.lossless,
+        CompressStrategy.ghostscript_ebook,
+        CompressStrategy.downsample_images,
+    ),
+    CompressLevel.high: (
+        CompressStrategy.lossless,
+        CompressStrategy.ghostscript_ebook,
+        CompressStrategy.ghostscript_screen,
+        CompressStrategy.downsample_images,
+    ),
+}
+
+# Resolution in DPI that images are downsampled to
+_LEVEL_IMAGE_RESOLUTIONS = {
+    CompressLevel.medium: 150,
+    CompressLevel.high: 72,
+}
+
+# JPEG quality that images are re-encoded with
+_LEVEL_IMAGE_QUALITIES = {
+    CompressLevel.medium: 80,
+    CompressLevel.high: 60,
+}
+
+
+class PdfCompressor:
+    """Compress PDF files with several strategies and keep the smallest result.
+
+    The strategies of a compression level run concurrently, bounded by the concurrency
+    limits of the CLI service and the heavy worker pool, and the ones still running after
+    `compress_timeout` seconds are cancelled. Outputs that can't be opened or that have a
+    different number of pages than the input are discarded.
+    """
+
+    def __init__(
+        self,
+        cli_service: CLIService,
+        executor_service: ExecutorService,
+        settings: Settings | dict[str, Any],
+    ) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
+        self.cli_service = cli_service
+        self.executor_service = executor_service
+        self.timeout = settings.compress_timeout
+        self.image_max_size = settings.compress_image_max_size
+        self.image_workers = settings.executor_heavy_pool_size
+
+    async def compress(self, input_path: Path, out_dir: Path, level: CompressLevel) -> Path | None:
+        """Compress the PDF file with the strategies of `level` into files in `out_dir`.
+
+        Returns:
+            The path of the smallest output, or None if none is smaller than the input.
+
+        Raises:
+            PdfServiceError: if no strategy produced an output before running out of time
+        """
+        strategies = _LEVEL_STRATEGIES[level]
+        num_pages = await self.executor_service.run(WorkerPool.light, _count_pages, input_path)
+        tasks = [
+            asyncio.create_task(
+                self._run_strategy(
+                    strategy, input_path, out_dir / f"{strategy.value}.pdf", level, num_pages
+                )
+            )
+            for strategy in strategies
+        ]
+
+        try:
+            _done, pending = await asyncio.wait(tasks, timeout=self.timeout)
+            if pending:
+                logger.info(
+                    "Cancelling {count} compression strategies that ran out of time",
+                    count=len(pending),
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        results: list[tuple[Path, int]] = []
+        for strategy, task in zip(strategies, tasks, strict=True):
+            if task.cancelled():
+                continue
+
+            # Strategies handle the errors that they expect, but an unexpected one still
+            # shouldn't throw away the outputs of the others
+            try:
+                result = task.result()
+            except Exception:  # noqa: BLE001
+                logger.exception("Compression strategy {strategy} failed", strategy=strategy.value)
+                continue
+
+            if result is not None:
+                results.append(result)
+
+        if not results and any(x.cancelled() for x in tasks):
+            raise PdfServiceError(_("Your PDF file took too long to compress"))
+
+        best_path: Path | None = None
+        best_size = input_path.stat().st_size
+        for path, size in results:
+            if size < best_size:
+                best_path, best_size = path, size
+
+        return best_path
+
+    async def _run_strategy(
+        self,
+        strategy: CompressStrategy,
+        input_path: Path,
+        out_path: Path,
+        level: CompressLevel,
+        num_pages: int | None,
+    ) -> tuple[Path, int] | None:
+        try:
+            if strategy == CompressStrategy.lossless:
+                await self.executor_service.run_killable(
+                    WorkerPool.heavy, _rewrite_pdf, input_path, out_path
+                )
+            elif strategy == CompressStrategy.ghostscript_ebook:
+                await self.cli_service.compress_pdf(input_path, out_path, "ebook")
+            elif strategy == CompressStrategy.ghostscript_screen:
+                await self.cli_service.compress_pdf(input_path, out_path, "screen")
+            elif not await self._recompress_images(input_path, out_path, level):
+                return None
+        except (CLIServiceError, pikepdf.PdfError, pikepdf.PasswordError, OSError):
+            # OSError includes the worker process exiting and missing command line tools
+            logger.exception("Compression strategy {strategy} failed", strategy=strategy.value)
+            return None
+
+        out_num_pages = await self.executor_service.run(WorkerPool.light, _count_pages, out_path)
+        if out_num_pages is None or (num_pages is not None and out_num_pages != num_pages):
+            logger.warning(
+                "Compression strategy {strategy} produced an invalid file",
+                strategy=strategy.value,
+            )
+            return None
+
+        return out_path, out_path.stat().st_size
+
+    async def _recompress_images(
+        self, input_path: Path, out_path: Path, level: CompressLevel
+    ) -> bool:
+        """Recompress the oversized images of the PDF file, leaving the rest as it is.
+
+        The images are split into batches that are recompressed in parallel in killable
+        worker processes, so that a batch that runs past `compress_timeout` is killed
+        rather than left running. If any batch fails, the other ones are cancelled.
+
+        Returns:
+            Whether any image was recompressed and the output was written.
+        """
+        tasks = await self.executor_service.run_killable(
+            WorkerPool.heavy,
+            find_images,
+            input_path,
+            _LEVEL_IMAGE_RESOLUTIONS[level],
+            _LEVEL_IMAGE_QUALITIES[level],
+            self.image_max_size,
+        )
+        if not tasks:
+            return False
+
+        batches = [tasks[i :: self.image_workers] for i in range(self.image_workers)]
+        batch_tasks = [
+            asyncio.create_task(
+                self.executor_service.run_killable(
+                    WorkerPool.heavy, recompress_images, input_path, batch
+                )
+            )
+            for batch in batches
+            if batch
+        ]
+        try:
+            results = await asyncio.gather(*batch_tasks)
+        except BaseException:
+            for task in batch_tasks:
+                task.cancel()
+            await asyncio.gather(*batch_tasks, return_exceptions=True)
+            raise
+
+        images: list[RecompressedImage] = [image for result in results for image in result]
+        if not images:
+            return False
+
+        await self.executor_service.run_killable(
+            WorkerPool.heavy, replace_images, input_path, out_path, images
+        )
+        return True
+
+
+def _rewrite_pdf(input_path: Path, output_path: Path) -> None:
+    with pikepdf.open(input_path) as pdf:
+        pdf.remove_unreferenced_resources()
+        pdf.save(
+            output_path,
+            compress_streams=True,
+            recompress_flate=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+
+
+def _count_pages(path: Path) -> int | None:
+    try:
+        with pikepdf.open(path) as pdf:
+            return len(pdf.pages)
+    except (pikepdf.PdfError, pikepdf.PasswordError):
+        return None
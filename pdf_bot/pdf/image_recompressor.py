@@ -0,0 +1,162 @@
+"""Recompress the oversized images of a PDF file with pikepdf and Pillow.
+
+Only image XObjects above a resolution or size threshold are downsampled and re-encoded
+as JPEG, everything else in the file, such as text, vector graphics and fonts, is kept as
+it is. Each step works on the file rather than on an open document, so that the images
+can be recompressed in parallel by any worker pool.
+"""
+
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import cast
+
+import pikepdf
+from pikepdf.models.image import UnsupportedImageTypeError
+from PIL import Image
+
+# Images are only downsampled if their resolution is above the target resolution by this
+# factor, which is the default threshold of Ghostscript
+_DOWNSAMPLE_THRESHOLD = 1.5
+
+_POINTS_PER_INCH = 72
+_BITS_PER_COMPONENT = 8
+_SUPPORTED_MODES = ("RGB", "L")
+
+
+@dataclass(frozen=True)
+class ImageTask:
+    objgen: tuple[int, int]
+    width: int
+    height: int
+    quality: int
+
+
+@dataclass(frozen=True)
+class RecompressedImage:
+    objgen: tuple[int, int]
+    data: bytes
+    width: int
+    height: int
+    grayscale: bool
+
+
+def find_images(input_path: Path, resolution: int, quality: int, max_size: int) -> list[ImageTask]:
+    """Find the images that are above `resolution` DPI or `max_size` bytes.
+
+    Returns:
+        The images to recompress, each with the size that it should be downsampled to.
+    """
+    tasks: dict[tuple[int, int], ImageTask] = {}
+    with pikepdf.open(input_path) as pdf:
+        for page in pdf.pages:
+            box = pikepdf.Rectangle(page.mediabox)
+            page_size = (abs(box.width) / _POINTS_PER_INCH, abs(box.height) / _POINTS_PER_INCH)
+
+            for image in page.images.values():
+                if image.objgen in tasks or image.objgen == (0, 0):
+                    continue
+
+                task = _get_image_task(
+                    cast(pikepdf.Stream, image), page_size, resolution, quality, max_size
+                )
+                if task is not None:
+                    tasks[image.objgen] = task
+
+    return list(tasks.values())
+
+
+def recompress_images(input_path: Path, tasks: list[ImageTask]) -> list[RecompressedImage]:
+    """Downsample and re-encode the images as JPEG.
+
+    Returns:
+        The recompressed images, without the ones that can't be decoded or that don't
+        get any smaller.
+    """
+    images: list[RecompressedImage] = []
+    with pikepdf.open(input_path) as pdf:
+        for task in tasks:
+            image = _recompress_image(pdf, task)
+            if image is not None:
+                images.append(image)
+
+    return images
+
+
+def replace_images(input_path: Path, output_path: Path, images: list[RecompressedImage]) -> None:
+    with pikepdf.open(input_path) as pdf:
+        for image in images:
+            obj = pdf.get_object(image.objgen)
+            obj.write(image.data, filter=pikepdf.Name.DCTDecode)
+            obj.Width = image.width
+            obj.Height = image.height
+            obj.BitsPerComponent = _BITS_PER_COMPONENT
+            obj.ColorSpace = pikepdf.Name.DeviceGray if image.grayscale else pikepdf.Name.DeviceRGB
+            if pikepdf.Name.DecodeParms in obj:
+                del obj.DecodeParms
+
+        pdf.save(
+            output_path,
+            compress_streams=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+
+
+def _get_image_task(
+    image: pikepdf.Stream,
+    page_size: tuple[float, float],
+    resolution: int,
+    quality: int,
+    max_size: int,
+) -> ImageTask | None:
+    # Masks, bilevel images and images with custom decoding are already compact or
+    # can't be re-encoded as JPEG as they are
+    if (
+        image.get(pikepdf.Name.ImageMask)
+        or image.get(pikepdf.Name.BitsPerComponent) != _BITS_PER_COMPONENT
+        or pikepdf.Name.Decode in image
+    ):
+        return None
+
+    try:
+        if pikepdf.PdfImage(image).mode not in _SUPPORTED_MODES:
+            return None
+    except (pikepdf.PdfError, UnsupportedImageTypeError, NotImplementedError):
+        return None
+
+    width = int(image.Width)
+    height = int(image.Height)
+
+    # An image is displayed at most across the whole page, so this is the lowest that its
+    # resolution can be, which keeps images that are displayed smaller sharp
+    dpi = min(width / page_size[0], height / page_size[1])
+    scale = resolution / dpi if dpi > resolution * _DOWNSAMPLE_THRESHOLD else 1
+    if scale == 1 and len(image.read_raw_bytes()) <= max_size:
+        return None
+
+    return ImageTask(
+        image.objgen, max(round(width * scale), 1), max(round(height * scale), 1), quality
+    )
+
+
+def _recompress_image(pdf: pikepdf.Pdf, task: ImageTask) -> RecompressedImage | None:
+    obj = cast(pikepdf.Stream, pdf.get_object(task.objgen))
+    try:
+        pil_image = pikepdf.PdfImage(obj).as_pil_image()
+    except (pikepdf.PdfError, UnsupportedImageTypeError, NotImplementedError, OSError):
+        return None
+
+    if pil_image.mode not in _SUPPORTED_MODES:
+        return None
+    if pil_image.size != (task.width, task.height):
+        pil_image = pil_image.resize((task.width, task.height), Image.Resampling.LANCZOS)
+
+    buffer = BytesIO()
+    pil_image.save(buffer, format="JPEG", quality=task.quality, optimize=True)
+    data = buffer.getvalue()
+    if len(data) >= len(obj.read_raw_bytes()):
+        return None
+
+    return RecompressedImage(
+        task.objgen, data, task.width, task.height, grayscale=pil_image.mode == "L"
+    )
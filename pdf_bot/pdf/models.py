@@ -1,9 +1,28 @@
 from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
 
 import humanize
 
 
+class CompressLevel(Enum):
+    # Only rewrites the file losslessly
+    low = "low"
+    # Also downsamples images to 150 DPI
+    medium = "medium"
+    # Also downsamples images to 72 DPI
+    high = "high"
+
+
+class CompressStrategy(Enum):
+    # Rewrites the objects of the file into compressed object streams with pikepdf
+    lossless = "lossless"
+    ghostscript_ebook = "ghostscript_ebook"
+    ghostscript_screen = "ghostscript_screen"
+    # Only downsamples images and keeps the rest of the file as it is
+    downsample_images = "downsample_images"
+
+
 @dataclass
 class CompressResult:
     old_size: int
@@ -53,3 +72,23 @@ class ScaleByData(ScaleData):
 
 class ScaleToData(ScaleData):
     pass
+
+
+@dataclass(frozen=True)
+class PdfProbe:
+    """What a PDF file contains, found without rendering or extracting any of it.
+
+    Only `is_encrypted` is known for files that can't be opened without a password.
+    """
+
+    is_encrypted: bool
+    num_pages: int | None = None
+    # None if none of the pages that were scanned for text had any, but not all were
+    has_text: bool | None = False
+    num_images: int = 0
+    # Width and height of each page in points
+    page_sizes: tuple[tuple[float, float], ...] = ()
+
+    @property
+    def is_readable(self) -> bool:
+        return self.num_pages is not None
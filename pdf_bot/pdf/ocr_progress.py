@@ -0,0 +1,74 @@
+"""OCRmyPDF plugin that reports the number of pages that have been OCRed.
+
+OCRmyPDF only lets plugins be given by name, so the function that progress is reported
+to is stored globally. `run_ocr` is meant to be run in its own worker process, which
+ensures that only one OCR job ever reports to it.
+"""
+
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import ocrmypdf
+from ocrmypdf import hookimpl
+
+from pdf_bot.executor import ReportFunc
+
+# Description of OCRmyPDF's progress bar that counts the pages that have been OCRed
+_OCR_DESC = "OCR"
+
+_report: ReportFunc | None = None
+
+
+def run_ocr(report: ReportFunc, input_path: Path, output_path: Path, **kwargs: Any) -> None:
+    """Run OCRmyPDF and report `(num_pages_done, num_pages)` with `report` as it goes."""
+    global _report  # noqa: PLW0603
+    _report = report
+
+    try:
+        ocrmypdf.ocr(input_path, output_path, plugins=[__name__], progress_bar=True, **kwargs)
+    finally:
+        _report = None
+
+
+class OcrProgressBar:
+    """Progress bar that reports whole pages once they're OCRed and ignores other steps."""
+
+    def __init__(
+        self,
+        *,
+        total: float | None = None,
+        desc: str | None = None,
+        disable: bool = False,
+        **_kwargs: Any,
+    ) -> None:
+        self._report = _report if desc == _OCR_DESC and not disable else None
+        self._total = int(total or 0)
+        self._completed = 0.0
+        self._num_reported = 0
+
+    def __enter__(self) -> "OcrProgressBar":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        pass
+
+    def update(self, n: float = 1, *, completed: float | None = None) -> None:
+        if self._report is None:
+            return
+
+        self._completed = self._completed + n if completed is None else completed
+        num_pages = int(self._completed)
+        if num_pages > self._num_reported:
+            self._num_reported = num_pages
+            self._report((num_pages, self._total))
+
+
+@hookimpl
+def get_progressbar_class() -> type[OcrProgressBar]:
+    return OcrProgressBar
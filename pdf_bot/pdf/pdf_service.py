@@ -1,20 +1,22 @@
 import asyncio
 import os
 import shutil
-import textwrap
-from collections.abc import AsyncGenerator, Generator
-from contextlib import asynccontextmanager, contextmanager
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from gettext import gettext as _
 from pathlib import Path
+from typing import Any, cast
 
 import img2pdf
 import ocrmypdf
 import pdf2image
 import pdf_diff
+import pikepdf
 from img2pdf import Rotation
+from loguru import logger
 from ocrmypdf.exceptions import EncryptedPdfError, PriorOcrFoundError, TaggedPDFError
 from pdfCropMargins import crop
-from pdfminer.high_level import extract_text
 from pdfminer.pdfdocument import PDFPasswordIncorrect
 from pypdf import PasswordType, PdfMerger, PdfReader, PdfWriter
 from pypdf.errors import PdfReadError as PyPdfReadError
@@ -23,8 +25,11 @@ from weasyprint import CSS, HTML
 from weasyprint.text.fonts import FontConfiguration
 
 from pdf_bot.cli import CLIService, CLIServiceError
-from pdf_bot.io import IOService
+from pdf_bot.executor import ExecutorService, WorkerPool
+from pdf_bot.io import IOService, ZipArchiveWriter
 from pdf_bot.models import FileData
+from pdf_bot.pdf import pikepdf_engine
+from pdf_bot.pdf.compressor import PdfCompressor
 from pdf_bot.pdf.exceptions import (
     PdfDecryptError,
     PdfEncryptedError,
@@ -34,9 +39,22 @@ from pdf_bot.pdf.exceptions import (
     PdfReadError,
     PdfServiceError,
 )
-from pdf_bot.pdf.models import CompressResult, FontData, ScaleData
+from pdf_bot.pdf.models import CompressLevel, CompressResult, FontData, PdfProbe, ScaleData
+from pdf_bot.pdf.ocr_progress import run_ocr
+from pdf_bot.pdf.prober import PdfProber
+from pdf_bot.pdf.text_extractor import PdfTextExtractor
+from pdf_bot.settings import Settings
 from pdf_bot.telegram_internal import TelegramService
 
+_CPU_COUNT = os.cpu_count() or 1
+
+# Number of pages rendered per pdftoppm process before they are appended to the archive
+# and removed, which bounds the disk space used while streaming pages into an archive
+_ARCHIVE_PAGES_PER_THREAD = 4
+
+# Called with the number of pages that have been processed and the total number of pages
+PageProgressFunc = Callable[[int, int], Awaitable[None]]
+
 
 class PdfService:
     def __init__(
@@ -44,45 +62,81 @@ class PdfService:
         cli_service: CLIService,
         io_service: IOService,
         telegram_service: TelegramService,
+        executor_service: ExecutorService,
+        settings: Settings | dict[str, Any],
     ) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
         self.cli_service = cli_service
         self.io_service = io_service
         self.telegram_service = telegram_service
+        self.executor_service = executor_service
+
+        self.pdf_engine = settings.pdf_engine
+        self.pdf_engine_overrides = settings.pdf_engine_overrides
+        self.grayscale_engine = settings.grayscale_engine
+        self.compressor = PdfCompressor(cli_service, executor_service, settings)
+        self.text_extractor = PdfTextExtractor(cli_service, executor_service, settings)
+        self.prober = PdfProber(telegram_service, executor_service, settings)
+        self.ocr_mode = settings.ocr_mode
+        self.ocr_options = self._get_ocr_options(settings)
+
+        # pdf2image splits the page range evenly across this many pdftoppm processes, and
+        # each heavy worker can be rasterizing at the same time, so the CPUs are shared
+        self.rasterize_thread_count = max(1, _CPU_COUNT // settings.executor_heavy_pool_size)
 
     @asynccontextmanager
     async def add_watermark_to_pdf(
         self, source_file_id: str, watermark_file_id: str
     ) -> AsyncGenerator[Path, None]:
+        if self._use_pikepdf("add_watermark"):
+            async with (
+                self.telegram_service.download_pdf_file(watermark_file_id) as wmk_path,
+                self._run_pikepdf(
+                    source_file_id,
+                    "File_with_watermark",
+                    pikepdf_engine.add_watermark_to_pdf,
+                    wmk_path,
+                ) as out_path,
+            ):
+                yield out_path
+            return
+
         src_reader, wmk_reader = await asyncio.gather(
             self._open_pdf(source_file_id), self._open_pdf(watermark_file_id)
         )
-        wmk_page = wmk_reader.pages[0]
-        writer = PdfWriter()
 
-        for page in src_reader.pages:
-            page.merge_page(wmk_page)
-            writer.add_page(page)
+        def add_watermark() -> PdfWriter:
+            wmk_page = wmk_reader.pages[0]
+            writer = PdfWriter()
+
+            for page in src_reader.pages:
+                page.merge_page(wmk_page)
+                writer.add_page(page)
+            return writer
 
-        with self._write_pdf(writer, "File_with_watermark") as out_path:
+        writer = await self.executor_service.run(WorkerPool.light, add_watermark)
+        async with self._write_pdf(writer, "File_with_watermark") as out_path:
             yield out_path
 
     @asynccontextmanager
     async def grayscale_pdf(self, file_id: str) -> AsyncGenerator[Path, None]:
         async with self.telegram_service.download_pdf_file(file_id) as file_path:
-            with (
-                self.io_service.create_temp_directory() as dir_name,
-                self.io_service.create_temp_pdf_file("Grayscale") as out_path,
-            ):
-                images = pdf2image.convert_from_path(
-                    file_path,
-                    output_folder=dir_name,
-                    fmt="png",
-                    grayscale=True,
-                    paths_only=True,
-                )
-
-                with out_path.open("wb") as f:
-                    f.write(img2pdf.convert(images, rotation=Rotation.ifvalid))
+            with self.io_service.create_temp_pdf_file("Grayscale") as out_path:
+                converted = False
+                if self.grayscale_engine == "ghostscript":
+                    try:
+                        await self.cli_service.grayscale_pdf(file_path, out_path)
+                        converted = True
+                    except (CLIServiceError, OSError):
+                        # OSError includes Ghostscript not being installed
+                        logger.warning("Failed to convert PDF to grayscale, rasterizing it")
+
+                if not converted:
+                    await self._rasterize_grayscale_pdf(file_path, out_path)
                 yield out_path
 
     @asynccontextmanager
@@ -92,14 +146,29 @@ class PdfService:
             self.telegram_service.download_pdf_file(file_id_b) as file_name_b,
         ):
             with self.io_service.create_temp_png_file("Differences") as out_path:
-                pdf_diff.main(files=[file_name_a, file_name_b], out_file=out_path)
+                await self.executor_service.run_killable(
+                    WorkerPool.heavy,
+                    pdf_diff.main,
+                    files=[file_name_a, file_name_b],
+                    out_file=out_path,
+                )
                 yield out_path
 
     @asynccontextmanager
-    async def compress_pdf(self, file_id: str) -> AsyncGenerator[CompressResult, None]:
+    async def compress_pdf(
+        self, file_id: str, level: CompressLevel = CompressLevel.medium
+    ) -> AsyncGenerator[CompressResult, None]:
         async with self.telegram_service.download_pdf_file(file_id) as file_path:
-            with self.io_service.create_temp_pdf_file("Compressed") as out_path:
-                self.cli_service.compress_pdf(file_path, out_path)
+            with (
+                self.io_service.create_temp_directory() as work_dir,
+                self.io_service.create_temp_pdf_file("Compressed") as out_path,
+            ):
+                # Keep the file as it is if none of the strategies made it smaller
+                best_path = await self.compressor.compress(file_path, work_dir, level)
+                await self.executor_service.run(
+                    WorkerPool.light, shutil.copy, best_path or file_path, out_path
+                )
+
                 old_size = file_path.stat().st_size
                 new_size = out_path.stat().st_size
                 yield CompressResult(old_size, new_size, out_path)
@@ -107,36 +176,38 @@ class PdfService:
     @asynccontextmanager
     async def convert_pdf_to_images(self, file_id: str) -> AsyncGenerator[Path, None]:
         async with self.telegram_service.download_pdf_file(file_id) as file_path:
-            with self.io_service.create_temp_directory("PDF_images") as out_dir:
-                pdf2image.convert_from_path(file_path, output_folder=out_dir, fmt="png")
-                yield out_dir
+            with (
+                self.io_service.create_temp_directory() as work_dir,
+                self.io_service.create_temp_zip_file("PDF_images") as out_path,
+            ):
+                start = time.perf_counter()
+                num_pages = await self.executor_service.run_killable(
+                    WorkerPool.heavy,
+                    _archive_pdf_pages,
+                    file_path,
+                    work_dir,
+                    out_path,
+                    self.rasterize_thread_count,
+                )
+                elapsed = time.perf_counter() - start
+
+                logger.info(
+                    "Converted {num_pages} PDF pages to images in {elapsed:.2f}s "
+                    "({rate:.2f} pages/s)",
+                    num_pages=num_pages,
+                    elapsed=elapsed,
+                    rate=num_pages / elapsed if elapsed > 0 else 0,
+                )
+                yield out_path
 
     @asynccontextmanager
     async def create_pdf_from_text(
         self, text: str, font_data: FontData | None
     ) -> AsyncGenerator[Path, None]:
-        html = HTML(string="<p>{content}</p>".format(content=text.replace("\n", "<br/>")))
-        font_config = FontConfiguration()
-        stylesheets: list[CSS] | None = None
-
-        if font_data is not None:
-            stylesheets = [
-                CSS(
-                    string=(
-                        "@font-face {"
-                        f"font-family: {font_data.font_family};"
-                        f"src: url({font_data.font_url});"
-                        "}"
-                        "p {"
-                        f"font-family: {font_data.font_family};"
-                        "}"
-                    ),
-                    font_config=font_config,
-                )
-            ]
-
         with self.io_service.create_temp_pdf_file("Text") as out_path:
-            html.write_pdf(out_path, stylesheets=stylesheets, font_config=font_config)
+            await self.executor_service.run_killable(
+                WorkerPool.heavy, _write_text_pdf, text, font_data, out_path
+            )
             yield out_path
 
     @asynccontextmanager
@@ -145,7 +216,11 @@ class PdfService:
     ) -> AsyncGenerator[Path, None]:
         async with self.telegram_service.download_pdf_file(file_id) as file_path:
             with self.io_service.create_temp_pdf_file("Cropped") as out_path:
-                crop(["-p", str(percentage), "-o", str(out_path), str(file_path)])
+                await self.executor_service.run_killable(
+                    WorkerPool.heavy,
+                    crop,
+                    ["-p", str(percentage), "-o", str(out_path), str(file_path)],
+                )
                 yield out_path
 
     @asynccontextmanager
@@ -154,48 +229,90 @@ class PdfService:
     ) -> AsyncGenerator[Path, None]:
         async with self.telegram_service.download_pdf_file(file_id) as file_path:
             with self.io_service.create_temp_pdf_file("Cropped") as out_path:
-                crop(["-a", str(margin_size), "-o", str(out_path), str(file_path)])
+                await self.executor_service.run_killable(
+                    WorkerPool.heavy,
+                    crop,
+                    ["-a", str(margin_size), "-o", str(out_path), str(file_path)],
+                )
                 yield out_path
 
     @asynccontextmanager
     async def decrypt_pdf(self, file_id: str, password: str) -> AsyncGenerator[Path, None]:
+        if self._use_pikepdf("decrypt"):
+            async with self._run_pikepdf(
+                file_id, "Decrypted", pikepdf_engine.decrypt_pdf, password
+            ) as out_path:
+                yield out_path
+            return
+
         reader = await self._open_pdf(file_id, allow_encrypted=True)
         if not reader.is_encrypted:
             raise PdfDecryptError(_("Your PDF file is not encrypted"))
 
         try:
-            if reader.decrypt(password) == PasswordType.NOT_DECRYPTED:
+            password_type = await self.executor_service.run(
+                WorkerPool.light, reader.decrypt, password
+            )
+            if password_type == PasswordType.NOT_DECRYPTED:
                 raise PdfIncorrectPasswordError(_("Incorrect password, please try again"))
         except NotImplementedError as e:
             raise PdfDecryptError(
                 _("Your PDF file is encrypted with a method that I can't decrypt")
             ) from e
 
-        writer = PdfWriter()
-        for page in reader.pages:
-            writer.add_page(page)
+        def copy_pages() -> PdfWriter:
+            writer = PdfWriter()
+            for page in reader.pages:
+                writer.add_page(page)
+            return writer
 
-        with self._write_pdf(writer, "Decrypted") as out_path:
+        writer = await self.executor_service.run(WorkerPool.light, copy_pages)
+        async with self._write_pdf(writer, "Decrypted") as out_path:
             yield out_path
 
     @asynccontextmanager
     async def encrypt_pdf(self, file_id: str, password: str) -> AsyncGenerator[Path, None]:
+        if self._use_pikepdf("encrypt"):
+            async with self._run_pikepdf(
+                file_id, "Encrypted", pikepdf_engine.encrypt_pdf, password
+            ) as out_path:
+                yield out_path
+            return
+
         reader = await self._open_pdf(file_id)
-        writer = PdfWriter()
 
-        for page in reader.pages:
-            writer.add_page(page)
-        writer.encrypt(password)
+        def encrypt() -> PdfWriter:
+            writer = PdfWriter()
+            for page in reader.pages:
+                writer.add_page(page)
+            writer.encrypt(password)
+            return writer
 
-        with self._write_pdf(writer, "Encrypted") as out_path:
+        writer = await self.executor_service.run(WorkerPool.light, encrypt)
+        async with self._write_pdf(writer, "Encrypted") as out_path:
             yield out_path
 
+    def probe_pdf(self, file_id: str) -> None:
+        """Probe the PDF file in the background for what it contains, cached for later tasks.
+
+        Tasks on a file that has been probed fail fast if they can't apply to it.
+        """
+        self.prober.probe_in_background(file_id)
+
+    async def get_pdf_probe(self, file_id: str) -> PdfProbe | None:
+        """Get the probe of the PDF file if it has already been probed."""
+        return await self.prober.get_cached(file_id)
+
     @asynccontextmanager
     async def extract_pdf_images(self, file_id: str) -> AsyncGenerator[Path, None]:
+        probe = await self.prober.get_cached(file_id)
+        if probe is not None and probe.is_readable and probe.num_images == 0:
+            raise PdfNoImagesError(_("No images found in your PDF file"))
+
         async with self.telegram_service.download_pdf_file(file_id) as file_path:
             with self.io_service.create_temp_directory("PDF_images") as out_dir:
                 try:
-                    self.cli_service.extract_pdf_images(file_path, out_dir)
+                    await self.cli_service.extract_pdf_images(file_path, out_dir)
                 except CLIServiceError as e:
                     raise PdfServiceError(e) from e
 
@@ -205,45 +322,96 @@ class PdfService:
 
     @asynccontextmanager
     async def extract_pdf_text(self, file_id: str) -> AsyncGenerator[Path, None]:
+        probe = await self.prober.get_cached(file_id)
+        if probe is not None:
+            if not probe.is_readable:
+                raise PdfEncryptedError
+            if probe.has_text is False:
+                raise PdfNoTextError(_("No text found in your PDF file"))
+
         async with self.telegram_service.download_pdf_file(file_id) as file_path:
-            try:
-                text = extract_text(file_path)
-            except PDFPasswordIncorrect as e:
-                raise PdfEncryptedError from e
-
-        if not text:
-            raise PdfNoTextError(_("No text found in your PDF file"))
-
-        wrapped_text = textwrap.wrap(text)
-        with self.io_service.create_temp_txt_file("PDF_text") as out_path:
-            with out_path.open("w") as f:
-                f.write("\n".join(wrapped_text))
-            yield out_path
+            with (
+                self.io_service.create_temp_directory() as work_dir,
+                self.io_service.create_temp_txt_file("PDF_text") as out_path,
+            ):
+                try:
+                    has_text = await self.text_extractor.extract(file_path, out_path, work_dir)
+                except PDFPasswordIncorrect as e:
+                    raise PdfEncryptedError from e
+
+                if not has_text:
+                    raise PdfNoTextError(_("No text found in your PDF file"))
+                yield out_path
 
     @asynccontextmanager
     async def merge_pdfs(self, file_data_list: list[FileData]) -> AsyncGenerator[Path, None]:
         file_ids = self._get_file_ids(file_data_list)
+        if self._use_pikepdf("merge"):
+            file_names = [x.name for x in file_data_list]
+            async with self.telegram_service.download_files(file_ids) as file_paths:
+                with self.io_service.create_temp_pdf_file("Merged") as out_path:
+                    try:
+                        await self.executor_service.run(
+                            WorkerPool.light,
+                            pikepdf_engine.merge_pdfs,
+                            file_paths,
+                            out_path,
+                            file_names,
+                        )
+                    except pikepdf.PdfError as e:
+                        # Errors from reading a file are named by the engine, while saving
+                        # the merged file can't be traced back to any one of them
+                        raise PdfReadError(_("Your PDF file is invalid")) from e
+                    yield out_path
+            return
+
         merger = PdfMerger()
 
         async with self.telegram_service.download_files(file_ids) as file_paths:
             for i, file_path in enumerate(file_paths):
                 try:
-                    merger.append(file_path)
+                    await self.executor_service.run(WorkerPool.light, merger.append, file_path)
                 except (PyPdfReadError, ValueError) as e:
                     raise PdfReadError(
                         _("I couldn't merge your PDF files as this file is invalid: %s")
                         % file_data_list[i].name
                     ) from e
 
-        with self._write_pdf(merger, "Merged") as out_path:
+        async with self._write_pdf(merger, "Merged") as out_path:
             yield out_path
 
     @asynccontextmanager
-    async def ocr_pdf(self, file_id: str) -> AsyncGenerator[Path, None]:
+    async def ocr_pdf(
+        self, file_id: str, on_progress: PageProgressFunc | None = None
+    ) -> AsyncGenerator[Path, None]:
+        probe = await self.prober.get_cached(file_id)
+        if probe is not None:
+            if probe.is_encrypted:
+                raise PdfEncryptedError
+            if probe.has_text and self.ocr_mode == "default":
+                raise PdfServiceError(_("Your PDF file already has a text layer"))
+
         async with self.telegram_service.download_pdf_file(file_id) as file_path:
             with self.io_service.create_temp_pdf_file("OCR") as out_path:
                 try:
-                    ocrmypdf.ocr(file_path, out_path, progress_bar=False)
+                    if on_progress is None:
+                        await self.executor_service.run_killable(
+                            WorkerPool.ocr,
+                            ocrmypdf.ocr,
+                            file_path,
+                            out_path,
+                            progress_bar=False,
+                            **self.ocr_options,
+                        )
+                    else:
+                        await self.executor_service.run_killable_with_progress(
+                            WorkerPool.ocr,
+                            lambda x: on_progress(*x),
+                            run_ocr,
+                            file_path,
+                            out_path,
+                            **self.ocr_options,
+                        )
                     yield out_path
                 except (PriorOcrFoundError, TaggedPDFError) as e:
                     raise PdfServiceError(_("Your PDF file already has a text layer")) from e
@@ -252,65 +420,108 @@ class PdfService:
 
     @asynccontextmanager
     async def preview_pdf(self, file_id: str) -> AsyncGenerator[Path, None]:
-        with (
-            self.io_service.create_temp_pdf_file() as pdf_path,
-            self.io_service.create_temp_png_file("Preview") as out_path,
-        ):
-            reader = await self._open_pdf(file_id)
-            writer = PdfWriter()
-            writer.add_page(reader.pages[0])
-            writer.write(pdf_path)
+        async with self.telegram_service.download_pdf_file(file_id) as file_path:
+            await self._read_pdf(file_path)
 
-            # Convert cover preview to image
-            imgs = pdf2image.convert_from_path(pdf_path, fmt="png")
-            imgs[0].save(out_path)
-            yield out_path
+            # Render only the cover page, straight into the output file
+            with self.io_service.create_temp_png_file("Preview") as out_path:
+                await self.executor_service.run_killable(
+                    WorkerPool.heavy,
+                    pdf2image.convert_from_path,
+                    file_path,
+                    output_folder=out_path.parent,
+                    output_file=out_path.stem,
+                    first_page=1,
+                    last_page=1,
+                    fmt="png",
+                    single_file=True,
+                    paths_only=True,
+                )
+                yield out_path
 
     @asynccontextmanager
     async def rename_pdf(self, file_id: str, file_name: str) -> AsyncGenerator[Path, None]:
         async with self.telegram_service.download_pdf_file(file_id) as file_path:
             with self.io_service.create_temp_directory() as dir_name:
                 out_path = dir_name / file_name
-                shutil.copy(file_path, out_path)
+                await self.executor_service.run(WorkerPool.light, shutil.copy, file_path, out_path)
                 yield out_path
 
     @asynccontextmanager
     async def rotate_pdf(self, file_id: str, degree: int) -> AsyncGenerator[Path, None]:
+        if self._use_pikepdf("rotate"):
+            async with self._run_pikepdf(
+                file_id, "Rotated", pikepdf_engine.rotate_pdf, degree
+            ) as out_path:
+                yield out_path
+            return
+
         reader = await self._open_pdf(file_id)
-        writer = PdfWriter()
 
-        for page in reader.pages:
-            writer.add_page(page.rotate(degree))
+        def rotate() -> PdfWriter:
+            writer = PdfWriter()
+            for page in reader.pages:
+                writer.add_page(page.rotate(degree))
+            return writer
 
-        with self._write_pdf(writer, "Rotated") as out_path:
+        writer = await self.executor_service.run(WorkerPool.light, rotate)
+        async with self._write_pdf(writer, "Rotated") as out_path:
             yield out_path
 
     @asynccontextmanager
     async def scale_pdf_by_factor(
         self, file_id: str, scale_data: ScaleData
     ) -> AsyncGenerator[Path, None]:
+        if self._use_pikepdf("scale"):
+            async with self._run_pikepdf(
+                file_id,
+                "Scaled",
+                pikepdf_engine.scale_pdf_by_factor,
+                scale_data.x,
+                scale_data.y,
+            ) as out_path:
+                yield out_path
+            return
+
         reader = await self._open_pdf(file_id)
-        writer = PdfWriter()
 
-        for page in reader.pages:
-            page.scale(scale_data.x, scale_data.y)
-            writer.add_page(page)
+        def scale() -> PdfWriter:
+            writer = PdfWriter()
+            for page in reader.pages:
+                page.scale(scale_data.x, scale_data.y)
+                writer.add_page(page)
+            return writer
 
-        with self._write_pdf(writer, "Scaled") as out_path:
+        writer = await self.executor_service.run(WorkerPool.light, scale)
+        async with self._write_pdf(writer, "Scaled") as out_path:
             yield out_path
 
     @asynccontextmanager
     async def scale_pdf_to_dimension(
         self, file_id: str, scale_data: ScaleData
     ) -> AsyncGenerator[Path, None]:
+        if self._use_pikepdf("scale"):
+            async with self._run_pikepdf(
+                file_id,
+                "Scaled",
+                pikepdf_engine.scale_pdf_to_dimension,
+                scale_data.x,
+                scale_data.y,
+            ) as out_path:
+                yield out_path
+            return
+
         reader = await self._open_pdf(file_id)
-        writer = PdfWriter()
 
-        for page in reader.pages:
-            page.scale_to(scale_data.x, scale_data.y)
-            writer.add_page(page)
+        def scale_to() -> PdfWriter:
+            writer = PdfWriter()
+            for page in reader.pages:
+                page.scale_to(scale_data.x, scale_data.y)
+                writer.add_page(page)
+            return writer
 
-        with self._write_pdf(writer, "Scaled") as out_path:
+        writer = await self.executor_service.run(WorkerPool.light, scale_to)
+        async with self._write_pdf(writer, "Scaled") as out_path:
             yield out_path
 
     @staticmethod
@@ -319,32 +530,182 @@ class PdfService:
 
     @asynccontextmanager
     async def split_pdf(self, file_id: str, split_range: str) -> AsyncGenerator[Path, None]:
+        if self._use_pikepdf("split"):
+            async with self._run_pikepdf(
+                file_id, "Split", pikepdf_engine.split_pdf, split_range
+            ) as out_path:
+                yield out_path
+            return
+
         reader = await self._open_pdf(file_id)
         merger = PdfMerger()
-        merger.append(reader, pages=PageRange(split_range))
+        await self.executor_service.run(
+            WorkerPool.light, merger.append, reader, pages=PageRange(split_range)
+        )
 
-        with self._write_pdf(merger, "Split") as out_path:
+        async with self._write_pdf(merger, "Split") as out_path:
             yield out_path
 
+    @staticmethod
+    def _get_ocr_options(settings: Settings) -> dict[str, Any]:
+        # At most `executor_ocr_pool_size` OCR jobs run at once, so the processes allowed
+        # on this node are split between them. OCRmyPDF also limits Tesseract's threads
+        # so that each job doesn't use more cores than its number of jobs.
+        max_processes = settings.ocr_max_processes or _CPU_COUNT
+        jobs = max(max_processes // settings.executor_ocr_pool_size, 1)
+        if settings.ocr_jobs is not None:
+            jobs = min(settings.ocr_jobs, jobs)
+
+        options: dict[str, Any] = {"jobs": jobs, "optimize": settings.ocr_optimize}
+        if settings.ocr_mode != "default":
+            options[settings.ocr_mode] = True
+        if settings.ocr_downsample_above is not None:
+            options["tesseract_downsample_large_images"] = True
+            options["tesseract_downsample_above"] = settings.ocr_downsample_above
+
+        return options
+
+    def _use_pikepdf(self, operation: str) -> bool:
+        engine = self.pdf_engine_overrides.get(operation, self.pdf_engine)
+        return engine == "pikepdf"
+
     @staticmethod
     def _get_file_ids(file_data_list: list[FileData]) -> list[str]:
         return [x.id for x in file_data_list]
 
     async def _open_pdf(self, file_id: str, allow_encrypted: bool = False) -> PdfReader:
+        if not allow_encrypted:
+            probe = await self.prober.get_cached(file_id)
+            if probe is not None and probe.is_encrypted:
+                raise PdfEncryptedError
+
         async with self.telegram_service.download_pdf_file(file_id) as file_name:
-            try:
-                pdf_reader = PdfReader(file_name)
-            except PyPdfReadError as e:
-                raise PdfReadError(_("Your PDF file is invalid")) from e
+            return await self._read_pdf(file_name, allow_encrypted)
+
+    async def _read_pdf(self, file_path: Path, allow_encrypted: bool = False) -> PdfReader:
+        try:
+            pdf_reader = await self.executor_service.run(WorkerPool.light, PdfReader, file_path)
+        except PyPdfReadError as e:
+            raise PdfReadError(_("Your PDF file is invalid")) from e
 
         if pdf_reader.is_encrypted and not allow_encrypted:
             raise PdfEncryptedError
         return pdf_reader
 
-    @contextmanager
-    def _write_pdf(
+    @asynccontextmanager
+    async def _run_pikepdf(
+        self, file_id: str, file_prefix: str, func: Callable[..., None], *args: Any
+    ) -> AsyncGenerator[Path, None]:
+        """Run a `pikepdf_engine` operation from the downloaded file into a temp file."""
+        async with self.telegram_service.download_pdf_file(file_id) as file_path:
+            with self.io_service.create_temp_pdf_file(file_prefix) as out_path:
+                try:
+                    await self.executor_service.run(
+                        WorkerPool.light, func, file_path, out_path, *args
+                    )
+                except pikepdf.PdfError as e:
+                    raise PdfReadError(_("Your PDF file is invalid")) from e
+                yield out_path
+
+    async def _rasterize_pdf(
+        self, file_path: Path, out_dir: Path, grayscale: bool = False
+    ) -> list[Path]:
+        """Render every page of the PDF file into a PNG file in `out_dir`.
+
+        The pages are rendered by several pdftoppm processes in parallel and written
+        straight to disk, so the images are never loaded into memory.
+
+        Returns:
+            The paths of the rendered pages, in page order.
+        """
+        paths = await self.executor_service.run_killable(
+            WorkerPool.heavy,
+            pdf2image.convert_from_path,
+            file_path,
+            output_folder=out_dir,
+            output_file="page",
+            fmt="png",
+            grayscale=grayscale,
+            thread_count=self.rasterize_thread_count,
+            paths_only=True,
+        )
+        # pdf2image returns paths instead of images when `paths_only` is set
+        return [Path(x) for x in cast(list[str], paths)]
+
+    async def _rasterize_grayscale_pdf(self, file_path: Path, out_path: Path) -> None:
+        with self.io_service.create_temp_directory() as dir_name:
+            images = await self._rasterize_pdf(file_path, dir_name, grayscale=True)
+            await self.executor_service.run_killable(
+                WorkerPool.heavy, _write_images_pdf, images, out_path
+            )
+
+    @asynccontextmanager
+    async def _write_pdf(
         self, writer: PdfWriter | PdfMerger, file_prefix: str
-    ) -> Generator[Path, None, None]:
+    ) -> AsyncGenerator[Path, None]:
         with self.io_service.create_temp_pdf_file(file_prefix) as out_path:
-            writer.write(out_path)
+            await self.executor_service.run(WorkerPool.light, writer.write, out_path)
             yield out_path
+
+
+def _archive_pdf_pages(file_path: Path, work_dir: Path, out_path: Path, thread_count: int) -> int:
+    """Render the pages of the PDF file into a ZIP archive of PNG files.
+
+    Pages are rendered in batches into `work_dir` and each page is removed once it has
+    been appended to the archive, so neither the disk nor the memory usage grows with the
+    number of pages.
+
+    Returns:
+        The number of pages written to the archive.
+    """
+    num_pages: int = pdf2image.pdfinfo_from_path(str(file_path))["Pages"]
+    num_digits = len(str(num_pages))
+    batch_size = thread_count * _ARCHIVE_PAGES_PER_THREAD
+
+    with ZipArchiveWriter(out_path) as writer:
+        for first_page in range(1, num_pages + 1, batch_size):
+            paths = pdf2image.convert_from_path(
+                file_path,
+                output_folder=work_dir,
+                output_file="page",
+                first_page=first_page,
+                last_page=min(first_page + batch_size - 1, num_pages),
+                fmt="png",
+                thread_count=thread_count,
+                paths_only=True,
+            )
+
+            for page_num, path in enumerate(cast(list[str], paths), first_page):
+                writer.write(Path(path), f"page_{page_num:0{num_digits}}.png")
+                Path(path).unlink()
+
+    return num_pages
+
+
+def _write_images_pdf(images: list[Path], out_path: Path) -> None:
+    with out_path.open("wb") as f:
+        img2pdf.convert(images, rotation=Rotation.ifvalid, outputstream=f)
+
+
+def _write_text_pdf(text: str, font_data: FontData | None, out_path: Path) -> None:
+    html = HTML(string="<p>{content}</p>".format(content=text.replace("\n", "<br/>")))
+    font_config = FontConfiguration()
+    stylesheets: list[CSS] | None = None
+
+    if font_data is not None:
+        stylesheets = [
+            CSS(
+                string=(
+                    "@font-face {"
+                    f"font-family: {font_data.font_family};"
+                    f"src: url({font_data.font_url});"
+                    "}"
+                    "p {"
+                    f"font-family: {font_data.font_family};"
+                    "}"
+                ),
+                font_config=font_config,
+            )
+        ]
+
+    html.write_pdf(out_path, stylesheets=stylesheets, font_config=font_config)
@@ -0,0 +1,356 @@
+"""PDF page operations backed by pikepdf/qpdf.
+
+These are the counterparts of the pypdf page loops in `PdfService`. They work on files
+rather than on readers and writers, so that the whole operation runs in native code and
+can be submitted to any worker pool.
+"""
+
+import hashlib
+import warnings
+from collections.abc import Iterator, Sequence
+from gettext import gettext as _
+from pathlib import Path
+from typing import cast
+
+import pikepdf
+from pypdf.pagerange import PageRange
+
+from pdf_bot.pdf.exceptions import (
+    PdfDecryptError,
+    PdfEncryptedError,
+    PdfIncorrectPasswordError,
+    PdfReadError,
+)
+
+_PAGE_BOXES = ("mediabox", "cropbox", "artbox", "bleedbox", "trimbox")
+
+ObjGen = tuple[int, int]
+
+
+def add_watermark_to_pdf(input_path: Path, output_path: Path, watermark_path: Path) -> None:
+    with _open_pdf(input_path) as pdf, _open_pdf(watermark_path) as watermark_pdf:
+        watermark_page = watermark_pdf.pages[0]
+
+        # Place the watermark at its original position and size, like pypdf does
+        rect = pikepdf.Rectangle(watermark_page.mediabox)
+        for page in pdf.pages:
+            page.add_overlay(watermark_page, rect)
+        pdf.save(output_path)
+
+
+def decrypt_pdf(input_path: Path, output_path: Path, password: str) -> None:
+    # Files with only an owner password open without one, so the password is always
+    # checked, as it is with pypdf
+    try:
+        with warnings.catch_warnings():
+            # Unencrypted files are rejected below
+            warnings.filterwarnings("ignore", "A password was provided", UserWarning)
+            pdf = pikepdf.open(input_path, password=password)
+    except pikepdf.PasswordError as e:
+        raise PdfIncorrectPasswordError(_("Incorrect password, please try again")) from e
+
+    with pdf:
+        if not pdf.is_encrypted:
+            raise PdfDecryptError(_("Your PDF file is not encrypted"))
+
+        # Saving without encryption settings removes the encryption
+        pdf.save(output_path)
+
+
+def encrypt_pdf(input_path: Path, output_path: Path, password: str) -> None:
+    with _open_pdf(input_path) as pdf:
+        pdf.save(output_path, encryption=pikepdf.Encryption(user=password, owner=password))
+
+
+def merge_pdfs(
+    input_paths: Sequence[Path], output_path: Path, file_names: Sequence[str | None]
+) -> None:
+    """Append the PDF files one by one, sharing the streams that are identical across them.
+
+    pikepdf copies the stream data of appended pages into the output straight away, so each
+    file is closed once it's appended, and the data of its duplicate streams is released.
+
+    Raises:
+        PdfEncryptedError: if any of the files is encrypted
+        PdfReadError: if any of the files is invalid, naming the file
+    """
+    with pikepdf.new() as out_pdf:
+        streams: dict[bytes, pikepdf.Object] = {}
+        visited: set[ObjGen] = set()
+        outline_items: list[pikepdf.OutlineItem] = []
+
+        for input_path, file_name in zip(input_paths, file_names, strict=True):
+            try:
+                with _open_pdf(input_path) as pdf:
+                    page_offset = len(out_pdf.pages)
+                    out_pdf.pages.extend(pdf.pages)
+
+                    new_pages = out_pdf.pages[page_offset:]
+                    _deduplicate_streams(new_pages, streams, visited)
+                    outline_items.extend(_copy_outline(pdf, new_pages))
+            except pikepdf.PdfError as e:
+                raise PdfReadError(
+                    _("I couldn't merge your PDF files as this file is invalid: %s") % file_name
+                ) from e
+
+        if outline_items:
+            with out_pdf.open_outline() as outline:
+                outline.root.extend(outline_items)
+        out_pdf.save(output_path, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+
+
+def rotate_pdf(input_path: Path, output_path: Path, degree: int) -> None:
+    with _open_pdf(input_path) as pdf:
+        for page in pdf.pages:
+            page.rotate(degree, relative=True)
+        pdf.save(output_path)
+
+
+def scale_pdf_by_factor(input_path: Path, output_path: Path, x: float, y: float) -> None:
+    with _open_pdf(input_path) as pdf:
+        for page in pdf.pages:
+            _scale_page(pdf, page, x, y)
+        pdf.save(output_path)
+
+
+def scale_pdf_to_dimension(
+    input_path: Path, output_path: Path, width: float, height: float
+) -> None:
+    with _open_pdf(input_path) as pdf:
+        for page in pdf.pages:
+            mediabox = pikepdf.Rectangle(page.mediabox)
+            _scale_page(pdf, page, width / mediabox.width, height / mediabox.height)
+        pdf.save(output_path)
+
+
+def split_pdf(input_path: Path, output_path: Path, split_range: str) -> None:
+    with _open_pdf(input_path) as pdf, pikepdf.new() as out_pdf:
+        page_range = PageRange(split_range)
+        for i in range(*page_range.indices(len(pdf.pages))):
+            out_pdf.pages.append(pdf.pages[i])
+        out_pdf.save(output_path)
+
+
+def _open_pdf(path: Path) -> pikepdf.Pdf:
+    try:
+        pdf = pikepdf.open(path)
+    except pikepdf.PasswordError as e:
+        raise PdfEncryptedError from e
+
+    # Files that are encrypted with an empty user password can be opened without one,
+    # but are still treated as encrypted, the same as with pypdf
+    if pdf.is_encrypted:
+        pdf.close()
+        raise PdfEncryptedError
+    return pdf
+
+
+def _deduplicate_streams(
+    pages: Sequence[pikepdf.Page], streams: dict[bytes, pikepdf.Object], visited: set[ObjGen]
+) -> None:
+    """Replace the references to streams of the pages that are identical to earlier ones.
+
+    Streams are keyed by their raw data and dictionary, with the references in the
+    dictionary resolved to the streams that they duplicate. Duplicates that are then left
+    unreferenced aren't written when the output is saved.
+
+    Args:
+        pages: The pages that have just been appended.
+        streams: The streams that have been merged so far, keyed by their content.
+        visited: The indirect objects that have already been deduplicated.
+    """
+    containers = _collect_containers(pages, visited)
+    new_streams = [x for x in containers if isinstance(x, pikepdf.Stream)]
+    duplicates = _match_streams(new_streams, streams)
+    if not duplicates:
+        return
+
+    for container in containers:
+        for key, value in _iter_items(container):
+            if isinstance(value, pikepdf.Object) and value.is_indirect:
+                original = duplicates.get(value.objgen)
+                if original is not None:
+                    container[key] = original
+
+    # The duplicates are no longer referenced, but their copied data is still held
+    for stream in new_streams:
+        if stream.objgen in duplicates:
+            stream.write(b"")
+
+
+def _collect_containers(
+    pages: Sequence[pikepdf.Page], visited: set[ObjGen]
+) -> list[pikepdf.Object]:
+    """Collect the dictionaries, arrays and streams that the pages use."""
+    containers: list[pikepdf.Object] = []
+    pending: list[pikepdf.Object] = [x.obj for x in pages]
+
+    while pending:
+        obj = pending.pop()
+        if obj.is_indirect:
+            if obj.objgen in visited:
+                continue
+            visited.add(obj.objgen)
+
+        containers.append(obj)
+        pending.extend(
+            value
+            for key, value in _iter_items(obj)
+            # The parent leads back to the pages that have already been merged
+            if key != "/Parent"
+            and isinstance(value, pikepdf.Dictionary | pikepdf.Array | pikepdf.Stream)
+        )
+
+    return containers
+
+
+def _match_streams(
+    new_streams: Sequence[pikepdf.Object], streams: dict[bytes, pikepdf.Object]
+) -> dict[ObjGen, pikepdf.Object]:
+    """Match the new streams to the merged ones, returning the duplicates by objgen."""
+    duplicates: dict[ObjGen, pikepdf.Object] = {}
+    for stream in _sort_by_references(new_streams):
+        original = streams.setdefault(_get_stream_key(stream, duplicates), stream)
+        if original.objgen != stream.objgen:
+            duplicates[stream.objgen] = original
+    return duplicates
+
+
+def _sort_by_references(new_streams: Sequence[pikepdf.Object]) -> list[pikepdf.Object]:
+    """Sort the streams after the ones that they reference, such as an image's soft mask.
+
+    A stream can then only be matched once the streams that it references have been.
+    """
+    by_objgen = {x.objgen: x for x in new_streams}
+    sorted_streams: list[pikepdf.Object] = []
+    seen: set[ObjGen] = set()
+
+    def visit(stream: pikepdf.Object) -> None:
+        seen.add(stream.objgen)
+        for ref in _iter_references(stream.stream_dict):
+            dependency = by_objgen.get(ref.objgen)
+            if dependency is not None and dependency.objgen not in seen:
+                visit(dependency)
+        sorted_streams.append(stream)
+
+    for stream in new_streams:
+        if stream.objgen not in seen:
+            visit(stream)
+    return sorted_streams
+
+
+def _iter_references(obj: pikepdf.Object) -> Iterator[pikepdf.Object]:
+    """Iterate over the indirect objects that the object or its direct children reference."""
+    for _key, value in _iter_items(obj):
+        if not isinstance(value, pikepdf.Object):
+            continue
+        if value.is_indirect:
+            yield value
+        elif isinstance(value, pikepdf.Dictionary | pikepdf.Array):
+            yield from _iter_references(value)
+
+
+def _get_stream_key(stream: pikepdf.Object, duplicates: dict[ObjGen, pikepdf.Object]) -> bytes:
+    stream_dict = pikepdf.Dictionary(
+        {k: v for k, v in stream.stream_dict.items() if k != "/Length"}
+    )
+    digest = hashlib.sha256(stream.read_raw_bytes())
+    digest.update(_unparse(stream_dict, duplicates))
+    return digest.digest()
+
+
+def _unparse(obj: object, duplicates: dict[ObjGen, pikepdf.Object]) -> bytes:
+    """Serialize the object, with references to duplicates replaced by their originals."""
+    if not isinstance(obj, pikepdf.Object):
+        return repr(obj).encode()
+
+    if obj.is_indirect:
+        original = duplicates.get(obj.objgen, obj)
+        return b"%d %d R" % original.objgen
+    if isinstance(obj, pikepdf.Dictionary):
+        items = sorted(obj.items())
+        return (
+            b"<<" + b" ".join(k.encode() + b" " + _unparse(v, duplicates) for k, v in items) + b">>"
+        )
+    if isinstance(obj, pikepdf.Array):
+        return b"[" + b" ".join(_unparse(x, duplicates) for x in obj.as_list()) + b"]"
+    return obj.unparse()
+
+
+def _iter_items(obj: pikepdf.Object) -> list[tuple[str | int, object]]:
+    if isinstance(obj, pikepdf.Array):
+        return list(enumerate(obj.as_list()))
+    return list(obj.items())
+
+
+def _copy_outline(pdf: pikepdf.Pdf, pages: Sequence[pikepdf.Page]) -> list[pikepdf.OutlineItem]:
+    """Copy the outline of the PDF file, pointing its items to the merged pages."""
+    page_indices = {x.obj.objgen: i for i, x in enumerate(pdf.pages)}
+    outline = pdf.open_outline()
+    return [_copy_outline_item(pdf, x, page_indices, pages) for x in outline.root]
+
+
+def _copy_outline_item(
+    pdf: pikepdf.Pdf,
+    item: pikepdf.OutlineItem,
+    page_indices: dict[ObjGen, int],
+    pages: Sequence[pikepdf.Page],
+) -> pikepdf.OutlineItem:
+    destination = None
+    source = _resolve_destination(pdf, item)
+
+    if source is not None and len(source) > 0:
+        page = source[0]
+        if isinstance(page, pikepdf.Dictionary) and page.objgen in page_indices:
+            view = source.as_list()[1:]
+            destination = pikepdf.Array([pages[page_indices[page.objgen]].obj, *view])
+
+    copy = pikepdf.OutlineItem(item.title, destination)
+    copy.children = [_copy_outline_item(pdf, x, page_indices, pages) for x in item.children]
+    return copy
+
+
+def _resolve_destination(pdf: pikepdf.Pdf, item: pikepdf.OutlineItem) -> pikepdf.Array | None:
+    destination: object = item.destination
+    if destination is None and item.action is not None:
+        destination = item.action.get("/D")
+
+    # Named destinations are looked up in the name tree, or in the older dictionary
+    if isinstance(destination, pikepdf.String):
+        names = pdf.Root.get("/Names")
+        dests = names.get("/Dests") if isinstance(names, pikepdf.Dictionary) else None
+        destination = (
+            pikepdf.NameTree(dests).get(str(destination))
+            if isinstance(dests, pikepdf.Dictionary)
+            else None
+        )
+    elif isinstance(destination, pikepdf.Name):
+        dests = pdf.Root.get("/Dests")
+        destination = dests.get(destination) if isinstance(dests, pikepdf.Dictionary) else None
+
+    if isinstance(destination, pikepdf.Dictionary):
+        destination = destination.get("/D")
+    return destination if isinstance(destination, pikepdf.Array) else None
+
+
+def _scale_page(pdf: pikepdf.Pdf, page: pikepdf.Page, x: float, y: float) -> None:
+    page.contents_add(pikepdf.Stream(pdf, f"q {x} 0 0 {y} 0 0 cm\n".encode()), prepend=True)
+    page.contents_add(pikepdf.Stream(pdf, b"\nQ"))
+
+    # Read all the boxes before updating any of them, as they default to each other
+    boxes = {name: pikepdf.Rectangle(getattr(page, name)) for name in _PAGE_BOXES}
+    for name, box in boxes.items():
+        setattr(page, name, _scale_rect(box, x, y))
+
+    annots = page.obj.get("/Annots")
+    if annots is None:
+        return
+
+    for annot in annots.as_list():
+        if "/Rect" in annot:
+            rect = pikepdf.Rectangle(cast(pikepdf.Array, annot.Rect))
+            annot.Rect = _scale_rect(rect, x, y)
+
+
+def _scale_rect(rect: pikepdf.Rectangle, x: float, y: float) -> pikepdf.Array:
+    return pikepdf.Array([rect.llx * x, rect.lly * y, rect.urx * x, rect.ury * y])
@@ -0,0 +1,188 @@
+import asyncio
+import re
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import pikepdf
+from loguru import logger
+from telegram.error import TelegramError
+
+from pdf_bot.executor import ExecutorService, WorkerPool
+from pdf_bot.pdf.models import PdfProbe
+from pdf_bot.settings import Settings
+from pdf_bot.telegram_internal import TelegramService
+
+_TEXT_OPERATORS = "Tj TJ ' \""
+_DO_OPERATOR = "Do"
+
+# Inline images can't be filtered for without parsing the whole content stream, so look
+# for their operator instead, which may also match text but only overcounts images
+_INLINE_IMAGE_PATTERN = re.compile(rb"(?:^|\s)BI\s")
+
+
+class PdfProber:
+    """Probe PDF files for what they contain, cached by their `file_unique_id`.
+
+    A probe only reads the page tree, the image objects and the text operators of the
+    file, which is cheap compared to the tasks that it lets fail fast. Only the first
+    `pdf_probe_max_text_pages` pages are scanned for text, as a probe that runs over its
+    timeout is abandoned but keeps its worker thread busy until it finishes.
+    """
+
+    def __init__(
+        self,
+        telegram_service: TelegramService,
+        executor_service: ExecutorService,
+        settings: Settings | dict[str, Any],
+    ) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
+        self.telegram_service = telegram_service
+        self.executor_service = executor_service
+        self.timeout = settings.pdf_probe_timeout
+        self.max_text_pages = settings.pdf_probe_max_text_pages
+        self.max_cache_size = settings.pdf_probe_cache_max_size
+        self._probes: OrderedDict[str, PdfProbe] = OrderedDict()
+        self._background_tasks: set[asyncio.Task[PdfProbe | None]] = set()
+
+    async def probe(self, file_id: str) -> PdfProbe | None:
+        """Probe the PDF file, unless it has already been probed.
+
+        Returns:
+            The probe, or None if the file is invalid or couldn't be probed in time.
+        """
+        try:
+            file_unique_id = await self.telegram_service.get_file_unique_id(file_id)
+            probe = self._get(file_unique_id)
+            if probe is not None:
+                return probe
+
+            async with (
+                asyncio.timeout(self.timeout),
+                self.telegram_service.download_pdf_file(file_id) as path,
+            ):
+                probe = await self.executor_service.run(
+                    WorkerPool.light, _probe_pdf, path, self.max_text_pages
+                )
+        except TimeoutError:
+            logger.warning("Probing PDF file timed out after {timeout}s", timeout=self.timeout)
+            return None
+        except Exception:  # noqa: BLE001
+            # A probe only hides tasks that can't apply, so failing one shouldn't fail the
+            # upload, however malformed the file is
+            logger.exception("Failed to probe PDF file")
+            return None
+
+        self._set(file_unique_id, probe)
+        return probe
+
+    def probe_in_background(self, file_id: str) -> None:
+        """Start probing the PDF file without waiting for it to finish."""
+        # Keep a reference to the task so that it isn't garbage collected while running
+        task = asyncio.create_task(self.probe(file_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def get_cached(self, file_id: str) -> PdfProbe | None:
+        """Get the probe of the PDF file if it has already been probed."""
+        try:
+            file_unique_id = await self.telegram_service.get_file_unique_id(file_id)
+        except TelegramError:
+            return None
+        return self._get(file_unique_id)
+
+    def _get(self, file_unique_id: str) -> PdfProbe | None:
+        probe = self._probes.get(file_unique_id)
+        if probe is not None:
+            self._probes.move_to_end(file_unique_id)
+        return probe
+
+    def _set(self, file_unique_id: str, probe: PdfProbe) -> None:
+        self._probes[file_unique_id] = probe
+        self._probes.move_to_end(file_unique_id)
+
+        if len(self._probes) > self.max_cache_size:
+            self._probes.popitem(last=False)
+
+
+def _probe_pdf(path: Path, max_text_pages: int) -> PdfProbe:
+    try:
+        pdf = pikepdf.open(path)
+    except pikepdf.PasswordError:
+        return PdfProbe(is_encrypted=True)
+
+    with pdf:
+        page_sizes = []
+        for page in pdf.pages:
+            box = pikepdf.Rectangle(page.mediabox)
+            page_sizes.append((abs(box.width), abs(box.height)))
+
+        num_images = sum(
+            1
+            for obj in pdf.objects
+            if isinstance(obj, pikepdf.Stream) and obj.get(pikepdf.Name.Subtype) == "/Image"
+        )
+        if num_images == 0:
+            num_images = sum(_count_inline_images(page) for page in pdf.pages)
+
+        has_text: bool | None = any(
+            _has_text(page.obj, set()) for page in islice(pdf.pages, max_text_pages)
+        )
+        if not has_text and len(pdf.pages) > max_text_pages:
+            has_text = None
+
+        return PdfProbe(
+            is_encrypted=pdf.is_encrypted,
+            num_pages=len(pdf.pages),
+            has_text=has_text,
+            num_images=num_images,
+            page_sizes=tuple(page_sizes),
+        )
+
+
+def _has_text(obj: pikepdf.Object, seen: set[tuple[int, int]]) -> bool:
+    """Check if the page or form XObject, or any form XObject that it draws, shows text."""
+    if obj.objgen != (0, 0):
+        if obj.objgen in seen:
+            return False
+        seen.add(obj.objgen)
+
+    instructions = pikepdf.parse_content_stream(obj, f"{_TEXT_OPERATORS} {_DO_OPERATOR}")
+    if any(str(x.operator) != _DO_OPERATOR for x in instructions):
+        return True
+
+    resources = obj.get(pikepdf.Name.Resources)
+    if not isinstance(resources, pikepdf.Dictionary):
+        return False
+    xobjects = resources.get(pikepdf.Name.XObject)
+    if not isinstance(xobjects, pikepdf.Dictionary):
+        return False
+
+    for instruction in instructions:
+        xobject = xobjects.get(str(instruction.operands[0]))
+        if (
+            isinstance(xobject, pikepdf.Stream)
+            and xobject.get(pikepdf.Name.Subtype) == "/Form"
+            and _has_text(xobject, seen)
+        ):
+            return True
+
+    return False
+
+
+def _count_inline_images(page: pikepdf.Page) -> int:
+    contents = page.obj.get(pikepdf.Name.Contents)
+    if contents is None:
+        return 0
+
+    streams = contents.as_list() if isinstance(contents, pikepdf.Array) else [contents]
+    return sum(
+        len(_INLINE_IMAGE_PATTERN.findall(x.read_bytes()))
+        for x in streams
+        if isinstance(x, pikepdf.Stream)
+    )
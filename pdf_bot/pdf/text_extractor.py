@@ -0,0 +1,141 @@
+import asyncio
+import textwrap
+from collections import deque
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from gettext import gettext as _
+from pathlib import Path
+from typing import Any, TextIO
+
+import pikepdf
+from loguru import logger
+from pdfminer.high_level import extract_text
+
+from pdf_bot.cli import CLINonZeroExitStatusError, CLIService
+from pdf_bot.executor import ExecutorService, WorkerPool
+from pdf_bot.pdf.exceptions import PdfEncryptedError, PdfReadError
+from pdf_bot.settings import Settings
+
+_PAGE_SEPARATOR = "\f"
+
+
+class PdfTextExtractor:
+    """Extract the text of PDF files in chunks of pages.
+
+    Each chunk is extracted by a pdftotext subprocess. If pdftotext fails or isn't
+    installed, the chunk falls back to pdfminer in the heavy worker pool, which runs in
+    threads unless `executor_heavy_use_processes` is set. Chunks are extracted
+    concurrently, but only a few are held in memory at once, as they are consumed in page
+    order as soon as they finish.
+    """
+
+    def __init__(
+        self,
+        cli_service: CLIService,
+        executor_service: ExecutorService,
+        settings: Settings | dict[str, Any],
+    ) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
+        self.cli_service = cli_service
+        self.executor_service = executor_service
+        self.pages_per_chunk = settings.text_pages_per_chunk
+        self.max_pending_chunks = max(
+            settings.cli_max_concurrency, settings.executor_heavy_pool_size
+        )
+
+    async def extract(self, input_path: Path, out_path: Path, work_dir: Path) -> bool:
+        """Extract the text of the PDF file into `out_path`, wrapped into short lines.
+
+        Returns:
+            Whether any text was found.
+        """
+        has_text = False
+        with out_path.open("w", encoding="utf-8") as f:
+            async with aclosing(self._extract_chunks(input_path, work_dir)) as chunks:
+                async for text in chunks:
+                    if text:
+                        has_text = True
+                        await self.executor_service.run(WorkerPool.light, _write, f, text)
+
+        return has_text
+
+    async def _extract_chunks(self, input_path: Path, work_dir: Path) -> AsyncGenerator[str, None]:
+        num_pages = await self.executor_service.run(WorkerPool.light, _count_pages, input_path)
+        tasks: deque[asyncio.Task[str]] = deque()
+
+        try:
+            for first_page in range(1, num_pages + 1, self.pages_per_chunk):
+                last_page = min(first_page + self.pages_per_chunk - 1, num_pages)
+                tasks.append(
+                    asyncio.create_task(
+                        self._extract_chunk(input_path, work_dir, first_page, last_page)
+                    )
+                )
+
+                if len(tasks) >= self.max_pending_chunks:
+                    yield await tasks.popleft()
+
+            while tasks:
+                yield await tasks.popleft()
+        finally:
+            # Reached when a chunk or the consumer fails, so stop the pending chunks
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _extract_chunk(
+        self, input_path: Path, work_dir: Path, first_page: int, last_page: int
+    ) -> str:
+        out_path = work_dir / f"text_{first_page}.txt"
+        try:
+            await self.cli_service.extract_pdf_text(input_path, out_path, first_page, last_page)
+        except (CLINonZeroExitStatusError, OSError):
+            # OSError includes pdftotext not being installed
+            logger.warning(
+                "Failed to extract text from pages {first_page}-{last_page} with pdftotext, "
+                "falling back to pdfminer",
+                first_page=first_page,
+                last_page=last_page,
+            )
+            return await self.executor_service.run(
+                WorkerPool.heavy, _extract_with_pdfminer, input_path, first_page, last_page
+            )
+
+        return await self.executor_service.run(WorkerPool.light, _read_pdftotext_output, out_path)
+
+
+def _count_pages(path: Path) -> int:
+    try:
+        with pikepdf.open(path) as pdf:
+            return len(pdf.pages)
+    except pikepdf.PasswordError as e:
+        raise PdfEncryptedError from e
+    except pikepdf.PdfError as e:
+        raise PdfReadError(_("Your PDF file is invalid")) from e
+
+
+def _extract_with_pdfminer(input_path: Path, first_page: int, last_page: int) -> str:
+    text = extract_text(input_path, page_numbers=range(first_page - 1, last_page))
+    return _wrap_pages(text)
+
+
+def _read_pdftotext_output(path: Path) -> str:
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    finally:
+        path.unlink(missing_ok=True)
+    return _wrap_pages(text)
+
+
+def _wrap_pages(text: str) -> str:
+    return "".join(
+        f"{line}\n" for page in text.split(_PAGE_SEPARATOR) for line in textwrap.wrap(page)
+    )
+
+
+def _write(f: TextIO, text: str) -> None:
+    f.write(text)
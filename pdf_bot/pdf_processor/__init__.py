@@ -9,7 +9,7 @@ from .abstract_pdf_text_input_processor import (
     AbstractPdfTextInputProcessor,
     TextInputData,
 )
-from .compress_pdf_processor import CompressPdfData, CompressPdfProcessor
+from .compress_pdf_processor import CompressLevelData, CompressPdfData, CompressPdfProcessor
 from .crop_pdf_processor import (
     CropOptionAndInputData,
     CropPdfData,
@@ -43,6 +43,7 @@ __all__ = [
     "SelectOptionData",
     "AbstractPdfTextInputProcessor",
     "TextInputData",
+    "CompressLevelData",
     "CompressPdfData",
     "CompressPdfProcessor",
     "CropOptionAndInputData",
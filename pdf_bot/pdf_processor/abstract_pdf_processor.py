@@ -1,10 +1,12 @@
+from collections.abc import Sequence
 from typing import ClassVar
 
 from pdf_bot.file_processor import AbstractFileProcessor
 from pdf_bot.file_processor.errors import DuplicateClassError
+from pdf_bot.job_scheduler import JobScheduler
 from pdf_bot.language import LanguageService
 from pdf_bot.models import TaskData
-from pdf_bot.pdf import PdfService, PdfServiceError
+from pdf_bot.pdf import PdfProbe, PdfService, PdfServiceError
 from pdf_bot.telegram_internal import TelegramService
 
 
@@ -16,9 +18,10 @@ class AbstractPdfProcessor(AbstractFileProcessor):
         pdf_service: PdfService,
         telegram_service: TelegramService,
         language_service: LanguageService,
+        job_scheduler: JobScheduler,
         bypass_init_check: bool = False,
     ) -> None:
-        super().__init__(telegram_service, language_service, bypass_init_check)
+        super().__init__(telegram_service, language_service, job_scheduler, bypass_init_check)
 
         self.pdf_service = pdf_service
         cls_name = self.__class__.__name__
@@ -31,6 +34,29 @@ class AbstractPdfProcessor(AbstractFileProcessor):
     def get_task_data_list(cls) -> list[TaskData]:
         return [x.task_data for x in cls._PDF_PROCESSORS.values()]
 
+    @classmethod
+    async def filter_pdf_tasks(
+        cls, pdf_service: PdfService, file_id: str, tasks: Sequence[TaskData]
+    ) -> Sequence[TaskData]:
+        """Hide the tasks that can't apply to the PDF file, if it has been probed."""
+        probe = await pdf_service.get_pdf_probe(file_id)
+        if probe is None:
+            return tasks
+
+        hidden_types = {
+            x.task_data.data_type
+            for x in cls._PDF_PROCESSORS.values()
+            if not x.is_applicable(probe)
+        }
+        return [x for x in tasks if x.data_type not in hidden_types]
+
     @property
     def generic_error_types(self) -> set[type[Exception]]:
         return {PdfServiceError}
+
+    def is_applicable(self, _probe: PdfProbe) -> bool:
+        """Whether the task can apply to the probed PDF file, which it can by default."""
+        return True
+
+    async def filter_tasks(self, file_id: str, tasks: Sequence[TaskData]) -> Sequence[TaskData]:
+        return await self.filter_pdf_tasks(self.pdf_service, file_id, tasks)
@@ -93,6 +93,8 @@ class AbstractPdfSelectAndTextProcessor(AbstractPdfProcessor):
                 # Return to wait file task state
                 AbstractFileTaskProcessor.WAIT_FILE_TASK: AbstractFileTaskProcessor.WAIT_FILE_TASK,
             },
+            name=type(self).__name__,
+            persistent=True,
         )
 
     async def _ask_select_option(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
@@ -65,6 +65,8 @@ class AbstractPdfTextInputProcessor(AbstractPdfProcessor):
                 # Return to wait file task state
                 AbstractFileTaskProcessor.WAIT_FILE_TASK: AbstractFileTaskProcessor.WAIT_FILE_TASK,
             },
+            name=type(self).__name__,
+            persistent=True,
         )
 
     async def _ask_text_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
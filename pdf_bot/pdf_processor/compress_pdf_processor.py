@@ -1,20 +1,38 @@
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from gettext import gettext as _
+from typing import cast
 
-from telegram.ext import CallbackQueryHandler
+from telegram import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.ext import CallbackQueryHandler, CommandHandler, ContextTypes, ConversationHandler
 
 from pdf_bot.analytics import TaskType
+from pdf_bot.errors import CallbackQueryDataTypeError, FileDataTypeError
+from pdf_bot.file_processor import AbstractFileTaskProcessor
 from pdf_bot.models import FileData, FileTaskResult, TaskData
+from pdf_bot.pdf import CompressLevel
+from pdf_bot.telegram_internal import BackData
 
 from .abstract_pdf_processor import AbstractPdfProcessor
 
 
-class CompressPdfData(FileData):
-    pass
+class CompressPdfData(FileData): ...
+
+
+@dataclass(kw_only=True)
+class CompressLevelData(CompressPdfData):
+    level: CompressLevel
 
 
 class CompressPdfProcessor(AbstractPdfProcessor):
+    _WAIT_LEVEL = "wait_level"
+    _LEVELS = (
+        (CompressLevel.low, _("Low")),
+        (CompressLevel.medium, _("Medium")),
+        (CompressLevel.high, _("High")),
+    )
+
     @property
     def task_type(self) -> TaskType:
         return TaskType.compress_pdf
@@ -24,17 +42,79 @@ class CompressPdfProcessor(AbstractPdfProcessor):
         return TaskData(_("Compress"), CompressPdfData)
 
     @property
-    def handler(self) -> CallbackQueryHandler:
-        return CallbackQueryHandler(self.process_file, pattern=CompressPdfData)
+    def handler(self) -> ConversationHandler:
+        return ConversationHandler(
+            entry_points=[CallbackQueryHandler(self.ask_level, pattern=CompressPdfData)],
+            states={
+                self._WAIT_LEVEL: [
+                    CallbackQueryHandler(self.process_file, pattern=CompressLevelData),
+                    CallbackQueryHandler(self.ask_task, pattern=BackData),
+                ]
+            },
+            fallbacks=[CommandHandler("cancel", self.telegram_service.cancel_conversation)],
+            map_to_parent={
+                # Return to wait file task state
+                AbstractFileTaskProcessor.WAIT_FILE_TASK: AbstractFileTaskProcessor.WAIT_FILE_TASK,
+            },
+            name=type(self).__name__,
+            persistent=True,
+        )
 
     @asynccontextmanager
     async def process_file_task(self, file_data: FileData) -> AsyncGenerator[FileTaskResult, None]:
-        async with self.pdf_service.compress_pdf(file_data.id) as result:
-            yield FileTaskResult(
-                result.out_path,
-                _("File size reduced by {percent}, from {old_size} to {new_size}").format(
+        if not isinstance(file_data, CompressLevelData):
+            raise FileDataTypeError(file_data)
+
+        async with self.pdf_service.compress_pdf(file_data.id, file_data.level) as result:
+            if result.new_size >= result.old_size:
+                message = _("Your PDF file is already as small as it can be")
+            else:
+                message = _("File size reduced by {percent}, from {old_size} to {new_size}").format(
                     percent=f"{result.reduced_percentage:.0%}",
                     old_size=result.readable_old_size,
                     new_size=result.readable_new_size,
-                ),
-            )
+                )
+            yield FileTaskResult(result.out_path, message)
+
+    async def ask_level(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
+        query = cast(CallbackQuery, update.callback_query)
+        await self.telegram_service.answer_query_and_drop_data(context, query)
+        data: str | CompressPdfData | None = query.data
+
+        if not isinstance(data, CompressPdfData):
+            raise CallbackQueryDataTypeError(data)
+
+        reply_markup = self._get_ask_level_reply_markup(update, context, data)
+        _ = self.language_service.set_app_language(update, context)
+        await query.edit_message_text(
+            _(
+                "Select the compression level, higher levels make your PDF file smaller "
+                "but lower the quality of its images"
+            ),
+            reply_markup=reply_markup,
+        )
+
+        return self._WAIT_LEVEL
+
+    def _get_ask_level_reply_markup(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        compress_data: CompressPdfData,
+    ) -> InlineKeyboardMarkup:
+        _ = self.language_service.set_app_language(update, context)
+        back_button = self.telegram_service.get_back_button(update, context)
+        keyboard = [
+            [
+                InlineKeyboardButton(
+                    _(text),
+                    callback_data=CompressLevelData(
+                        id=compress_data.id, name=compress_data.name, level=level
+                    ),
+                )
+                for level, text in self._LEVELS
+            ],
+            [back_button],
+        ]
+
+        return InlineKeyboardMarkup(keyboard)
@@ -9,8 +9,9 @@ from telegram.ext import ContextTypes
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import FileDataTypeError
 from pdf_bot.file_processor import ErrorHandlerType
+from pdf_bot.job_scheduler import JobLane
 from pdf_bot.models import FileData, FileTaskResult, TaskData
-from pdf_bot.pdf import PdfIncorrectPasswordError
+from pdf_bot.pdf import PdfIncorrectPasswordError, PdfProbe
 
 from .abstract_pdf_text_input_processor import AbstractPdfTextInputProcessor, TextInputData
 
@@ -20,10 +21,18 @@ class DecryptPdfData(FileData):
 
 
 class DecryptPdfProcessor(AbstractPdfTextInputProcessor):
+    @property
+    def cache_result(self) -> bool:
+        return False
+
     @property
     def task_type(self) -> TaskType:
         return TaskType.decrypt_pdf
 
+    @property
+    def job_lane(self) -> JobLane:
+        return JobLane.light
+
     @property
     def entry_point_data_type(self) -> type[DecryptPdfData]:
         return DecryptPdfData
@@ -32,6 +41,9 @@ class DecryptPdfProcessor(AbstractPdfTextInputProcessor):
     def task_data(self) -> TaskData:
         return TaskData(_("Decrypt"), self.entry_point_data_type)
 
+    def is_applicable(self, probe: PdfProbe) -> bool:
+        return probe.is_encrypted
+
     @property
     def invalid_text_input_error(self) -> str:  # pragma: no cover
         return ""
@@ -4,7 +4,9 @@ from gettext import gettext as _
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import FileDataTypeError
+from pdf_bot.job_scheduler import JobLane
 from pdf_bot.models import FileData, FileTaskResult, TaskData
+from pdf_bot.pdf import PdfProbe
 
 from .abstract_pdf_text_input_processor import AbstractPdfTextInputProcessor, TextInputData
 
@@ -14,10 +16,18 @@ class EncryptPdfData(FileData):
 
 
 class EncryptPdfProcessor(AbstractPdfTextInputProcessor):
+    @property
+    def cache_result(self) -> bool:
+        return False
+
     @property
     def task_type(self) -> TaskType:
         return TaskType.encrypt_pdf
 
+    @property
+    def job_lane(self) -> JobLane:
+        return JobLane.light
+
     @property
     def entry_point_data_type(self) -> type[EncryptPdfData]:
         return EncryptPdfData
@@ -26,6 +36,9 @@ class EncryptPdfProcessor(AbstractPdfTextInputProcessor):
     def task_data(self) -> TaskData:
         return TaskData(_("Encrypt"), self.entry_point_data_type)
 
+    def is_applicable(self, probe: PdfProbe) -> bool:
+        return not probe.is_encrypted
+
     @property
     def invalid_text_input_error(self) -> str:  # pragma: no cover
         return ""
@@ -6,6 +6,7 @@ from telegram.ext import CallbackQueryHandler
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.models import FileData, FileTaskResult, TaskData
+from pdf_bot.pdf import PdfProbe
 
 from .abstract_pdf_processor import AbstractPdfProcessor
 
@@ -23,6 +24,9 @@ class ExtractPdfImageProcessor(AbstractPdfProcessor):
     def task_data(self) -> TaskData:
         return TaskData(_("Extract images"), ExtractPdfImageData)
 
+    def is_applicable(self, probe: PdfProbe) -> bool:
+        return not probe.is_readable or probe.num_images > 0
+
     @property
     def handler(self) -> CallbackQueryHandler:
         return CallbackQueryHandler(self.process_file, pattern=ExtractPdfImageData)
@@ -6,6 +6,7 @@ from telegram.ext import CallbackQueryHandler
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.models import FileData, FileTaskResult, TaskData
+from pdf_bot.pdf import PdfProbe
 
 from .abstract_pdf_processor import AbstractPdfProcessor
 
@@ -23,6 +24,9 @@ class ExtractPdfTextProcessor(AbstractPdfProcessor):
     def task_data(self) -> TaskData:
         return TaskData(_("Extract text"), ExtractPdfTextData)
 
+    def is_applicable(self, probe: PdfProbe) -> bool:
+        return not probe.is_readable or probe.has_text is not False
+
     @property
     def handler(self) -> CallbackQueryHandler:
         return CallbackQueryHandler(self.process_file, pattern=ExtractPdfTextData)
@@ -1,10 +1,16 @@
+import time
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
+from typing import cast
 
-from telegram.ext import CallbackQueryHandler
+from telegram import Message, Update
+from telegram.error import TelegramError
+from telegram.ext import CallbackQueryHandler, ContextTypes
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.models import FileData, FileTaskResult, TaskData
+from pdf_bot.pdf import PdfProbe
+from pdf_bot.pdf.pdf_service import PageProgressFunc
 
 from .abstract_pdf_processor import AbstractPdfProcessor
 
@@ -14,6 +20,10 @@ class OcrPdfData(FileData):
 
 
 class OcrPdfProcessor(AbstractPdfProcessor):
+    # Minimum number of seconds between progress updates, which are only sent for files
+    # that take longer than this to OCR
+    _PROGRESS_INTERVAL = 5
+
     @property
     def task_type(self) -> TaskType:
         return TaskType.ocr_pdf
@@ -22,6 +32,12 @@ class OcrPdfProcessor(AbstractPdfProcessor):
     def task_data(self) -> TaskData:
         return TaskData("OCR", OcrPdfData)
 
+    def is_applicable(self, probe: PdfProbe) -> bool:
+        # Pages with text are an error unless OCR is configured to skip or redo them
+        return not probe.is_encrypted and not (
+            probe.has_text and self.pdf_service.ocr_mode == "default"
+        )
+
     @property
     def handler(self) -> CallbackQueryHandler:
         return CallbackQueryHandler(self.process_file, pattern=OcrPdfData)
@@ -30,3 +46,43 @@ class OcrPdfProcessor(AbstractPdfProcessor):
     async def process_file_task(self, file_data: FileData) -> AsyncGenerator[FileTaskResult, None]:
         async with self.pdf_service.ocr_pdf(file_data.id) as path:
             yield FileTaskResult(path)
+
+    def _create_file_task(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE, file_data: FileData
+    ) -> AbstractAsyncContextManager[FileTaskResult]:
+        return self._process_with_progress(file_data, self._create_progress_func(update, context))
+
+    @asynccontextmanager
+    async def _process_with_progress(
+        self, file_data: FileData, on_progress: PageProgressFunc
+    ) -> AsyncGenerator[FileTaskResult, None]:
+        async with self.pdf_service.ocr_pdf(file_data.id, on_progress) as path:
+            yield FileTaskResult(path)
+
+    def _create_progress_func(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> PageProgressFunc:
+        msg = cast(Message, update.effective_message)
+        progress_msg: Message | None = None
+        last_sent = time.monotonic()
+
+        async def send_progress(num_pages_done: int, num_pages: int) -> None:
+            nonlocal progress_msg, last_sent
+            now = time.monotonic()
+            if now - last_sent < self._PROGRESS_INTERVAL:
+                return
+            last_sent = now
+
+            _ = self.language_service.set_app_language(update, context)
+            text = _("OCRed {num_pages_done} of {num_pages} pages").format(
+                num_pages_done=num_pages_done, num_pages=num_pages
+            )
+
+            # Edit the same message so that the chat isn't flooded with updates
+            with suppress(TelegramError):
+                if progress_msg is None:
+                    progress_msg = await msg.reply_text(text)
+                else:
+                    await progress_msg.edit_text(text)
+
+        return send_progress
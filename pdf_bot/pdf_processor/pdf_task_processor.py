@@ -1,9 +1,21 @@
+from collections.abc import Sequence
+
 from pdf_bot.file_processor import AbstractFileTaskProcessor
+from pdf_bot.language import LanguageService
+from pdf_bot.models import TaskData
+from pdf_bot.pdf import PdfService
 
 from .abstract_pdf_processor import AbstractPdfProcessor
 
 
 class PdfTaskProcessor(AbstractFileTaskProcessor):
+    def __init__(self, language_service: LanguageService, pdf_service: PdfService) -> None:
+        super().__init__(language_service)
+        self.pdf_service = pdf_service
+
     @property
     def processor_type(self) -> type[AbstractPdfProcessor]:
         return AbstractPdfProcessor
+
+    async def filter_tasks(self, file_id: str, tasks: Sequence[TaskData]) -> Sequence[TaskData]:
+        return await AbstractPdfProcessor.filter_pdf_tasks(self.pdf_service, file_id, tasks)
@@ -5,6 +5,7 @@ from gettext import gettext as _
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import FileDataTypeError
+from pdf_bot.job_scheduler import JobLane
 from pdf_bot.models import FileData, FileTaskResult, TaskData
 
 from .abstract_pdf_text_input_processor import AbstractPdfTextInputProcessor, TextInputData
@@ -21,6 +22,10 @@ class RenamePdfProcessor(AbstractPdfTextInputProcessor):
     def task_type(self) -> TaskType:
         return TaskType.rename_pdf
 
+    @property
+    def job_lane(self) -> JobLane:
+        return JobLane.light
+
     @property
     def entry_point_data_type(self) -> type[RenamePdfData]:
         return RenamePdfData
@@ -10,6 +10,7 @@ from telegram.ext import CallbackQueryHandler, CommandHandler, ContextTypes, Con
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import CallbackQueryDataTypeError, FileDataTypeError
 from pdf_bot.file_processor import AbstractFileTaskProcessor
+from pdf_bot.job_scheduler import JobLane
 from pdf_bot.models import FileData, FileTaskResult, TaskData
 from pdf_bot.telegram_internal import BackData
 
@@ -32,6 +33,10 @@ class RotatePdfProcessor(AbstractPdfProcessor):
     def task_type(self) -> TaskType:
         return TaskType.rotate_pdf
 
+    @property
+    def job_lane(self) -> JobLane:
+        return JobLane.light
+
     @property
     def task_data(self) -> TaskData:
         return TaskData(_("Rotate"), RotatePdfData)
@@ -51,6 +56,8 @@ class RotatePdfProcessor(AbstractPdfProcessor):
                 # Return to wait file task state
                 AbstractFileTaskProcessor.WAIT_FILE_TASK: AbstractFileTaskProcessor.WAIT_FILE_TASK,
             },
+            name=type(self).__name__,
+            persistent=True,
         )
 
     @asynccontextmanager
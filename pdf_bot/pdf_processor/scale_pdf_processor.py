@@ -4,6 +4,7 @@ from gettext import gettext as _
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import FileDataTypeError
+from pdf_bot.job_scheduler import JobLane
 from pdf_bot.models import FileData, FileTaskResult, TaskData
 from pdf_bot.pdf import ScaleData
 
@@ -49,6 +50,10 @@ class ScalePdfProcessor(AbstractPdfSelectAndTextProcessor):
     def task_type(self) -> TaskType:
         return TaskType.scale_pdf
 
+    @property
+    def job_lane(self) -> JobLane:
+        return JobLane.light
+
     @property
     def task_data(self) -> TaskData:
         return TaskData(_("Scale"), self.entry_point_data_type)
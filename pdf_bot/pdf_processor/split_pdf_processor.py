@@ -4,6 +4,7 @@ from gettext import gettext as _
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import FileDataTypeError
+from pdf_bot.job_scheduler import JobLane
 from pdf_bot.models import FileData, FileTaskResult, TaskData
 
 from .abstract_pdf_text_input_processor import AbstractPdfTextInputProcessor, TextInputData
@@ -20,6 +21,10 @@ class SplitPdfProcessor(AbstractPdfTextInputProcessor):
     def task_type(self) -> TaskType:
         return TaskType.split_pdf
 
+    @property
+    def job_lane(self) -> JobLane:
+        return JobLane.light
+
     @property
     def entry_point_data_type(self) -> type[SplitPdfData]:
         return SplitPdfData
@@ -0,0 +1,15 @@
+from .backends import (
+    AbstractPersistenceBackend,
+    FilePersistenceBackend,
+    MemoryPersistenceBackend,
+    SqlitePersistenceBackend,
+)
+from .bot_persistence import BotPersistence
+
+__all__ = [
+    "AbstractPersistenceBackend",
+    "BotPersistence",
+    "FilePersistenceBackend",
+    "MemoryPersistenceBackend",
+    "SqlitePersistenceBackend",
+]
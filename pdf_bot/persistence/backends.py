@@ -0,0 +1,154 @@
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from urllib.parse import quote, unquote
+
+# Pending writes keyed by (namespace, key), where a value of None deletes the entry
+WriteBatch = Mapping[tuple[str, str], bytes | None]
+
+
+class AbstractPersistenceBackend(ABC):
+    # Whether the stored data can be changed by other processes, in which case it has to
+    # be read again before being used
+    is_shared = True
+    # Whether the stored data outlives the process, otherwise there's no point in storing
+    # the data that the application already holds in memory
+    is_durable = True
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    def get_all(self, namespace: str) -> dict[str, bytes]:
+        pass
+
+    @abstractmethod
+    def write_batch(self, batch: WriteBatch) -> None:
+        pass
+
+
+class MemoryPersistenceBackend(AbstractPersistenceBackend):
+    is_shared = False
+    is_durable = False
+
+    def __init__(self) -> None:
+        self._data: dict[str, dict[str, bytes]] = {}
+
+    def get(self, namespace: str, key: str) -> bytes | None:
+        return self._data.get(namespace, {}).get(key)
+
+    def get_all(self, namespace: str) -> dict[str, bytes]:
+        return dict(self._data.get(namespace, {}))
+
+    def write_batch(self, batch: WriteBatch) -> None:
+        for (namespace, key), value in batch.items():
+            if value is None:
+                self._data.get(namespace, {}).pop(key, None)
+            else:
+                self._data.setdefault(namespace, {})[key] = value
+
+
+class FilePersistenceBackend(AbstractPersistenceBackend):
+    """Stores each entry in its own file under `dir_path/<namespace>/`.
+
+    Entries are replaced atomically, so several processes can share the directory, e.g.
+    on a network volume, without corrupting each other's writes.
+    """
+
+    _SUFFIX = ".pickle"
+
+    def __init__(self, dir_path: Path) -> None:
+        self.dir_path = dir_path
+
+    def get(self, namespace: str, key: str) -> bytes | None:
+        try:
+            return self._get_path(namespace, key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def get_all(self, namespace: str) -> dict[str, bytes]:
+        namespace_dir = self._get_namespace_dir(namespace)
+        if not namespace_dir.is_dir():
+            return {}
+
+        data = {}
+        for path in namespace_dir.glob(f"*{self._SUFFIX}"):
+            try:
+                data[unquote(path.stem)] = path.read_bytes()
+            except FileNotFoundError:
+                # Deleted by another process
+                continue
+        return data
+
+    def write_batch(self, batch: WriteBatch) -> None:
+        for (namespace, key), value in batch.items():
+            path = self._get_path(namespace, key)
+            if value is None:
+                path.unlink(missing_ok=True)
+                continue
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile(dir=path.parent, suffix=".part", delete=False) as f:
+                f.write(value)
+            Path(f.name).replace(path)
+
+    def _get_namespace_dir(self, namespace: str) -> Path:
+        return self.dir_path / quote(namespace, safe="")
+
+    def _get_path(self, namespace: str, key: str) -> Path:
+        return self._get_namespace_dir(namespace) / f"{quote(key, safe='')}{self._SUFFIX}"
+
+
+class SqlitePersistenceBackend(AbstractPersistenceBackend):
+    def __init__(self, path: Path) -> None:
+        # The connection is used from worker threads, so only let one use it at a time
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        # WAL lets readers in other processes carry on while a batch is being written
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS persistence ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+
+    def get(self, namespace: str, key: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM persistence WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        if row is None:
+            return None
+        return bytes(row[0])
+
+    def get_all(self, namespace: str) -> dict[str, bytes]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM persistence WHERE namespace = ?", (namespace,)
+            ).fetchall()
+        return {key: bytes(value) for key, value in rows}
+
+    def write_batch(self, batch: WriteBatch) -> None:
+        upserts = [(ns, key, value) for (ns, key), value in batch.items() if value is not None]
+        deletes = [(ns, key) for (ns, key), value in batch.items() if value is None]
+
+        # Write the whole batch in a single transaction
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO persistence VALUES (?, ?, ?)", upserts
+                )
+                self._conn.executemany(
+                    "DELETE FROM persistence WHERE namespace = ? AND key = ?", deletes
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
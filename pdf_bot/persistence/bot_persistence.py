@@ -0,0 +1,238 @@
+import asyncio
+import json
+import pickle
+from typing import Any
+
+from loguru import logger
+from telegram.ext import BasePersistence, PersistenceInput
+from telegram.ext._utils.types import CDCData, ConversationDict, ConversationKey
+
+from pdf_bot.settings import Settings
+
+from .backends import (
+    AbstractPersistenceBackend,
+    FilePersistenceBackend,
+    MemoryPersistenceBackend,
+    SqlitePersistenceBackend,
+)
+
+BotData = dict[Any, Any]
+
+
+class BotPersistence(BasePersistence[BotData, BotData, BotData]):
+    """Persist user, chat and bot data, callback data and conversation states.
+
+    Updates are pickled when they are received and buffered, so that repeated updates of
+    the same entry are coalesced and then written to the backend in batches, either after
+    `persistence_flush_interval` seconds or once `persistence_max_batch_size` entries
+    are pending.
+
+    With a shared backend, user, chat and bot data are read again before each update is
+    handled. Conversation states and callback data are only loaded by the application on
+    startup, as python-telegram-bot looks them up synchronously, so they are restored
+    after restarts but aren't shared between running replicas. Several replicas can only
+    share a backend if each user's updates are always routed to the same replica.
+
+    Nothing is stored with a backend that isn't durable, as the application already holds
+    all of its data in memory.
+    """
+
+    FILE_BACKEND = "file"
+    SQLITE_BACKEND = "sqlite"
+
+    USER_DATA = "user_data"
+    CHAT_DATA = "chat_data"
+    BOT_DATA = "bot_data"
+    CALLBACK_DATA = "callback_data"
+    _CONVERSATIONS = "conversations"
+    _SINGLE_KEY = "data"
+
+    def __init__(
+        self,
+        settings: Settings | dict[str, Any],
+        backend: AbstractPersistenceBackend | None = None,
+    ) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
+        if backend is None:
+            if settings.persistence_backend == self.SQLITE_BACKEND:
+                backend = SqlitePersistenceBackend(settings.persistence_path)
+            elif settings.persistence_backend == self.FILE_BACKEND:
+                backend = FilePersistenceBackend(settings.persistence_path)
+            else:
+                backend = MemoryPersistenceBackend()
+        self.backend = backend
+
+        # The application doesn't even hand over its data if none of it is stored
+        store_data = None
+        if not backend.is_durable:
+            store_data = PersistenceInput(
+                bot_data=False, chat_data=False, user_data=False, callback_data=False
+            )
+        super().__init__(
+            store_data=store_data, update_interval=settings.persistence_update_interval
+        )
+
+        self.flush_interval = settings.persistence_flush_interval
+        self.max_batch_size = settings.persistence_max_batch_size
+
+        self._pending: dict[tuple[str, str], bytes | None] = {}
+        self._writing: dict[tuple[str, str], bytes | None] = {}
+        self._write_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task[None] | None = None
+
+    async def get_user_data(self) -> dict[int, BotData]:
+        data = await self._load_all(self.USER_DATA)
+        return {int(key): value for key, value in data.items()}
+
+    async def get_chat_data(self) -> dict[int, BotData]:
+        data = await self._load_all(self.CHAT_DATA)
+        return {int(key): value for key, value in data.items()}
+
+    async def get_bot_data(self) -> BotData:
+        data: BotData | None = await self._load(self.BOT_DATA, self._SINGLE_KEY)
+        return data or {}
+
+    async def get_callback_data(self) -> CDCData | None:
+        data: CDCData | None = await self._load(self.CALLBACK_DATA, self._SINGLE_KEY)
+        return data
+
+    async def get_conversations(self, name: str) -> ConversationDict:
+        data = await self._load_all(self._get_conversation_namespace(name))
+        return {tuple(json.loads(key)): value for key, value in data.items()}
+
+    async def update_conversation(
+        self, name: str, key: ConversationKey, new_state: object | None
+    ) -> None:
+        self._set(self._get_conversation_namespace(name), json.dumps(key), new_state)
+
+    async def update_user_data(self, user_id: int, data: BotData) -> None:
+        self._set(self.USER_DATA, str(user_id), data)
+
+    async def update_chat_data(self, chat_id: int, data: BotData) -> None:
+        self._set(self.CHAT_DATA, str(chat_id), data)
+
+    async def update_bot_data(self, data: BotData) -> None:
+        self._set(self.BOT_DATA, self._SINGLE_KEY, data)
+
+    async def update_callback_data(self, data: CDCData) -> None:
+        self._set(self.CALLBACK_DATA, self._SINGLE_KEY, data)
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        self._set(self.CHAT_DATA, str(chat_id), None)
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._set(self.USER_DATA, str(user_id), None)
+
+    async def refresh_user_data(self, user_id: int, user_data: BotData) -> None:
+        await self._refresh(self.USER_DATA, str(user_id), user_data)
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: BotData) -> None:
+        await self._refresh(self.CHAT_DATA, str(chat_id), chat_data)
+
+    async def refresh_bot_data(self, bot_data: BotData) -> None:
+        await self._refresh(self.BOT_DATA, self._SINGLE_KEY, bot_data)
+
+    async def flush(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._write_pending()
+
+    def _set(self, namespace: str, key: str, value: object | None) -> None:
+        # Conversation states are still handed over, as long as handlers are persistent
+        if not self.backend.is_durable:
+            return
+
+        # Pickle the value straight away, as the caller keeps on mutating it
+        self._pending[(namespace, key)] = None if value is None else pickle.dumps(value)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._schedule_flush(0)
+        else:
+            self._schedule_flush(self.flush_interval)
+
+    def _schedule_flush(self, delay: float) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            if delay > 0:
+                return
+            self._flush_task.cancel()
+        self._flush_task = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            await self._write_pending()
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to write persistence data, retrying later")
+            self._flush_task = None
+            self._schedule_flush(self.flush_interval)
+
+    async def _write_pending(self) -> None:
+        async with self._write_lock:
+            if not self._pending:
+                return
+
+            self._writing, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(self.backend.write_batch, self._writing)
+            except BaseException:
+                # Keep the entries that haven't been updated since, so they're retried
+                self._pending = self._writing | self._pending
+                raise
+            finally:
+                self._writing = {}
+
+    async def _refresh(self, namespace: str, key: str, data: BotData) -> None:
+        # Local changes that haven't been written yet are newer than the stored data
+        if not self.backend.is_shared or self._is_pending(namespace, key):
+            return
+
+        value = await asyncio.to_thread(self.backend.get, namespace, key)
+        if value is None or self._is_pending(namespace, key):
+            return
+
+        data.clear()
+        data.update(self._loads(value))
+
+    async def _load(self, namespace: str, key: str) -> Any:
+        # A pending value of None is a delete that hasn't been written yet
+        if self._is_pending(namespace, key):
+            value = self._get_pending(namespace, key)
+        else:
+            value = await asyncio.to_thread(self.backend.get, namespace, key)
+        if value is None:
+            return None
+        return self._loads(value)
+
+    async def _load_all(self, namespace: str) -> dict[str, Any]:
+        data = await asyncio.to_thread(self.backend.get_all, namespace)
+        for (pending_namespace, key), value in (self._writing | self._pending).items():
+            if pending_namespace != namespace:
+                continue
+            if value is None:
+                data.pop(key, None)
+            else:
+                data[key] = value
+
+        return {key: self._loads(value) for key, value in data.items()}
+
+    def _is_pending(self, namespace: str, key: str) -> bool:
+        return (namespace, key) in self._pending or (namespace, key) in self._writing
+
+    def _get_pending(self, namespace: str, key: str) -> bytes | None:
+        if (namespace, key) in self._pending:
+            return self._pending[(namespace, key)]
+        return self._writing.get((namespace, key))
+
+    @staticmethod
+    def _loads(value: bytes) -> Any:
+        # The data is only ever written by the bot itself
+        return pickle.loads(value)  # noqa: S301
+
+    @classmethod
+    def _get_conversation_namespace(cls, name: str) -> str:
+        return f"{cls._CONVERSATIONS}:{name}"
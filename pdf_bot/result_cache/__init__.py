@@ -0,0 +1,15 @@
+from .backends import (
+    AbstractResultCacheBackend,
+    MemoryResultCacheBackend,
+    SqliteResultCacheBackend,
+)
+from .models import CachedResult
+from .result_cache_service import ResultCacheService
+
+__all__ = [
+    "AbstractResultCacheBackend",
+    "CachedResult",
+    "MemoryResultCacheBackend",
+    "ResultCacheService",
+    "SqliteResultCacheBackend",
+]
@@ -0,0 +1,97 @@
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+
+from .models import CachedResult
+
+
+class AbstractResultCacheBackend(ABC):
+    # Whether the backend does blocking I/O, in which case it's used off the event loop
+    is_blocking = True
+
+    @abstractmethod
+    def get(self, key: str) -> CachedResult | None:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, result: CachedResult) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+
+class MemoryResultCacheBackend(AbstractResultCacheBackend):
+    is_blocking = False
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._results: OrderedDict[str, CachedResult] = OrderedDict()
+
+    def get(self, key: str) -> CachedResult | None:
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+        return result
+
+    def set(self, key: str, result: CachedResult) -> None:
+        self._results[key] = result
+        self._results.move_to_end(key)
+
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._results.pop(key, None)
+
+
+class SqliteResultCacheBackend(AbstractResultCacheBackend):
+    # Recency is tracked with a logical clock rather than timestamps, which can tie
+    # when entries are accessed within the same millisecond
+    _NEXT_ACCESS = "(SELECT COALESCE(MAX(accessed_at), 0) + 1 FROM results)"
+
+    def __init__(self, path: Path, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, file_id TEXT NOT NULL, is_photo INTEGER NOT NULL, "
+            "message TEXT, accessed_at INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)"
+        )
+
+    def get(self, key: str) -> CachedResult | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_id, is_photo, message FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                f"UPDATE results SET accessed_at = {self._NEXT_ACCESS} WHERE key = ?",  # noqa: S608
+                (key,),
+            )
+        return CachedResult(file_id=row[0], is_photo=bool(row[1]), message=row[2])
+
+    def set(self, key: str, result: CachedResult) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, {self._NEXT_ACCESS})",  # noqa: S608
+                (key, result.file_id, result.is_photo, result.message),
+            )
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed_at "
+                "LIMIT max(0, (SELECT COUNT(*) FROM results) - ?))",
+                (self.max_entries,),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
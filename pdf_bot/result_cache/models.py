@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    file_id: str
+    is_photo: bool = False
+    message: str | None = None
@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+import json
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from pdf_bot.analytics import TaskType
+from pdf_bot.settings import Settings
+
+from .backends import (
+    AbstractResultCacheBackend,
+    MemoryResultCacheBackend,
+    SqliteResultCacheBackend,
+)
+from .models import CachedResult
+
+T = TypeVar("T")
+
+
+class ResultCacheService:
+    """Cache of Telegram file IDs of results that have already been uploaded.
+
+    Results are keyed by the source file's `file_unique_id`, the task type and the task
+    parameters, so an identical request can be answered by re-sending the file ID
+    without processing or uploading the file again.
+    """
+
+    SQLITE_BACKEND = "sqlite"
+
+    def __init__(
+        self,
+        settings: Settings | dict[str, Any],
+        backend: AbstractResultCacheBackend | None = None,
+    ) -> None:
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
+        if backend is None:
+            if settings.result_cache_backend == self.SQLITE_BACKEND:
+                backend = SqliteResultCacheBackend(
+                    settings.result_cache_path, settings.result_cache_max_entries
+                )
+            else:
+                backend = MemoryResultCacheBackend(settings.result_cache_max_entries)
+        self.backend = backend
+
+    @staticmethod
+    def build_key(file_unique_id: str, task_type: TaskType, params: dict[str, Any]) -> str:
+        payload = json.dumps(
+            {"file": file_unique_id, "task": task_type.value, "params": params},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> CachedResult | None:
+        return await self._run(self.backend.get, key)
+
+    async def set(self, key: str, result: CachedResult) -> None:
+        await self._run(self.backend.set, key, result)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self.backend.delete, key)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.backend.is_blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -30,3 +31,97 @@ class Settings(BaseSettings):
     request_pool_timeout: int = 45
 
     telegram_max_retries: int = 2
+
+    analytics_batch_size: int = 100
+    analytics_flush_interval: float = 10
+    analytics_max_buffer_size: int = 10_000
+
+    executor_light_pool_size: int = 4
+    executor_heavy_pool_size: int = 2
+    executor_heavy_use_processes: bool = False
+    executor_ocr_pool_size: int = 1
+    executor_ocr_use_processes: bool = True
+    # Killable worker processes are reused for this many jobs and then replaced, so that
+    # they don't hold on to the memory of earlier jobs indefinitely
+    executor_killable_worker_max_jobs: int = 100
+
+    # Each OCR job OCRs its pages in parallel. Unless `ocr_jobs` is set, the processes
+    # allowed on this node, which default to its number of CPUs, are split evenly between
+    # the `executor_ocr_pool_size` jobs that can run at once
+    ocr_jobs: int | None = None
+    ocr_max_processes: int | None = None
+    ocr_optimize: Literal[0, 1, 2, 3] = 1
+    # How pages that already have text are handled, which is an error by default
+    ocr_mode: Literal["default", "skip_text", "redo_ocr"] = "default"
+    # Page images larger than this many pixels on either side are downsampled before
+    # they are OCRed, which speeds up large scans at the cost of accuracy
+    ocr_downsample_above: int | None = None
+
+    # Jobs beyond the limits wait in a queue, and the lane limits keep quick jobs from
+    # waiting behind long running ones
+    job_max_concurrency: int = 10
+    job_light_max_concurrency: int = 8
+    job_heavy_max_concurrency: int = 4
+    job_max_jobs_per_user: int = 2
+
+    # Time budgets in seconds, with overrides keyed by task type, e.g. ocr_pdf
+    task_timeout: float = 300
+    task_timeouts: dict[str, float] = Field(default_factory=lambda: {"ocr_pdf": 900})
+
+    cli_timeout: float = 300
+    cli_max_concurrency: int = 2
+    cli_output_limit: int = 64 * 1024
+
+    language_cache_max_size: int = 100_000
+    language_cache_ttl: float = 24 * 60 * 60
+    language_cache_negative_ttl: float = 10 * 60
+
+    google_fonts_cache_dir: Path | None = None
+    google_fonts_catalog_ttl: float = 24 * 60 * 60
+
+    download_cache_dir: Path | None = None
+    download_cache_max_size: int = 1024**3
+
+    result_cache_backend: Literal["memory", "sqlite"] = "memory"
+    result_cache_max_entries: int = 10_000
+    result_cache_path: Path = Path("result_cache.sqlite3")
+
+    # Engine used for page level operations, where pikepdf is opt in. Overrides are keyed
+    # by operation name, which is one of add_watermark, decrypt, encrypt, merge, rotate,
+    # scale and split
+    pdf_engine: Literal["pypdf", "pikepdf"] = "pypdf"
+    pdf_engine_overrides: dict[str, Literal["pypdf", "pikepdf"]] = Field(default_factory=dict)
+
+    # Compression strategies that are still running after this many seconds are cancelled,
+    # and the smallest output of the ones that have finished is kept
+    compress_timeout: float = 120
+    # Images larger than this many bytes are recompressed even if their resolution is
+    # below the target resolution of the compression level
+    compress_image_max_size: int = 512 * 1024
+
+    # Text is extracted in chunks of pages, with pdftotext or pdfminer if it fails, and the
+    # chunks are written to the output in order as they finish
+    text_pages_per_chunk: int = 20
+
+    # Uploaded PDF files are probed in the background for what they contain, so that
+    # tasks that can't apply are hidden from later task lists. Probes are cached by
+    # `file_unique_id`, and are abandoned if they take longer than the timeout
+    pdf_probe_timeout: float = 10
+    # Only this many pages are scanned for text, so that huge files don't tie up a worker
+    pdf_probe_max_text_pages: int = 50
+    pdf_probe_cache_max_size: int = 10_000
+
+    # Ghostscript converts the colours within the PDF and keeps text and vector graphics.
+    # Pages are only rendered into grayscale images with the rasterize engine, or as a
+    # fallback when Ghostscript fails
+    grayscale_engine: Literal["ghostscript", "rasterize"] = "ghostscript"
+
+    # The memory backend stores nothing, as the data is lost on restart anyway. The path is
+    # a directory for the file backend. Conversation states and callback data are only
+    # loaded on startup, so replicas sharing a backend must each serve their own set of
+    # users
+    persistence_backend: Literal["memory", "file", "sqlite"] = "memory"
+    persistence_path: Path = Path("persistence.sqlite3")
+    persistence_update_interval: float = 1
+    persistence_flush_interval: float = 0.5
+    persistence_max_batch_size: int = 500
@@ -4,6 +4,10 @@ from telegram.ext import BaseHandler
 
 
 class AbstractTelegramHandler(ABC):
+    # Handler group, where lower groups are processed first and an update can be handled
+    # by one handler in each group
+    GROUP = 0
+
     @property
     @abstractmethod
     def handlers(self) -> list[BaseHandler]:
@@ -1,9 +1,14 @@
-from collections.abc import AsyncGenerator, Coroutine
-from contextlib import asynccontextmanager, suppress
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Callable, Coroutine
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from functools import partial
 from gettext import gettext as _
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from typing import Any, cast
 
+from loguru import logger
 from pydantic import BaseModel
 from telegram import (
     Bot,
@@ -18,13 +23,16 @@ from telegram import (
     Update,
 )
 from telegram.constants import ChatAction, FileSizeLimit, MessageLimit, ParseMode
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes, ConversationHandler
 
 from pdf_bot.analytics import AnalyticsService, EventAction, TaskType
 from pdf_bot.consts import BACK, CANCEL, CHANNEL_NAME, FILE_DATA, MESSAGE_DATA
-from pdf_bot.io import IOService
+from pdf_bot.download_cache import DownloadCacheService
+from pdf_bot.io import FileSplitError, split_dir, split_pdf, split_zip
 from pdf_bot.language import LanguageService
 from pdf_bot.models import BackData, FileData, MessageData, SupportData
+from pdf_bot.result_cache import CachedResult, ResultCacheService
 
 from .exceptions import (
     TelegramFileMimeTypeError,
@@ -44,21 +52,30 @@ class _ReplyData(BaseModel):
 class TelegramService:
     IMAGE_MIME_TYPE_PREFIX = "image"
     PDF_MIME_TYPE_SUFFIX = "pdf"
+    PDF_SUFFIX = ".pdf"
     PNG_SUFFIX = ".png"
+    ZIP_SUFFIX = ".zip"
+    DOWNLOAD_CONCURRENCY = 4
+    UPLOAD_CONCURRENCY = 3
     BACK = _("Back")
     MESSAGE_TRUNCATED = "\n..."
 
+    _MAX_FILE_UNIQUE_IDS = 10_000
+
     def __init__(
         self,
-        io_service: IOService,
         language_service: LanguageService,
         analytics_service: AnalyticsService,
+        download_cache_service: DownloadCacheService,
+        result_cache_service: ResultCacheService,
         bot: Bot,
     ) -> None:
-        self.io_service = io_service
         self.language_service = language_service
         self.analytics_service = analytics_service
+        self.download_cache_service = download_cache_service
+        self.result_cache_service = result_cache_service
         self.bot = bot
+        self._file_unique_ids: OrderedDict[str, str] = OrderedDict()
 
     @staticmethod
     def check_file_size(file: Document | PhotoSize) -> None:
@@ -76,13 +93,7 @@ class TelegramService:
     @staticmethod
     def check_file_upload_size(path: Path) -> None:
         if path.stat().st_size > FileSizeLimit.FILESIZE_UPLOAD:
-            raise TelegramFileTooLargeError(
-                _(
-                    "The file is too large for me to send to you\n\n"
-                    "Note that this limit is enforced by Telegram and there's "
-                    "nothing I can do unless Telegram changes it"
-                )
-            )
+            raise TelegramService._get_upload_too_large_error()
 
     @staticmethod
     def get_user_data(context: ContextTypes.DEFAULT_TYPE, key: str) -> Any:
@@ -175,19 +186,44 @@ class TelegramService:
 
     @asynccontextmanager
     async def download_pdf_file(self, file_id: str) -> AsyncGenerator[Path, None]:
-        with self.io_service.create_temp_pdf_file() as path:
-            file = await self.bot.get_file(file_id)
-            await file.download_to_drive(custom_path=path)
+        async with self._download_file(file_id, self.PDF_SUFFIX) as path:
             yield path
 
     @asynccontextmanager
     async def download_files(self, file_ids: list[str]) -> AsyncGenerator[list[Path], None]:
-        with self.io_service.create_temp_files(len(file_ids)) as out_paths:
-            for i, file_id in enumerate(file_ids):
-                file = await self.bot.get_file(file_id)
-                await file.download_to_drive(custom_path=out_paths[i])
+        """Download the files concurrently and yield their paths in the same order.
+
+        If any of the downloads fails, the remaining ones are cancelled and the error is
+        raised once all of them have stopped.
+        """
+        semaphore = asyncio.Semaphore(self.DOWNLOAD_CONCURRENCY)
+
+        async with AsyncExitStack() as stack:
+
+            async def download(file_id: str) -> Path:
+                async with semaphore:
+                    return await stack.enter_async_context(self._download_file(file_id))
+
+            tasks = [asyncio.create_task(download(x)) for x in file_ids]
+            try:
+                out_paths = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
             yield out_paths
 
+    async def get_file_unique_id(self, file_id: str) -> str:
+        file_unique_id = self._file_unique_ids.get(file_id)
+        if file_unique_id is not None:
+            return file_unique_id
+
+        file = await self.bot.get_file(file_id)
+        self._remember_file_unique_id(file_id, file.file_unique_id)
+        return file.file_unique_id
+
     async def cancel_conversation(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         _ = self.language_service.set_app_language(update, context)
         query: CallbackQuery | None = update.callback_query
@@ -252,35 +288,76 @@ class TelegramService:
         context: ContextTypes.DEFAULT_TYPE,
         file_path: Path,
         task: TaskType,
-    ) -> None:
+    ) -> Message | None:
+        """Send the result file, or ZIP archives of it if it is a directory.
+
+        Results that are too large to be uploaded are split into multiple files: PDF files
+        by page ranges, and directories and ZIP archives into volumes.
+
+        Returns:
+            Message | None: the sent message, or None if the result was split into
+                multiple files or is too large to be sent
+        """
         _ = self.language_service.set_app_language(update, context)
         chat_id = self._get_chat_id(update)
 
         try:
-            self.check_file_upload_size(file_path)
+            async with self._get_upload_paths(file_path) as upload_paths:
+                messages = await self._send_result_files(update, context, upload_paths)
         except TelegramFileTooLargeError as e:
             await self.bot.send_message(chat_id, _(str(e)))
-            return
+            return None
 
-        reply_markup = self.get_support_markup(update, context)
-        if file_path.suffix == self.PNG_SUFFIX:
-            await self.bot.send_chat_action(chat_id, ChatAction.UPLOAD_PHOTO)
-            await self.bot.send_photo(
-                chat_id,
-                file_path,
-                caption=_("Here is your result file"),
-                reply_markup=reply_markup,
-            )
-        else:
-            await self.bot.send_chat_action(chat_id, ChatAction.UPLOAD_DOCUMENT)
-            await self.bot.send_document(
-                chat_id,
-                file_path,
-                caption=_("Here is your result file"),
-                reply_markup=reply_markup,
-            )
+        self.analytics_service.send_event(update, context, task, EventAction.complete)
+
+        if len(messages) == 1:
+            return messages[0]
+        return None
+
+    async def send_cached_result(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        result_key: str,
+        task: TaskType,
+    ) -> bool:
+        """Send the cached result for the key, if there is one.
+
+        Returns:
+            bool: whether the cached result was sent
+        """
+        result = await self.result_cache_service.get(result_key)
+        if result is None:
+            return False
+
+        # The message is sent before the file, as it is when the result isn't cached. It's
+        # sent again if the file ID turns out to be invalid, which should be rare.
+        if result.message is not None:
+            await self.send_message(update, context, result.message)
+
+        try:
+            await self._send_result_file(update, context, result.file_id, result.is_photo)
+        except BadRequest:
+            # The file ID is no longer valid, so drop it and let the caller process the
+            # file again
+            logger.exception("Failed to send cached result")
+            await self.result_cache_service.delete(result_key)
+            return False
 
         self.analytics_service.send_event(update, context, task, EventAction.complete)
+        return True
+
+    async def cache_result(
+        self, result_key: str, message: Message, text: str | None = None
+    ) -> None:
+        if message.photo:
+            result = CachedResult(message.photo[-1].file_id, is_photo=True, message=text)
+        elif message.document is not None:
+            result = CachedResult(message.document.file_id, message=text)
+        else:
+            return
+
+        await self.result_cache_service.set(result_key, result)
 
     async def send_file_names(
         self, chat_id: int, text: str, file_data_list: list[FileData]
@@ -307,6 +384,131 @@ class TelegramService:
         chat_id = self._get_chat_id(update)
         await self.bot.send_message(chat_id, _(text))
 
+    @asynccontextmanager
+    async def _get_upload_paths(self, path: Path) -> AsyncGenerator[list[Path], None]:
+        is_dir = path.is_dir()
+        if not is_dir and path.stat().st_size <= FileSizeLimit.FILESIZE_UPLOAD:
+            yield [path]
+            return
+
+        split_file: Callable[[Path, Path, int], list[Path]]
+        if is_dir:
+            split_file = split_dir
+        elif path.suffix == self.PDF_SUFFIX:
+            split_file = split_pdf
+        elif path.suffix == self.ZIP_SUFFIX:
+            split_file = split_zip
+        else:
+            raise self._get_upload_too_large_error()
+
+        with TemporaryDirectory(prefix="upload_") as dir_name:
+            try:
+                paths = await asyncio.to_thread(
+                    split_file, path, Path(dir_name), FileSizeLimit.FILESIZE_UPLOAD
+                )
+            except FileSplitError as e:
+                raise self._get_upload_too_large_error() from e
+            yield paths
+
+    async def _send_result_files(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE, paths: list[Path]
+    ) -> list[Message]:
+        if len(paths) == 1:
+            message = await self._send_result_file(
+                update, context, paths[0], paths[0].suffix == self.PNG_SUFFIX
+            )
+            return [message]
+
+        _ = self.language_service.set_app_language(update, context)
+        semaphore = asyncio.Semaphore(self.UPLOAD_CONCURRENCY)
+
+        async def send_part(part: int, path: Path) -> Message:
+            caption = _("Here is part {part} of {num_parts} of your result file").format(
+                part=part, num_parts=len(paths)
+            )
+            async with semaphore:
+                return await self._send_result_file(
+                    update, context, path, is_photo=False, caption=caption
+                )
+
+        return await asyncio.gather(*[send_part(i, x) for i, x in enumerate(paths, start=1)])
+
+    @staticmethod
+    def _get_upload_too_large_error() -> TelegramFileTooLargeError:
+        return TelegramFileTooLargeError(
+            _(
+                "The file is too large for me to send to you\n\n"
+                "Note that this limit is enforced by Telegram and there's "
+                "nothing I can do unless Telegram changes it"
+            )
+        )
+
+    async def _send_result_file(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        file: Path | str,
+        is_photo: bool,
+        caption: str | None = None,
+    ) -> Message:
+        _ = self.language_service.set_app_language(update, context)
+        chat_id = self._get_chat_id(update)
+        reply_markup = self.get_support_markup(update, context)
+
+        if caption is None:
+            caption = _("Here is your result file")
+
+        if is_photo:
+            await self.bot.send_chat_action(chat_id, ChatAction.UPLOAD_PHOTO)
+            return await self.bot.send_photo(
+                chat_id,
+                file,
+                caption=caption,
+                reply_markup=reply_markup,
+            )
+
+        await self.bot.send_chat_action(chat_id, ChatAction.UPLOAD_DOCUMENT)
+        return await self.bot.send_document(
+            chat_id,
+            file,
+            caption=caption,
+            reply_markup=reply_markup,
+        )
+
+    def _remember_file_unique_id(self, file_id: str, file_unique_id: str) -> None:
+        self._file_unique_ids[file_id] = file_unique_id
+        self._file_unique_ids.move_to_end(file_id)
+
+        if len(self._file_unique_ids) > self._MAX_FILE_UNIQUE_IDS:
+            self._file_unique_ids.popitem(last=False)
+
+    @asynccontextmanager
+    async def _download_file(self, file_id: str, suffix: str = "") -> AsyncGenerator[Path, None]:
+        """Download the file through the shared download cache.
+
+        The returned path is shared with other callers and must not be modified.
+        """
+        download: Callable[[Path], Coroutine[Any, Any, Any]]
+        file_unique_id = self._file_unique_ids.get(file_id)
+
+        if file_unique_id is None:
+            file = await self.bot.get_file(file_id)
+            self._remember_file_unique_id(file_id, file.file_unique_id)
+            file_unique_id = file.file_unique_id
+            download = file.download_to_drive
+        else:
+            # The file is only fetched from Telegram if it isn't cached
+            download = partial(self._download_to_drive, file_id)
+
+        async with self.download_cache_service.get_or_download(
+            file_unique_id, download, suffix
+        ) as path:
+            yield path
+
+    async def _download_to_drive(self, file_id: str, path: Path) -> None:
+        file = await self.bot.get_file(file_id)
+        await file.download_to_drive(path)
+
     @staticmethod
     def _get_chat_id(update: Update) -> int:
         query = update.callback_query
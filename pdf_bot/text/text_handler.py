@@ -31,5 +31,7 @@ class TextHandler(AbstractTelegramHandler):
                     CommandHandler("cancel", self.telegram_service.cancel_conversation),
                 ],
                 allow_reentry=True,
+                name="text",
+                persistent=True,
             )
         ]
@@ -1,26 +1,162 @@
-from requests import Session
+import asyncio
+import hashlib
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+from loguru import logger
+from requests import RequestException, Session
 
 from pdf_bot.pdf import FontData
+from pdf_bot.settings import Settings
 
 
 class TextRepository:
-    def __init__(self, api_client: Session, google_fonts_token: str) -> None:
+    """Look up Google Fonts by family name.
+
+    The fonts catalog is fetched once, indexed by the lowercase family name and saved to
+    disk, so that cold starts don't need the API. Once it's older than
+    `google_fonts_catalog_ttl`, lookups are still served from it while it's refreshed in
+    the background. Font files are downloaded once and returned as local file URLs.
+    """
+
+    _CATALOG_FILE = "catalog.json"
+    _FONTS_DIR = "fonts"
+    _DEFAULT_FONT_SUFFIX = ".ttf"
+    _RETRY_INTERVAL = 60
+    _TIMEOUT = 30
+
+    def __init__(self, api_client: Session, settings: Settings | dict[str, Any]) -> None:
         self.api_client = api_client
-        self.google_fonts_token = google_fonts_token
 
-    def get_font(self, font: str) -> FontData | None:
-        font_data: FontData | None = None
-        font = font.lower()
+        # There's a bug where configurations are passed as a dict, so we attempt to pass
+        # it here. See https://github.com/ets-labs/python-dependency-injector/issues/593
+        if isinstance(settings, dict):
+            settings = Settings(**settings)
+
+        self.google_fonts_token = settings.google_fonts_token
+        self.catalog_ttl = settings.google_fonts_catalog_ttl
+        self._cache_dir = settings.google_fonts_cache_dir
+
+        self._catalog: dict[str, FontData] | None = None
+        self._refresh_at = 0.0
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    async def get_font(self, font: str) -> FontData | None:
+        catalog = await self._get_catalog()
+        font_data = catalog.get(font.lower())
+        if font_data is None:
+            return None
+
+        font_url = await self._get_font_file_url(font_data.font_url)
+        return FontData(font_data.font_family, font_url)
+
+    async def _get_catalog(self) -> dict[str, FontData]:
+        if self._catalog is None:
+            # Nothing to serve yet, so wait for the catalog to be loaded
+            await self._start_refresh()
+        if self._catalog is not None and time.time() >= self._refresh_at:
+            self._start_refresh()
+
+        return self._catalog or {}
+
+    def _start_refresh(self) -> asyncio.Task[None]:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_catalog())
+        return self._refresh_task
+
+    async def _refresh_catalog(self) -> None:
+        if self._catalog is None:
+            catalog, fetched_at = await asyncio.to_thread(self._load_catalog)
+            if catalog is not None:
+                self._catalog = catalog
+                self._refresh_at = fetched_at + self.catalog_ttl
+                return
 
+        try:
+            catalog = await asyncio.to_thread(self._fetch_catalog)
+        except (RequestException, KeyError, ValueError):
+            if self._catalog is None:
+                raise
+
+            logger.exception("Failed to refresh the Google Fonts catalog")
+            self._refresh_at = time.time() + self._RETRY_INTERVAL
+            return
+
+        self._catalog = catalog
+        self._refresh_at = time.time() + self.catalog_ttl
+
+    def _fetch_catalog(self) -> dict[str, FontData]:
         r = self.api_client.get(
             "https://www.googleapis.com/webfonts/v1/webfonts",
             params={"key": self.google_fonts_token},
+            timeout=self._TIMEOUT,
         )
+        r.raise_for_status()
 
+        catalog: dict[str, FontData] = {}
         for item in r.json()["items"]:
-            if item["family"].lower() == font:
-                if "regular" in item["files"]:
-                    font_data = FontData(item["family"], item["files"]["regular"])
-                break
+            if "regular" in item["files"]:
+                catalog[item["family"].lower()] = FontData(item["family"], item["files"]["regular"])
+
+        self._save_catalog(catalog)
+        return catalog
+
+    def _load_catalog(self) -> tuple[dict[str, FontData] | None, float]:
+        path = self._get_cache_dir() / self._CATALOG_FILE
+        try:
+            data = json.loads(path.read_text())
+            catalog = {key: FontData(family, url) for key, (family, url) in data["fonts"].items()}
+            fetched_at = float(data["fetched_at"])
+        except FileNotFoundError:
+            return None, 0
+        except (OSError, KeyError, TypeError, ValueError):
+            logger.exception("Failed to load the Google Fonts catalog from {path}", path=path)
+            return None, 0
+
+        return catalog, fetched_at
+
+    def _save_catalog(self, catalog: dict[str, FontData]) -> None:
+        data = {
+            "fetched_at": time.time(),
+            "fonts": {key: [x.font_family, x.font_url] for key, x in catalog.items()},
+        }
+        self._write_file(self._get_cache_dir() / self._CATALOG_FILE, json.dumps(data).encode())
+
+    async def _get_font_file_url(self, font_url: str) -> str:
+        suffix = Path(urlparse(font_url).path).suffix or self._DEFAULT_FONT_SUFFIX
+        name = hashlib.sha256(font_url.encode()).hexdigest()
+        path = self._get_cache_dir() / self._FONTS_DIR / f"{name}{suffix}"
+
+        if not path.exists():
+            try:
+                await asyncio.to_thread(self._download_font_file, font_url, path)
+            except (RequestException, OSError):
+                # Let the renderer try to fetch the font itself
+                logger.exception("Failed to download font file {url}", url=font_url)
+                return font_url
+
+        return path.as_uri()
+
+    def _download_font_file(self, font_url: str, path: Path) -> None:
+        r = self.api_client.get(font_url, timeout=self._TIMEOUT)
+        r.raise_for_status()
+        self._write_file(path, r.content)
+
+    def _get_cache_dir(self) -> Path:
+        if self._cache_dir is None:
+            self._cache_dir = Path(tempfile.mkdtemp(prefix="google_fonts_"))
+        return self._cache_dir
 
-        return font_data
+    @staticmethod
+    def _write_file(path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = path.with_name(f"{path.name}.part")
+        try:
+            partial_path.write_bytes(content)
+            partial_path.replace(path)
+        finally:
+            partial_path.unlink(missing_ok=True)
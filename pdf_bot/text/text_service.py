@@ -83,7 +83,7 @@ class TextService:
         if msg_text == _(self.SKIP):
             return await self._text_to_pdf(update, context)
 
-        font_data = self.text_repository.get_font(msg_text)
+        font_data = await self.text_repository.get_font(msg_text)
         if font_data is not None:
             return await self._text_to_pdf(update, context, font_data)
 
@@ -42,5 +42,7 @@ class WatermarkHandler(AbstractTelegramHandler):
                     MessageHandler(TEXT_FILTER, self.watermark_service.check_text),
                 ],
                 allow_reentry=True,
+                name="watermark",
+                persistent=True,
             )
         ]
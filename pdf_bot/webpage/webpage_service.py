@@ -1,5 +1,6 @@
 import hashlib
 from contextlib import suppress
+from pathlib import Path
 from typing import cast
 from urllib.parse import urlparse
 
@@ -10,7 +11,9 @@ from weasyprint.css.utils import InvalidValues
 from weasyprint.urls import URLFetchingError
 
 from pdf_bot.analytics import TaskType
+from pdf_bot.executor import ExecutorService, WorkerPool
 from pdf_bot.io import IOService
+from pdf_bot.job_scheduler import JobScheduler, JobTimeoutError
 from pdf_bot.language import LanguageService
 from pdf_bot.telegram_internal import (
     TelegramGetUserDataError,
@@ -25,10 +28,14 @@ class WebpageService:
         io_service: IOService,
         language_service: LanguageService,
         telegram_service: TelegramService,
+        executor_service: ExecutorService,
+        job_scheduler: JobScheduler,
     ) -> None:
         self.io_service = io_service
         self.language_service = language_service
         self.telegram_service = telegram_service
+        self.executor_service = executor_service
+        self.job_scheduler = job_scheduler
 
     async def url_to_pdf(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         _ = self.language_service.set_app_language(update, context)
@@ -64,12 +71,18 @@ class WebpageService:
 
         with self.io_service.create_temp_pdf_file(o.hostname) as out_path:
             try:
-                HTML(url=url).write_pdf(out_path)
+                # Rendering a webpage can hang, so run it in a process that can be killed
+                async with self.job_scheduler.time_budget(TaskType.url_to_pdf):
+                    await self.executor_service.run_killable(
+                        WorkerPool.heavy, _write_url_pdf, url, out_path
+                    )
                 await self.telegram_service.send_file(
                     update, context, out_path, TaskType.url_to_pdf
                 )
             except URLFetchingError:
                 err_text = _("Unable to reach your webpage")
+            except JobTimeoutError as e:
+                err_text = _(str(e))
             except (
                 AssertionError,
                 AttributeError,
@@ -86,3 +99,7 @@ class WebpageService:
         if err_text is not None:
             msg = cast(Message, update.effective_message)
             await msg.reply_text(err_text)
+
+
+def _write_url_pdf(url: str, out_path: Path) -> None:
+    HTML(url=url).write_pdf(out_path)
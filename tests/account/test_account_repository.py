@@ -1,9 +1,12 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import MagicMock
 
-from google.cloud.datastore import Client, Entity, Key
+import pytest
+from google.cloud.datastore import Client, Entity
 
 from pdf_bot.account import AccountRepository
-from pdf_bot.consts import LANGUAGE
+from pdf_bot.consts import LANGUAGE, USER
+from pdf_bot.datastore import MemoryDatastoreClient
 
 
 class TestAccountRepository:
@@ -16,6 +19,9 @@ class TestAccountRepository:
         self.datastore_client = MagicMock(spec=Client)
         self.sut = AccountRepository(self.datastore_client)
 
+        self.memory_client = MemoryDatastoreClient()
+        self.memory_sut = AccountRepository(self.memory_client)
+
     def test_get_user(self) -> None:
         self.datastore_client.get.return_value = self.user_entity
         actual = self.sut.get_user(self.USER_ID)
@@ -26,33 +32,47 @@ class TestAccountRepository:
         actual = self.sut.get_user(self.USER_ID)
         assert actual is None
 
-    def test_upsert_user(self) -> None:
-        user_dict: dict = {}
-        self.user_entity.__contains__.side_effect = user_dict.__contains__
-        self.datastore_client.get.return_value = self.user_entity
+    @pytest.mark.asyncio
+    async def test_upsert_user(self) -> None:
+        key = self.memory_client.key(USER, self.USER_ID)
+        self.memory_client.put(Entity(key))
 
-        self.sut.upsert_user(self.USER_ID, self.LANGUAGE_CODE)
+        actual = await self.memory_sut.upsert_user(self.USER_ID, self.LANGUAGE_CODE)
 
-        self.user_entity.__setitem__.assert_called_once_with(LANGUAGE, self.LANGUAGE_CODE)
-        self.datastore_client.put.assert_called_with(self.user_entity)
+        assert actual is True
+        assert self.memory_client.entities[key][LANGUAGE] == self.LANGUAGE_CODE
 
-    def test_upsert_user_language_exists(self) -> None:
-        user_dict: dict = {LANGUAGE: self.LANGUAGE_CODE}
-        self.user_entity.__contains__.side_effect = user_dict.__contains__
-        self.datastore_client.get.return_value = self.user_entity
+    @pytest.mark.asyncio
+    async def test_upsert_user_language_exists(self) -> None:
+        await self.memory_sut.upsert_user(self.USER_ID, self.LANGUAGE_CODE)
+        num_writes = self.memory_client.num_writes
 
-        self.sut.upsert_user(self.USER_ID, self.LANGUAGE_CODE)
+        actual = await self.memory_sut.upsert_user(self.USER_ID, "other_lang_code")
 
-        self.user_entity.__setitem__.assert_not_called()
-        self.datastore_client.put.assert_called_with(self.user_entity)
+        # Existing users are only read
+        assert actual is False
+        assert self.memory_client.num_writes == num_writes
+        assert self._get_language() == self.LANGUAGE_CODE
 
-    def test_upsert_user_new_user(self) -> None:
-        key = MagicMock(spec=Key)
-        self.datastore_client.key.return_value = key
-        self.datastore_client.get.return_value = None
+    @pytest.mark.asyncio
+    async def test_upsert_user_new_user(self) -> None:
+        actual = await self.memory_sut.upsert_user(self.USER_ID, self.LANGUAGE_CODE)
+
+        assert actual is True
+        assert self._get_language() == self.LANGUAGE_CODE
+        assert self.memory_client.num_writes == 1
+
+    @pytest.mark.asyncio
+    async def test_upsert_user_concurrent(self) -> None:
+        await asyncio.gather(
+            *[self.memory_sut.upsert_user(self.USER_ID, self.LANGUAGE_CODE) for _ in range(5)]
+        )
 
-        with patch("pdf_bot.account.account_repository.Entity") as entity_cls:
-            self.sut.upsert_user(self.USER_ID, self.LANGUAGE_CODE)
+        assert self._get_language() == self.LANGUAGE_CODE
+        assert self.memory_client.num_writes == 1
 
-            entity_cls.assert_called_once_with(key)
-            self.datastore_client.put.assert_called_once()
+    def _get_language(self) -> str:
+        lang: str = self.memory_client.entities[self.memory_client.key(USER, self.USER_ID)][
+            LANGUAGE
+        ]
+        return lang
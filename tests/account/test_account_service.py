@@ -1,6 +1,8 @@
 from unittest.mock import MagicMock
 
+import pytest
 from telegram import User
+from telegram.ext import CallbackContext
 
 from pdf_bot.account import AccountRepository, AccountService
 from tests.language import LanguageServiceTestMixin
@@ -13,31 +15,49 @@ class TestAccountService(LanguageServiceTestMixin):
     def setup_method(self) -> None:
         self.user = MagicMock(spec=User)
         self.user.id = self.USER_ID
+        self.context = MagicMock(spec=CallbackContext)
 
         self.account_repository = MagicMock(spec=AccountRepository)
+        self.account_repository.upsert_user.return_value = True
         self.language_service = self.mock_language_service()
         self.language_service.get_language_code_from_short_code.return_value = self.LANGUAGE_CODE
 
         self.service = AccountService(self.account_repository, self.language_service)
 
-    def test_create_user(self) -> None:
+    @pytest.mark.asyncio
+    async def test_create_user(self) -> None:
         self.user.language_code = None
-        self.service.create_user(self.user)
+        await self.service.create_user(self.user, self.context)
         self.account_repository.upsert_user.assert_called_with(self.USER_ID, self.LANGUAGE_CODE)
 
-    def test_create_user_with_language_code(self) -> None:
+    @pytest.mark.asyncio
+    async def test_create_user_with_language_code(self) -> None:
         user_code = "user_code"
         self.user.language_code = user_code
         self.language_service.get_language_code_from_short_code.return_value = user_code
 
-        self.service.create_user(self.user)
+        await self.service.create_user(self.user, self.context)
 
         self.account_repository.upsert_user.assert_called_with(self.USER_ID, user_code)
+        self.language_service.set_new_user_language.assert_called_once_with(
+            self.USER_ID, self.context, user_code
+        )
 
-    def test_create_user_with_invalid_language_code(self) -> None:
+    @pytest.mark.asyncio
+    async def test_create_user_existing_user(self) -> None:
+        self.user.language_code = "user_code"
+        self.account_repository.upsert_user.return_value = False
+
+        await self.service.create_user(self.user, self.context)
+
+        # The language that the user has set is kept
+        self.language_service.set_new_user_language.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_user_with_invalid_language_code(self) -> None:
         self.user.language_code = "clearly_invalid"
         self.language_service.get_language_code_from_short_code.return_value = None
 
-        self.service.create_user(self.user)
+        await self.service.create_user(self.user, self.context)
 
         self.account_repository.upsert_user.assert_called_with(self.USER_ID, self.LANGUAGE_CODE)
@@ -1,9 +1,13 @@
+import asyncio
+from typing import Any
 from unittest.mock import MagicMock, patch
 from uuid import UUID
 
+import pytest
 from requests import HTTPError
 
 from pdf_bot.analytics import AnalyticsRepository, AnalyticsService, EventAction, TaskType
+from pdf_bot.settings import Settings
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramTestMixin
 
@@ -12,6 +16,8 @@ class TestAnalyticsService(LanguageServiceTestMixin, TelegramTestMixin):
     TASK_TYPE = TaskType.beautify_image
     EVENT_ACTION = EventAction.complete
     LANGUAGE = "language"
+    BATCH_SIZE = 3
+    MAX_BUFFER_SIZE = 5
 
     def setup_method(self) -> None:
         super().setup_method()
@@ -19,24 +25,98 @@ class TestAnalyticsService(LanguageServiceTestMixin, TelegramTestMixin):
         self.language_service = self.mock_language_service()
         self.language_service.get_user_language.return_value = self.LANGUAGE
 
+        self.settings = Settings(
+            analytics_batch_size=self.BATCH_SIZE,
+            analytics_flush_interval=60,
+            analytics_max_buffer_size=self.MAX_BUFFER_SIZE,
+        )
         self.sut = AnalyticsService(
             self.analytics_repository,
             self.language_service,
+            self.settings,
         )
 
-    def test_send_event(self) -> None:
-        self._test_and_assert_send_event()
+    @pytest.mark.asyncio
+    async def test_send_event(self) -> None:
+        self._send_event()
+
+        # Nothing is sent on the caller's path
+        self.analytics_repository.send_event.assert_not_called()
+        self.language_service.get_user_language.assert_called_once_with(
+            self.telegram_update, self.telegram_context
+        )
+
+        await self.sut.shutdown()
+        self.analytics_repository.send_event.assert_called_once_with(self._get_payload(1))
+
+    @pytest.mark.asyncio
+    async def test_send_event_batched_per_client(self) -> None:
+        with patch.object(AnalyticsService, "_MAX_EVENTS_PER_REQUEST", 2):
+            for _ in range(self.BATCH_SIZE):
+                self._send_event()
+            await self._wait_for_calls(2)
+
+        assert self.analytics_repository.send_event.call_args_list == [
+            ((self._get_payload(2),),),
+            ((self._get_payload(1),),),
+        ]
+        await self.sut.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_send_event_flush_interval(self) -> None:
+        self.sut.flush_interval = 0
+
+        self._send_event()
+        await self._wait_for_calls(1)
+
+        self.analytics_repository.send_event.assert_called_once_with(self._get_payload(1))
+        await self.sut.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_send_event_buffer_full(self) -> None:
+        self.sut.batch_size = self.MAX_BUFFER_SIZE * 2
+        num_events = self.MAX_BUFFER_SIZE + 2
+
+        with patch("pdf_bot.analytics.analytics_service.logger") as logger:
+            for _ in range(num_events):
+                self._send_event()
+            await self.sut.shutdown()
+            logger.warning.assert_called_once()
+
+        assert self.sut.num_dropped_events == 2
+        assert self.language_service.get_user_language.call_count == self.MAX_BUFFER_SIZE
 
-    def test_send_event_error(self) -> None:
+    @pytest.mark.asyncio
+    async def test_send_event_error(self) -> None:
         self.analytics_repository.send_event.side_effect = HTTPError(
             request=MagicMock(), response=MagicMock()
         )
 
         with patch("pdf_bot.analytics.analytics_service.logger") as logger:
-            self._test_and_assert_send_event()
+            self._send_event()
+            await self.sut.shutdown()
             logger.exception.assert_called_once()
 
-    def _test_and_assert_send_event(self) -> None:
+    @pytest.mark.asyncio
+    async def test_shutdown_stops_buffering(self) -> None:
+        await self.sut.shutdown()
+
+        self._send_event()
+        await self.sut.flush()
+
+        self.analytics_repository.send_event.assert_called_once()
+
+    def test_send_event_without_event_loop(self) -> None:
+        self._send_event()
+        self.analytics_repository.send_event.assert_not_called()
+
+    def test_init_with_dict(self) -> None:
+        sut = AnalyticsService(
+            self.analytics_repository, self.language_service, self.settings.model_dump()
+        )
+        assert sut.batch_size == self.BATCH_SIZE
+
+    def _send_event(self) -> None:
         self.sut.send_event(
             self.telegram_update,
             self.telegram_context,
@@ -44,11 +124,8 @@ class TestAnalyticsService(LanguageServiceTestMixin, TelegramTestMixin):
             self.EVENT_ACTION,
         )
 
-        self.language_service.get_user_language.assert_called_once_with(
-            self.telegram_update, self.telegram_context
-        )
-
-        event = {
+    def _get_payload(self, num_events: int) -> dict[str, Any]:
+        return {
             "client_id": str(UUID(int=self.TELEGRAM_USER_ID)),
             "user_properties": {"bot_language": {"value": self.LANGUAGE}},
             "events": [
@@ -56,6 +133,13 @@ class TestAnalyticsService(LanguageServiceTestMixin, TelegramTestMixin):
                     "name": self.TASK_TYPE.value,
                     "params": {"action": self.EVENT_ACTION.value},
                 }
-            ],
+            ]
+            * num_events,
         }
-        self.analytics_repository.send_event.assert_called_once_with(event)
+
+    async def _wait_for_calls(self, num_calls: int) -> None:
+        # Wait for the background worker to send the requests
+        for _ in range(100):
+            if self.analytics_repository.send_event.call_count >= num_calls:
+                return
+            await asyncio.sleep(0.01)
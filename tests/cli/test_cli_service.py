@@ -1,87 +1,208 @@
+import asyncio
 import shlex
-from subprocess import Popen
+import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from pdf_bot.cli import CLIService, CLIServiceError
+from pdf_bot.cli.exceptions import CLITimeoutError
+from pdf_bot.settings import Settings
 from tests.path_test_mixin import PathTestMixin
 
 
 class TestCLIService(PathTestMixin):
-    PERCENT = 0.1
-    MARGIN_SIZE = 10
+    TIMEOUT = 5
+    MAX_CONCURRENCY = 1
+    OUTPUT_LIMIT = 10
 
     def setup_method(self) -> None:
         self.input_path = self.mock_file_path()
         self.output_path = self.mock_file_path()
 
-        self.process = MagicMock(spec=Popen)
-        self.process.communicate.return_value = (
-            b"0",
-            b"1",
+        self.returncode = 0
+        self.exec_patcher = patch(
+            "pdf_bot.cli.cli_service.asyncio.create_subprocess_exec",
+            side_effect=self._create_process,
         )
+        self.create_subprocess_exec = self.exec_patcher.start()
 
-        self.popen_patcher = patch("pdf_bot.cli.cli_service.Popen", return_value=self.process)
-        self.popen = self.popen_patcher.start()
-
-        self.sut = CLIService()
+        settings = Settings(
+            cli_timeout=self.TIMEOUT,
+            cli_max_concurrency=self.MAX_CONCURRENCY,
+            cli_output_limit=self.OUTPUT_LIMIT,
+        )
+        self.sut = CLIService(settings)
 
     def teardown_method(self) -> None:
-        self.popen_patcher.stop()
+        self.exec_patcher.stop()
 
     @pytest.mark.asyncio
     async def test_compress_pdf(self) -> None:
-        self.process.returncode = 0
-        self.sut.compress_pdf(self.input_path, self.output_path)
+        await self.sut.compress_pdf(self.input_path, self.output_path)
         self._assert_compress_command()
 
+    @pytest.mark.asyncio
+    async def test_compress_pdf_preset(self) -> None:
+        await self.sut.compress_pdf(self.input_path, self.output_path, "screen")
+        self._assert_compress_command("screen")
+
     @pytest.mark.asyncio
     async def test_compress_pdf_error(self) -> None:
-        self.process.returncode = 1
+        self.returncode = 1
 
         with pytest.raises(CLIServiceError):
-            self.sut.compress_pdf(self.input_path, self.output_path)
+            await self.sut.compress_pdf(self.input_path, self.output_path)
 
         self._assert_compress_command()
 
+    @pytest.mark.asyncio
+    async def test_grayscale_pdf(self) -> None:
+        await self.sut.grayscale_pdf(self.input_path, self.output_path)
+
+        args = self.create_subprocess_exec.call_args.args
+        assert list(args) == shlex.split(
+            "gs -sDEVICE=pdfwrite -sColorConversionStrategy=Gray "
+            "-dProcessColorModel=/DeviceGray -dCompatibilityLevel=1.4 "
+            "-dAutoRotatePages=/None -dNOPAUSE -dQUIET -dBATCH "
+            f'-sOutputFile="{self.output_path}" "{self.input_path}"'
+        )
+
     @pytest.mark.asyncio
     async def test_extract_pdf_images(self) -> None:
-        self.process.returncode = 0
-        self.sut.extract_pdf_images(self.input_path, self.output_path)
+        await self.sut.extract_pdf_images(self.input_path, self.output_path)
         self._assert_get_pdf_images_command()
 
     @pytest.mark.asyncio
     async def test_extract_pdf_images_error(self) -> None:
-        self.process.returncode = 1
+        self.returncode = 1
 
         with pytest.raises(CLIServiceError):
-            self.sut.extract_pdf_images(self.input_path, self.output_path)
+            await self.sut.extract_pdf_images(self.input_path, self.output_path)
 
         self._assert_get_pdf_images_command()
 
-    def _assert_compress_command(self) -> None:
-        args = self.popen.call_args.args[0]
-        assert args == shlex.split(
-            "gs -sDEVICE=pdfwrite -dCompatibilityLevel=1.4 -dPDFSETTINGS=/default "
-            f'-dNOPAUSE -dQUIET -dBATCH -sOutputFile="{self.output_path}" '
-            f'"{self.input_path}"'
+    @pytest.mark.asyncio
+    async def test_extract_pdf_text(self) -> None:
+        await self.sut.extract_pdf_text(self.input_path, self.output_path, 21, 40)
+
+        args = self.create_subprocess_exec.call_args.args
+        assert list(args) == shlex.split(
+            f'pdftotext -f 21 -l 40 -enc UTF-8 "{self.input_path}" "{self.output_path}"'
         )
 
-    def _assert_crop_pdf_percentage_command(self) -> None:
-        args = self.popen.call_args.args[0]
-        assert args == shlex.split(
-            f'pdfcropmargins -o "{self.output_path}" "{self.input_path}" -p {self.PERCENT}'
+    @pytest.mark.asyncio
+    async def test_run_command_concurrency_limit(self) -> None:
+        running = 0
+        max_running = 0
+
+        async def create_process(*_args: str, **_kwargs: int) -> MagicMock:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return self._create_process()
+
+        self.create_subprocess_exec.side_effect = create_process
+        await asyncio.gather(
+            *[self.sut.compress_pdf(self.input_path, self.output_path) for _ in range(3)],
+            self.sut.extract_pdf_images(self.input_path, self.output_path),
         )
 
-    def _assert_crop_pdf_margin_size_command(self) -> None:
-        args = self.popen.call_args.args[0]
-        assert args == shlex.split(
-            f'pdfcropmargins -o "{self.output_path}" "{self.input_path}" -a {self.MARGIN_SIZE}'
+        # gs and pdfimages have separate limits, so two commands can run at once
+        assert max_running == 2
+        assert self.create_subprocess_exec.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_read_stream_bounded(self) -> None:
+        stream = asyncio.StreamReader()
+        stream.feed_data(b"a" * 100)
+        stream.feed_data(b"0123456789")
+        stream.feed_eof()
+
+        actual = await self.sut._read_stream(stream)  # noqa: SLF001
+        assert actual == b"0123456789"
+
+    def test_init_with_dict(self) -> None:
+        sut = CLIService(Settings(cli_timeout=self.TIMEOUT).model_dump())
+        assert sut.timeout == self.TIMEOUT
+
+    def _create_process(self, *_args: str, **_kwargs: int) -> MagicMock:
+        process = MagicMock(spec=asyncio.subprocess.Process)
+        process.returncode = None
+        process.stdout = self._create_stream(b"out")
+        process.stderr = self._create_stream(b"err")
+
+        async def wait() -> int:
+            process.returncode = self.returncode
+            return self.returncode
+
+        process.wait.side_effect = wait
+        return process
+
+    def _create_stream(self, data: bytes) -> asyncio.StreamReader:
+        stream = asyncio.StreamReader()
+        stream.feed_data(data)
+        stream.feed_eof()
+        return stream
+
+    def _assert_compress_command(self, preset: str = "default") -> None:
+        args = self.create_subprocess_exec.call_args.args
+        assert list(args) == shlex.split(
+            f"gs -sDEVICE=pdfwrite -dCompatibilityLevel=1.4 -dPDFSETTINGS=/{preset} "
+            f'-dNOPAUSE -dQUIET -dBATCH -sOutputFile="{self.output_path}" '
+            f'"{self.input_path}"'
         )
 
     def _assert_get_pdf_images_command(self) -> None:
-        args = self.popen.call_args.args[0]
-        assert args == shlex.split(
+        args = self.create_subprocess_exec.call_args.args
+        assert list(args) == shlex.split(
             f'pdfimages -png "{self.input_path}" "{self.output_path}/images"'
         )
+
+
+class TestCLIServiceSubprocess:
+    SLEEP_COMMAND = f'"{sys.executable}" -c "import time; time.sleep(10)"'
+
+    def setup_method(self) -> None:
+        self.sut = CLIService(Settings(cli_timeout=0.5))
+
+    @pytest.mark.asyncio
+    async def test_run_command(self) -> None:
+        await self.sut._run_command(f'"{sys.executable}" -c "print(1)"')  # noqa: SLF001
+
+    @pytest.mark.asyncio
+    async def test_run_command_error(self) -> None:
+        with pytest.raises(CLIServiceError):
+            await self.sut._run_command(f'"{sys.executable}" -c "raise SystemExit(1)"')  # noqa: SLF001
+
+    @pytest.mark.asyncio
+    async def test_run_command_timeout(self) -> None:
+        with pytest.raises(CLITimeoutError):
+            await self.sut._run_command(self.SLEEP_COMMAND)  # noqa: SLF001
+
+    @pytest.mark.asyncio
+    async def test_run_command_cancelled(self) -> None:
+        self.sut.timeout = 10
+        processes: list[asyncio.subprocess.Process] = []
+        started = asyncio.Event()
+        create_subprocess_exec = asyncio.create_subprocess_exec
+
+        async def create_process(*args: str, **kwargs: int) -> asyncio.subprocess.Process:
+            process = await create_subprocess_exec(*args, **kwargs)  # type: ignore[arg-type]
+            processes.append(process)
+            started.set()
+            return process
+
+        with patch(
+            "pdf_bot.cli.cli_service.asyncio.create_subprocess_exec", side_effect=create_process
+        ):
+            task = asyncio.create_task(self.sut._run_command(self.SLEEP_COMMAND))  # noqa: SLF001
+            await started.wait()
+            task.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert processes[0].returncode is not None
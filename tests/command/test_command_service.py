@@ -1,11 +1,16 @@
-from unittest.mock import ANY, MagicMock
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
+from google.cloud.datastore import Entity
 from telegram.constants import ParseMode
 from telegram.error import Forbidden
 
-from pdf_bot.account import AccountService
+from pdf_bot.account import AccountRepository, AccountService
 from pdf_bot.command import CommandService
+from pdf_bot.consts import LANGUAGE, USER
+from pdf_bot.datastore import MemoryDatastoreClient
+from pdf_bot.language import LanguageRepository, LanguageService
+from pdf_bot.settings import Settings
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramTestMixin
 
@@ -22,11 +27,64 @@ class TestCommandService(LanguageServiceTestMixin, TelegramTestMixin):
     async def test_send_start_message(self) -> None:
         await self.sut.send_start_message(self.telegram_update, self.telegram_context)
 
-        self.account_service.create_user.assert_called_once_with(self.telegram_user)
+        self.account_service.create_user.assert_called_once_with(
+            self.telegram_user, self.telegram_context
+        )
         self.telegram_update.effective_message.reply_text.assert_called_once_with(
             ANY, parse_mode=ParseMode.HTML
         )
 
+    @pytest.mark.asyncio
+    async def test_send_start_message_new_user_language(self) -> None:
+        language_service, sut = self._create_real_services(MemoryDatastoreClient())
+        self.telegram_user.language_code = "es"
+        self.telegram_update.callback_query = None
+        self.telegram_context.user_data = {}
+
+        with patch("pdf_bot.language.language_service.gettext") as gettext:
+            # The language is preloaded before the user is created
+            await language_service.preload_user_language(
+                self.telegram_update, self.telegram_context
+            )
+            await sut.send_start_message(self.telegram_update, self.telegram_context)
+
+            gettext.translation.assert_called_once_with(
+                "pdf_bot", localedir="locale", languages=["es_ES"]
+            )
+
+        # Later updates are also in the new user's language
+        assert (
+            language_service.get_user_language(self.telegram_update, MagicMock(user_data={}))
+            == "es_ES"
+        )
+
+    @pytest.mark.asyncio
+    async def test_send_start_message_existing_user_language(self) -> None:
+        datastore_client = MemoryDatastoreClient()
+        entity = Entity(datastore_client.key(USER, self.TELEGRAM_USER_ID))
+        entity[LANGUAGE] = "fr_FR"
+        datastore_client.put(entity)
+
+        language_service, sut = self._create_real_services(datastore_client)
+        self.telegram_user.language_code = "es"
+        self.telegram_update.callback_query = None
+        # The language was persisted, so nothing is preloaded or cached
+        self.telegram_context.user_data = {"language_code": "fr_FR"}
+
+        with patch("pdf_bot.language.language_service.gettext") as gettext:
+            await sut.send_start_message(self.telegram_update, self.telegram_context)
+
+            gettext.translation.assert_called_once_with(
+                "pdf_bot", localedir="locale", languages=["fr_FR"]
+            )
+
+        # The language that the user has set is kept
+        assert self.telegram_context.user_data == {"language_code": "fr_FR"}
+        assert (
+            language_service.get_user_language(self.telegram_update, MagicMock(user_data={}))
+            == "fr_FR"
+        )
+
     @pytest.mark.asyncio
     async def test_send_help_message(self) -> None:
         await self.sut.send_help_message(self.telegram_update, self.telegram_context)
@@ -64,3 +122,11 @@ class TestCommandService(LanguageServiceTestMixin, TelegramTestMixin):
             self.TELEGRAM_USER_ID, self.TELEGRAM_TEXT
         )
         self.telegram_update.effective_message.reply_text.assert_called_once_with(message)
+
+    @staticmethod
+    def _create_real_services(
+        datastore_client: MemoryDatastoreClient,
+    ) -> tuple[LanguageService, CommandService]:
+        language_service = LanguageService(LanguageRepository(datastore_client), Settings())
+        account_service = AccountService(AccountRepository(datastore_client), language_service)
+        return language_service, CommandService(account_service, language_service)
@@ -7,13 +7,17 @@ from telegram.ext import ConversationHandler
 from pdf_bot.analytics import TaskType
 from pdf_bot.compare import CompareService
 from pdf_bot.consts import BACK, CANCEL
+from pdf_bot.job_scheduler import JobTimeoutError
 from pdf_bot.pdf import PdfService
 from pdf_bot.telegram_internal import TelegramGetUserDataError, TelegramServiceError
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
-class TestCompareService(LanguageServiceTestMixin, TelegramServiceTestMixin, TelegramTestMixin):
+class TestCompareService(
+    JobSchedulerTestMixin, LanguageServiceTestMixin, TelegramServiceTestMixin, TelegramTestMixin
+):
     COMPARE_ID = "compare_id"
     WAIT_FIRST_PDF = 0
     WAIT_SECOND_PDF = 1
@@ -25,7 +29,10 @@ class TestCompareService(LanguageServiceTestMixin, TelegramServiceTestMixin, Tel
         self.telegram_service = self.mock_telegram_service()
         self.telegram_service.get_user_data.side_effect = None
 
-        self.sut = CompareService(self.pdf_service, self.telegram_service, self.language_service)
+        self.job_scheduler = self.mock_job_scheduler()
+        self.sut = CompareService(
+            self.pdf_service, self.telegram_service, self.language_service, self.job_scheduler
+        )
 
     @pytest.mark.asyncio
     async def test_ask_first_pdf(self) -> None:
@@ -81,6 +88,18 @@ class TestCompareService(LanguageServiceTestMixin, TelegramServiceTestMixin, Tel
         )
         self.telegram_service.send_file.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_compare_pdfs_timeout(self) -> None:
+        self.telegram_service.get_user_data.return_value = self.TELEGRAM_DOCUMENT_ID
+        self.job_scheduler.time_budget.return_value.__aexit__.side_effect = JobTimeoutError
+
+        actual = await self.sut.compare_pdfs(self.telegram_update, self.telegram_context)
+
+        assert actual == ConversationHandler.END
+        self.job_scheduler.time_budget.assert_called_once_with(TaskType.compare_pdf)
+        self.telegram_service.send_file.assert_not_called()
+        assert self.telegram_message.reply_text.call_count == 2
+
     @pytest.mark.asyncio
     async def test_compare_pdfs_invalid_user_data(self) -> None:
         self.telegram_service.get_user_data.side_effect = TelegramGetUserDataError()
@@ -0,0 +1,34 @@
+from google.cloud.datastore import Entity
+
+from pdf_bot.datastore import MemoryDatastoreClient
+
+
+class TestMemoryDatastoreClient:
+    KIND = "kind"
+
+    def setup_method(self) -> None:
+        self.sut = MemoryDatastoreClient()
+
+    def test_get_and_put(self) -> None:
+        key = self.sut.key(self.KIND, 1)
+        assert self.sut.get(key) is None
+
+        entity = Entity(key)
+        entity["value"] = 1
+        with self.sut.transaction():
+            self.sut.put(entity)
+        entity["value"] = 2
+
+        actual = self.sut.get(key)
+        assert actual is not None
+        assert actual["value"] == 1
+        assert self.sut.num_reads == 2
+        assert self.sut.num_writes == 1
+
+    def test_get_multi(self) -> None:
+        keys = [self.sut.key(self.KIND, x) for x in range(3)]
+        self.sut.put_multi([Entity(keys[0]), Entity(keys[2])])
+
+        actual = self.sut.get_multi(keys)
+
+        assert [x.key for x in actual] == [keys[0], keys[2]]
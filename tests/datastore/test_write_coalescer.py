@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+import pytest
+
+from pdf_bot.datastore import WriteCoalescer
+
+
+class TestWriteCoalescer:
+    KEY = "key"
+
+    def setup_method(self) -> None:
+        self.writes: list[tuple[str, int]] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+        self.sut: WriteCoalescer[str, int, int] = WriteCoalescer(self._write)
+
+    @pytest.mark.asyncio
+    async def test_write(self) -> None:
+        await self.sut.write(self.KEY, 1)
+        await self.sut.write(self.KEY, 2)
+
+        assert self.writes == [(self.KEY, 1), (self.KEY, 2)]
+
+    @pytest.mark.asyncio
+    async def test_write_coalesced(self) -> None:
+        self.release.clear()
+        first = asyncio.create_task(self.sut.write(self.KEY, 1))
+        await asyncio.to_thread(self.started.wait)
+
+        others = [asyncio.create_task(self.sut.write(self.KEY, x)) for x in range(2, 5)]
+        await asyncio.sleep(0)
+        self.release.set()
+        await asyncio.gather(first, *others)
+
+        assert self.writes == [(self.KEY, 1), (self.KEY, 4)]
+
+    @pytest.mark.asyncio
+    async def test_write_result(self) -> None:
+        self.release.clear()
+        first = asyncio.create_task(self.sut.write(self.KEY, 1))
+        await asyncio.to_thread(self.started.wait)
+
+        others = [asyncio.create_task(self.sut.write(self.KEY, x)) for x in range(2, 4)]
+        await asyncio.sleep(0)
+        self.release.set()
+
+        # Each caller gets the result of the write that covered its value
+        assert await asyncio.gather(first, *others) == [1, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_write_different_keys(self) -> None:
+        await asyncio.gather(self.sut.write(self.KEY, 1), self.sut.write("other", 1))
+        assert sorted(self.writes) == [(self.KEY, 1), ("other", 1)]
+
+    @pytest.mark.asyncio
+    async def test_write_error(self) -> None:
+        with pytest.raises(ValueError):  # noqa: PT011
+            await self.sut.write(self.KEY, -1)
+
+        await self.sut.write(self.KEY, 1)
+        assert self.writes == [(self.KEY, 1)]
+
+    @pytest.mark.asyncio
+    async def test_write_cancelled_caller(self) -> None:
+        self.release.clear()
+        task = asyncio.create_task(self.sut.write(self.KEY, 1))
+        await asyncio.to_thread(self.started.wait)
+
+        task.cancel()
+        self.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The write still completes in the background
+        await self.sut.write(self.KEY, 2)
+        assert self.writes == [(self.KEY, 1), (self.KEY, 2)]
+
+    def _write(self, key: str, value: int) -> int:
+        self.started.set()
+        self.release.wait()
+        if value < 0:
+            raise ValueError
+        self.writes.append((key, value))
+        return len(self.writes)
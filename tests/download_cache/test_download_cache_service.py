@@ -0,0 +1,180 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from pdf_bot.download_cache import CacheStats, DownloadCacheService
+from pdf_bot.settings import Settings
+
+
+class TestDownloadCacheService:
+    KEY = "key"
+    OTHER_KEY = "other_key"
+    SUFFIX = ".pdf"
+    CONTENT = b"content"
+    MAX_SIZE = len(CONTENT) * 2
+
+    def setup_method(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name)
+        self.num_downloads = 0
+
+        self.sut = self._create_sut()
+
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_get_or_download(self) -> None:
+        async with self.sut.get_or_download(self.KEY, self._download, self.SUFFIX) as actual:
+            assert actual == self.cache_dir / f"{self.KEY}{self.SUFFIX}"
+            assert actual.read_bytes() == self.CONTENT
+
+        assert self.num_downloads == 1
+        assert self.sut.stats == CacheStats(
+            hits=0, misses=1, evictions=0, num_entries=1, total_size=len(self.CONTENT)
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_or_download_hit(self) -> None:
+        async with self.sut.get_or_download(self.KEY, self._download) as path_a:
+            pass
+        async with self.sut.get_or_download(self.KEY, self._download) as path_b:
+            assert path_a == path_b
+
+        assert self.num_downloads == 1
+        assert self.sut.stats.hits == 1
+        assert self.sut.stats.misses == 1
+        assert self.sut.stats.hit_rate == 0.5
+
+    @pytest.mark.asyncio
+    async def test_get_or_download_suffix(self) -> None:
+        async with self.sut.get_or_download(self.KEY, self._download) as path_a:
+            assert path_a == self.cache_dir / self.KEY
+        async with self.sut.get_or_download(self.KEY, self._download, self.SUFFIX) as path_b:
+            assert path_b == self.cache_dir / f"{self.KEY}{self.SUFFIX}"
+
+        assert self.num_downloads == 2
+
+    @pytest.mark.asyncio
+    async def test_get_or_download_concurrent(self) -> None:
+        async def get_path() -> Path:
+            async with self.sut.get_or_download(self.KEY, self._slow_download) as path:
+                return path
+
+        paths = await asyncio.gather(*[get_path() for _ in range(5)])
+
+        assert len(set(paths)) == 1
+        assert self.num_downloads == 1
+        assert self.sut.stats.misses == 1
+        assert self.sut.stats.hits == 4
+
+    @pytest.mark.asyncio
+    async def test_get_or_download_error(self) -> None:
+        async def download(_path: Path) -> None:
+            raise ValueError
+
+        with pytest.raises(ValueError):  # noqa: PT011
+            async with self.sut.get_or_download(self.KEY, download):
+                pass
+
+        assert list(self.cache_dir.iterdir()) == []
+        async with self.sut.get_or_download(self.KEY, self._download) as actual:
+            assert actual.read_bytes() == self.CONTENT
+        assert self.num_downloads == 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_download_cancelled_waiter_retries(self) -> None:
+        started = asyncio.Event()
+
+        async def hanging_download(_path: Path) -> None:
+            started.set()
+            await asyncio.sleep(10)
+
+        async def get_content(download_func: Callable[[Path], Awaitable[None]]) -> bytes:
+            async with self.sut.get_or_download(self.KEY, download_func) as path:
+                return path.read_bytes()
+
+        first = asyncio.create_task(get_content(hanging_download))
+        await started.wait()
+        second = asyncio.create_task(get_content(self._download))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        assert await second == self.CONTENT
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    @pytest.mark.asyncio
+    async def test_evict_least_recently_used(self) -> None:
+        for key in [self.KEY, self.OTHER_KEY, self.KEY, "new_key"]:
+            async with self.sut.get_or_download(key, self._download):
+                pass
+
+        assert sorted(x.name for x in self.cache_dir.iterdir()) == ["key", "new_key"]
+        assert self.sut.stats.evictions == 1
+        assert self.sut.stats.total_size == self.MAX_SIZE
+
+    @pytest.mark.asyncio
+    async def test_evict_skips_pinned_entries(self) -> None:
+        self.sut.max_size = 0
+
+        async with self.sut.get_or_download(self.KEY, self._download) as path:
+            async with self.sut.get_or_download(self.OTHER_KEY, self._download):
+                assert path.exists()
+            assert path.exists()
+
+        assert list(self.cache_dir.iterdir()) == []
+        assert self.sut.stats.evictions == 2
+
+    @pytest.mark.asyncio
+    async def test_load_existing_entries(self) -> None:
+        (self.cache_dir / f"{self.KEY}{self.SUFFIX}").write_bytes(self.CONTENT)
+        (self.cache_dir / f"{self.OTHER_KEY}.part").write_bytes(self.CONTENT)
+        sut = self._create_sut()
+
+        async with sut.get_or_download(self.KEY, self._download, self.SUFFIX) as actual:
+            assert actual.read_bytes() == self.CONTENT
+
+        assert self.num_downloads == 0
+        assert not (self.cache_dir / f"{self.OTHER_KEY}.part").exists()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_temp_dir(self) -> None:
+        sut = DownloadCacheService(Settings(download_cache_dir=None))
+        async with sut.get_or_download(self.KEY, self._download) as path:
+            pass
+
+        sut.shutdown()
+
+        assert not path.parent.exists()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cache_dir(self) -> None:
+        async with self.sut.get_or_download(self.KEY, self._download) as path:
+            pass
+
+        self.sut.shutdown()
+
+        assert path.exists()
+
+    def test_init_with_dict(self) -> None:
+        settings = Settings(download_cache_max_size=self.MAX_SIZE)
+        sut = DownloadCacheService(settings.model_dump())
+        assert sut.max_size == self.MAX_SIZE
+
+    def _create_sut(self) -> DownloadCacheService:
+        settings = Settings(
+            download_cache_dir=self.cache_dir, download_cache_max_size=self.MAX_SIZE
+        )
+        return DownloadCacheService(settings)
+
+    async def _download(self, path: Path) -> None:
+        self.num_downloads += 1
+        path.write_bytes(self.CONTENT)
+
+    async def _slow_download(self, path: Path) -> None:
+        await asyncio.sleep(0.01)
+        await self._download(path)
@@ -0,0 +1,31 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+from unittest.mock import AsyncMock
+
+from pdf_bot.executor import ExecutorService, WorkerPool
+
+
+class ExecutorServiceTestMixin:
+    @staticmethod
+    def mock_executor_service() -> AsyncMock:
+        def run(_pool: WorkerPool, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+            return func(*args, **kwargs)
+
+        async def run_with_progress(
+            _pool: WorkerPool,
+            on_progress: Callable[[Any], Awaitable[None]],
+            func: Callable[..., Any],
+            *args: Any,
+            **kwargs: Any,
+        ) -> Any:
+            reported: list[Any] = []
+            result = func(reported.append, *args, **kwargs)
+            for value in reported:
+                await on_progress(value)
+            return result
+
+        service = AsyncMock(spec=ExecutorService)
+        service.run.side_effect = run
+        service.run_killable.side_effect = run
+        service.run_killable_with_progress.side_effect = run_with_progress
+        return service
@@ -0,0 +1,234 @@
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pdf_bot.executor import ExecutorService, WorkerPool
+from pdf_bot.settings import Settings
+
+
+def _count(report: Callable[[Any], None], num: int) -> int:
+    for i in range(num):
+        report(i)
+    return num
+
+
+def _square_in_pool(nums: list[int]) -> list[int]:
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+        return pool.map(_square, nums)
+
+
+def _square(num: int) -> int:
+    return num * num
+
+
+def _sleep_in_child(pid_path: Path) -> None:
+    proc = subprocess.Popen(["sleep", "60"])  # noqa: S607
+    pid_path.write_text(str(proc.pid))
+    time.sleep(60)
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+    except FileNotFoundError:
+        return False
+    return state != "Z"
+
+
+class TestExecutorService:
+    def setup_method(self) -> None:
+        self.settings = Settings(
+            executor_light_pool_size=1,
+            executor_heavy_pool_size=2,
+            executor_heavy_use_processes=False,
+            executor_ocr_pool_size=3,
+            executor_ocr_use_processes=True,
+        )
+        self.sut = ExecutorService(self.settings)
+
+    def teardown_method(self) -> None:
+        self.sut.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run(self) -> None:
+        actual = await self.sut.run(WorkerPool.light, threading.current_thread)
+        assert actual is not threading.current_thread()
+        assert actual.name.startswith("light_worker")
+
+    @pytest.mark.asyncio
+    async def test_run_with_args(self) -> None:
+        actual = await self.sut.run(WorkerPool.heavy, int, "ff", base=16)
+        assert actual == 255
+
+    @pytest.mark.asyncio
+    async def test_run_error(self) -> None:
+        with pytest.raises(ValueError, match="invalid literal"):
+            await self.sut.run(WorkerPool.heavy, int, "invalid")
+
+    @pytest.mark.asyncio
+    async def test_run_reuses_executor(self) -> None:
+        thread_a = await self.sut.run(WorkerPool.light, threading.current_thread)
+        thread_b = await self.sut.run(WorkerPool.light, threading.current_thread)
+        assert thread_a is thread_b
+
+    @pytest.mark.asyncio
+    async def test_run_process_pool(self) -> None:
+        executor = MagicMock(spec=ProcessPoolExecutor)
+        with patch(
+            "pdf_bot.executor.executor_service.ProcessPoolExecutor", return_value=executor
+        ) as executor_cls:
+            assert self.sut._get_executor(WorkerPool.ocr) == executor  # noqa: SLF001
+            assert executor_cls.call_args.kwargs["max_workers"] == 3
+
+    @pytest.mark.asyncio
+    async def test_run_killable(self) -> None:
+        actual = await self.sut.run_killable(WorkerPool.heavy, int, "ff", base=16)
+        assert actual == 255
+
+    @pytest.mark.asyncio
+    async def test_run_killable_error(self) -> None:
+        with pytest.raises(ValueError, match="invalid literal"):
+            await self.sut.run_killable(WorkerPool.heavy, int, "invalid")
+
+    @pytest.mark.asyncio
+    async def test_run_killable_process_exited(self) -> None:
+        with pytest.raises(ChildProcessError, match="code 3"):
+            await self.sut.run_killable(WorkerPool.heavy, os._exit, 3)
+
+    @pytest.mark.asyncio
+    async def test_run_killable_cancelled(self) -> None:
+        with (
+            patch("pdf_bot.executor.executor_service.logger") as logger,
+            pytest.raises(TimeoutError),
+        ):
+            async with asyncio.timeout(1):
+                await self.sut.run_killable(WorkerPool.heavy, time.sleep, 60)
+
+        # The process is killed rather than left running in the background
+        pid = logger.info.call_args.kwargs["pid"]
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+    @pytest.mark.asyncio
+    async def test_run_killable_reuses_worker(self) -> None:
+        pid_a = await self.sut.run_killable(WorkerPool.heavy, os.getpid)
+        with pytest.raises(ValueError, match="invalid literal"):
+            await self.sut.run_killable(WorkerPool.heavy, int, "invalid")
+        pid_b = await self.sut.run_killable(WorkerPool.heavy, os.getpid)
+
+        assert pid_a == pid_b != os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_run_killable_unpicklable_job(self) -> None:
+        pid_a = await self.sut.run_killable(WorkerPool.heavy, os.getpid)
+        with pytest.raises(AttributeError, match="pickle"):
+            await self.sut.run_killable(WorkerPool.heavy, lambda: None)
+        pid_b = await self.sut.run_killable(WorkerPool.heavy, os.getpid)
+
+        assert pid_a == pid_b
+
+    @pytest.mark.asyncio
+    async def test_run_killable_cancelled_replaces_worker(self) -> None:
+        pid_a = await self.sut.run_killable(WorkerPool.heavy, os.getpid)
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.5):
+                await self.sut.run_killable(WorkerPool.heavy, time.sleep, 60)
+        pid_b = await self.sut.run_killable(WorkerPool.heavy, os.getpid)
+
+        assert pid_a != pid_b
+        assert not _is_running(pid_a)
+
+    @pytest.mark.asyncio
+    async def test_run_killable_worker_max_jobs(self) -> None:
+        sut = ExecutorService(Settings(executor_killable_worker_max_jobs=1))
+        try:
+            pid_a = await sut.run_killable(WorkerPool.heavy, os.getpid)
+            pid_b = await sut.run_killable(WorkerPool.heavy, os.getpid)
+        finally:
+            sut.shutdown()
+
+        assert pid_a != pid_b
+        assert not _is_running(pid_a)
+
+    @pytest.mark.asyncio
+    async def test_run_killable_child_processes(self) -> None:
+        actual = await self.sut.run_killable(WorkerPool.heavy, _square_in_pool, [1, 2, 3])
+        assert actual == [1, 4, 9]
+
+    @pytest.mark.asyncio
+    async def test_run_killable_cancelled_kills_child_processes(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            pid_path = Path(dir_name) / "pid"
+            with pytest.raises(TimeoutError):
+                async with asyncio.timeout(3):
+                    await self.sut.run_killable(WorkerPool.heavy, _sleep_in_child, pid_path)
+
+            pid = int(pid_path.read_text())
+
+        for _ in range(50):
+            if not _is_running(pid):
+                break
+            await asyncio.sleep(0.1)
+        assert not _is_running(pid)
+
+    @pytest.mark.asyncio
+    async def test_run_killable_with_progress(self) -> None:
+        reported: list[int] = []
+
+        async def on_progress(value: int) -> None:
+            reported.append(value)
+
+        actual = await self.sut.run_killable_with_progress(WorkerPool.heavy, on_progress, _count, 3)
+
+        assert actual == 3
+        assert reported == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_run_killable_with_progress_error(self) -> None:
+        async def on_progress(_value: int) -> None:
+            raise ValueError
+
+        with patch("pdf_bot.executor.executor_service.logger") as logger:
+            actual = await self.sut.run_killable_with_progress(
+                WorkerPool.heavy, on_progress, _count, 2
+            )
+
+        # Failing to report progress doesn't fail the work itself
+        assert actual == 2
+        assert logger.exception.call_count == 2
+
+    def test_init_with_dict(self) -> None:
+        sut = ExecutorService(self.settings.model_dump())
+        with patch(
+            "pdf_bot.executor.executor_service.ThreadPoolExecutor",
+            return_value=MagicMock(spec=ThreadPoolExecutor),
+        ) as executor_cls:
+            sut._get_executor(WorkerPool.heavy)  # noqa: SLF001
+            assert executor_cls.call_args.kwargs["max_workers"] == 2
+
+    def test_shutdown(self) -> None:
+        executor = MagicMock(spec=ThreadPoolExecutor)
+        with patch("pdf_bot.executor.executor_service.ThreadPoolExecutor", return_value=executor):
+            self.sut._get_executor(WorkerPool.light)  # noqa: SLF001
+
+        self.sut.shutdown()
+        executor.shutdown.assert_called_once_with(wait=True, cancel_futures=True)
+
+    @pytest.mark.asyncio
+    async def test_shutdown_stops_killable_workers(self) -> None:
+        pid = await self.sut.run_killable(WorkerPool.heavy, os.getpid)
+
+        self.sut.shutdown()
+
+        assert not _is_running(pid)
@@ -6,6 +6,7 @@ from telegram.ext import ConversationHandler
 
 from pdf_bot.file import FileService
 from pdf_bot.image_processor import ImageTaskProcessor
+from pdf_bot.pdf import PdfService
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
@@ -19,12 +20,14 @@ class TestFileService(LanguageServiceTestMixin, TelegramServiceTestMixin, Telegr
         self.telegram_service = self.mock_telegram_service()
         self.image_task_processor = MagicMock(spec=ImageTaskProcessor)
         self.pdf_task_processor = MagicMock(spec=ImageTaskProcessor)
+        self.pdf_service = MagicMock(spec=PdfService)
 
         self.sut = FileService(
             self.telegram_service,
             self.language_service,
             self.image_task_processor,
             self.pdf_task_processor,
+            self.pdf_service,
         )
 
     @pytest.mark.asyncio
@@ -35,6 +38,7 @@ class TestFileService(LanguageServiceTestMixin, TelegramServiceTestMixin, Telegr
         actual = await self.sut.check_pdf(self.telegram_update, self.telegram_context)
 
         assert actual == self.STATE
+        self.pdf_service.probe_pdf.assert_called_once_with(self.TELEGRAM_DOCUMENT_ID)
         self.pdf_task_processor.ask_task.assert_called_once_with(
             self.telegram_update, self.telegram_context
         )
@@ -46,6 +50,7 @@ class TestFileService(LanguageServiceTestMixin, TelegramServiceTestMixin, Telegr
         actual = await self.sut.check_pdf(self.telegram_update, self.telegram_context)
 
         assert actual == ConversationHandler.END
+        self.pdf_service.probe_pdf.assert_not_called()
         self.pdf_task_processor.ask_task.assert_not_called()
 
     @pytest.mark.asyncio
@@ -1,20 +1,23 @@
 from collections.abc import AsyncGenerator, Sequence
 from contextlib import asynccontextmanager
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, PropertyMock, patch
 
 import pytest
-from telegram import Update
-from telegram.error import BadRequest
+from telegram import Message, Update
+from telegram.error import BadRequest, TelegramError
 from telegram.ext import BaseHandler, ContextTypes, ConversationHandler
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import CallbackQueryDataTypeError
 from pdf_bot.file_processor import AbstractFileProcessor, ErrorHandlerType
 from pdf_bot.file_processor.errors import DuplicateClassError
+from pdf_bot.job_scheduler import JobLane, JobScheduler, JobTimeoutError
 from pdf_bot.language import LanguageService
 from pdf_bot.models import FileData, FileTaskResult, TaskData
+from pdf_bot.result_cache import ResultCacheService
 from pdf_bot.telegram_internal import TelegramGetUserDataError, TelegramService
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.path_test_mixin import PathTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
@@ -41,9 +44,10 @@ class MockProcessor(PathTestMixin, AbstractFileProcessor):
         self,
         telegram_service: TelegramService,
         language_service: LanguageService,
+        job_scheduler: JobScheduler,
         bypass_init_check: bool = False,
     ) -> None:
-        super().__init__(telegram_service, language_service, bypass_init_check)
+        super().__init__(telegram_service, language_service, job_scheduler, bypass_init_check)
         self.path = self.mock_file_path()
         self.file_task_result = FileTaskResult(self.path)
 
@@ -94,12 +98,14 @@ class MockProcessorWithCustomErrorHandler(MockProcessor):
 
 
 class TestAbstractFileProcessorInit(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
 ):
     def setup_method(self) -> None:
         super().setup_method()
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.file_processors_patcher = patch(
@@ -115,7 +121,7 @@ class TestAbstractFileProcessorInit(
         processors: dict = {}
         self.file_processors.__contains__.side_effect = processors.__contains__
 
-        proc = MockProcessor(self.telegram_service, self.language_service)
+        proc = MockProcessor(self.telegram_service, self.language_service, self.job_scheduler)
 
         self.file_processors.__setitem__.assert_called_once_with(proc.__class__.__name__, proc)
 
@@ -124,12 +130,13 @@ class TestAbstractFileProcessorInit(
         self.file_processors.__contains__.side_effect = processors.__contains__
 
         with pytest.raises(DuplicateClassError):
-            MockProcessor(self.telegram_service, self.language_service)
+            MockProcessor(self.telegram_service, self.language_service, self.job_scheduler)
 
         self.file_processors.__setitem__.assert_not_called()
 
 
 class TestAbstractFileProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -142,11 +149,13 @@ class TestAbstractFileProcessor(
         self.telegram_update.callback_query = None
 
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.sut = MockProcessor(
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
@@ -193,6 +202,35 @@ class TestAbstractFileProcessor(
         assert actual == ConversationHandler.END
         self._assert_process_file_succeed()
 
+    @pytest.mark.asyncio
+    async def test_process_file_scheduled(self) -> None:
+        job = self.job_scheduler.schedule.return_value.__aenter__.return_value
+
+        await self.sut.process_file(self.telegram_update, self.telegram_context)
+
+        self.job_scheduler.schedule.assert_called_once_with(
+            self.TELEGRAM_USER_ID, JobLane.heavy, ANY
+        )
+        job.release.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_process_file_queue_position(self) -> None:
+        await self.sut.process_file(self.telegram_update, self.telegram_context)
+        on_queued = self.job_scheduler.schedule.call_args.args[2]
+
+        await on_queued(3)
+
+        self.telegram_message.reply_text.assert_called_once()
+        assert "3" in self.telegram_message.reply_text.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_process_file_queue_position_error(self) -> None:
+        self.telegram_message.reply_text.side_effect = TelegramError("error")
+        await self.sut.process_file(self.telegram_update, self.telegram_context)
+        on_queued = self.job_scheduler.schedule.call_args.args[2]
+
+        await on_queued(3)
+
     @pytest.mark.asyncio
     async def test_process_file_with_result_message(self) -> None:
         with patch.object(self.sut, "process_file_task") as process_file_task:
@@ -209,25 +247,70 @@ class TestAbstractFileProcessor(
 
     @pytest.mark.asyncio
     async def test_process_file_dir_output(self) -> None:
-        with (
-            patch.object(self.sut, "process_file_task") as process_file_task,
-            patch("pdf_bot.file_processor.abstract_file_processor.shutil") as mock_shutil,
-        ):
-            path_with_suffix = self.mock_file_path()
+        with patch.object(self.sut, "process_file_task") as process_file_task:
             dir_path = self.mock_dir_path()
-            dir_path.with_suffix.return_value = path_with_suffix
-
             result = FileTaskResult(dir_path, self.TELEGRAM_TEXT)
             process_file_task.return_value.__aenter__.return_value = result
 
             actual = await self.sut.process_file(self.telegram_update, self.telegram_context)
 
             assert actual == ConversationHandler.END
-            self._assert_process_file_succeed(path_with_suffix)
-            dir_path.with_suffix.assert_called_once_with(".zip")
-            mock_shutil.make_archive(
-                MockProcessor.PROCESS_RESULT, "zip", MockProcessor.PROCESS_RESULT
-            )
+            self._assert_process_file_succeed(dir_path)
+
+    @pytest.mark.asyncio
+    async def test_process_file_caches_result(self) -> None:
+        message = MagicMock(spec=Message)
+        self.telegram_service.send_file.return_value = message
+
+        actual = await self.sut.process_file(self.telegram_update, self.telegram_context)
+
+        assert actual == ConversationHandler.END
+        self._assert_process_file_succeed()
+
+        expected_key = ResultCacheService.build_key(
+            self.TELEGRAM_FILE_UNIQUE_ID, MockProcessor.TASK_TYPE, {"data_type": "FileData"}
+        )
+        self.telegram_service.get_file_unique_id.assert_called_once_with(self.FILE_DATA.id)
+        self.telegram_service.send_cached_result.assert_called_once_with(
+            self.telegram_update, self.telegram_context, expected_key, MockProcessor.TASK_TYPE
+        )
+        self.telegram_service.cache_result.assert_called_once_with(expected_key, message, None)
+
+    @pytest.mark.asyncio
+    async def test_process_file_cached_result(self) -> None:
+        self.telegram_service.send_cached_result.return_value = True
+
+        with patch.object(self.sut, "process_file_task") as process_file_task:
+            actual = await self.sut.process_file(self.telegram_update, self.telegram_context)
+
+            assert actual == ConversationHandler.END
+            process_file_task.assert_not_called()
+            self.telegram_service.send_file.assert_not_called()
+            self.telegram_service.cache_result.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_process_file_cache_result_disabled(self) -> None:
+        with patch.object(
+            MockProcessor, "cache_result", new_callable=PropertyMock, return_value=False
+        ):
+            actual = await self.sut.process_file(self.telegram_update, self.telegram_context)
+
+        assert actual == ConversationHandler.END
+        self._assert_process_file_succeed()
+        self.telegram_service.get_file_unique_id.assert_not_called()
+        self.telegram_service.send_cached_result.assert_not_called()
+        self.telegram_service.cache_result.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_process_file_get_file_unique_id_error(self) -> None:
+        self.telegram_service.get_file_unique_id.side_effect = TelegramError("error")
+
+        actual = await self.sut.process_file(self.telegram_update, self.telegram_context)
+
+        assert actual == ConversationHandler.END
+        self._assert_process_file_succeed()
+        self.telegram_service.send_cached_result.assert_not_called()
+        self.telegram_service.cache_result.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_process_file_generic_error_not_registered(self) -> None:
@@ -244,7 +327,7 @@ class TestAbstractFileProcessor(
     @pytest.mark.asyncio
     async def test_process_file_error(self) -> None:
         sut = MockProcessorWithGenericError(
-            self.telegram_service, self.language_service, bypass_init_check=True
+            self.telegram_service, self.language_service, self.job_scheduler, bypass_init_check=True
         )
 
         with patch.object(sut, "process_file_task", side_effect=GenericError):
@@ -255,10 +338,21 @@ class TestAbstractFileProcessor(
             self.telegram_message.reply_text.assert_called_once()
             self.telegram_service.send_file.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_process_file_timeout(self) -> None:
+        self.job_scheduler.time_budget.return_value.__aexit__.side_effect = JobTimeoutError
+
+        actual = await self.sut.process_file(self.telegram_update, self.telegram_context)
+
+        assert actual == ConversationHandler.END
+        self.job_scheduler.time_budget.assert_called_once_with(MockProcessor.TASK_TYPE)
+        self.telegram_message.reply_text.assert_called_once()
+        self.telegram_service.send_file.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_process_file_custom_error(self) -> None:
         sut = MockProcessorWithCustomErrorHandler(
-            self.telegram_service, self.language_service, bypass_init_check=True
+            self.telegram_service, self.language_service, self.job_scheduler, bypass_init_check=True
         )
 
         with patch.object(sut, "process_file_task", side_effect=CustomError):
@@ -271,7 +365,7 @@ class TestAbstractFileProcessor(
     @pytest.mark.asyncio
     async def test_process_file_unknown_error(self) -> None:
         sut = MockProcessorWithCustomErrorHandler(
-            self.telegram_service, self.language_service, bypass_init_check=True
+            self.telegram_service, self.language_service, self.job_scheduler, bypass_init_check=True
         )
 
         with (
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 import pytest
@@ -64,8 +65,27 @@ class TestFileTaskMixin(LanguageServiceTestMixin, TelegramTestMixin):
         assert actual == ConversationHandler.END
         self.telegram_update.effective_message.reply_text.assert_called_once_with(GENERIC_ERROR)
 
-    def _assert_inline_keyboard(self) -> None:
-        tasks = self.TASK_DATA_LIST
+    @pytest.mark.asyncio
+    async def test_ask_task_helper_filter_tasks(self) -> None:
+        class FilteringMixin(FileTaskMixin):
+            async def filter_tasks(
+                self, file_id: str, tasks: Sequence[TaskData]
+            ) -> Sequence[TaskData]:
+                assert file_id == TestFileTaskMixin.TELEGRAM_DOCUMENT_ID
+                return tasks[:1]
+
+        self.telegram_context.user_data = None
+        actual = await FilteringMixin().ask_task_helper(
+            self.language_service,
+            self.telegram_update,
+            self.telegram_context,
+            self.TASK_DATA_LIST,
+        )
+
+        assert actual == self.WAIT_FILE_TASK
+        self._assert_inline_keyboard(self.TASK_DATA_LIST[:1])
+
+    def _assert_inline_keyboard(self, tasks: Sequence[TaskData] = TASK_DATA_LIST) -> None:
         _args, kwargs = self.telegram_update.effective_message.reply_text.call_args
 
         reply_markup: InlineKeyboardMarkup | None = kwargs.get("reply_markup")
@@ -7,11 +7,17 @@ from pdf_bot.cli import CLIService
 from pdf_bot.image import ImageService
 from pdf_bot.io.io_service import IOService
 from pdf_bot.models import FileData
+from tests.executor import ExecutorServiceTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
-class TestImageService(LanguageServiceTestMixin, TelegramServiceTestMixin, TelegramTestMixin):
+class TestImageService(
+    ExecutorServiceTestMixin,
+    LanguageServiceTestMixin,
+    TelegramServiceTestMixin,
+    TelegramTestMixin,
+):
     PASSWORD = "password"
     FILE_PATH_STEM = "file_path_stem"
 
@@ -23,10 +29,12 @@ class TestImageService(LanguageServiceTestMixin, TelegramServiceTestMixin, Teleg
         self.io_service = MagicMock(spec=IOService)
         self.io_service.create_temp_pdf_file.return_value.__enter__.return_value = self.file_path
 
+        self.executor_service = self.mock_executor_service()
         self.sut = ImageService(
             self.cli_service,
             self.io_service,
             self.telegram_service,
+            self.executor_service,
         )
 
     @pytest.mark.asyncio
@@ -10,6 +10,7 @@ from pdf_bot.file_processor.errors import DuplicateClassError
 from pdf_bot.image import ImageService
 from pdf_bot.image_processor import AbstractImageProcessor
 from pdf_bot.models import FileData, FileTaskResult, TaskData
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin
 
@@ -32,11 +33,14 @@ class MockProcessor(AbstractImageProcessor):
         yield MagicMock(spec=FileTaskResult)
 
 
-class TestAbstractImageProcessor(LanguageServiceTestMixin, TelegramServiceTestMixin):
+class TestAbstractImageProcessor(
+    JobSchedulerTestMixin, LanguageServiceTestMixin, TelegramServiceTestMixin
+):
     def setup_method(self) -> None:
         super().setup_method()
         self.image_service = MagicMock(spec=ImageService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.image_processors_patcher = patch(
@@ -59,7 +63,9 @@ class TestAbstractImageProcessor(LanguageServiceTestMixin, TelegramServiceTestMi
         processors: dict = {}
         self.image_processors.__contains__.side_effect = processors.__contains__
 
-        proc = MockProcessor(self.image_service, self.telegram_service, self.language_service)
+        proc = MockProcessor(
+            self.image_service, self.telegram_service, self.language_service, self.job_scheduler
+        )
 
         self.image_processors.__setitem__.assert_called_once_with(proc.__class__.__name__, proc)
 
@@ -68,7 +74,9 @@ class TestAbstractImageProcessor(LanguageServiceTestMixin, TelegramServiceTestMi
         self.image_processors.__contains__.side_effect = processors.__contains__
 
         with pytest.raises(DuplicateClassError):
-            MockProcessor(self.image_service, self.telegram_service, self.language_service)
+            MockProcessor(
+                self.image_service, self.telegram_service, self.language_service, self.job_scheduler
+            )
 
         self.image_processors.__setitem__.assert_not_called()
 
@@ -8,11 +8,13 @@ from pdf_bot.image import ImageService
 from pdf_bot.image_processor import BeautifyImageProcessor
 from pdf_bot.image_processor.beautify_image_processor import BeautifyImageData
 from pdf_bot.models import TaskData
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
 class TestBeautifyImageProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -21,12 +23,14 @@ class TestBeautifyImageProcessor(
         super().setup_method()
         self.image_service = MagicMock(spec=ImageService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.sut = BeautifyImageProcessor(
             self.image_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
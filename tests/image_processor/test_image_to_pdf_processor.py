@@ -8,11 +8,13 @@ from pdf_bot.image import ImageService
 from pdf_bot.image_processor import ImageToPdfProcessor
 from pdf_bot.image_processor.image_to_pdf_processor import ImageToPdfData
 from pdf_bot.models import TaskData
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
 class TestImageToPdfProcessorProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -21,12 +23,14 @@ class TestImageToPdfProcessorProcessor(
         super().setup_method()
         self.image_service = MagicMock(spec=ImageService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.sut = ImageToPdfProcessor(
             self.image_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
@@ -0,0 +1,121 @@
+import zipfile
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ContentStream
+
+from pdf_bot.io import FileSplitError, split_dir, split_pdf, split_zip
+
+
+class TestFileSplitter:
+    PAGE_CONTENT_SIZE = 1000
+
+    def setup_method(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.root_dir = Path(self.temp_dir.name)
+        self.out_dir = self.root_dir / "out"
+        self.out_dir.mkdir()
+
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_split_pdf(self) -> None:
+        path = self._create_pdf(num_pages=10)
+
+        actual = split_pdf(path, self.out_dir, max_size=3000)
+
+        assert len(actual) > 1
+        assert actual[0].name == "file_pages_1-2.pdf"
+        assert all(x.stat().st_size <= 3000 for x in actual)
+        assert sum(len(PdfReader(x).pages) for x in actual) == 10
+
+    def test_split_pdf_halves_large_parts(self) -> None:
+        path = self._create_pdf(num_pages=4)
+
+        # Make the initial estimate keep all the pages in a single part, which is too large
+        with patch("pdf_bot.io.file_splitter._PDF_PART_SIZE_RATIO", 10):
+            actual = split_pdf(path, self.out_dir, max_size=1800)
+
+        assert [x.name for x in actual] == [f"file_pages_{i}-{i}.pdf" for i in range(1, 5)]
+        assert sorted(x.name for x in self.out_dir.iterdir()) == sorted(x.name for x in actual)
+
+    def test_split_pdf_page_too_large(self) -> None:
+        path = self._create_pdf(num_pages=2)
+
+        with pytest.raises(FileSplitError):
+            split_pdf(path, self.out_dir, max_size=self.PAGE_CONTENT_SIZE)
+
+    def test_split_dir(self) -> None:
+        dir_path = self._create_dir({f"{i}.png": 1000 for i in range(5)})
+
+        actual = split_dir(dir_path, self.out_dir, max_size=2500)
+
+        assert [x.name for x in actual] == [f"images_part{i}.zip" for i in range(1, 4)]
+        assert all(x.stat().st_size <= 2500 for x in actual)
+
+        names = []
+        for path in actual:
+            with zipfile.ZipFile(path) as archive:
+                names.extend(archive.namelist())
+        assert names == [f"{i}.png" for i in range(5)]
+
+    def test_split_dir_single_volume(self) -> None:
+        dir_path = self._create_dir({"a.png": 10, "nested/b.txt": 10})
+
+        actual = split_dir(dir_path, self.out_dir, max_size=1000)
+
+        assert actual == [self.out_dir / "images.zip"]
+        with zipfile.ZipFile(actual[0]) as archive:
+            assert archive.namelist() == ["a.png", "nested/b.txt"]
+
+    def test_split_dir_empty(self) -> None:
+        dir_path = self._create_dir({})
+
+        actual = split_dir(dir_path, self.out_dir, max_size=1000)
+
+        assert actual == [self.out_dir / "images.zip"]
+        with zipfile.ZipFile(actual[0]) as archive:
+            assert archive.namelist() == []
+
+    def test_split_dir_file_too_large(self) -> None:
+        dir_path = self._create_dir({"a.png": 2000})
+
+        with pytest.raises(FileSplitError):
+            split_dir(dir_path, self.out_dir, max_size=1000)
+
+    def test_split_zip(self) -> None:
+        dir_path = self._create_dir({f"{i}.png": 1000 for i in range(3)})
+        zip_path = self.root_dir / "archive.zip"
+        with zipfile.ZipFile(zip_path, "w") as archive:
+            for path in sorted(dir_path.iterdir()):
+                archive.write(path, path.name)
+
+        actual = split_zip(zip_path, self.out_dir, max_size=1500)
+
+        assert [x.name for x in actual] == [f"archive_part{i}.zip" for i in range(1, 4)]
+        assert sorted(x.name for x in self.out_dir.iterdir()) == [x.name for x in actual]
+
+    def _create_pdf(self, num_pages: int) -> Path:
+        writer = PdfWriter()
+        for _ in range(num_pages):
+            page = writer.add_blank_page(100, 100)
+            content = ContentStream(None, writer)
+            content.set_data(b"%" + b"x" * self.PAGE_CONTENT_SIZE + b"\n")
+            page.replace_contents(content)
+
+        path = self.root_dir / "file.pdf"
+        writer.write(path)
+        return path
+
+    def _create_dir(self, files: dict[str, int]) -> Path:
+        dir_path = self.root_dir / "images"
+        dir_path.mkdir()
+
+        for name, size in files.items():
+            path = dir_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"a" * size)
+        return dir_path
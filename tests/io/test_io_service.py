@@ -109,6 +109,12 @@ class TestIOService:
             assert actual == self.FILE_PATH
         self._assert_temp_file(self.FILE_PREFIX_UNDERSCORE, ".png")
 
+    @pytest.mark.asyncio
+    async def test_create_temp_zip_file(self) -> None:
+        with self.sut.create_temp_zip_file(self.FILE_PREFIX_UNDERSCORE) as actual:
+            assert actual == self.FILE_PATH
+        self._assert_temp_file(self.FILE_PREFIX_UNDERSCORE, ".zip")
+
     @pytest.mark.asyncio
     async def test_create_temp_txt_file(self) -> None:
         with self.sut.create_temp_txt_file(self.FILE_PREFIX_UNDERSCORE) as actual:
@@ -0,0 +1,83 @@
+import zipfile
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from pdf_bot.io import ZipArchiveTooLargeError, ZipArchiveWriter
+
+
+class TestZipArchiveWriter:
+    def setup_method(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.dir_path = Path(self.temp_dir.name) / "files"
+        self.dir_path.mkdir()
+        self.out_path = Path(self.temp_dir.name) / "files.zip"
+
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_write_dir(self) -> None:
+        self._create_file("b.txt", b"text" * 100)
+        self._create_file("a.PNG", b"image")
+        self._create_file("nested/c.jpg", b"image")
+
+        with ZipArchiveWriter(self.out_path) as writer:
+            writer.write_dir(self.dir_path)
+            expected_size = writer.size
+
+        assert self.out_path.stat().st_size == expected_size
+        with zipfile.ZipFile(self.out_path) as archive:
+            actual = {x.filename: x.compress_type for x in archive.infolist()}
+            assert archive.read("b.txt") == b"text" * 100
+
+        assert actual == {
+            "a.PNG": zipfile.ZIP_STORED,
+            "b.txt": zipfile.ZIP_DEFLATED,
+            "nested/c.jpg": zipfile.ZIP_STORED,
+        }
+
+    def test_write_with_arcname(self) -> None:
+        path = self._create_file("a.png", b"image")
+
+        with ZipArchiveWriter(self.out_path) as writer:
+            writer.write(path, "page_1.png")
+
+        with zipfile.ZipFile(self.out_path) as archive:
+            assert archive.namelist() == ["page_1.png"]
+
+    def test_write_stored_too_large(self) -> None:
+        path = self._create_file("a.png", b"a" * 100)
+
+        with (
+            pytest.raises(ZipArchiveTooLargeError),
+            ZipArchiveWriter(self.out_path, max_size=100) as writer,
+        ):
+            writer.write(path)
+
+        # The size of stored entries is checked before they are written
+        with zipfile.ZipFile(self.out_path) as archive:
+            assert archive.namelist() == []
+
+    def test_write_deflated_too_large(self) -> None:
+        path = self._create_file("a.txt", bytes(range(256)))
+
+        with (
+            pytest.raises(ZipArchiveTooLargeError),
+            ZipArchiveWriter(self.out_path, max_size=100) as writer,
+        ):
+            writer.write(path)
+
+    def test_write_within_max_size(self) -> None:
+        path = self._create_file("a.png", b"a" * 100)
+
+        with ZipArchiveWriter(self.out_path, max_size=1000) as writer:
+            writer.write(path)
+
+        assert self.out_path.stat().st_size <= 1000
+
+    def _create_file(self, name: str, content: bytes) -> Path:
+        path = self.dir_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        return path
@@ -0,0 +1,3 @@
+from .job_scheduler_test_mixin import JobSchedulerTestMixin
+
+__all__ = ["JobSchedulerTestMixin"]
@@ -0,0 +1,11 @@
+from unittest.mock import MagicMock
+
+from pdf_bot.job_scheduler import JobScheduler, ScheduledJob
+
+
+class JobSchedulerTestMixin:
+    @staticmethod
+    def mock_job_scheduler() -> MagicMock:
+        scheduler = MagicMock(spec=JobScheduler)
+        scheduler.schedule.return_value.__aenter__.return_value = MagicMock(spec=ScheduledJob)
+        return scheduler
@@ -0,0 +1,176 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from pdf_bot.analytics import TaskType
+from pdf_bot.executor import ExecutorService, WorkerPool
+from pdf_bot.job_scheduler import JobLane, JobScheduler, JobTimeoutError
+from pdf_bot.settings import Settings
+
+
+class TestJobScheduler:
+    USER_ID = 0
+    OTHER_USER_ID = 1
+
+    def setup_method(self) -> None:
+        self.settings = Settings(
+            job_max_concurrency=3,
+            job_light_max_concurrency=3,
+            job_heavy_max_concurrency=2,
+            job_max_jobs_per_user=2,
+        )
+        self.sut = JobScheduler(self.settings)
+        self.started: list[int] = []
+        self.positions: list[int] = []
+
+    @pytest.mark.asyncio
+    async def test_schedule(self) -> None:
+        async with self.sut.schedule(self.USER_ID, JobLane.heavy) as job:
+            assert self.sut.num_running == 1
+            job.release()
+            assert self.sut.num_running == 0
+
+        assert self.sut.num_running == 0
+
+    @pytest.mark.asyncio
+    async def test_schedule_lane_limit(self) -> None:
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(self._run_job(x, JobLane.heavy, release)) for x in range(3)]
+        await asyncio.sleep(0)
+
+        assert self.started == [0, 1]
+        assert self.positions == [1]
+
+        # Light jobs don't wait behind heavy ones
+        await self._run_job(3, JobLane.light)
+        assert self.started == [0, 1, 3]
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert self.started == [0, 1, 3, 2]
+
+    @pytest.mark.asyncio
+    async def test_schedule_global_limit(self) -> None:
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(self._run_job(x, JobLane.light, release)) for x in range(4)]
+        await asyncio.sleep(0)
+
+        assert self.started == [0, 1, 2]
+        assert self.sut.num_waiting == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert self.started == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_schedule_user_limit_and_fairness(self) -> None:
+        release = asyncio.Event()
+        tasks = [
+            asyncio.create_task(self._run_job(self.USER_ID, JobLane.light, release))
+            for _ in range(4)
+        ]
+        await asyncio.sleep(0)
+        assert self.started == [self.USER_ID] * 2
+
+        # The other user jumps ahead of the queued jobs as they have none running
+        tasks.append(asyncio.create_task(self._run_job(self.OTHER_USER_ID, JobLane.light)))
+        await asyncio.sleep(0)
+        assert self.started == [self.USER_ID, self.USER_ID, self.OTHER_USER_ID]
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert self.started.count(self.USER_ID) == 4
+
+    @pytest.mark.asyncio
+    async def test_schedule_cancelled_while_waiting(self) -> None:
+        release = asyncio.Event()
+        running = asyncio.create_task(self._run_job(self.USER_ID, JobLane.light, release))
+        await asyncio.sleep(0)
+        self.sut.max_jobs_per_user = 1
+
+        waiting = asyncio.create_task(self._run_job(self.USER_ID, JobLane.light))
+        await asyncio.sleep(0)
+        assert self.sut.num_waiting == 1
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert self.sut.num_waiting == 0
+
+        release.set()
+        await running
+        assert self.sut.num_running == 0
+
+    @pytest.mark.asyncio
+    async def test_schedule_cancelled_after_start(self) -> None:
+        self.sut.max_jobs_per_user = 1
+        schedule = self.sut.schedule(self.USER_ID, JobLane.light)
+        job = await schedule.__aenter__()
+
+        waiting = asyncio.create_task(self._run_job(self.USER_ID, JobLane.light))
+        await asyncio.sleep(0)
+
+        # The slot is handed over to the waiting job, which is cancelled before it resumes
+        job.release()
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        await schedule.__aexit__(None, None, None)
+
+        assert self.started == []
+        assert self.sut.num_running == 0
+
+    @pytest.mark.asyncio
+    async def test_time_budget(self) -> None:
+        self.sut.task_timeouts = {TaskType.ocr_pdf.value: 0.01}
+
+        with pytest.raises(JobTimeoutError):
+            async with self.sut.time_budget(TaskType.ocr_pdf):
+                await asyncio.sleep(1)
+
+    @pytest.mark.asyncio
+    async def test_time_budget_kills_worker(self) -> None:
+        self.sut.task_timeouts = {TaskType.ocr_pdf.value: 0.5}
+        executor_service = ExecutorService(Settings(executor_heavy_pool_size=1))
+
+        try:
+            # Workers are reused, so this is the process that runs the timed out job
+            pid = await executor_service.run_killable(WorkerPool.heavy, os.getpid)
+            with pytest.raises(JobTimeoutError):
+                async with self.sut.time_budget(TaskType.ocr_pdf):
+                    await executor_service.run_killable(WorkerPool.heavy, time.sleep, 60)
+
+            # The worker is terminated rather than left running in the background
+            with pytest.raises(ProcessLookupError):
+                os.kill(pid, 0)
+        finally:
+            executor_service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_time_budget_other_timeout(self) -> None:
+        with pytest.raises(TimeoutError) as exc_info:
+            async with self.sut.time_budget(TaskType.ocr_pdf):
+                raise TimeoutError
+
+        assert not isinstance(exc_info.value, JobTimeoutError)
+
+    def test_get_timeout(self) -> None:
+        assert self.sut.get_timeout(TaskType.ocr_pdf) == self.settings.task_timeouts["ocr_pdf"]
+        assert self.sut.get_timeout(TaskType.rename_pdf) == self.settings.task_timeout
+
+    def test_init_with_dict(self) -> None:
+        sut = JobScheduler(self.settings.model_dump())
+        assert sut.max_jobs_per_user == self.settings.job_max_jobs_per_user
+
+    async def _run_job(
+        self, user_id: int, lane: JobLane, release: asyncio.Event | None = None
+    ) -> None:
+        async with self.sut.schedule(user_id, lane, self._on_queued):
+            self.started.append(user_id)
+            if release is not None:
+                await release.wait()
+
+    async def _on_queued(self, position: int) -> None:
+        self.positions.append(position)
@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+from pdf_bot.language import LanguageCache
+
+
+class TestLanguageCache:
+    USER_ID = 1
+    LANGUAGE = "en_US"
+    TTL = 10
+    NEGATIVE_TTL = 5
+
+    def setup_method(self) -> None:
+        self.now = 100.0
+        self.time_patcher = patch(
+            "pdf_bot.language.language_cache.time.monotonic", side_effect=lambda: self.now
+        )
+        self.time_patcher.start()
+
+        self.sut = LanguageCache(max_size=2, ttl=self.TTL, negative_ttl=self.NEGATIVE_TTL)
+
+    def teardown_method(self) -> None:
+        self.time_patcher.stop()
+
+    def test_get_miss(self) -> None:
+        assert self.sut.get(self.USER_ID) is None
+
+    def test_set_and_get(self) -> None:
+        self.sut.set(self.USER_ID, self.LANGUAGE)
+
+        entry = self.sut.get(self.USER_ID)
+
+        assert entry is not None
+        assert entry.language == self.LANGUAGE
+
+    def test_negative_entry(self) -> None:
+        self.sut.set(self.USER_ID, None)
+
+        entry = self.sut.get(self.USER_ID)
+        assert entry is not None
+        assert entry.language is None
+
+        self.now += self.NEGATIVE_TTL
+        assert self.sut.get(self.USER_ID) is None
+
+    def test_expired(self) -> None:
+        self.sut.set(self.USER_ID, self.LANGUAGE)
+
+        self.now += self.TTL - 1
+        assert self.sut.get(self.USER_ID) is not None
+
+        self.now += 1
+        assert self.sut.get(self.USER_ID) is None
+        assert len(self.sut) == 0
+
+    def test_evict_least_recently_used(self) -> None:
+        self.sut.set(1, self.LANGUAGE)
+        self.sut.set(2, self.LANGUAGE)
+        self.sut.get(1)
+        self.sut.set(3, self.LANGUAGE)
+
+        assert len(self.sut) == 2
+        assert self.sut.get(1) is not None
+        assert self.sut.get(2) is None
+        assert self.sut.get(3) is not None
@@ -0,0 +1,28 @@
+import pytest
+from telegram.ext import TypeHandler
+
+from pdf_bot.language import LanguagePreloadHandler
+from tests.telegram_internal import TelegramTestMixin
+
+from .language_service_test_mixin import LanguageServiceTestMixin
+
+
+class TestLanguagePreloadHandler(LanguageServiceTestMixin, TelegramTestMixin):
+    def setup_method(self) -> None:
+        super().setup_method()
+        self.language_service = self.mock_language_service()
+        self.sut = LanguagePreloadHandler(self.language_service)
+
+    @pytest.mark.asyncio
+    async def test_handlers(self) -> None:
+        actual = self.sut.handlers
+        assert len(actual) == 1
+        assert self.sut.GROUP < 0
+
+        handler = actual[0]
+        assert isinstance(handler, TypeHandler)
+
+        await handler.callback(self.telegram_update, self.telegram_context)
+        self.language_service.preload_user_language.assert_called_once_with(
+            self.telegram_update, self.telegram_context
+        )
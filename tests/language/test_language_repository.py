@@ -1,9 +1,12 @@
+import asyncio
 from typing import Any, ClassVar
 from unittest.mock import MagicMock, patch
 
+import pytest
 from google.cloud.datastore import Client, Entity
 
-from pdf_bot.consts import LANGUAGE
+from pdf_bot.consts import LANGUAGE, USER
+from pdf_bot.datastore import MemoryDatastoreClient
 from pdf_bot.language import LanguageRepository
 
 
@@ -14,55 +17,83 @@ class TestLanguageRepository:
 
     def setup_method(self) -> None:
         self.user_entity = MagicMock(spec=Entity)
+        self.user_entity.key = MagicMock(id=self.USER_ID)
         self.db_client = MagicMock(spec=Client)
 
         self.sut = LanguageRepository(self.db_client)
 
+        self.memory_client = MemoryDatastoreClient()
+        self.memory_sut = LanguageRepository(self.memory_client)
+
     def test_get_language(self) -> None:
         self._mock_user_entity_dict()
-        self.db_client.get.return_value = self.user_entity
+        self.db_client.get_multi.return_value = [self.user_entity]
 
         actual = self.sut.get_language(self.USER_ID)
 
         assert actual == self.LANGUAGE_CODE
 
     def test_get_language_without_user(self) -> None:
-        self.db_client.get.return_value = None
+        self.db_client.get_multi.return_value = []
         actual = self.sut.get_language(self.USER_ID)
         assert actual == self.sut.EN_GB_CODE
 
     def test_get_language_and_language_not_set(self) -> None:
-        self.db_client.get.return_value = self.user_entity
+        self.db_client.get_multi.return_value = [self.user_entity]
         actual = self.sut.get_language(self.USER_ID)
         assert actual == self.sut.EN_GB_CODE
 
     def test_get_language_legacy_en_code(self) -> None:
         user_entity_dict = {LANGUAGE: "en"}
         self._mock_user_entity_dict(user_entity_dict)
-        self.db_client.get.return_value = self.user_entity
+        self.db_client.get_multi.return_value = [self.user_entity]
 
         actual = self.sut.get_language(self.USER_ID)
 
         assert actual == self.sut.EN_GB_CODE
 
-    def test_upsert_language(self) -> None:
-        self.db_client.get.return_value = self.user_entity
+    def test_get_languages(self) -> None:
+        self._mock_user_entity_dict()
+        self.db_client.get_multi.return_value = [self.user_entity]
+
+        with patch.object(LanguageRepository, "_MAX_GET_MULTI_KEYS", 2):
+            actual = self.sut.get_languages([self.USER_ID, 1, 2])
+
+        assert actual == {self.USER_ID: self.LANGUAGE_CODE, 1: None, 2: None}
+        assert self.db_client.get_multi.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_upsert_language(self) -> None:
+        key = self.memory_client.key(USER, self.USER_ID)
+        self.memory_client.put(Entity(key))
+
+        await self.memory_sut.upsert_language(self.USER_ID, self.LANGUAGE_CODE)
+
+        assert self.memory_sut.get_language(self.USER_ID) == self.LANGUAGE_CODE
+
+    @pytest.mark.asyncio
+    async def test_upsert_language_without_user(self) -> None:
+        await self.memory_sut.upsert_language(self.USER_ID, self.LANGUAGE_CODE)
 
-        self.sut.upsert_language(self.USER_ID, self.LANGUAGE_CODE)
+        assert self.memory_sut.get_language(self.USER_ID) == self.LANGUAGE_CODE
+        assert self.memory_client.num_writes == 1
 
-        self.user_entity.__setitem__.assert_called_with(LANGUAGE, self.LANGUAGE_CODE)
-        self.db_client.put.assert_called_once_with(self.user_entity)
+    @pytest.mark.asyncio
+    async def test_upsert_language_unchanged(self) -> None:
+        await self.memory_sut.upsert_language(self.USER_ID, self.LANGUAGE_CODE)
+        await self.memory_sut.upsert_language(self.USER_ID, self.LANGUAGE_CODE)
 
-    def test_upsert_language_without_user(self) -> None:
-        self.db_client.get.return_value = None
+        assert self.memory_client.num_writes == 1
 
-        with patch("pdf_bot.language.language_repository.Entity") as entity_cls:
-            entity_cls.return_value = self.user_entity
-            self.sut.upsert_language(self.USER_ID, self.LANGUAGE_CODE)
+    @pytest.mark.asyncio
+    async def test_upsert_language_concurrent(self) -> None:
+        await asyncio.gather(
+            *[self.memory_sut.upsert_language(self.USER_ID, str(x)) for x in range(5)]
+        )
 
-        entity_cls.assert_called_once()
-        self.user_entity.__setitem__.assert_called_with(LANGUAGE, self.LANGUAGE_CODE)
-        self.db_client.put.assert_called_once_with(self.user_entity)
+        # Only the latest language is written
+        assert self.memory_sut.get_language(self.USER_ID) == "4"
+        assert self.memory_client.num_writes == 1
 
     def _mock_user_entity_dict(self, user_entity_dict: dict[str, Any] | None = None) -> None:
         if user_entity_dict is None:
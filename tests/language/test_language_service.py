@@ -1,9 +1,11 @@
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from pdf_bot.errors import CallbackQueryDataTypeError, UserIdError
 from pdf_bot.language import LanguageData, LanguageRepository, LanguageService
+from pdf_bot.settings import Settings
 from tests.telegram_internal.telegram_test_mixin import TelegramTestMixin
 
 
@@ -15,12 +17,14 @@ class TestLanguageService(TelegramTestMixin):
     def setup_method(self) -> None:
         super().setup_method()
         self.language_repository = MagicMock(spec=LanguageRepository)
-        self.language_repository.get_language.return_value = self.EN_CODE
+        self.language_repository.get_languages.side_effect = lambda user_ids: dict.fromkeys(
+            user_ids, self.EN_CODE
+        )
 
-        self.sut = LanguageService(self.language_repository)
+        self.sut = LanguageService(self.language_repository, Settings())
 
         self.gettext_patcher = patch("pdf_bot.language.language_service.gettext")
-        self.gettext_patcher.start()
+        self.gettext = self.gettext_patcher.start()
 
     def teardown_method(self) -> None:
         self.gettext_patcher.stop()
@@ -58,7 +62,9 @@ class TestLanguageService(TelegramTestMixin):
         actual = self.sut.get_user_language(self.telegram_update, self.telegram_context)
 
         assert actual == self.EN_CODE
-        self.language_repository.get_language.assert_called_once_with(self.TELEGRAM_QUERY_USER_ID)
+        self.language_repository.get_languages.assert_called_once_with(
+            [self.TELEGRAM_QUERY_USER_ID]
+        )
         self.telegram_user_data.__setitem__.assert_called_once_with(
             self.LANGUAGE_CODE, self.EN_CODE
         )
@@ -89,7 +95,7 @@ class TestLanguageService(TelegramTestMixin):
         actual = self.sut.get_user_language(self.telegram_update, self.telegram_context)
 
         assert actual == self.EN_CODE
-        self.language_repository.get_language.assert_called_once_with(self.TELEGRAM_USER_ID)
+        self.language_repository.get_languages.assert_called_once_with([self.TELEGRAM_USER_ID])
         self.telegram_user_data.__setitem__.assert_called_once_with(
             self.LANGUAGE_CODE, self.EN_CODE
         )
@@ -104,7 +110,7 @@ class TestLanguageService(TelegramTestMixin):
         actual = self.sut.get_user_language(self.telegram_update, self.telegram_context)
 
         assert actual == self.EN_CODE
-        self.language_repository.get_language.assert_called_once_with(self.TELEGRAM_CHAT_ID)
+        self.language_repository.get_languages.assert_called_once_with([self.TELEGRAM_CHAT_ID])
         self.telegram_user_data.__setitem__.assert_called_once_with(
             self.LANGUAGE_CODE, self.EN_CODE
         )
@@ -119,9 +125,136 @@ class TestLanguageService(TelegramTestMixin):
         with pytest.raises(UserIdError):
             self.sut.get_user_language(self.telegram_update, self.telegram_context)
 
-        self.language_repository.get_language.assert_not_called()
+        self.language_repository.get_languages.assert_not_called()
         self.telegram_user_data.__setitem__.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_get_user_language_from_cache(self) -> None:
+        self.telegram_user_data.get.return_value = None
+        self.sut.cache.set(self.TELEGRAM_QUERY_USER_ID, self.EN_CODE)
+
+        actual = self.sut.get_user_language(self.telegram_update, self.telegram_context)
+
+        assert actual == self.EN_CODE
+        self.language_repository.get_languages.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_user_language_negative_entry(self) -> None:
+        self.telegram_user_data.get.return_value = None
+        self.language_repository.get_languages.side_effect = lambda user_ids: dict.fromkeys(
+            user_ids
+        )
+
+        for _ in range(2):
+            actual = self.sut.get_user_language(self.telegram_update, self.telegram_context)
+            assert actual == LanguageRepository.EN_GB_CODE
+
+        self.language_repository.get_languages.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_preload_user_language(self) -> None:
+        user_data_list: list[dict] = [{}, {}, {}]
+        contexts = []
+        updates = []
+        for i, user_data in enumerate(user_data_list):
+            update = MagicMock()
+            update.callback_query.from_user.id = i
+            updates.append(update)
+            contexts.append(MagicMock(user_data=user_data))
+
+        await asyncio.gather(
+            *[
+                self.sut.preload_user_language(update, context)
+                for update, context in zip(updates, contexts, strict=True)
+            ],
+            # Concurrent lookup of the same user
+            self.sut.preload_user_language(updates[0], MagicMock(user_data={})),
+        )
+
+        self.language_repository.get_languages.assert_called_once_with([0, 1, 2])
+        assert user_data_list == [{self.LANGUAGE_CODE: self.EN_CODE}] * 3
+
+        # Later lookups are served from the cache
+        await self.sut.preload_user_language(updates[1], MagicMock(user_data={}))
+        self.language_repository.get_languages.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_preload_user_language_already_set(self) -> None:
+        self.telegram_user_data.get.return_value = self.EN_CODE
+
+        await self.sut.preload_user_language(self.telegram_update, self.telegram_context)
+
+        self.language_repository.get_languages.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_preload_user_language_without_user(self) -> None:
+        self.telegram_user_data.get.return_value = None
+        self.telegram_update.callback_query = None
+        self.telegram_update.effective_message = None
+        self.telegram_update.effective_chat = None
+
+        await self.sut.preload_user_language(self.telegram_update, self.telegram_context)
+
+        self.language_repository.get_languages.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_preload_user_language_error(self) -> None:
+        self.telegram_user_data.get.return_value = None
+        self.language_repository.get_languages.side_effect = RuntimeError
+
+        with pytest.raises(RuntimeError):
+            await self.sut.preload_user_language(self.telegram_update, self.telegram_context)
+
+        assert self.sut.cache.get(self.TELEGRAM_QUERY_USER_ID) is None
+
+    @pytest.mark.parametrize("cached_language", [None, "es_ES"])
+    def test_set_new_user_language(self, cached_language: str | None) -> None:
+        user_data = {self.LANGUAGE_CODE: LanguageRepository.EN_GB_CODE}
+        context = MagicMock(user_data=user_data)
+        self.sut.cache.set(self.TELEGRAM_USER_ID, cached_language)
+
+        self.sut.set_new_user_language(self.TELEGRAM_USER_ID, context, self.EN_CODE)
+
+        # Users that have already set a language keep it
+        expected = cached_language or self.EN_CODE
+        entry = self.sut.cache.get(self.TELEGRAM_USER_ID)
+        assert entry is not None
+        assert entry.language == expected
+        if cached_language is None:
+            assert user_data == {self.LANGUAGE_CODE: expected}
+
+    def test_set_app_language(self) -> None:
+        self.telegram_user_data.get.return_value = self.EN_CODE
+
+        actual = self.sut.set_app_language(self.telegram_update, self.telegram_context)
+
+        assert actual == self.gettext.translation.return_value.gettext
+        self.gettext.translation.assert_called_once_with(
+            "pdf_bot", localedir="locale", languages=[self.EN_CODE]
+        )
+
+    def test_set_app_language_memoized(self) -> None:
+        self.gettext.translation.side_effect = lambda *_args, languages, **_kwargs: MagicMock(
+            gettext=languages[0]
+        )
+        self.telegram_user_data.get.return_value = self.EN_CODE
+
+        actual_a = self.sut.set_app_language(self.telegram_update, self.telegram_context)
+        actual_b = self.sut.set_app_language(self.telegram_update, self.telegram_context)
+        self.telegram_user_data.get.return_value = "es_ES"
+        actual_c = self.sut.set_app_language(self.telegram_update, self.telegram_context)
+
+        assert actual_a is actual_b
+        assert actual_c == "es_ES"
+        assert self.gettext.translation.call_count == 2
+
+    def test_init_with_dict(self) -> None:
+        settings = Settings(language_cache_max_size=1, language_cache_ttl=2)
+        sut = LanguageService(self.language_repository, settings.model_dump())
+
+        assert sut.cache.max_size == 1
+        assert sut.cache.ttl == 2
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize("side_effect", [None, KeyError])
     async def test_update_user_language(self, side_effect: type[Exception] | None) -> None:
@@ -141,6 +274,11 @@ class TestLanguageService(TelegramTestMixin):
             self.LANGUAGE_CODE, self.EN_CODE
         )
 
+        # The new language is written through to the cache
+        entry = self.sut.cache.get(self.TELEGRAM_QUERY_USER_ID)
+        assert entry is not None
+        assert entry.language == self.EN_CODE
+
     @pytest.mark.asyncio
     async def test_update_user_language_without_user_data(self) -> None:
         self.telegram_callback_query.data = self.LANGUAGE_DATA
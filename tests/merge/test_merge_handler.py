@@ -26,6 +26,8 @@ class TestMergeHandler(TelegramServiceTestMixin):
 
         handler = actual[0]
         assert isinstance(handler, ConversationHandler)
+        assert handler.name == "merge"
+        assert handler.persistent
 
         entry_points = handler.entry_points
         assert len(entry_points) == 1
@@ -0,0 +1,240 @@
+import asyncio
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest.mock import MagicMock
+
+import pikepdf
+import pytest
+from PIL import Image, ImageFilter
+
+from pdf_bot.cli import CLIService, CLIServiceError
+from pdf_bot.executor import WorkerPool
+from pdf_bot.pdf import CompressLevel, CompressStrategy, PdfCompressor
+from pdf_bot.pdf.exceptions import PdfServiceError
+from pdf_bot.pdf.image_recompressor import recompress_images
+from pdf_bot.settings import Settings
+from tests.executor import ExecutorServiceTestMixin
+
+
+class TestPdfCompressor(ExecutorServiceTestMixin):
+    NUM_PAGES = 3
+    LARGE_CONTENT = b"0 0 m 10 10 l S " * 10_000
+    IMAGE_SIZE = 600
+    IMAGE_CONTENT = b"q 144 0 0 144 0 0 cm /Im0 Do Q 0 0 m 10 10 l S"
+
+    def setup_method(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.dir_path = Path(self.temp_dir.name)
+        self.out_dir = self.dir_path / "out"
+        self.out_dir.mkdir()
+
+        # Uncompressed content streams, which the lossless rewrite compresses
+        self.input_path = self.dir_path / "input.pdf"
+        self._write_pdf(self.input_path, self.NUM_PAGES, b"0 0 m 10 10 l S " * 1000)
+
+        self.cli_service = MagicMock(spec=CLIService)
+        self.executor_service = self.mock_executor_service()
+        self.sut = PdfCompressor(
+            self.cli_service, self.executor_service, Settings(compress_timeout=5)
+        )
+
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_compress_low(self) -> None:
+        actual = await self.sut.compress(self.input_path, self.out_dir, CompressLevel.low)
+
+        assert actual == self._get_out_path(CompressStrategy.lossless)
+        assert actual.stat().st_size < self.input_path.stat().st_size
+        with pikepdf.open(actual) as pdf:
+            assert len(pdf.pages) == self.NUM_PAGES
+
+        self.cli_service.compress_pdf.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_compress_keeps_smallest(self) -> None:
+        self.cli_service.compress_pdf.side_effect = self._write_output
+
+        actual = await self.sut.compress(self.input_path, self.out_dir, CompressLevel.high)
+
+        assert actual in {
+            self._get_out_path(CompressStrategy.ghostscript_ebook),
+            self._get_out_path(CompressStrategy.ghostscript_screen),
+        }
+        self.cli_service.compress_pdf.assert_any_call(
+            self.input_path, self._get_out_path(CompressStrategy.ghostscript_ebook), "ebook"
+        )
+        self.cli_service.compress_pdf.assert_any_call(
+            self.input_path, self._get_out_path(CompressStrategy.ghostscript_screen), "screen"
+        )
+
+    @pytest.mark.asyncio
+    async def test_compress_skips_failed_strategies(self) -> None:
+        self.cli_service.compress_pdf.side_effect = [CLIServiceError, FileNotFoundError]
+
+        actual = await self.sut.compress(self.input_path, self.out_dir, CompressLevel.medium)
+        assert actual == self._get_out_path(CompressStrategy.lossless)
+
+    @pytest.mark.asyncio
+    async def test_compress_skips_invalid_outputs(self) -> None:
+        async def write_invalid(_input_path: Path, output_path: Path, preset: str) -> None:
+            if preset == "ebook":
+                output_path.write_bytes(b"invalid")
+            else:
+                self._write_pdf(output_path, self.NUM_PAGES - 1)
+
+        self.cli_service.compress_pdf.side_effect = write_invalid
+
+        actual = await self.sut.compress(self.input_path, self.out_dir, CompressLevel.high)
+        assert actual == self._get_out_path(CompressStrategy.lossless)
+
+    @pytest.mark.asyncio
+    async def test_compress_downsample_images(self) -> None:
+        self._write_image_pdf(self.input_path)
+        self.cli_service.compress_pdf.side_effect = CLIServiceError
+
+        actual = await self.sut.compress(self.input_path, self.out_dir, CompressLevel.medium)
+
+        assert actual == self._get_out_path(CompressStrategy.downsample_images)
+        with pikepdf.open(actual) as pdf:
+            assert len(pdf.pages) == self.NUM_PAGES
+            for page in pdf.pages:
+                image = page.Resources.XObject.Im0
+                assert image.Filter == pikepdf.Name.DCTDecode
+                assert image.Width == self.IMAGE_SIZE * 150 // 300
+                # Text is kept as it is
+                assert page.Contents.read_bytes() == self.IMAGE_CONTENT
+
+    @pytest.mark.asyncio
+    async def test_compress_downsample_images_spreads_batches(self) -> None:
+        self._write_image_pdf(self.input_path, distinct_images=True)
+        self.cli_service.compress_pdf.side_effect = CLIServiceError
+        self.sut.image_workers = 2
+
+        await self.sut.compress(self.input_path, self.out_dir, CompressLevel.medium)
+
+        batch_calls = [
+            x
+            for x in self.executor_service.run_killable.call_args_list
+            if x.args[1] == recompress_images
+        ]
+        assert sorted(len(x.args[3]) for x in batch_calls) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_compress_downsample_images_batch_failed(self) -> None:
+        self._write_image_pdf(self.input_path)
+
+        def fail_batches(_pool: WorkerPool, func: Callable, *args: Any) -> Any:
+            if func == recompress_images:
+                raise OSError
+            return func(*args)
+
+        self.executor_service.run_killable.side_effect = fail_batches
+        self.cli_service.compress_pdf.side_effect = CLIServiceError
+
+        actual = await self.sut.compress(self.input_path, self.out_dir, CompressLevel.medium)
+        assert actual != self._get_out_path(CompressStrategy.downsample_images)
+        assert not self._get_out_path(CompressStrategy.downsample_images).exists()
+
+    @pytest.mark.asyncio
+    async def test_compress_not_smaller(self) -> None:
+        def write_large_output(_pool: WorkerPool, func: Callable, *args: Any) -> Any:
+            out_path = self._get_out_path(CompressStrategy.lossless)
+            if args[-1] == out_path:
+                self._write_pdf(out_path, self.NUM_PAGES, self.LARGE_CONTENT)
+                return None
+            return func(*args)
+
+        self.executor_service.run_killable.side_effect = write_large_output
+        self.cli_service.compress_pdf.side_effect = self._write_large_output
+
+        actual = await self.sut.compress(self.input_path, self.out_dir, CompressLevel.medium)
+        assert actual is None
+
+    @pytest.mark.asyncio
+    async def test_compress_timeout(self) -> None:
+        async def hang(*_args: Any) -> None:
+            await asyncio.sleep(10)
+
+        self.sut.timeout = 0.1
+        self.cli_service.compress_pdf.side_effect = hang
+
+        # The strategies that finished in time are still used
+        actual = await self.sut.compress(self.input_path, self.out_dir, CompressLevel.medium)
+        assert actual == self._get_out_path(CompressStrategy.lossless)
+
+    @pytest.mark.asyncio
+    async def test_compress_timeout_all_strategies(self) -> None:
+        async def hang(*_args: Any) -> None:
+            await asyncio.sleep(10)
+
+        self.sut.timeout = 0.1
+        self.executor_service.run_killable.side_effect = hang
+        self.cli_service.compress_pdf.side_effect = hang
+
+        with pytest.raises(PdfServiceError, match="too long"):
+            await self.sut.compress(self.input_path, self.out_dir, CompressLevel.medium)
+
+    @pytest.mark.asyncio
+    async def test_compress_unexpected_error(self) -> None:
+        self.cli_service.compress_pdf.side_effect = ValueError
+
+        # The outputs of the other strategies are still used
+        actual = await self.sut.compress(self.input_path, self.out_dir, CompressLevel.medium)
+        assert actual == self._get_out_path(CompressStrategy.lossless)
+
+    def test_init_with_dict(self) -> None:
+        sut = PdfCompressor(
+            self.cli_service,
+            self.executor_service,
+            Settings(compress_timeout=10).model_dump(),
+        )
+        assert sut.timeout == 10
+        assert sut.image_workers == Settings().executor_heavy_pool_size
+
+    def _get_out_path(self, strategy: CompressStrategy) -> Path:
+        return self.out_dir / f"{strategy.value}.pdf"
+
+    async def _write_output(self, _input_path: Path, output_path: Path, *_args: Any) -> None:
+        self._write_pdf(output_path, self.NUM_PAGES)
+
+    async def _write_large_output(self, _input_path: Path, output_path: Path, *_args: Any) -> None:
+        self._write_pdf(output_path, self.NUM_PAGES, self.LARGE_CONTENT)
+
+    @staticmethod
+    def _write_pdf(path: Path, num_pages: int, content: bytes = b"") -> None:
+        with pikepdf.new() as pdf:
+            for _ in range(num_pages):
+                page = pdf.add_blank_page()
+                page.Contents = pdf.make_stream(content)
+            pdf.save(path, compress_streams=False)
+
+    def _write_image_pdf(self, path: Path, distinct_images: bool = False) -> None:
+        # Noisy images like scans at 300 DPI on 2 inch pages
+        image = Image.effect_noise((self.IMAGE_SIZE, self.IMAGE_SIZE), 64).filter(
+            ImageFilter.GaussianBlur(2)
+        )
+
+        with pikepdf.new() as pdf:
+            image_stream: pikepdf.Stream | None = None
+            for _ in range(self.NUM_PAGES):
+                if image_stream is None or distinct_images:
+                    image_stream = pdf.make_stream(
+                        zlib.compress(image.tobytes()),
+                        Type=pikepdf.Name.XObject,
+                        Subtype=pikepdf.Name.Image,
+                        Width=self.IMAGE_SIZE,
+                        Height=self.IMAGE_SIZE,
+                        ColorSpace=pikepdf.Name.DeviceGray,
+                        BitsPerComponent=8,
+                        Filter=pikepdf.Name.FlateDecode,
+                    )
+
+                page = pdf.add_blank_page(page_size=(144, 144))
+                page.Contents = pdf.make_stream(self.IMAGE_CONTENT)
+                page.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Im0=image_stream))
+            pdf.save(path)
@@ -0,0 +1,163 @@
+import zlib
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pikepdf
+from PIL import Image, ImageFilter
+
+from pdf_bot.pdf.image_recompressor import (
+    ImageTask,
+    find_images,
+    recompress_images,
+    replace_images,
+)
+
+
+class TestImageRecompressor:
+    PAGE_SIZE = 144
+    LARGE_IMAGE_SIZE = 600
+    SMALL_IMAGE_SIZE = 100
+    RESOLUTION = 150
+    QUALITY = 80
+    MAX_SIZE = 10 * 1024 * 1024
+    CONTENT = b"BT /F1 12 Tf 10 10 Td (Hello) Tj ET q 144 0 0 144 0 0 cm /Im0 Do Q"
+
+    def setup_method(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.dir_path = Path(self.temp_dir.name)
+        self.in_path = self.dir_path / "in.pdf"
+        self.out_path = self.dir_path / "out.pdf"
+
+        with pikepdf.new() as pdf:
+            large_image = self._add_image(pdf, self.LARGE_IMAGE_SIZE, "RGB")
+            small_image = self._add_image(pdf, self.SMALL_IMAGE_SIZE, "RGB")
+            gray_image = self._add_image(pdf, self.LARGE_IMAGE_SIZE, "L")
+            mask = pdf.make_stream(
+                b"\xff" * (self.LARGE_IMAGE_SIZE // 8) * self.LARGE_IMAGE_SIZE,
+                Type=pikepdf.Name.XObject,
+                Subtype=pikepdf.Name.Image,
+                Width=self.LARGE_IMAGE_SIZE,
+                Height=self.LARGE_IMAGE_SIZE,
+                ImageMask=True,
+            )
+            font = pdf.make_indirect(
+                pikepdf.Dictionary(
+                    Type=pikepdf.Name.Font,
+                    Subtype=pikepdf.Name.Type1,
+                    BaseFont=pikepdf.Name.Helvetica,
+                )
+            )
+
+            for images in (
+                {"/Im0": large_image, "/Im1": small_image},
+                {"/Im0": large_image, "/Im1": gray_image, "/Im2": mask},
+            ):
+                page = pdf.add_blank_page(page_size=(self.PAGE_SIZE, self.PAGE_SIZE))
+                page.Contents = pdf.make_stream(self.CONTENT)
+                page.Resources = pikepdf.Dictionary(
+                    Font=pikepdf.Dictionary(F1=font),
+                    XObject=pikepdf.Dictionary(images),
+                )
+            pdf.save(self.in_path)
+
+        # Objects are renumbered when they're saved
+        with pikepdf.open(self.in_path) as pdf:
+            self.large_image_objgen = pdf.pages[0].Resources.XObject.Im0.objgen
+            self.small_image_objgen = pdf.pages[0].Resources.XObject.Im1.objgen
+            self.gray_image_objgen = pdf.pages[1].Resources.XObject.Im1.objgen
+
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_find_images(self) -> None:
+        actual = find_images(self.in_path, self.RESOLUTION, self.QUALITY, self.MAX_SIZE)
+
+        # Each image is only found once, and the mask and small image are skipped
+        dpi = self.LARGE_IMAGE_SIZE / (self.PAGE_SIZE / 72)
+        expected_size = round(self.LARGE_IMAGE_SIZE * self.RESOLUTION / dpi)
+        assert sorted(actual, key=lambda x: x.objgen) == sorted(
+            [
+                ImageTask(self.large_image_objgen, expected_size, expected_size, self.QUALITY),
+                ImageTask(self.gray_image_objgen, expected_size, expected_size, self.QUALITY),
+            ],
+            key=lambda x: x.objgen,
+        )
+
+    def test_find_images_above_max_size(self) -> None:
+        actual = find_images(self.in_path, 1000, self.QUALITY, 1)
+
+        # Images are kept at their size if only their size is above the threshold
+        assert {(x.objgen, x.width) for x in actual} == {
+            (self.large_image_objgen, self.LARGE_IMAGE_SIZE),
+            (self.small_image_objgen, self.SMALL_IMAGE_SIZE),
+            (self.gray_image_objgen, self.LARGE_IMAGE_SIZE),
+        }
+
+    def test_recompress_images(self) -> None:
+        tasks = [
+            ImageTask(self.large_image_objgen, 300, 300, self.QUALITY),
+            ImageTask(self.gray_image_objgen, 300, 300, self.QUALITY),
+        ]
+
+        actual = recompress_images(self.in_path, tasks)
+
+        assert [(x.objgen, x.width, x.height, x.grayscale) for x in actual] == [
+            (self.large_image_objgen, 300, 300, False),
+            (self.gray_image_objgen, 300, 300, True),
+        ]
+        with Image.open(BytesIO(actual[0].data)) as image:
+            assert image.format == "JPEG"
+            assert image.size == (300, 300)
+
+    def test_recompress_images_not_smaller(self) -> None:
+        # The small image is a gradient, which Flate compresses better than JPEG
+        tasks = [
+            ImageTask(
+                self.small_image_objgen, self.SMALL_IMAGE_SIZE, self.SMALL_IMAGE_SIZE, self.QUALITY
+            )
+        ]
+        assert recompress_images(self.in_path, tasks) == []
+
+    def test_replace_images(self) -> None:
+        tasks = [ImageTask(self.large_image_objgen, 300, 300, self.QUALITY)]
+        images = recompress_images(self.in_path, tasks)
+
+        replace_images(self.in_path, self.out_path, images)
+
+        assert self.out_path.stat().st_size < self.in_path.stat().st_size
+        with pikepdf.open(self.out_path) as pdf:
+            image = pdf.pages[0].Resources.XObject.Im0
+            assert image.Filter == pikepdf.Name.DCTDecode
+            assert image.Width == 300
+            assert image.ColorSpace == pikepdf.Name.DeviceRGB
+            assert pikepdf.Name.DecodeParms not in image
+
+            for page in pdf.pages:
+                # Text, fonts and the other images are kept as they are
+                assert page.Contents.read_bytes() == self.CONTENT
+                assert page.Resources.Font.F1.BaseFont == pikepdf.Name.Helvetica
+                assert page.Resources.XObject.Im1.Width in {
+                    self.SMALL_IMAGE_SIZE,
+                    self.LARGE_IMAGE_SIZE,
+                }
+
+    @staticmethod
+    def _add_image(pdf: pikepdf.Pdf, size: int, mode: str) -> pikepdf.Stream:
+        # Large images are noisy like scans, and small ones are gradients like graphics
+        if size == TestImageRecompressor.SMALL_IMAGE_SIZE:
+            band = Image.linear_gradient("L").resize((size, size))
+        else:
+            band = Image.effect_noise((size, size), 64).filter(ImageFilter.GaussianBlur(2))
+        image = band if mode == "L" else Image.merge("RGB", (band,) * 3)
+
+        return pdf.make_stream(
+            zlib.compress(image.tobytes()),
+            Type=pikepdf.Name.XObject,
+            Subtype=pikepdf.Name.Image,
+            Width=size,
+            Height=size,
+            ColorSpace=pikepdf.Name.DeviceGray if mode == "L" else pikepdf.Name.DeviceRGB,
+            BitsPerComponent=8,
+            Filter=pikepdf.Name.FlateDecode,
+        )
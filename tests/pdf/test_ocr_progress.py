@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from pdf_bot.pdf import ocr_progress
+from pdf_bot.pdf.ocr_progress import OcrProgressBar, get_progressbar_class, run_ocr
+
+
+class TestOcrProgress:
+    INPUT_PATH = Path("input.pdf")
+    OUTPUT_PATH = Path("output.pdf")
+
+    def setup_method(self) -> None:
+        self.report = MagicMock()
+        self.ocrmypdf_patcher = patch("pdf_bot.pdf.ocr_progress.ocrmypdf")
+        self.ocrmypdf = self.ocrmypdf_patcher.start()
+
+    def teardown_method(self) -> None:
+        self.ocrmypdf_patcher.stop()
+
+    def test_run_ocr(self) -> None:
+        def ocr(*_args: Any, **_kwargs: Any) -> None:
+            progress_bar_cls = get_progressbar_class()
+            with progress_bar_cls(total=2, desc="OCR", unit="page") as progress_bar:
+                # OCRmyPDF updates the progress in halves of pages
+                for _ in range(4):
+                    progress_bar.update(0.5)
+
+        self.ocrmypdf.ocr.side_effect = ocr
+
+        run_ocr(self.report, self.INPUT_PATH, self.OUTPUT_PATH, jobs=2)
+
+        self.ocrmypdf.ocr.assert_called_once_with(
+            self.INPUT_PATH,
+            self.OUTPUT_PATH,
+            plugins=[ocr_progress.__name__],
+            progress_bar=True,
+            jobs=2,
+        )
+        assert [x.args for x in self.report.call_args_list] == [((1, 2),), ((2, 2),)]
+        assert ocr_progress._report is None  # noqa: SLF001
+
+    def test_progress_bar_completed(self) -> None:
+        self._run_progress_bar(desc="OCR", completed=2)
+        self.report.assert_called_once_with((2, 3))
+
+    def test_progress_bar_other_step(self) -> None:
+        self._run_progress_bar(desc="Linearizing")
+        self.report.assert_not_called()
+
+    def test_progress_bar_disabled(self) -> None:
+        self._run_progress_bar(desc="OCR", disable=True)
+        self.report.assert_not_called()
+
+    def _run_progress_bar(self, completed: float | None = None, **kwargs: Any) -> None:
+        with patch.object(ocr_progress, "_report", self.report):
+            progress_bar = OcrProgressBar(total=3, unit="page", **kwargs)
+
+        with progress_bar:
+            progress_bar.update(completed=completed)
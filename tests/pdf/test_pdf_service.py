@@ -1,6 +1,11 @@
-from typing import Any
-from unittest.mock import MagicMock, call, patch
-
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Literal
+from unittest.mock import ANY, AsyncMock, MagicMock, call, patch
+
+import pikepdf
 import pytest
 from img2pdf import Rotation
 from ocrmypdf.exceptions import EncryptedPdfError, PriorOcrFoundError, TaggedPDFError
@@ -11,15 +16,25 @@ from pypdf.pagerange import PageRange
 from weasyprint import CSS, HTML
 from weasyprint.text.fonts import FontConfiguration
 
-from pdf_bot.cli import CLIService, CLIServiceError
+from pdf_bot.cli import (
+    CLINonZeroExitStatusError,
+    CLIService,
+    CLIServiceError,
+    CLITimeoutError,
+)
 from pdf_bot.io.io_service import IOService
 from pdf_bot.models import FileData
 from pdf_bot.pdf import (
+    CompressLevel,
     CompressResult,
     FontData,
+    PdfCompressor,
     PdfDecryptError,
+    PdfProbe,
+    PdfProber,
     PdfReadError,
     PdfService,
+    PdfTextExtractor,
     ScaleByData,
     ScaleToData,
 )
@@ -30,11 +45,14 @@ from pdf_bot.pdf.exceptions import (
     PdfNoTextError,
     PdfServiceError,
 )
+from pdf_bot.settings import Settings
+from tests.executor import ExecutorServiceTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
 class TestPDFService(
+    ExecutorServiceTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -52,24 +70,23 @@ class TestPDFService(
         self.io_service.create_temp_png_file.return_value.__enter__.return_value = self.file_path
         self.io_service.create_temp_txt_file.return_value.__enter__.return_value = self.file_path
 
+        self.executor_service = self.mock_executor_service()
         self.sut = PdfService(
             self.cli_service,
             self.io_service,
             self.telegram_service,
+            self.executor_service,
+            Settings(pdf_engine="pypdf"),
         )
 
         self.os_patcher = patch("pdf_bot.pdf.pdf_service.os")
         self.ocrmypdf_patcher = patch("pdf_bot.pdf.pdf_service.ocrmypdf")
-        self.extract_text_patcher = patch("pdf_bot.pdf.pdf_service.extract_text")
-        self.textwrap_patcher = patch("pdf_bot.pdf.pdf_service.textwrap")
         self.pdf_reader_patcher = patch("pdf_bot.pdf.pdf_service.PdfReader")
         self.pdf_writer_patcher = patch("pdf_bot.pdf.pdf_service.PdfWriter")
         self.pdf_merger_patcher = patch("pdf_bot.pdf.pdf_service.PdfMerger")
 
         self.mock_os = self.os_patcher.start()
         self.ocrmypdf = self.ocrmypdf_patcher.start()
-        self.extract_text = self.extract_text_patcher.start()
-        self.textwrap_patcher.start()
         self.pdf_reader_cls = self.pdf_reader_patcher.start()
         self.pdf_writer_cls = self.pdf_writer_patcher.start()
         self.pdf_merger_cls = self.pdf_merger_patcher.start()
@@ -77,8 +94,6 @@ class TestPDFService(
     def teardown_method(self) -> None:
         self.os_patcher.stop()
         self.ocrmypdf_patcher.stop()
-        self.extract_text_patcher.stop()
-        self.textwrap_patcher.stop()
         self.pdf_reader_patcher.stop()
         self.pdf_writer_patcher.stop()
         self.pdf_merger_patcher.stop()
@@ -137,8 +152,40 @@ class TestPDFService(
 
     @pytest.mark.asyncio
     async def test_grayscale_pdf(self) -> None:
-        image_paths = "image_paths"
-        image_bytes = "image_bytes"
+        with patch("pdf_bot.pdf.pdf_service.pdf2image") as pdf2image:
+            async with self.sut.grayscale_pdf(self.TELEGRAM_FILE_ID) as actual:
+                assert actual == self.file_path
+                self._assert_telegram_and_io_services("Grayscale")
+                self.cli_service.grayscale_pdf.assert_called_once_with(
+                    self.download_path, self.file_path
+                )
+                pdf2image.convert_from_path.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [CLITimeoutError, FileNotFoundError])
+    async def test_grayscale_pdf_ghostscript_error(self, error: type[Exception]) -> None:
+        # Ghostscript timing out or not being installed also falls back to rasterizing
+        self.cli_service.grayscale_pdf.side_effect = error
+        self.mock_path_open(self.file_path)
+
+        with (
+            patch("pdf_bot.pdf.pdf_service.pdf2image") as pdf2image,
+            patch("pdf_bot.pdf.pdf_service.img2pdf"),
+        ):
+            pdf2image.convert_from_path.return_value = ["page1.png"]
+
+            async with self.sut.grayscale_pdf(self.TELEGRAM_FILE_ID) as actual:
+                assert actual == self.file_path
+                self._assert_rasterize_pdf(pdf2image, grayscale=True)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("engine", ["ghostscript", "rasterize"])
+    async def test_grayscale_pdf_rasterize(
+        self, engine: Literal["ghostscript", "rasterize"]
+    ) -> None:
+        self.sut.grayscale_engine = engine
+        self.cli_service.grayscale_pdf.side_effect = CLINonZeroExitStatusError
+        image_paths = ["page1.png", "page2.png"]
         buffered_writer = self.mock_path_open(self.file_path)
 
         with (
@@ -146,22 +193,22 @@ class TestPDFService(
             patch("pdf_bot.pdf.pdf_service.img2pdf") as img2pdf,
         ):
             pdf2image.convert_from_path.return_value = image_paths
-            img2pdf.convert.return_value = image_bytes
 
             async with self.sut.grayscale_pdf(self.TELEGRAM_FILE_ID) as actual:
                 assert actual == self.file_path
                 self._assert_telegram_and_io_services("Grayscale")
                 self.io_service.create_temp_directory.assert_called_once()
-                pdf2image.convert_from_path.assert_called_once_with(
-                    self.download_path,
-                    output_folder=self.dir_path,
-                    fmt="png",
-                    grayscale=True,
-                    paths_only=True,
-                )
-                img2pdf.convert.assert_called_once_with(image_paths, rotation=Rotation.ifvalid)
+                self._assert_rasterize_pdf(pdf2image, grayscale=True)
                 self.file_path.open.assert_called_once_with("wb")
-                buffered_writer.write.assert_called_once_with(image_bytes)
+                img2pdf.convert.assert_called_once_with(
+                    [Path(x) for x in image_paths],
+                    rotation=Rotation.ifvalid,
+                    outputstream=buffered_writer,
+                )
+                assert self.executor_service.run_killable.call_count == 2
+
+        # Ghostscript is only tried with its engine, and rasterizing is its fallback
+        assert self.cli_service.grayscale_pdf.called == (engine == "ghostscript")
 
     @pytest.mark.asyncio
     async def test_compare_pdfs(self) -> None:
@@ -187,25 +234,80 @@ class TestPDFService(
         file_stat = self.mock_path_stat(self.file_path)
         file_stat.st_size = new_size
 
-        async with self.sut.compress_pdf(self.TELEGRAM_FILE_ID) as compress_result:
-            assert compress_result == CompressResult(old_size, new_size, self.file_path)
-            self.cli_service.compress_pdf.assert_called_once_with(
-                self.download_path, self.file_path
-            )
-            self._assert_telegram_and_io_services("Compressed")
+        best_path = self.dir_path / "best.pdf"
+        compressor = self._mock_compressor(best_path)
+
+        with patch("pdf_bot.pdf.pdf_service.shutil") as shutil:
+            async with self.sut.compress_pdf(
+                self.TELEGRAM_FILE_ID, CompressLevel.high
+            ) as compress_result:
+                assert compress_result == CompressResult(old_size, new_size, self.file_path)
+                compressor.compress.assert_called_once_with(
+                    self.download_path, self.dir_path, CompressLevel.high
+                )
+                shutil.copy.assert_called_once_with(best_path, self.file_path)
+                self._assert_telegram_and_io_services("Compressed")
+
+    @pytest.mark.asyncio
+    async def test_compress_pdf_not_smaller(self) -> None:
+        self.mock_path_stat(self.download_path).st_size = 10
+        self.mock_path_stat(self.file_path).st_size = 10
+        compressor = self._mock_compressor(None)
+
+        with patch("pdf_bot.pdf.pdf_service.shutil") as shutil:
+            async with self.sut.compress_pdf(self.TELEGRAM_FILE_ID) as compress_result:
+                assert compress_result == CompressResult(10, 10, self.file_path)
+                compressor.compress.assert_called_once_with(
+                    self.download_path, self.dir_path, CompressLevel.medium
+                )
+                # The original file is kept as it is
+                shutil.copy.assert_called_once_with(self.download_path, self.file_path)
 
     @pytest.mark.asyncio
     async def test_convert_to_images(self) -> None:
-        with patch("pdf_bot.pdf.pdf_service.pdf2image") as pdf2image:
+        num_pages = 3
+
+        def convert_from_path(
+            *_args: Any, output_folder: Path, first_page: int, last_page: int, **_kwargs: Any
+        ) -> list[str]:
+            paths = []
+            for page_num in range(first_page, last_page + 1):
+                path = output_folder / f"page-{page_num}.png"
+                path.write_bytes(f"page {page_num}".encode())
+                paths.append(str(path))
+            return paths
+
+        with (
+            TemporaryDirectory() as dir_name,
+            patch("pdf_bot.pdf.pdf_service.pdf2image") as pdf2image,
+            patch("pdf_bot.pdf.pdf_service._ARCHIVE_PAGES_PER_THREAD", 2),
+        ):
+            self.sut.rasterize_thread_count = 1
+            work_dir = Path(dir_name) / "work"
+            work_dir.mkdir()
+            out_path = Path(dir_name) / "PDF_images.zip"
+            self.io_service.create_temp_directory.return_value.__enter__.return_value = work_dir
+            self.io_service.create_temp_zip_file.return_value.__enter__.return_value = out_path
+
+            pdf2image.pdfinfo_from_path.return_value = {"Pages": num_pages}
+            pdf2image.convert_from_path.side_effect = convert_from_path
+
             async with self.sut.convert_pdf_to_images(self.TELEGRAM_FILE_ID) as actual:
-                assert actual == self.dir_path
+                assert actual == out_path
                 self.telegram_service.download_pdf_file.assert_called_once_with(
                     self.TELEGRAM_FILE_ID
                 )
-                self.io_service.create_temp_directory.assert_called_once_with("PDF_images")
-                pdf2image.convert_from_path.assert_called_once_with(
-                    self.download_path, output_folder=self.dir_path, fmt="png"
-                )
+                self.io_service.create_temp_zip_file.assert_called_once_with("PDF_images")
+
+                with zipfile.ZipFile(actual) as archive:
+                    assert archive.namelist() == ["page_1.png", "page_2.png", "page_3.png"]
+                    assert archive.read("page_3.png") == b"page 3"
+                    assert all(x.compress_type == zipfile.ZIP_STORED for x in archive.infolist())
+
+                # Rendered pages are removed once they are in the archive
+                assert list(work_dir.iterdir()) == []
+                assert pdf2image.convert_from_path.call_count == 2
+                self.executor_service.run_killable.assert_called_once()
 
     @pytest.mark.parametrize("has_font_data", [True, False])
     @pytest.mark.asyncio
@@ -231,6 +333,7 @@ class TestPDFService(
             async with self.sut.create_pdf_from_text(self.TELEGRAM_TEXT, font_data) as actual:
                 assert actual == self.file_path
                 html.write_pdf.assert_called_once()
+                self.executor_service.run_killable.assert_called_once()
                 self.io_service.create_temp_pdf_file.assert_called_once_with("Text")
                 html.write_pdf.assert_called_once_with(
                     self.file_path, stylesheets=stylesheets, font_config=font_config
@@ -371,37 +474,82 @@ class TestPDFService(
         self.telegram_service.download_pdf_file.assert_called_once_with(self.TELEGRAM_FILE_ID)
         self.io_service.create_temp_pdf_file.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_encrypt_pdf_probed_encrypted(self) -> None:
+        self._mock_prober(PdfProbe(is_encrypted=True))
+
+        with pytest.raises(PdfEncryptedError):
+            async with self.sut.encrypt_pdf(self.TELEGRAM_FILE_ID, self.PASSWORD):
+                pass
+
+        self.telegram_service.download_pdf_file.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_extract_pdf_text(self) -> None:
+        text_extractor = self._mock_text_extractor(has_text=True)
+
         async with self.sut.extract_pdf_text(self.TELEGRAM_FILE_ID) as actual:
             assert actual == self.file_path
             self.telegram_service.download_pdf_file.assert_called_once_with(self.TELEGRAM_FILE_ID)
             self.io_service.create_temp_txt_file.assert_called_once_with("PDF_text")
-            self.extract_text.assert_called_once_with(self.download_path)
+            text_extractor.extract.assert_called_once_with(
+                self.download_path, self.file_path, self.dir_path
+            )
 
     @pytest.mark.asyncio
     async def test_extract_pdf_text_error(self) -> None:
-        self.extract_text.side_effect = PDFPasswordIncorrect
+        text_extractor = self._mock_text_extractor(has_text=True)
+        text_extractor.extract.side_effect = PDFPasswordIncorrect
 
         with pytest.raises(PdfEncryptedError):
             async with self.sut.extract_pdf_text(self.TELEGRAM_FILE_ID):
                 pass
 
         self.telegram_service.download_pdf_file.assert_called_once_with(self.TELEGRAM_FILE_ID)
-        self.io_service.create_temp_txt_file.assert_not_called()
-        self.extract_text.assert_called_once_with(self.download_path)
+        text_extractor.extract.assert_called_once_with(
+            self.download_path, self.file_path, self.dir_path
+        )
 
     @pytest.mark.asyncio
     async def test_extract_pdf_text_no_text(self) -> None:
-        self.extract_text.return_value = ""
+        text_extractor = self._mock_text_extractor(has_text=False)
 
         with pytest.raises(PdfNoTextError):
             async with self.sut.extract_pdf_text(self.TELEGRAM_FILE_ID):
                 pass
 
         self.telegram_service.download_pdf_file.assert_called_once_with(self.TELEGRAM_FILE_ID)
-        self.io_service.create_temp_txt_file.assert_not_called()
-        self.extract_text.assert_called_once_with(self.download_path)
+        text_extractor.extract.assert_called_once_with(
+            self.download_path, self.file_path, self.dir_path
+        )
+
+    @pytest.mark.parametrize(
+        ("probe", "error_type"),
+        [
+            (PdfProbe(is_encrypted=True), PdfEncryptedError),
+            (PdfProbe(is_encrypted=False, num_pages=1), PdfNoTextError),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_extract_pdf_text_probed(
+        self, probe: PdfProbe, error_type: type[Exception]
+    ) -> None:
+        self._mock_prober(probe)
+
+        with pytest.raises(error_type):
+            async with self.sut.extract_pdf_text(self.TELEGRAM_FILE_ID):
+                pass
+
+        self.telegram_service.download_pdf_file.assert_not_called()
+
+    @pytest.mark.parametrize("has_text", [True, None])
+    @pytest.mark.asyncio
+    async def test_extract_pdf_text_probed_with_text(self, has_text: bool | None) -> None:
+        self._mock_prober(PdfProbe(is_encrypted=False, num_pages=1, has_text=has_text))
+        self._mock_text_extractor(has_text=True)
+
+        async with self.sut.extract_pdf_text(self.TELEGRAM_FILE_ID) as actual:
+            assert actual == self.file_path
 
     @pytest.mark.asyncio
     async def test_extract_pdf_images(self) -> None:
@@ -482,9 +630,117 @@ class TestPDFService(
             assert actual == self.file_path
             self._assert_telegram_and_io_services("OCR")
             self.ocrmypdf.ocr.assert_called_once_with(
-                self.download_path, self.file_path, progress_bar=False
+                self.download_path, self.file_path, progress_bar=False, **self.sut.ocr_options
             )
 
+    @pytest.mark.asyncio
+    async def test_extract_pdf_images_probed_no_images(self) -> None:
+        self._mock_prober(PdfProbe(is_encrypted=False, num_pages=1))
+
+        with pytest.raises(PdfNoImagesError):
+            async with self.sut.extract_pdf_images(self.TELEGRAM_FILE_ID):
+                pass
+
+        self.telegram_service.download_pdf_file.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("probe", "error_type"),
+        [
+            (PdfProbe(is_encrypted=True), PdfEncryptedError),
+            (PdfProbe(is_encrypted=False, num_pages=1, has_text=True), PdfServiceError),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_ocr_pdf_probed(self, probe: PdfProbe, error_type: type[Exception]) -> None:
+        self._mock_prober(probe)
+
+        with pytest.raises(error_type):
+            async with self.sut.ocr_pdf(self.TELEGRAM_FILE_ID):
+                pass
+
+        self.telegram_service.download_pdf_file.assert_not_called()
+        self.ocrmypdf.ocr.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ocr_pdf_probed_with_text_skip_mode(self) -> None:
+        self._mock_prober(PdfProbe(is_encrypted=False, num_pages=1, has_text=True))
+        self.sut.ocr_mode = "skip_text"
+
+        async with self.sut.ocr_pdf(self.TELEGRAM_FILE_ID) as actual:
+            assert actual == self.file_path
+            self.ocrmypdf.ocr.assert_called_once()
+
+    def test_probe_pdf(self) -> None:
+        prober = self._mock_prober(None)
+
+        self.sut.probe_pdf(self.TELEGRAM_FILE_ID)
+
+        prober.probe_in_background.assert_called_once_with(self.TELEGRAM_FILE_ID)
+
+    @pytest.mark.asyncio
+    async def test_get_pdf_probe(self) -> None:
+        probe = PdfProbe(is_encrypted=False, num_pages=1)
+        prober = self._mock_prober(probe)
+
+        actual = await self.sut.get_pdf_probe(self.TELEGRAM_FILE_ID)
+
+        assert actual == probe
+        prober.get_cached.assert_called_once_with(self.TELEGRAM_FILE_ID)
+        prober.probe.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ocr_pdf_with_progress(self) -> None:
+        on_progress = AsyncMock()
+
+        def run_ocr(
+            report: Callable[[Any], None], _input_path: Path, _output_path: Path, **_kwargs: Any
+        ) -> None:
+            report((1, 2))
+            report((2, 2))
+
+        with patch("pdf_bot.pdf.pdf_service.run_ocr", side_effect=run_ocr) as run_ocr_mock:
+            async with self.sut.ocr_pdf(self.TELEGRAM_FILE_ID, on_progress) as actual:
+                assert actual == self.file_path
+                run_ocr_mock.assert_called_once_with(
+                    ANY, self.download_path, self.file_path, **self.sut.ocr_options
+                )
+
+        assert on_progress.call_args_list == [call(1, 2), call(2, 2)]
+
+    @pytest.mark.parametrize(
+        ("settings", "expected"),
+        [
+            (Settings(ocr_max_processes=8), {"jobs": 8, "optimize": 1}),
+            (Settings(ocr_max_processes=8, executor_ocr_pool_size=3), {"jobs": 2, "optimize": 1}),
+            (Settings(ocr_max_processes=2, executor_ocr_pool_size=4), {"jobs": 1, "optimize": 1}),
+            (Settings(ocr_max_processes=8, ocr_jobs=4), {"jobs": 4, "optimize": 1}),
+            (Settings(ocr_max_processes=2, ocr_jobs=4), {"jobs": 2, "optimize": 1}),
+            (
+                Settings(ocr_max_processes=1, ocr_optimize=3, ocr_mode="skip_text"),
+                {"jobs": 1, "optimize": 3, "skip_text": True},
+            ),
+            (
+                Settings(ocr_max_processes=1, ocr_mode="redo_ocr", ocr_downsample_above=4000),
+                {
+                    "jobs": 1,
+                    "optimize": 1,
+                    "redo_ocr": True,
+                    "tesseract_downsample_large_images": True,
+                    "tesseract_downsample_above": 4000,
+                },
+            ),
+        ],
+    )
+    def test_ocr_options(self, settings: Settings, expected: dict[str, Any]) -> None:
+        sut = PdfService(
+            self.cli_service,
+            self.io_service,
+            self.telegram_service,
+            self.executor_service,
+            settings.model_dump(),
+        )
+        assert sut.ocr_options == expected
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
         ("error", "expected"),
@@ -503,39 +759,46 @@ class TestPDFService(
 
         self._assert_telegram_and_io_services("OCR")
         self.ocrmypdf.ocr.assert_called_once_with(
-            self.download_path, self.file_path, progress_bar=False
+            self.download_path, self.file_path, progress_bar=False, **self.sut.ocr_options
         )
 
     @pytest.mark.asyncio
     async def test_preview_pdf(self) -> None:
-        pdf_path = "pdf_path"
-        out_path = "out_path"
-
-        reader = MagicMock(spec=PdfReader)
-        writer = MagicMock(spec=PdfWriter)
-        page = MagicMock(spec=PageObject)
-        reader.is_encrypted = False
-        reader.pages = [page]
-
-        self.pdf_reader_cls.return_value = reader
-        self.pdf_writer_cls.return_value = writer
-
-        image = MagicMock()
-
-        self.io_service.create_temp_pdf_file.return_value.__enter__.return_value = pdf_path
+        out_path = Path("dir/Preview.png")
         self.io_service.create_temp_png_file.return_value.__enter__.return_value = out_path
+        self.pdf_reader_cls.return_value.is_encrypted = False
 
         with patch("pdf_bot.pdf.pdf_service.pdf2image") as pdf2image:
-            pdf2image.convert_from_path.return_value = [image]
-
             async with self.sut.preview_pdf(self.TELEGRAM_FILE_ID) as actual:
                 assert actual == out_path
                 self.telegram_service.download_pdf_file.assert_called_once_with(
                     self.TELEGRAM_FILE_ID
                 )
-                writer.add_page.assert_called_once_with(page)
-                pdf2image.convert_from_path.assert_called_once_with(pdf_path, fmt="png")
-                image.save.assert_called_once_with(out_path)
+                self.pdf_reader_cls.assert_called_once_with(self.download_path)
+                pdf2image.convert_from_path.assert_called_once_with(
+                    self.download_path,
+                    output_folder=out_path.parent,
+                    output_file=out_path.stem,
+                    first_page=1,
+                    last_page=1,
+                    fmt="png",
+                    single_file=True,
+                    paths_only=True,
+                )
+                self.executor_service.run_killable.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_preview_pdf_encrypted(self) -> None:
+        self.pdf_reader_cls.return_value.is_encrypted = True
+
+        with (
+            patch("pdf_bot.pdf.pdf_service.pdf2image") as pdf2image,
+            pytest.raises(PdfEncryptedError),
+        ):
+            async with self.sut.preview_pdf(self.TELEGRAM_FILE_ID):
+                pass
+
+        pdf2image.convert_from_path.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_rename_pdf(self) -> None:
@@ -669,6 +932,124 @@ class TestPDFService(
             self._assert_telegram_and_io_services("Split")
             merger.append.assert_called_once_with(reader, pages=PageRange(split_range))
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("method", "args", "expected_args", "prefix"),
+        [
+            ("decrypt_pdf", (PASSWORD,), (PASSWORD,), "Decrypted"),
+            ("encrypt_pdf", (PASSWORD,), (PASSWORD,), "Encrypted"),
+            ("rotate_pdf", (90,), (90,), "Rotated"),
+            ("scale_pdf_by_factor", (ScaleByData(1, 2),), (1, 2), "Scaled"),
+            ("scale_pdf_to_dimension", (ScaleToData(3, 4),), (3, 4), "Scaled"),
+            ("split_pdf", ("7:",), ("7:",), "Split"),
+        ],
+    )
+    async def test_pikepdf_engine(
+        self, method: str, args: tuple[Any, ...], expected_args: tuple[Any, ...], prefix: str
+    ) -> None:
+        self.sut.pdf_engine = "pikepdf"
+
+        with patch("pdf_bot.pdf.pdf_service.pikepdf_engine") as pikepdf_engine:
+            async with getattr(self.sut, method)(self.TELEGRAM_FILE_ID, *args) as actual:
+                assert actual == self.file_path
+                self._assert_telegram_and_io_services(prefix)
+                getattr(pikepdf_engine, method).assert_called_once_with(
+                    self.download_path, self.file_path, *expected_args
+                )
+            self.pdf_reader_cls.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_pikepdf_engine_merge_pdfs(self) -> None:
+        self.sut.pdf_engine = "pikepdf"
+        file_data_list, file_ids, file_paths = self._get_file_data_list(3)
+        self.telegram_service.download_files.return_value.__aenter__.return_value = file_paths
+
+        with patch("pdf_bot.pdf.pdf_service.pikepdf_engine") as pikepdf_engine:
+            async with self.sut.merge_pdfs(file_data_list) as actual:
+                assert actual == self.file_path
+                self.telegram_service.download_files.assert_called_once_with(file_ids)
+                self.io_service.create_temp_pdf_file.assert_called_once_with("Merged")
+                pikepdf_engine.merge_pdfs.assert_called_once_with(
+                    file_paths, self.file_path, [x.name for x in file_data_list]
+                )
+            self.pdf_merger_cls.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_pikepdf_engine_merge_pdfs_invalid_pdf(self) -> None:
+        self.sut.pdf_engine = "pikepdf"
+        file_data_list, _file_ids, file_paths = self._get_file_data_list(2)
+        self.telegram_service.download_files.return_value.__aenter__.return_value = file_paths
+
+        with patch("pdf_bot.pdf.pdf_service.pikepdf_engine") as pikepdf_engine:
+            pikepdf_engine.merge_pdfs.side_effect = pikepdf.PdfError()
+            with pytest.raises(PdfReadError):
+                async with self.sut.merge_pdfs(file_data_list):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_pikepdf_engine_add_watermark(self) -> None:
+        self.sut.pdf_engine = "pikepdf"
+        self.telegram_service.download_pdf_file.side_effect = (
+            self._async_context_manager_side_effect_echo
+        )
+
+        with patch("pdf_bot.pdf.pdf_service.pikepdf_engine") as pikepdf_engine:
+            async with self.sut.add_watermark_to_pdf("src_file_id", "wmk_file_id") as actual:
+                assert actual == self.file_path
+                pikepdf_engine.add_watermark_to_pdf.assert_called_once_with(
+                    "src_file_id", self.file_path, "wmk_file_id"
+                )
+                self.io_service.create_temp_pdf_file.assert_called_once_with("File_with_watermark")
+
+    @pytest.mark.asyncio
+    async def test_pikepdf_engine_override(self) -> None:
+        self.sut.pdf_engine = "pikepdf"
+        self.sut.pdf_engine_overrides = {"rotate": "pypdf"}
+        reader = MagicMock(spec=PdfReader)
+        reader.is_encrypted = False
+        reader.pages = []
+        self.pdf_reader_cls.return_value = reader
+
+        with patch("pdf_bot.pdf.pdf_service.pikepdf_engine") as pikepdf_engine:
+            async with self.sut.rotate_pdf(self.TELEGRAM_FILE_ID, 90):
+                pikepdf_engine.rotate_pdf.assert_not_called()
+                self.pdf_reader_cls.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_pikepdf_engine_invalid_pdf(self) -> None:
+        self.sut.pdf_engine = "pikepdf"
+
+        with patch("pdf_bot.pdf.pdf_service.pikepdf_engine") as pikepdf_engine:
+            pikepdf_engine.rotate_pdf.side_effect = pikepdf.PdfError()
+            with pytest.raises(PdfReadError):
+                async with self.sut.rotate_pdf(self.TELEGRAM_FILE_ID, 90):
+                    pass
+
+    @pytest.mark.parametrize(("pool_size", "expected"), [(1, 8), (2, 4), (3, 2), (16, 1)])
+    def test_init_rasterize_thread_count(self, pool_size: int, expected: int) -> None:
+        with patch("pdf_bot.pdf.pdf_service._CPU_COUNT", 8):
+            sut = PdfService(
+                self.cli_service,
+                self.io_service,
+                self.telegram_service,
+                self.executor_service,
+                Settings(executor_heavy_pool_size=pool_size),
+            )
+        assert sut.rasterize_thread_count == expected
+
+    def test_init_with_dict(self) -> None:
+        settings = Settings(pdf_engine="pypdf", pdf_engine_overrides={"split": "pikepdf"})
+        sut = PdfService(
+            self.cli_service,
+            self.io_service,
+            self.telegram_service,
+            self.executor_service,
+            settings.model_dump(),
+        )
+
+        assert sut._use_pikepdf("split")  # noqa: SLF001
+        assert not sut._use_pikepdf("rotate")  # noqa: SLF001
+
     @staticmethod
     def _async_context_manager_side_effect_echo(
         return_value: str, *_args: Any, **_kwargs: Any
@@ -697,6 +1078,35 @@ class TestPDFService(
 
         return file_data_list, file_ids, file_paths
 
+    def _assert_rasterize_pdf(self, pdf2image: MagicMock, grayscale: bool) -> None:
+        pdf2image.convert_from_path.assert_called_once()
+        assert pdf2image.convert_from_path.call_args.args == (self.download_path,)
+
+        kwargs = pdf2image.convert_from_path.call_args.kwargs
+        assert kwargs["output_folder"] == self.dir_path
+        assert kwargs["fmt"] == "png"
+        assert kwargs["grayscale"] == grayscale
+        assert kwargs["paths_only"] is True
+        assert kwargs["thread_count"] >= 1
+
+    def _mock_compressor(self, best_path: Path | None) -> MagicMock:
+        compressor = MagicMock(spec=PdfCompressor)
+        compressor.compress.return_value = best_path
+        self.sut.compressor = compressor
+        return compressor
+
+    def _mock_prober(self, probe: PdfProbe | None) -> MagicMock:
+        prober = MagicMock(spec=PdfProber)
+        prober.get_cached.return_value = probe
+        self.sut.prober = prober
+        return prober
+
+    def _mock_text_extractor(self, has_text: bool) -> MagicMock:
+        text_extractor = MagicMock(spec=PdfTextExtractor)
+        text_extractor.extract.return_value = has_text
+        self.sut.text_extractor = text_extractor
+        return text_extractor
+
     def _assert_telegram_and_io_services(self, temp_pdf_file_prefix: str) -> None:
         self.telegram_service.download_pdf_file.assert_called_once_with(self.TELEGRAM_FILE_ID)
         self.io_service.create_temp_pdf_file.assert_called_once_with(temp_pdf_file_prefix)
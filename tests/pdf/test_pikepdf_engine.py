@@ -0,0 +1,272 @@
+import zlib
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import cast
+
+import pikepdf
+import pytest
+
+from pdf_bot.pdf import pikepdf_engine
+from pdf_bot.pdf.exceptions import (
+    PdfDecryptError,
+    PdfEncryptedError,
+    PdfIncorrectPasswordError,
+    PdfReadError,
+)
+
+
+class TestPikepdfEngine:
+    NUM_PAGES = 4
+    WIDTH = 200
+    HEIGHT = 300
+    PASSWORD = "password"
+
+    def setup_method(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.dir_path = Path(self.temp_dir.name)
+        self.in_path = self.dir_path / "in.pdf"
+        self.out_path = self.dir_path / "out.pdf"
+
+        with pikepdf.new() as pdf:
+            for _ in range(self.NUM_PAGES):
+                pdf.add_blank_page(page_size=(self.WIDTH, self.HEIGHT))
+            pdf.save(self.in_path)
+
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_add_watermark_to_pdf(self) -> None:
+        wmk_path = self.dir_path / "wmk.pdf"
+        with pikepdf.new() as pdf:
+            pdf.add_blank_page(page_size=(50, 50))
+            pdf.save(wmk_path)
+
+        pikepdf_engine.add_watermark_to_pdf(self.in_path, self.out_path, wmk_path)
+
+        with pikepdf.open(self.out_path) as pdf:
+            assert len(pdf.pages) == self.NUM_PAGES
+            for page in pdf.pages:
+                assert len(page.Resources.XObject.keys()) == 1
+
+    def test_merge_pdfs(self) -> None:
+        paths = [self._write_merge_input(f"in_{i}", f"Part {i}") for i in range(3)]
+
+        pikepdf_engine.merge_pdfs(paths, self.out_path, ["a", "b", "c"])
+
+        with pikepdf.open(self.out_path) as pdf:
+            assert len(pdf.pages) == 6
+            assert [x.Contents.read_bytes() for x in pdf.pages[::2]] == [
+                b"(Part 0) Tj",
+                b"(Part 1) Tj",
+                b"(Part 2) Tj",
+            ]
+
+            # The image, its soft mask and the font file are shared by all the pages
+            images = {x.Resources.XObject.Im0.objgen for x in pdf.pages}
+            smasks = {x.Resources.XObject.Im0.SMask.objgen for x in pdf.pages}
+            font_files = {x.Resources.Font.F1.FontDescriptor.FontFile.objgen for x in pdf.pages}
+            assert len(images) == len(smasks) == len(font_files) == 1
+
+            streams = [x for x in pdf.objects if isinstance(x, pikepdf.Stream)]
+            assert len([x for x in streams if x.get("/Subtype") == "/Image"]) == 2
+
+    def test_merge_pdfs_different_streams(self) -> None:
+        path_a = self._write_merge_input("a", "Part a", image_data=b"\x00" * 300)
+        path_b = self._write_merge_input("b", "Part b", image_data=b"\xff" * 300)
+
+        pikepdf_engine.merge_pdfs([path_a, path_b], self.out_path, ["a", "b"])
+
+        with pikepdf.open(self.out_path) as pdf:
+            images = {x.Resources.XObject.Im0.objgen for x in pdf.pages}
+            smasks = {x.Resources.XObject.Im0.SMask.objgen for x in pdf.pages}
+            assert len(images) == 2
+            assert len(smasks) == 1
+
+    def test_merge_pdfs_outline(self) -> None:
+        paths = [self._write_merge_input(f"in_{i}", f"Part {i}") for i in range(2)]
+        with pikepdf.open(paths[1], allow_overwriting_input=True) as pdf:
+            dests = pikepdf.NameTree.new(pdf)
+            dests["named"] = pikepdf.Array([pdf.pages[1].obj, pikepdf.Name.Fit])
+            pdf.Root.Names = pikepdf.Dictionary(Dests=dests.obj)
+
+            with pdf.open_outline() as outline:
+                item = pikepdf.OutlineItem("Part 1", 1)
+                item.children.append(pikepdf.OutlineItem("Child", 0))
+                outline.root.append(item)
+                outline.root.append(pikepdf.OutlineItem("Named", pikepdf.String("named")))
+            pdf.save(paths[1])
+
+        pikepdf_engine.merge_pdfs(paths, self.out_path, ["a", "b"])
+
+        with pikepdf.open(self.out_path) as pdf, pdf.open_outline() as outline:
+            assert [x.title for x in outline.root] == ["Part 1", "Named"]
+            item, named_item = outline.root
+            destinations = [
+                cast(pikepdf.Array, x.destination) for x in (item, item.children[0], named_item)
+            ]
+            assert [pikepdf.Page(x[0]).index for x in destinations] == [3, 2, 3]
+
+    def test_merge_pdfs_invalid(self) -> None:
+        invalid_path = self.dir_path / "invalid.pdf"
+        invalid_path.write_bytes(b"invalid")
+
+        with pytest.raises(PdfReadError, match="invalid.pdf"):
+            pikepdf_engine.merge_pdfs(
+                [self.in_path, invalid_path], self.out_path, ["in.pdf", "invalid.pdf"]
+            )
+
+    @pytest.mark.parametrize("owner_password_only", [False, True])
+    def test_merge_pdfs_encrypted(self, owner_password_only: bool) -> None:
+        if owner_password_only:
+            self._encrypt_with_owner_password()
+        else:
+            pikepdf_engine.encrypt_pdf(self.in_path, self.out_path, self.PASSWORD)
+
+        with pytest.raises(PdfEncryptedError):
+            pikepdf_engine.merge_pdfs(
+                [self.in_path, self.out_path],
+                self.dir_path / "merged.pdf",
+                ["in.pdf", "encrypted.pdf"],
+            )
+
+    def test_decrypt_pdf(self) -> None:
+        pikepdf_engine.encrypt_pdf(self.in_path, self.out_path, self.PASSWORD)
+        decrypted_path = self.dir_path / "decrypted.pdf"
+
+        pikepdf_engine.decrypt_pdf(self.out_path, decrypted_path, self.PASSWORD)
+
+        with pikepdf.open(decrypted_path) as pdf:
+            assert not pdf.is_encrypted
+            assert len(pdf.pages) == self.NUM_PAGES
+
+    def test_decrypt_pdf_incorrect_password(self) -> None:
+        pikepdf_engine.encrypt_pdf(self.in_path, self.out_path, self.PASSWORD)
+
+        with pytest.raises(PdfIncorrectPasswordError):
+            pikepdf_engine.decrypt_pdf(self.out_path, self.dir_path / "decrypted.pdf", "wrong")
+
+    def test_decrypt_pdf_owner_password_only(self) -> None:
+        self._encrypt_with_owner_password()
+        decrypted_path = self.dir_path / "decrypted.pdf"
+
+        pikepdf_engine.decrypt_pdf(self.out_path, decrypted_path, self.PASSWORD)
+
+        with pikepdf.open(decrypted_path) as pdf:
+            assert not pdf.is_encrypted
+
+    def test_decrypt_pdf_owner_password_only_incorrect_password(self) -> None:
+        self._encrypt_with_owner_password()
+
+        with pytest.raises(PdfIncorrectPasswordError):
+            pikepdf_engine.decrypt_pdf(self.out_path, self.dir_path / "decrypted.pdf", "wrong")
+
+    def test_decrypt_pdf_not_encrypted(self) -> None:
+        with pytest.raises(PdfDecryptError):
+            pikepdf_engine.decrypt_pdf(self.in_path, self.out_path, self.PASSWORD)
+
+    def test_encrypt_pdf(self) -> None:
+        pikepdf_engine.encrypt_pdf(self.in_path, self.out_path, self.PASSWORD)
+
+        with pytest.raises(pikepdf.PasswordError):
+            pikepdf.open(self.out_path)
+        with pikepdf.open(self.out_path, password=self.PASSWORD) as pdf:
+            assert pdf.is_encrypted
+
+    def test_encrypted_pdf(self) -> None:
+        pikepdf_engine.encrypt_pdf(self.in_path, self.out_path, self.PASSWORD)
+
+        with pytest.raises(PdfEncryptedError):
+            pikepdf_engine.rotate_pdf(self.out_path, self.dir_path / "rotated.pdf", 90)
+
+    def test_rotate_pdf(self) -> None:
+        pikepdf_engine.rotate_pdf(self.in_path, self.out_path, 90)
+
+        with pikepdf.open(self.out_path) as pdf:
+            assert [x.Rotate for x in pdf.pages] == [90] * self.NUM_PAGES
+
+    def test_scale_pdf_by_factor(self) -> None:
+        pikepdf_engine.scale_pdf_by_factor(self.in_path, self.out_path, 2, 0.5)
+
+        with pikepdf.open(self.out_path) as pdf:
+            for page in pdf.pages:
+                mediabox = pikepdf.Rectangle(page.mediabox)
+                assert mediabox == pikepdf.Rectangle(0, 0, self.WIDTH * 2, self.HEIGHT * 0.5)
+                assert pikepdf.Rectangle(page.cropbox) == mediabox
+                assert page.Contents[0].read_bytes().startswith(b"q 2 0 0 0.5 0 0 cm")
+
+    def test_scale_pdf_by_factor_annotations(self) -> None:
+        with pikepdf.open(self.in_path, allow_overwriting_input=True) as pdf:
+            annot = pdf.make_indirect(
+                pikepdf.Dictionary(Type=pikepdf.Name.Annot, Rect=[10, 20, 30, 40])
+            )
+            pdf.pages[0].Annots = pdf.make_indirect(pikepdf.Array([annot]))
+            pdf.save(self.in_path)
+
+        pikepdf_engine.scale_pdf_by_factor(self.in_path, self.out_path, 2, 0.5)
+
+        with pikepdf.open(self.out_path) as pdf:
+            rect = pikepdf.Rectangle(cast(pikepdf.Array, pdf.pages[0].Annots[0].Rect))
+            assert rect == pikepdf.Rectangle(20, 10, 60, 20)
+
+    def test_scale_pdf_to_dimension(self) -> None:
+        pikepdf_engine.scale_pdf_to_dimension(self.in_path, self.out_path, 100, 600)
+
+        with pikepdf.open(self.out_path) as pdf:
+            for page in pdf.pages:
+                assert pikepdf.Rectangle(page.mediabox) == pikepdf.Rectangle(0, 0, 100, 600)
+                assert page.Contents[0].read_bytes().startswith(b"q 0.5 0 0 2.0 0 0 cm")
+
+    @pytest.mark.parametrize(("split_range", "expected"), [(":2", 2), ("1:", 3), ("-1", 1)])
+    def test_split_pdf(self, split_range: str, expected: int) -> None:
+        pikepdf_engine.split_pdf(self.in_path, self.out_path, split_range)
+
+        with pikepdf.open(self.out_path) as pdf:
+            assert len(pdf.pages) == expected
+
+    def _write_merge_input(self, name: str, text: str, image_data: bytes = b"\x80" * 300) -> Path:
+        path = self.dir_path / f"{name}.pdf"
+        with pikepdf.new() as pdf:
+            smask = pdf.make_stream(
+                zlib.compress(b"\xff" * 100),
+                Type=pikepdf.Name.XObject,
+                Subtype=pikepdf.Name.Image,
+                Width=10,
+                Height=10,
+                ColorSpace=pikepdf.Name.DeviceGray,
+                BitsPerComponent=8,
+                Filter=pikepdf.Name.FlateDecode,
+            )
+            image = pdf.make_stream(
+                zlib.compress(image_data),
+                Type=pikepdf.Name.XObject,
+                Subtype=pikepdf.Name.Image,
+                Width=10,
+                Height=10,
+                ColorSpace=pikepdf.Name.DeviceRGB,
+                BitsPerComponent=8,
+                Filter=pikepdf.Name.FlateDecode,
+                SMask=smask,
+            )
+            font = pikepdf.Dictionary(
+                Type=pikepdf.Name.Font,
+                FontDescriptor=pdf.make_indirect(
+                    pikepdf.Dictionary(
+                        Type=pikepdf.Name.FontDescriptor,
+                        FontFile=pdf.make_stream(b"font" * 100),
+                    )
+                ),
+            )
+
+            for content in (f"({text}) Tj", "/Im0 Do"):
+                page = pdf.add_blank_page()
+                page.Resources = pikepdf.Dictionary(
+                    XObject=pikepdf.Dictionary(Im0=image), Font=pikepdf.Dictionary(F1=font)
+                )
+                page.Contents = pdf.make_stream(content.encode())
+            pdf.save(path)
+
+        return path
+
+    def _encrypt_with_owner_password(self) -> None:
+        with pikepdf.open(self.in_path) as pdf:
+            pdf.save(self.out_path, encryption=pikepdf.Encryption(owner=self.PASSWORD, user=""))
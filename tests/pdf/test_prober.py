@@ -0,0 +1,253 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pikepdf
+import pytest
+from telegram.error import TelegramError
+
+from pdf_bot.pdf import PdfProbe, PdfProber
+from pdf_bot.settings import Settings
+from tests.executor import ExecutorServiceTestMixin
+from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
+
+
+class TestPdfProber(ExecutorServiceTestMixin, TelegramServiceTestMixin, TelegramTestMixin):
+    PASSWORD = "password"
+    TEXT_CONTENT = b"BT /F1 12 Tf 72 720 Td (Hello) Tj ET"
+
+    def setup_method(self) -> None:
+        super().setup_method()
+        self.temp_dir = TemporaryDirectory()
+        self.input_path = Path(self.temp_dir.name) / "input.pdf"
+
+        self.telegram_service = self.mock_telegram_service()
+        self.telegram_service.download_pdf_file.return_value.__aenter__.return_value = (
+            self.input_path
+        )
+        self.executor_service = self.mock_executor_service()
+        self.sut = PdfProber(
+            self.telegram_service,
+            self.executor_service,
+            Settings(pdf_probe_timeout=1, pdf_probe_cache_max_size=2, pdf_probe_max_text_pages=2),
+        )
+
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
+        super().teardown_method()
+
+    @pytest.mark.asyncio
+    async def test_probe_text(self) -> None:
+        with pikepdf.new() as pdf:
+            page = pdf.add_blank_page(page_size=(200, 100))
+            page.Contents = pdf.make_stream(self.TEXT_CONTENT)
+            pdf.add_blank_page()
+            pdf.save(self.input_path)
+
+        actual = await self.sut.probe(self.TELEGRAM_FILE_ID)
+
+        assert actual == PdfProbe(
+            is_encrypted=False,
+            num_pages=2,
+            has_text=True,
+            page_sizes=((200, 100), (612, 792)),
+        )
+        self.telegram_service.download_pdf_file.assert_called_once_with(self.TELEGRAM_FILE_ID)
+
+    @pytest.mark.asyncio
+    async def test_probe_images(self) -> None:
+        with pikepdf.new() as pdf:
+            page = pdf.add_blank_page()
+            image = pdf.make_stream(
+                b"\xff" * 3,
+                Type=pikepdf.Name.XObject,
+                Subtype=pikepdf.Name.Image,
+                Width=1,
+                Height=1,
+                ColorSpace=pikepdf.Name.DeviceRGB,
+                BitsPerComponent=8,
+            )
+            page.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Im0=image))
+            page.Contents = pdf.make_stream(b"q 10 0 0 10 0 0 cm /Im0 Do Q")
+            pdf.save(self.input_path)
+
+        actual = await self.sut.probe(self.TELEGRAM_FILE_ID)
+
+        assert actual is not None
+        assert actual.num_images == 1
+        assert actual.has_text is False
+
+    @pytest.mark.asyncio
+    async def test_probe_inline_image(self) -> None:
+        with pikepdf.new() as pdf:
+            page = pdf.add_blank_page()
+            page.Contents = pdf.make_stream(
+                b"q 10 0 0 10 0 0 cm BI /W 1 /H 1 /CS /G /BPC 8 ID \xff EI Q"
+            )
+            pdf.save(self.input_path)
+
+        actual = await self.sut.probe(self.TELEGRAM_FILE_ID)
+
+        assert actual is not None
+        assert actual.num_images == 1
+
+    @pytest.mark.asyncio
+    async def test_probe_form_xobject_text(self) -> None:
+        with pikepdf.new() as pdf:
+            page = pdf.add_blank_page()
+            form = pdf.make_stream(
+                self.TEXT_CONTENT,
+                Type=pikepdf.Name.XObject,
+                Subtype=pikepdf.Name.Form,
+                BBox=[0, 0, 100, 100],
+            )
+            page.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Fm0=form))
+            page.Contents = pdf.make_stream(b"/Fm0 Do")
+            pdf.save(self.input_path)
+
+        actual = await self.sut.probe(self.TELEGRAM_FILE_ID)
+
+        assert actual is not None
+        assert actual.has_text is True
+        assert actual.num_images == 0
+
+    @pytest.mark.asyncio
+    async def test_probe_max_text_pages(self) -> None:
+        with pikepdf.new() as pdf:
+            pdf.add_blank_page()
+            pdf.add_blank_page()
+            page = pdf.add_blank_page()
+            page.Contents = pdf.make_stream(self.TEXT_CONTENT)
+            pdf.save(self.input_path)
+
+        actual = await self.sut.probe(self.TELEGRAM_FILE_ID)
+
+        # The page with text isn't scanned, so whether the file has text isn't known
+        assert actual is not None
+        assert actual.num_pages == 3
+        assert actual.has_text is None
+
+    @pytest.mark.asyncio
+    async def test_probe_encrypted(self) -> None:
+        with pikepdf.new() as pdf:
+            pdf.add_blank_page()
+            pdf.save(
+                self.input_path,
+                encryption=pikepdf.Encryption(owner=self.PASSWORD, user=self.PASSWORD),
+            )
+
+        actual = await self.sut.probe(self.TELEGRAM_FILE_ID)
+
+        assert actual == PdfProbe(is_encrypted=True)
+        assert actual is not None
+        assert actual.is_readable is False
+
+    @pytest.mark.asyncio
+    async def test_probe_invalid(self) -> None:
+        self.input_path.write_bytes(b"invalid")
+
+        actual = await self.sut.probe(self.TELEGRAM_FILE_ID)
+
+        assert actual is None
+        assert await self.sut.get_cached(self.TELEGRAM_FILE_ID) is None
+
+    @pytest.mark.asyncio
+    async def test_probe_unexpected_error(self) -> None:
+        self._write_blank_pdf()
+
+        with (
+            patch("pdf_bot.pdf.prober.pikepdf.Rectangle", side_effect=TypeError),
+            patch("pdf_bot.pdf.prober.logger") as logger,
+        ):
+            actual = await self.sut.probe(self.TELEGRAM_FILE_ID)
+
+        assert actual is None
+        logger.exception.assert_called_once()
+        assert await self.sut.get_cached(self.TELEGRAM_FILE_ID) is None
+
+    @pytest.mark.asyncio
+    async def test_probe_telegram_error(self) -> None:
+        self.telegram_service.get_file_unique_id.side_effect = TelegramError("error")
+
+        actual = await self.sut.probe(self.TELEGRAM_FILE_ID)
+
+        assert actual is None
+        self.telegram_service.download_pdf_file.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_probe_timeout(self) -> None:
+        @asynccontextmanager
+        async def download_pdf_file(_file_id: str) -> AsyncGenerator[Path, None]:
+            await asyncio.sleep(10)
+            yield self.input_path
+
+        self.telegram_service.download_pdf_file = download_pdf_file
+        self.sut.timeout = 0.01
+
+        actual = await self.sut.probe(self.TELEGRAM_FILE_ID)
+        assert actual is None
+
+    @pytest.mark.asyncio
+    async def test_probe_in_background(self) -> None:
+        self._write_blank_pdf()
+
+        self.sut.probe_in_background(self.TELEGRAM_FILE_ID)
+        assert await self.sut.get_cached(self.TELEGRAM_FILE_ID) is None
+
+        await asyncio.gather(*self.sut._background_tasks)  # noqa: SLF001
+        assert await self.sut.get_cached(self.TELEGRAM_FILE_ID) is not None
+
+    @pytest.mark.asyncio
+    async def test_probe_cached(self) -> None:
+        self._write_blank_pdf()
+
+        actual_a = await self.sut.probe(self.TELEGRAM_FILE_ID)
+        actual_b = await self.sut.probe(self.TELEGRAM_FILE_ID)
+        actual_c = await self.sut.get_cached(self.TELEGRAM_FILE_ID)
+
+        assert actual_a is not None
+        assert actual_a == actual_b == actual_c
+        self.telegram_service.download_pdf_file.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_probe_cache_evicts_oldest(self) -> None:
+        self._write_blank_pdf()
+        self.telegram_service.get_file_unique_id.side_effect = lambda x: x
+
+        for file_id in ("a", "b", "a", "c"):
+            await self.sut.probe(file_id)
+
+        assert await self.sut.get_cached("a") is not None
+        assert await self.sut.get_cached("b") is None
+        assert await self.sut.get_cached("c") is not None
+
+    @pytest.mark.asyncio
+    async def test_get_cached_not_probed(self) -> None:
+        actual = await self.sut.get_cached(self.TELEGRAM_FILE_ID)
+
+        assert actual is None
+        self.telegram_service.download_pdf_file.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_cached_telegram_error(self) -> None:
+        self.telegram_service.get_file_unique_id.side_effect = TelegramError("error")
+
+        actual = await self.sut.get_cached(self.TELEGRAM_FILE_ID)
+        assert actual is None
+
+    def test_init_with_dict(self) -> None:
+        sut = PdfProber(
+            self.telegram_service,
+            self.executor_service,
+            Settings(pdf_probe_timeout=5, pdf_probe_max_text_pages=10).model_dump(),
+        )
+        assert sut.timeout == 5
+        assert sut.max_text_pages == 10
+
+    def _write_blank_pdf(self) -> None:
+        with pikepdf.new() as pdf:
+            pdf.add_blank_page()
+            pdf.save(self.input_path)
@@ -0,0 +1,191 @@
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest.mock import MagicMock
+
+import pikepdf
+import pytest
+
+from pdf_bot.cli import CLINonZeroExitStatusError, CLIService, CLITimeoutError
+from pdf_bot.pdf import PdfTextExtractor
+from pdf_bot.pdf.exceptions import PdfEncryptedError, PdfReadError
+from pdf_bot.settings import Settings
+from tests.executor import ExecutorServiceTestMixin
+
+
+class TestPdfTextExtractor(ExecutorServiceTestMixin):
+    NUM_PAGES = 5
+    PAGES_PER_CHUNK = 2
+    LONG_LINE = "word " * 30
+    PASSWORD = "password"
+
+    def setup_method(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.dir_path = Path(self.temp_dir.name)
+        self.work_dir = self.dir_path / "work"
+        self.work_dir.mkdir()
+        self.input_path = self.dir_path / "input.pdf"
+        self.out_path = self.dir_path / "out.txt"
+        self._write_pdf(self.input_path, [f"Page {i}" for i in range(1, self.NUM_PAGES + 1)])
+
+        self.cli_service = MagicMock(spec=CLIService)
+        self.cli_service.extract_pdf_text.side_effect = self._write_pdftotext_output
+        self.executor_service = self.mock_executor_service()
+        self.sut = PdfTextExtractor(
+            self.cli_service,
+            self.executor_service,
+            Settings(text_pages_per_chunk=self.PAGES_PER_CHUNK, cli_max_concurrency=2),
+        )
+
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_extract(self) -> None:
+        actual = await self.sut.extract(self.input_path, self.out_path, self.work_dir)
+
+        assert actual is True
+        assert self.out_path.read_text() == "".join(
+            f"pdftotext {i}\n" for i in range(1, self.NUM_PAGES + 1)
+        )
+        assert [x.args[2:] for x in self.cli_service.extract_pdf_text.call_args_list] == [
+            (1, 2),
+            (3, 4),
+            (5, 5),
+        ]
+        # The outputs of pdftotext are removed once they're read
+        assert list(self.work_dir.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_extract_wraps_lines(self) -> None:
+        self._write_pdf(self.input_path, [self.LONG_LINE])
+
+        async def write_output(_input_path: Path, output_path: Path, *_args: Any) -> None:
+            output_path.write_text(f"{self.LONG_LINE}\f")
+
+        self.cli_service.extract_pdf_text.side_effect = write_output
+
+        await self.sut.extract(self.input_path, self.out_path, self.work_dir)
+
+        lines = self.out_path.read_text().splitlines()
+        assert len(lines) > 1
+        assert all(len(x) <= 70 for x in lines)
+
+    @pytest.mark.asyncio
+    async def test_extract_utf8(self) -> None:
+        text = "Ça coûte 5 € 日本語"
+
+        async def write_output(_input_path: Path, output_path: Path, *_args: Any) -> None:
+            output_path.write_text(f"{text}\f", encoding="utf-8")
+
+        self.cli_service.extract_pdf_text.side_effect = write_output
+
+        await self.sut.extract(self.input_path, self.out_path, self.work_dir)
+
+        assert self.out_path.read_text(encoding="utf-8").splitlines()[0] == text
+
+    @pytest.mark.asyncio
+    async def test_extract_pdfminer_fallback(self) -> None:
+        self.cli_service.extract_pdf_text.side_effect = CLINonZeroExitStatusError
+
+        actual = await self.sut.extract(self.input_path, self.out_path, self.work_dir)
+
+        assert actual is True
+        assert self.out_path.read_text() == "".join(
+            f"Page {i}\n" for i in range(1, self.NUM_PAGES + 1)
+        )
+
+    @pytest.mark.asyncio
+    async def test_extract_pdftotext_not_installed(self) -> None:
+        self.cli_service.extract_pdf_text.side_effect = FileNotFoundError
+
+        actual = await self.sut.extract(self.input_path, self.out_path, self.work_dir)
+
+        assert actual is True
+        assert self.out_path.read_text().splitlines()[0] == "Page 1"
+
+    @pytest.mark.asyncio
+    async def test_extract_timeout(self) -> None:
+        self.cli_service.extract_pdf_text.side_effect = CLITimeoutError
+
+        with pytest.raises(CLITimeoutError):
+            await self.sut.extract(self.input_path, self.out_path, self.work_dir)
+
+    @pytest.mark.asyncio
+    async def test_extract_no_text(self) -> None:
+        self._write_pdf(self.input_path, ["", ""])
+        self.cli_service.extract_pdf_text.side_effect = CLINonZeroExitStatusError
+
+        actual = await self.sut.extract(self.input_path, self.out_path, self.work_dir)
+
+        assert actual is False
+        assert self.out_path.read_text() == ""
+
+    @pytest.mark.asyncio
+    async def test_extract_encrypted(self) -> None:
+        self._write_pdf(self.input_path, ["Page 1"], self.PASSWORD)
+
+        with pytest.raises(PdfEncryptedError):
+            await self.sut.extract(self.input_path, self.out_path, self.work_dir)
+
+    @pytest.mark.asyncio
+    async def test_extract_invalid(self) -> None:
+        self.input_path.write_bytes(b"invalid")
+
+        with pytest.raises(PdfReadError):
+            await self.sut.extract(self.input_path, self.out_path, self.work_dir)
+
+    @pytest.mark.asyncio
+    async def test_extract_bounds_pending_chunks(self) -> None:
+        running = 0
+        max_running = 0
+
+        async def write_output(input_path: Path, output_path: Path, *args: Any) -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            await self._write_pdftotext_output(input_path, output_path, *args)
+
+        self.cli_service.extract_pdf_text.side_effect = write_output
+
+        await self.sut.extract(self.input_path, self.out_path, self.work_dir)
+        assert max_running == 2
+
+    def test_init_with_dict(self) -> None:
+        sut = PdfTextExtractor(
+            self.cli_service,
+            self.executor_service,
+            Settings(text_pages_per_chunk=10).model_dump(),
+        )
+        assert sut.pages_per_chunk == 10
+
+    @staticmethod
+    async def _write_pdftotext_output(
+        _input_path: Path, output_path: Path, first_page: int, last_page: int
+    ) -> None:
+        output_path.write_text(
+            "".join(f"pdftotext {i}\f" for i in range(first_page, last_page + 1))
+        )
+
+    @staticmethod
+    def _write_pdf(path: Path, texts: list[str], password: str | None = None) -> None:
+        with pikepdf.new() as pdf:
+            font = pdf.make_indirect(
+                pikepdf.Dictionary(
+                    Type=pikepdf.Name.Font,
+                    Subtype=pikepdf.Name.Type1,
+                    BaseFont=pikepdf.Name.Helvetica,
+                    Encoding=pikepdf.Name.WinAnsiEncoding,
+                )
+            )
+            for text in texts:
+                page = pdf.add_blank_page()
+                page.Resources = pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font))
+                content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET" if text else ""
+                page.Contents = pdf.make_stream(content.encode())
+
+            encryption = pikepdf.Encryption(owner=password, user=password) if password else False
+            pdf.save(path, encryption=encryption)
@@ -8,8 +8,9 @@ from telegram.ext import BaseHandler
 from pdf_bot.analytics import TaskType
 from pdf_bot.file_processor.errors import DuplicateClassError
 from pdf_bot.models import FileData, FileTaskResult, TaskData
-from pdf_bot.pdf import PdfService, PdfServiceError
+from pdf_bot.pdf import PdfProbe, PdfService, PdfServiceError
 from pdf_bot.pdf_processor import AbstractPdfProcessor
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin
 
@@ -32,11 +33,14 @@ class MockProcessor(AbstractPdfProcessor):
         yield MagicMock(spec=FileTaskResult)
 
 
-class TestAbstractPdfProcessor(LanguageServiceTestMixin, TelegramServiceTestMixin):
+class TestAbstractPdfProcessor(
+    JobSchedulerTestMixin, LanguageServiceTestMixin, TelegramServiceTestMixin
+):
     def setup_method(self) -> None:
         super().setup_method()
         self.pdf_service = MagicMock(spec=PdfService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.pdf_processors_patcher = patch(
@@ -58,7 +62,9 @@ class TestAbstractPdfProcessor(LanguageServiceTestMixin, TelegramServiceTestMixi
         processors: dict = {}
         self.pdf_processors.__contains__.side_effect = processors.__contains__
 
-        proc = MockProcessor(self.pdf_service, self.telegram_service, self.language_service)
+        proc = MockProcessor(
+            self.pdf_service, self.telegram_service, self.language_service, self.job_scheduler
+        )
 
         self.pdf_processors.__setitem__.assert_called_once_with(proc.__class__.__name__, proc)
 
@@ -67,7 +73,9 @@ class TestAbstractPdfProcessor(LanguageServiceTestMixin, TelegramServiceTestMixi
         self.pdf_processors.__contains__.side_effect = processors.__contains__
 
         with pytest.raises(DuplicateClassError):
-            MockProcessor(self.pdf_service, self.telegram_service, self.language_service)
+            MockProcessor(
+                self.pdf_service, self.telegram_service, self.language_service, self.job_scheduler
+            )
 
         self.pdf_processors.__setitem__.assert_not_called()
 
@@ -81,11 +89,57 @@ class TestAbstractPdfProcessor(LanguageServiceTestMixin, TelegramServiceTestMixi
 
         assert actual == [task_data]
 
+    @pytest.mark.asyncio
+    async def test_filter_pdf_tasks(self) -> None:
+        shown = TaskData("shown", FileData)
+        hidden = TaskData("hidden", FileTaskResult)  # type: ignore[arg-type]
+        probe = PdfProbe(is_encrypted=False, num_pages=1)
+        self.pdf_service.get_pdf_probe.return_value = probe
+
+        shown_processor = MagicMock(spec=AbstractPdfProcessor)
+        shown_processor.task_data = shown
+        shown_processor.is_applicable.return_value = True
+        hidden_processor = MagicMock(spec=AbstractPdfProcessor)
+        hidden_processor.task_data = hidden
+        hidden_processor.is_applicable.return_value = False
+        self.pdf_processors.values.return_value = [shown_processor, hidden_processor]
+
+        actual = await AbstractPdfProcessor.filter_pdf_tasks(
+            self.pdf_service, self.TELEGRAM_DOCUMENT_ID, [shown, hidden]
+        )
+
+        assert actual == [shown]
+        self.pdf_service.get_pdf_probe.assert_called_once_with(self.TELEGRAM_DOCUMENT_ID)
+        hidden_processor.is_applicable.assert_called_once_with(probe)
+
+    @pytest.mark.asyncio
+    async def test_filter_pdf_tasks_without_probe(self) -> None:
+        tasks = [TaskData("a", FileData)]
+        self.pdf_service.get_pdf_probe.return_value = None
+
+        actual = await AbstractPdfProcessor.filter_pdf_tasks(
+            self.pdf_service, self.TELEGRAM_DOCUMENT_ID, tasks
+        )
+
+        assert actual == tasks
+        self.pdf_processors.values.assert_not_called()
+
+    def test_is_applicable(self) -> None:
+        processor = MockProcessor(
+            self.pdf_service,
+            self.telegram_service,
+            self.language_service,
+            self.job_scheduler,
+            bypass_init_check=True,
+        )
+        assert processor.is_applicable(PdfProbe(is_encrypted=True)) is True
+
     def test_generic_error_types(self) -> None:
         processor = MockProcessor(
             self.pdf_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
         assert processor.generic_error_types == {PdfServiceError}
@@ -8,6 +8,7 @@ from telegram.ext import CallbackQueryHandler, CommandHandler, ConversationHandl
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import CallbackQueryDataTypeError, FileDataTypeError
 from pdf_bot.file_processor import AbstractFileTaskProcessor
+from pdf_bot.job_scheduler import JobScheduler
 from pdf_bot.language import LanguageService
 from pdf_bot.models import BackData, FileData, FileTaskResult, TaskData
 from pdf_bot.pdf import PdfService
@@ -18,6 +19,7 @@ from pdf_bot.pdf_processor import (
     SelectOptionData,
 )
 from pdf_bot.telegram_internal import TelegramService
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.path_test_mixin import PathTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
@@ -40,9 +42,12 @@ class MockProcessor(PathTestMixin, AbstractPdfSelectAndTextProcessor):
         pdf_service: PdfService,
         telegram_service: TelegramService,
         language_service: LanguageService,
+        job_scheduler: JobScheduler,
         bypass_init_check: bool = False,
     ) -> None:
-        super().__init__(pdf_service, telegram_service, language_service, bypass_init_check)
+        super().__init__(
+            pdf_service, telegram_service, language_service, job_scheduler, bypass_init_check
+        )
         path = self.mock_file_path()
         self.file_task_result = FileTaskResult(path)
 
@@ -79,6 +84,7 @@ class MockProcessor(PathTestMixin, AbstractPdfSelectAndTextProcessor):
 
 
 class TestAbstractPdfTextInputProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -104,12 +110,14 @@ class TestAbstractPdfTextInputProcessor(
 
         self.pdf_service = MagicMock(spec=PdfService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.sut = MockProcessor(
             self.pdf_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
@@ -8,12 +8,14 @@ from telegram.ext import CallbackQueryHandler, CommandHandler, ConversationHandl
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.file_processor import AbstractFileTaskProcessor
+from pdf_bot.job_scheduler import JobScheduler
 from pdf_bot.language import LanguageService
 from pdf_bot.models import BackData, FileData, FileTaskResult, TaskData
 from pdf_bot.pdf import PdfService
 from pdf_bot.pdf_processor import AbstractPdfTextInputProcessor, TextInputData
 from pdf_bot.telegram_internal import TelegramService
 from pdf_bot.telegram_internal.exceptions import TelegramGetUserDataError
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.path_test_mixin import PathTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
@@ -27,9 +29,12 @@ class MockProcessor(PathTestMixin, AbstractPdfTextInputProcessor):
         pdf_service: PdfService,
         telegram_service: TelegramService,
         language_service: LanguageService,
+        job_scheduler: JobScheduler,
         bypass_init_check: bool = False,
     ) -> None:
-        super().__init__(pdf_service, telegram_service, language_service, bypass_init_check)
+        super().__init__(
+            pdf_service, telegram_service, language_service, job_scheduler, bypass_init_check
+        )
         path = self.mock_file_path()
         self.file_task_result = FileTaskResult(path)
 
@@ -61,6 +66,7 @@ class MockProcessor(PathTestMixin, AbstractPdfTextInputProcessor):
 
 
 class TestAbstractPdfTextInputProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -78,12 +84,14 @@ class TestAbstractPdfTextInputProcessor(
 
         self.pdf_service = MagicMock(spec=PdfService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.sut = MockProcessor(
             self.pdf_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
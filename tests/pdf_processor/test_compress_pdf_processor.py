@@ -1,32 +1,50 @@
+from typing import cast
 from unittest.mock import MagicMock
 
 import pytest
-from telegram.ext import CallbackQueryHandler
+from telegram import InlineKeyboardMarkup
+from telegram.ext import CallbackQueryHandler, CommandHandler, ConversationHandler
 
 from pdf_bot.analytics import TaskType
-from pdf_bot.models import TaskData
-from pdf_bot.pdf import PdfService
+from pdf_bot.errors import CallbackQueryDataTypeError, FileDataTypeError
+from pdf_bot.file_processor import AbstractFileTaskProcessor
+from pdf_bot.models import BackData, TaskData
+from pdf_bot.pdf import CompressLevel, PdfService
 from pdf_bot.pdf.models import CompressResult
-from pdf_bot.pdf_processor import CompressPdfData, CompressPdfProcessor
+from pdf_bot.pdf_processor import CompressLevelData, CompressPdfData, CompressPdfProcessor
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
 class TestCompressPdfProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
 ):
+    WAIT_LEVEL = "wait_level"
+
     def setup_method(self) -> None:
         super().setup_method()
+        self.telegram_update.callback_query = None
+
         self.pdf_service = MagicMock(spec=PdfService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
+        self.level_data = CompressLevelData(
+            id=self.TELEGRAM_DOCUMENT_ID,
+            name=self.TELEGRAM_DOCUMENT_NAME,
+            level=CompressLevel.high,
+        )
+
         self.sut = CompressPdfProcessor(
             self.pdf_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
@@ -40,16 +58,92 @@ class TestCompressPdfProcessor(
 
     def test_handler(self) -> None:
         actual = self.sut.handler
+        assert isinstance(actual, ConversationHandler)
+
+        entry_points = actual.entry_points
+        assert len(entry_points) == 1
+        assert isinstance(entry_points[0], CallbackQueryHandler)
+        assert entry_points[0].pattern == CompressPdfData
+
+        assert self.WAIT_LEVEL in actual.states
+        wait_level_state = actual.states[self.WAIT_LEVEL]
+        assert len(wait_level_state) == 2
+
+        assert isinstance(wait_level_state[0], CallbackQueryHandler)
+        assert wait_level_state[0].pattern == CompressLevelData
 
-        assert isinstance(actual, CallbackQueryHandler)
-        assert actual.pattern == CompressPdfData
+        assert isinstance(wait_level_state[1], CallbackQueryHandler)
+        assert wait_level_state[1].pattern == BackData
+
+        fallbacks = actual.fallbacks
+        assert len(fallbacks) == 1
+        assert isinstance(fallbacks[0], CommandHandler)
+        assert fallbacks[0].commands == {"cancel"}
+
+        map_to_parent = actual.map_to_parent
+        assert map_to_parent is not None
+        assert (
+            map_to_parent[AbstractFileTaskProcessor.WAIT_FILE_TASK]
+            == AbstractFileTaskProcessor.WAIT_FILE_TASK
+        )
 
     @pytest.mark.asyncio
     async def test_process_file_task(self) -> None:
         result = CompressResult(2, 1, self.file_path)
         self.pdf_service.compress_pdf.return_value.__aenter__.return_value = result
 
-        async with self.sut.process_file_task(self.FILE_DATA) as actual:
+        async with self.sut.process_file_task(self.level_data) as actual:
             assert actual.path == self.file_path
             assert actual.message is not None
-            self.pdf_service.compress_pdf.assert_called_once_with(self.FILE_DATA.id)
+            assert actual.message.startswith("File size reduced by 50%")
+            self.pdf_service.compress_pdf.assert_called_once_with(
+                self.level_data.id, CompressLevel.high
+            )
+
+    @pytest.mark.asyncio
+    async def test_process_file_task_not_smaller(self) -> None:
+        result = CompressResult(2, 2, self.file_path)
+        self.pdf_service.compress_pdf.return_value.__aenter__.return_value = result
+
+        async with self.sut.process_file_task(self.level_data) as actual:
+            assert actual.path == self.file_path
+            assert actual.message == "Your PDF file is already as small as it can be"
+
+    @pytest.mark.asyncio
+    async def test_process_file_task_invalid_file_data(self) -> None:
+        with pytest.raises(FileDataTypeError):
+            async with self.sut.process_file_task(self.FILE_DATA):
+                pass
+        self.pdf_service.compress_pdf.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ask_level(self) -> None:
+        self.telegram_callback_query.data = CompressPdfData(
+            self.TELEGRAM_DOCUMENT_ID, self.TELEGRAM_DOCUMENT_NAME
+        )
+        self.telegram_update.callback_query = self.telegram_callback_query
+
+        actual = await self.sut.ask_level(self.telegram_update, self.telegram_context)
+
+        assert actual == self.WAIT_LEVEL
+        self.telegram_service.answer_query_and_drop_data.assert_called_once_with(
+            self.telegram_context, self.telegram_callback_query
+        )
+        self.telegram_callback_query.edit_message_text.assert_called_once()
+
+        reply_markup = self.telegram_callback_query.edit_message_text.call_args.kwargs[
+            "reply_markup"
+        ]
+        assert isinstance(reply_markup, InlineKeyboardMarkup)
+        levels = [
+            cast(CompressLevelData, x.callback_data).level for x in reply_markup.inline_keyboard[0]
+        ]
+        assert levels == [CompressLevel.low, CompressLevel.medium, CompressLevel.high]
+
+    @pytest.mark.asyncio
+    async def test_ask_level_invalid_callback_query_data(self) -> None:
+        self.telegram_update.callback_query = self.telegram_callback_query
+
+        with pytest.raises(CallbackQueryDataTypeError):
+            await self.sut.ask_level(self.telegram_update, self.telegram_context)
+        self.telegram_callback_query.edit_message_text.assert_not_called()
@@ -5,13 +5,15 @@ import pytest
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import FileDataTypeError
 from pdf_bot.models import FileData, TaskData
-from pdf_bot.pdf import PdfIncorrectPasswordError, PdfService
+from pdf_bot.pdf import PdfIncorrectPasswordError, PdfProbe, PdfService
 from pdf_bot.pdf_processor import DecryptPdfData, DecryptPdfProcessor
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
 class TestDecryptPdfProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -22,12 +24,14 @@ class TestDecryptPdfProcessor(
         super().setup_method()
         self.pdf_service = MagicMock(spec=PdfService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.sut = DecryptPdfProcessor(
             self.pdf_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
@@ -43,6 +47,16 @@ class TestDecryptPdfProcessor(
         actual = self.sut.task_data
         assert actual == TaskData("Decrypt", DecryptPdfData)
 
+    @pytest.mark.parametrize(
+        ("probe", "expected"),
+        [
+            (PdfProbe(is_encrypted=True), True),
+            (PdfProbe(is_encrypted=False, num_pages=1), False),
+        ],
+    )
+    def test_is_applicable(self, probe: PdfProbe, expected: bool) -> None:
+        assert self.sut.is_applicable(probe) == expected
+
     def test_get_cleaned_text_input(self) -> None:
         actual = self.sut.get_cleaned_text_input(self.TELEGRAM_TEXT)
         assert actual == self.TELEGRAM_TEXT
@@ -5,13 +5,15 @@ import pytest
 from pdf_bot.analytics import TaskType
 from pdf_bot.errors import FileDataTypeError
 from pdf_bot.models import TaskData
-from pdf_bot.pdf import PdfService
+from pdf_bot.pdf import PdfProbe, PdfService
 from pdf_bot.pdf_processor import EncryptPdfData, EncryptPdfProcessor
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
 class TestEncryptPdfProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -20,12 +22,14 @@ class TestEncryptPdfProcessor(
         super().setup_method()
         self.pdf_service = MagicMock(spec=PdfService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.sut = EncryptPdfProcessor(
             self.pdf_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
@@ -41,6 +45,16 @@ class TestEncryptPdfProcessor(
         actual = self.sut.task_data
         assert actual == TaskData("Encrypt", EncryptPdfData)
 
+    @pytest.mark.parametrize(
+        ("probe", "expected"),
+        [
+            (PdfProbe(is_encrypted=True), False),
+            (PdfProbe(is_encrypted=False, num_pages=1), True),
+        ],
+    )
+    def test_is_applicable(self, probe: PdfProbe, expected: bool) -> None:
+        assert self.sut.is_applicable(probe) == expected
+
     def test_get_cleaned_text_input(self) -> None:
         actual = self.sut.get_cleaned_text_input(self.TELEGRAM_TEXT)
         assert actual == self.TELEGRAM_TEXT
@@ -5,13 +5,15 @@ from telegram.ext import CallbackQueryHandler
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.models import TaskData
-from pdf_bot.pdf import PdfService
+from pdf_bot.pdf import PdfProbe, PdfService
 from pdf_bot.pdf_processor import ExtractPdfTextData, ExtractPdfTextProcessor
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
 class TestExtractPDFTextProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -20,12 +22,14 @@ class TestExtractPDFTextProcessor(
         super().setup_method()
         self.pdf_service = MagicMock(spec=PdfService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.sut = ExtractPdfTextProcessor(
             self.pdf_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
@@ -37,6 +41,18 @@ class TestExtractPDFTextProcessor(
         actual = self.sut.task_data
         assert actual == TaskData("Extract text", ExtractPdfTextData)
 
+    @pytest.mark.parametrize(
+        ("probe", "expected"),
+        [
+            (PdfProbe(is_encrypted=False, num_pages=1, has_text=True), True),
+            (PdfProbe(is_encrypted=False, num_pages=1, has_text=False), False),
+            (PdfProbe(is_encrypted=False, num_pages=1, has_text=None), True),
+            (PdfProbe(is_encrypted=True), True),
+        ],
+    )
+    def test_is_applicable(self, probe: PdfProbe, expected: bool) -> None:
+        assert self.sut.is_applicable(probe) == expected
+
     def test_handler(self) -> None:
         actual = self.sut.handler
 
@@ -1,17 +1,22 @@
-from unittest.mock import MagicMock
+from unittest.mock import ANY, AsyncMock, MagicMock
 
 import pytest
+from telegram import Message
+from telegram.error import TelegramError
 from telegram.ext import CallbackQueryHandler
 
 from pdf_bot.analytics import TaskType
 from pdf_bot.models import TaskData
-from pdf_bot.pdf import PdfService
+from pdf_bot.pdf import PdfProbe, PdfService
+from pdf_bot.pdf.pdf_service import PageProgressFunc
 from pdf_bot.pdf_processor import OcrPdfData, OcrPdfProcessor
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
 class TestOCRPdfProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -20,12 +25,14 @@ class TestOCRPdfProcessor(
         super().setup_method()
         self.pdf_service = MagicMock(spec=PdfService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.sut = OcrPdfProcessor(
             self.pdf_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
@@ -37,6 +44,19 @@ class TestOCRPdfProcessor(
         actual = self.sut.task_data
         assert actual == TaskData("OCR", OcrPdfData)
 
+    @pytest.mark.parametrize(
+        ("probe", "expected"),
+        [
+            (PdfProbe(is_encrypted=False, num_pages=1), True),
+            (PdfProbe(is_encrypted=False, num_pages=1, has_text=True), False),
+            (PdfProbe(is_encrypted=False, num_pages=1, has_text=None), True),
+            (PdfProbe(is_encrypted=True), False),
+        ],
+    )
+    def test_is_applicable(self, probe: PdfProbe, expected: bool) -> None:
+        self.pdf_service.ocr_mode = "default"
+        assert self.sut.is_applicable(probe) == expected
+
     def test_handler(self) -> None:
         actual = self.sut.handler
 
@@ -50,3 +70,48 @@ class TestOCRPdfProcessor(
         async with self.sut.process_file_task(self.FILE_DATA) as actual:
             assert actual == self.file_task_result
             self.pdf_service.ocr_pdf.assert_called_once_with(self.FILE_DATA.id)
+
+    @pytest.mark.asyncio
+    async def test_create_file_task_with_progress(self) -> None:
+        progress_msg = AsyncMock(spec=Message)
+        self.telegram_message.reply_text.return_value = progress_msg
+        self.sut._PROGRESS_INTERVAL = 0  # noqa: SLF001
+
+        on_progress = await self._get_progress_func()
+        await on_progress(1, 2)
+        await on_progress(2, 2)
+
+        # The progress is sent once and then edited in place
+        self.telegram_message.reply_text.assert_called_once()
+        progress_msg.edit_text.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_create_file_task_progress_throttled(self) -> None:
+        on_progress = await self._get_progress_func()
+        await on_progress(1, 2)
+
+        # Files that are OCRed quickly don't get any progress updates
+        self.telegram_message.reply_text.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_file_task_progress_error(self) -> None:
+        self.telegram_message.reply_text.side_effect = TelegramError("Error")
+        self.sut._PROGRESS_INTERVAL = 0  # noqa: SLF001
+
+        on_progress = await self._get_progress_func()
+        await on_progress(1, 2)
+
+        self.telegram_message.reply_text.assert_called_once()
+
+    async def _get_progress_func(self) -> PageProgressFunc:
+        self.pdf_service.ocr_pdf.return_value.__aenter__.return_value = self.file_path
+
+        file_task = self.sut._create_file_task(  # noqa: SLF001
+            self.telegram_update, self.telegram_context, self.FILE_DATA
+        )
+        async with file_task as actual:
+            assert actual == self.file_task_result
+
+        self.pdf_service.ocr_pdf.assert_called_once_with(self.FILE_DATA.id, ANY)
+        on_progress: PageProgressFunc = self.pdf_service.ocr_pdf.call_args.args[1]
+        return on_progress
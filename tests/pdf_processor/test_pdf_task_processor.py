@@ -1,3 +1,9 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pdf_bot.models import FileData, TaskData
+from pdf_bot.pdf import PdfService
 from pdf_bot.pdf_processor import AbstractPdfProcessor, PdfTaskProcessor
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramTestMixin
@@ -7,11 +13,26 @@ class TestPdfTaskProcessor(
     LanguageServiceTestMixin,
     TelegramTestMixin,
 ):
+    TASKS = (TaskData("a", FileData),)
+
     def setup_method(self) -> None:
         super().setup_method()
         self.language_service = self.mock_language_service()
-        self.sut = PdfTaskProcessor(self.language_service)
+        self.pdf_service = MagicMock(spec=PdfService)
+        self.sut = PdfTaskProcessor(self.language_service, self.pdf_service)
 
     def test_processor_type(self) -> None:
         actual = self.sut.processor_type
         assert actual == AbstractPdfProcessor
+
+    @pytest.mark.asyncio
+    async def test_filter_tasks(self) -> None:
+        with patch.object(AbstractPdfProcessor, "filter_pdf_tasks") as filter_pdf_tasks:
+            filter_pdf_tasks.return_value = []
+
+            actual = await self.sut.filter_tasks(self.TELEGRAM_DOCUMENT_ID, self.TASKS)
+
+            assert actual == []
+            filter_pdf_tasks.assert_called_once_with(
+                self.pdf_service, self.TELEGRAM_DOCUMENT_ID, self.TASKS
+            )
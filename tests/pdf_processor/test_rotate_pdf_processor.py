@@ -9,11 +9,13 @@ from pdf_bot.file_processor import AbstractFileTaskProcessor
 from pdf_bot.models import BackData, TaskData
 from pdf_bot.pdf import PdfService
 from pdf_bot.pdf_processor import RotateDegreeData, RotatePdfData, RotatePdfProcessor
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
 class TestRotatePdfProcessor(
+    JobSchedulerTestMixin,
     LanguageServiceTestMixin,
     TelegramServiceTestMixin,
     TelegramTestMixin,
@@ -26,12 +28,14 @@ class TestRotatePdfProcessor(
 
         self.pdf_service = MagicMock(spec=PdfService)
         self.language_service = self.mock_language_service()
+        self.job_scheduler = self.mock_job_scheduler()
         self.telegram_service = self.mock_telegram_service()
 
         self.sut = RotatePdfProcessor(
             self.pdf_service,
             self.telegram_service,
             self.language_service,
+            self.job_scheduler,
             bypass_init_check=True,
         )
 
@@ -0,0 +1,275 @@
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pytest
+
+from pdf_bot.models import FileData
+from pdf_bot.persistence import (
+    AbstractPersistenceBackend,
+    BotPersistence,
+    FilePersistenceBackend,
+    MemoryPersistenceBackend,
+    SqlitePersistenceBackend,
+)
+from pdf_bot.settings import Settings
+
+
+class TestBotPersistence:
+    USER_ID = 1
+    CHAT_ID = 2
+    USER_DATA = {"file_data": FileData("id", "name")}  # noqa: RUF012
+    CONVERSATION_NAME = "conversation"
+    CONVERSATION_KEY = (2, 1)
+
+    def setup_method(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.backend = SqlitePersistenceBackend(Path(self.temp_dir.name) / "persistence.db")
+        self.settings = Settings(persistence_flush_interval=60, persistence_max_batch_size=3)
+        self.sut = BotPersistence(self.settings, self.backend)
+
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
+
+    @pytest.mark.parametrize(
+        ("backend", "backend_cls"),
+        [
+            ("memory", MemoryPersistenceBackend),
+            ("file", FilePersistenceBackend),
+            ("sqlite", SqlitePersistenceBackend),
+        ],
+    )
+    def test_init_backend(
+        self, backend: str, backend_cls: type[AbstractPersistenceBackend]
+    ) -> None:
+        settings = Settings(
+            persistence_backend=backend,
+            persistence_path=Path(self.temp_dir.name) / "data",
+            persistence_update_interval=5,
+        )
+        sut = BotPersistence(settings.model_dump())
+
+        assert isinstance(sut.backend, backend_cls)
+        assert sut.update_interval == 5
+        # Data is only handed over to be stored by durable backends
+        assert sut.store_data.user_data is (backend != "memory")
+        assert sut.store_data.callback_data is (backend != "memory")
+
+    @pytest.mark.asyncio
+    async def test_not_durable(self) -> None:
+        backend = MemoryPersistenceBackend()
+        sut = BotPersistence(self.settings, backend)
+
+        await sut.update_conversation(self.CONVERSATION_NAME, self.CONVERSATION_KEY, 1)
+        await sut.update_user_data(self.USER_ID, self.USER_DATA)
+        await sut.flush()
+
+        assert await sut.get_conversations(self.CONVERSATION_NAME) == {}
+        assert await sut.get_user_data() == {}
+        assert sut._flush_task is None  # noqa: SLF001
+
+    @pytest.mark.asyncio
+    async def test_write_behind(self) -> None:
+        await self.sut.update_user_data(self.USER_ID, {"a": 1})
+        await self.sut.update_user_data(self.USER_ID, self.USER_DATA)
+
+        # Pending updates are visible to this instance before they're written
+        assert self.backend.get(BotPersistence.USER_DATA, str(self.USER_ID)) is None
+        assert await self.sut.get_user_data() == {self.USER_ID: self.USER_DATA}
+
+        await self.sut.flush()
+        assert await self._create_sut().get_user_data() == {self.USER_ID: self.USER_DATA}
+
+    @pytest.mark.asyncio
+    async def test_update_snapshots_data(self) -> None:
+        data: dict = {"a": 1}
+        await self.sut.update_user_data(self.USER_ID, data)
+        data["a"] = 2
+        await self.sut.flush()
+
+        assert await self.sut.get_user_data() == {self.USER_ID: {"a": 1}}
+
+    @pytest.mark.asyncio
+    async def test_flush_after_interval(self) -> None:
+        self.sut.flush_interval = 0
+
+        await self.sut.update_chat_data(self.CHAT_ID, {"a": 1})
+        await self._wait_for_flush()
+
+        assert await self._create_sut().get_chat_data() == {self.CHAT_ID: {"a": 1}}
+
+    @pytest.mark.asyncio
+    async def test_flush_on_max_batch_size(self) -> None:
+        with patch.object(
+            self.backend, "write_batch", wraps=self.backend.write_batch
+        ) as write_batch:
+            for user_id in range(self.settings.persistence_max_batch_size):
+                await self.sut.update_user_data(user_id, {"id": user_id})
+            await self._wait_for_flush()
+
+            write_batch.assert_called_once()
+            assert len(write_batch.call_args.args[0]) == self.settings.persistence_max_batch_size
+
+    @pytest.mark.asyncio
+    async def test_flush_error_retries(self) -> None:
+        await self.sut.update_user_data(self.USER_ID, self.USER_DATA)
+        with (
+            patch.object(self.backend, "write_batch", side_effect=OSError),
+            pytest.raises(OSError),  # noqa: PT011
+        ):
+            await self.sut.flush()
+
+        # The entry is kept so that it's written on the next flush
+        await self.sut.flush()
+        assert await self._create_sut().get_user_data() == {self.USER_ID: self.USER_DATA}
+
+    @pytest.mark.asyncio
+    async def test_drop_user_data(self) -> None:
+        await self.sut.update_user_data(self.USER_ID, self.USER_DATA)
+        await self.sut.flush()
+        await self.sut.drop_user_data(self.USER_ID)
+
+        assert await self.sut.get_user_data() == {}
+        await self.sut.flush()
+        assert await self._create_sut().get_user_data() == {}
+
+    @pytest.mark.asyncio
+    async def test_bot_and_callback_data(self) -> None:
+        callback_data = ([("uuid", 1.0, {"button": FileData("id")})], {"query": "uuid"})
+        assert await self.sut.get_bot_data() == {}
+        assert await self.sut.get_callback_data() is None
+
+        await self.sut.update_bot_data({"a": 1})
+        await self.sut.update_callback_data(callback_data)
+        await self.sut.flush()
+
+        sut = self._create_sut()
+        assert await sut.get_bot_data() == {"a": 1}
+        assert await sut.get_callback_data() == callback_data
+
+    @pytest.mark.asyncio
+    async def test_callback_data_pending_delete(self) -> None:
+        await self.sut.update_callback_data(([], {}))
+        await self.sut.flush()
+        self.sut._set(BotPersistence.CALLBACK_DATA, "data", None)  # noqa: SLF001
+
+        assert await self.sut.get_callback_data() is None
+
+    @pytest.mark.asyncio
+    async def test_conversations(self) -> None:
+        await self.sut.update_conversation(self.CONVERSATION_NAME, self.CONVERSATION_KEY, "state")
+        await self.sut.update_conversation(self.CONVERSATION_NAME, (3, 4), "state")
+        await self.sut.update_conversation("other", self.CONVERSATION_KEY, "other_state")
+        await self.sut.update_conversation(self.CONVERSATION_NAME, (3, 4), None)
+        await self.sut.flush()
+
+        assert await self._create_sut().get_conversations(self.CONVERSATION_NAME) == {
+            self.CONVERSATION_KEY: "state"
+        }
+
+    @pytest.mark.asyncio
+    async def test_refresh_user_data(self) -> None:
+        other = self._create_sut()
+        await other.update_user_data(self.USER_ID, self.USER_DATA)
+        await other.flush()
+
+        user_data: dict = {"stale": True}
+        await self.sut.refresh_user_data(self.USER_ID, user_data)
+
+        assert user_data == self.USER_DATA
+
+    @pytest.mark.asyncio
+    async def test_refresh_user_data_pending(self) -> None:
+        other = self._create_sut()
+        await other.update_user_data(self.USER_ID, self.USER_DATA)
+        await other.flush()
+
+        user_data = {"local": True}
+        await self.sut.update_user_data(self.USER_ID, user_data)
+        await self.sut.refresh_user_data(self.USER_ID, user_data)
+
+        assert user_data == {"local": True}
+
+    @pytest.mark.asyncio
+    async def test_refresh_chat_and_bot_data(self) -> None:
+        other = self._create_sut()
+        await other.update_chat_data(self.CHAT_ID, {"chat": True})
+        await other.update_bot_data({"bot": True})
+        await other.flush()
+
+        chat_data: dict = {}
+        bot_data: dict = {}
+        await self.sut.refresh_chat_data(self.CHAT_ID, chat_data)
+        await self.sut.refresh_bot_data(bot_data)
+
+        assert chat_data == {"chat": True}
+        assert bot_data == {"bot": True}
+
+    @pytest.mark.asyncio
+    async def test_refresh_not_shared(self) -> None:
+        backend = MemoryPersistenceBackend()
+        sut = BotPersistence(self.settings, backend)
+        backend.write_batch({(BotPersistence.USER_DATA, str(self.USER_ID)): b"invalid"})
+
+        user_data = {"local": True}
+        await sut.refresh_user_data(self.USER_ID, user_data)
+
+        assert user_data == {"local": True}
+
+    def _create_sut(self) -> BotPersistence:
+        return BotPersistence(self.settings, self.backend)
+
+    async def _wait_for_flush(self) -> None:
+        # Let the scheduled flush run and finish writing in its worker thread
+        for _ in range(100):
+            if self.sut._flush_task is None or self.sut._flush_task.done():  # noqa: SLF001
+                return
+            await asyncio.sleep(0.01)
+
+
+class TestPersistenceBackends:
+    NAMESPACE = "namespace"
+    KEY = "key/with:special chars"
+    VALUE = b"value"
+
+    @pytest.fixture(params=["memory", "file", "sqlite"])
+    def backend(self, request: pytest.FixtureRequest) -> Iterator[AbstractPersistenceBackend]:
+        with TemporaryDirectory() as dir_name:
+            dir_path = Path(dir_name)
+            if request.param == "file":
+                yield FilePersistenceBackend(dir_path / "data")
+            elif request.param == "sqlite":
+                yield SqlitePersistenceBackend(dir_path / "persistence.db")
+            else:
+                yield MemoryPersistenceBackend()
+
+    def test_get_missing(self, backend: AbstractPersistenceBackend) -> None:
+        assert backend.get(self.NAMESPACE, self.KEY) is None
+        assert backend.get_all(self.NAMESPACE) == {}
+
+    def test_write_batch(self, backend: AbstractPersistenceBackend) -> None:
+        backend.write_batch(
+            {
+                (self.NAMESPACE, self.KEY): self.VALUE,
+                (self.NAMESPACE, "other"): self.VALUE,
+                ("other", self.KEY): b"other",
+            }
+        )
+
+        assert backend.get(self.NAMESPACE, self.KEY) == self.VALUE
+        assert backend.get_all(self.NAMESPACE) == {self.KEY: self.VALUE, "other": self.VALUE}
+        assert backend.get_all("other") == {self.KEY: b"other"}
+
+    def test_write_batch_replace_and_delete(self, backend: AbstractPersistenceBackend) -> None:
+        backend.write_batch({(self.NAMESPACE, self.KEY): self.VALUE})
+        backend.write_batch({(self.NAMESPACE, self.KEY): b"new", (self.NAMESPACE, "other"): None})
+        assert backend.get(self.NAMESPACE, self.KEY) == b"new"
+
+        backend.write_batch({(self.NAMESPACE, self.KEY): None})
+        assert backend.get(self.NAMESPACE, self.KEY) is None
+        assert backend.get_all(self.NAMESPACE) == {}
+
+    def test_shared(self, backend: AbstractPersistenceBackend) -> None:
+        assert backend.is_shared is not isinstance(backend, MemoryPersistenceBackend)
@@ -0,0 +1,119 @@
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+import pytest
+
+from pdf_bot.analytics import TaskType
+from pdf_bot.result_cache import (
+    AbstractResultCacheBackend,
+    CachedResult,
+    MemoryResultCacheBackend,
+    ResultCacheService,
+    SqliteResultCacheBackend,
+)
+from pdf_bot.settings import Settings
+
+
+class TestResultCacheService:
+    KEY = "key"
+    RESULT = CachedResult("file_id")
+
+    def setup_method(self) -> None:
+        self.backend = MagicMock(spec=AbstractResultCacheBackend)
+        self.sut = ResultCacheService(Settings(), self.backend)
+
+    def test_init_memory_backend(self) -> None:
+        sut = ResultCacheService(Settings(result_cache_backend="memory").model_dump())
+        assert isinstance(sut.backend, MemoryResultCacheBackend)
+
+    def test_init_sqlite_backend(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            settings = Settings(
+                result_cache_backend="sqlite", result_cache_path=Path(dir_name) / "cache.db"
+            )
+            sut = ResultCacheService(settings)
+            assert isinstance(sut.backend, SqliteResultCacheBackend)
+
+    def test_build_key(self) -> None:
+        key = ResultCacheService.build_key("a", TaskType.rotate_pdf, {"degree": 90, "x": 1})
+        assert key == ResultCacheService.build_key("a", TaskType.rotate_pdf, {"x": 1, "degree": 90})
+        assert key != ResultCacheService.build_key("b", TaskType.rotate_pdf, {"degree": 90})
+        assert key != ResultCacheService.build_key("a", TaskType.split_pdf, {"degree": 90})
+        assert key != ResultCacheService.build_key("a", TaskType.rotate_pdf, {"degree": 180})
+
+    @pytest.mark.asyncio
+    async def test_get(self) -> None:
+        self.backend.get.return_value = self.RESULT
+        assert await self.sut.get(self.KEY) == self.RESULT
+        self.backend.get.assert_called_once_with(self.KEY)
+
+    @pytest.mark.asyncio
+    async def test_set(self) -> None:
+        await self.sut.set(self.KEY, self.RESULT)
+        self.backend.set.assert_called_once_with(self.KEY, self.RESULT)
+
+    @pytest.mark.asyncio
+    async def test_delete(self) -> None:
+        await self.sut.delete(self.KEY)
+        self.backend.delete.assert_called_once_with(self.KEY)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("is_blocking", [True, False])
+    async def test_get_off_event_loop(self, is_blocking: bool) -> None:
+        thread_ids: list[int] = []
+
+        def get(_key: str) -> CachedResult:
+            thread_ids.append(threading.get_ident())
+            return self.RESULT
+
+        self.backend.is_blocking = is_blocking
+        self.backend.get.side_effect = get
+
+        assert await self.sut.get(self.KEY) == self.RESULT
+        assert (thread_ids[0] != threading.get_ident()) is is_blocking
+
+
+class TestResultCacheBackends:
+    MAX_ENTRIES = 2
+    RESULT = CachedResult("file_id", is_photo=True, message="message")
+
+    def setup_method(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
+
+    @pytest.mark.parametrize("backend_type", ["memory", "sqlite"])
+    def test_get_and_set(self, backend_type: str) -> None:
+        backend = self._create_backend(backend_type)
+        assert backend.get("a") is None
+
+        backend.set("a", self.RESULT)
+        assert backend.get("a") == self.RESULT
+
+        backend.delete("a")
+        assert backend.get("a") is None
+
+    @pytest.mark.parametrize("backend_type", ["memory", "sqlite"])
+    def test_evict_least_recently_used(self, backend_type: str) -> None:
+        backend = self._create_backend(backend_type)
+        backend.set("a", self.RESULT)
+        backend.set("b", self.RESULT)
+        backend.get("a")
+        backend.set("c", self.RESULT)
+
+        assert backend.get("a") == self.RESULT
+        assert backend.get("b") is None
+        assert backend.get("c") == self.RESULT
+
+    def test_sqlite_persistence(self) -> None:
+        self._create_backend("sqlite").set("a", self.RESULT)
+        assert self._create_backend("sqlite").get("a") == self.RESULT
+
+    def _create_backend(self, backend_type: str) -> AbstractResultCacheBackend:
+        if backend_type == "sqlite":
+            path = Path(self.temp_dir.name) / "cache.db"
+            return SqliteResultCacheBackend(path, self.MAX_ENTRIES)
+        return MemoryResultCacheBackend(self.MAX_ENTRIES)
@@ -20,6 +20,8 @@ class TelegramServiceTestMixin(TelegramTestMixin):
         service.get_message_data.return_value = self.MESSAGE_DATA
         service.get_back_inline_markup.return_value = self.BACK_INLINE_MARKUP
         service.download_pdf_file.return_value.__aenter__.return_value = self.download_path
+        service.get_file_unique_id.return_value = self.TELEGRAM_FILE_UNIQUE_ID
+        service.send_cached_result.return_value = False
 
         return service
 
@@ -27,6 +27,7 @@ class TelegramTestMixin(PathTestMixin):
     TELEGRAM_MESSAGE_ID = 3
     TELEGRAM_USERNAME = "username"
     TELEGRAM_FILE_ID = "file_id"
+    TELEGRAM_FILE_UNIQUE_ID = "file_unique_id"
     TELEGRAM_DOCUMENT_ID = "document_id"
     TELEGRAM_DOCUMENT_NAME = "document_name"
     TELEGRAM_PHOTO_SIZE_ID = "photo_size_id"
@@ -86,6 +87,7 @@ class TelegramTestMixin(PathTestMixin):
         self.telegram_update = AsyncMock(spec=Update)
         self.telegram_update.message = self.telegram_message
         self.telegram_update.effective_message = self.telegram_message
+        self.telegram_update.effective_user = self.telegram_user
         self.telegram_update.callback_query = self.telegram_callback_query
         self.telegram_update.pre_checkout_query = self.telegram_pre_checkout_query
 
@@ -1,15 +1,23 @@
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from unittest.mock import MagicMock, call, patch
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
 from telegram import File, InlineKeyboardMarkup, Message, ReplyKeyboardMarkup
 from telegram.constants import ChatAction, FileSizeLimit, MessageLimit, ParseMode
+from telegram.error import BadRequest, TelegramError
 from telegram.ext import Application, ConversationHandler
 
 from pdf_bot.analytics import AnalyticsService, EventAction, TaskType
 from pdf_bot.consts import FILE_DATA, MESSAGE_DATA
-from pdf_bot.io import IOService
+from pdf_bot.download_cache import DownloadCacheService
+from pdf_bot.io import FileSplitError
 from pdf_bot.models import BackData, FileData, MessageData
+from pdf_bot.result_cache import CachedResult, ResultCacheService
 from pdf_bot.telegram_internal import (
     TelegramFileMimeTypeError,
     TelegramFileTooLargeError,
@@ -31,16 +39,24 @@ class TestTelegramService(LanguageServiceTestMixin, TelegramTestMixin):
     BACK = "Back"
     CANCEL = "Cancel"
     MESSAGE_TRUNCATED = "\n..."
+    RESULT_KEY = "result_key"
 
     def setup_method(self) -> None:
         super().setup_method()
-        self.io_service = MagicMock(spec=IOService)
         self.language_service = self.mock_language_service()
         self.analytics_service = MagicMock(spec=AnalyticsService)
+
+        self.download_cache_service = MagicMock(spec=DownloadCacheService)
+        self.download_cache_service.get_or_download.side_effect = self._get_or_download
+
+        self.result_cache_service = MagicMock(spec=ResultCacheService)
+        self.result_cache_service.get.return_value = None
+
         self.sut = TelegramService(
-            self.io_service,
             self.language_service,
             self.analytics_service,
+            self.download_cache_service,
+            self.result_cache_service,
             bot=self.telegram_bot,
         )
 
@@ -167,13 +183,16 @@ class TestTelegramService(LanguageServiceTestMixin, TelegramTestMixin):
 
     @pytest.mark.asyncio
     async def test_download_pdf_file(self) -> None:
-        self.io_service.create_temp_pdf_file.return_value.__enter__.return_value = self.file_path
+        self.telegram_file.file_unique_id = self.TELEGRAM_FILE_UNIQUE_ID
         self.telegram_bot.get_file.return_value = self.telegram_file
 
         async with self.sut.download_pdf_file(self.TELEGRAM_FILE_ID) as actual:
-            assert actual == self.file_path
+            assert actual == self._get_cache_path(self.TELEGRAM_FILE_UNIQUE_ID, ".pdf")
             self.telegram_bot.get_file.assert_called_with(self.TELEGRAM_FILE_ID)
-            self.telegram_file.download_to_drive.assert_called_once_with(custom_path=self.file_path)
+            self.download_cache_service.get_or_download.assert_called_once_with(
+                self.TELEGRAM_FILE_UNIQUE_ID, self.telegram_file.download_to_drive, ".pdf"
+            )
+            self.telegram_file.download_to_drive.assert_called_once_with(actual)
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize("num_files", [1, 2, 5])
@@ -194,22 +213,77 @@ class TestTelegramService(LanguageServiceTestMixin, TelegramTestMixin):
             file_paths.append(file_path)
 
             file = MagicMock(spec=File)
+            file.file_unique_id = file_path
             files[file_id] = FileAndPath(file, file_path)
 
-        self.io_service.create_temp_files.return_value.__enter__.return_value = file_paths
         self.telegram_bot.get_file.side_effect = lambda file_id: files[file_id].file
 
         async with self.sut.download_files(file_ids) as actual:
-            assert actual == file_paths
+            assert actual == [self._get_cache_path(x, "") for x in file_paths]
 
             get_file_calls = [call(file_id) for file_id in file_ids]
             self.telegram_bot.get_file.assert_has_calls(get_file_calls)
 
             for file_and_path in files.values():
                 file_and_path.file.download_to_drive.assert_called_once_with(
-                    custom_path=file_and_path.path
+                    self._get_cache_path(file_and_path.path, "")
                 )
 
+    @pytest.mark.asyncio
+    async def test_download_files_concurrency(self) -> None:
+        num_files = 6
+        self.sut.DOWNLOAD_CONCURRENCY = 2
+        running = max_running = 0
+
+        async def download(_path: Path) -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        def get_file(file_id: str) -> MagicMock:
+            file = MagicMock(spec=File)
+            file.file_unique_id = file_id
+            file.download_to_drive.side_effect = download
+            return file
+
+        file_ids = [f"file_id_{i}" for i in range(num_files)]
+        self.telegram_bot.get_file.side_effect = get_file
+
+        async with self.sut.download_files(file_ids) as actual:
+            assert actual == [self._get_cache_path(x, "") for x in file_ids]
+            assert max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_download_files_error(self) -> None:
+        file_ids = ["file_id_0", "file_id_1", "file_id_2"]
+        cancelled: list[str] = []
+
+        async def download(path: Path) -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(path.name)
+                raise
+
+        def get_file(file_id: str) -> MagicMock:
+            if file_id == file_ids[1]:
+                raise TelegramError(file_id)
+
+            file = MagicMock(spec=File)
+            file.file_unique_id = file_id
+            file.download_to_drive.side_effect = download
+            return file
+
+        self.telegram_bot.get_file.side_effect = get_file
+
+        with pytest.raises(TelegramError):
+            async with self.sut.download_files(file_ids):
+                pass
+
+        assert sorted(cancelled) == [file_ids[0], file_ids[2]]
+
     @pytest.mark.asyncio
     async def test_cancel_conversation(self) -> None:
         self.telegram_update.callback_query = None
@@ -376,6 +450,7 @@ class TestTelegramService(LanguageServiceTestMixin, TelegramTestMixin):
     @pytest.mark.asyncio
     async def test_send_file_document(self) -> None:
         file_path = self.file_path.with_suffix(".pdf")
+        file_path.is_dir.return_value = False
         stat = self.mock_path_stat(file_path)
         stat.st_size = FileSizeLimit.FILESIZE_UPLOAD
         self.telegram_update.callback_query = None
@@ -427,6 +502,7 @@ class TestTelegramService(LanguageServiceTestMixin, TelegramTestMixin):
     async def test_send_file_document_with_query(self) -> None:
         chat_id = 10
         file_path = self.file_path.with_suffix(".pdf")
+        file_path.is_dir.return_value = False
         stat = self.mock_path_stat(file_path)
         stat.st_size = FileSizeLimit.FILESIZE_UPLOAD
         message = MagicMock(spec=Message)
@@ -452,6 +528,98 @@ class TestTelegramService(LanguageServiceTestMixin, TelegramTestMixin):
             EventAction.complete,
         )
 
+    @pytest.mark.asyncio
+    async def test_send_file_dir(self) -> None:
+        self.telegram_update.callback_query = None
+        self.telegram_bot.send_document.return_value = self.telegram_message
+        dir_path = self.mock_dir_path()
+        archive_path = Path("images.zip")
+
+        with patch("pdf_bot.telegram_internal.telegram_service.split_dir") as split_dir:
+            split_dir.return_value = [archive_path]
+
+            actual = await self.sut.send_file(
+                self.telegram_update, self.telegram_context, dir_path, TaskType.pdf_to_image
+            )
+
+            assert actual == self.telegram_message
+            split_dir.assert_called_once()
+            args = split_dir.call_args.args
+            assert args[0] == dir_path
+            assert args[2] == FileSizeLimit.FILESIZE_UPLOAD
+
+        assert self.telegram_bot.send_document.call_args.args[1] == archive_path
+        self.analytics_service.send_event.assert_called_once_with(
+            self.telegram_update,
+            self.telegram_context,
+            TaskType.pdf_to_image,
+            EventAction.complete,
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("suffix", "split_func"), [(".pdf", "split_pdf"), (".zip", "split_zip")]
+    )
+    async def test_send_file_split(self, suffix: str, split_func: str) -> None:
+        num_parts = 5
+        running = 0
+        max_running = 0
+        self.telegram_update.callback_query = None
+        self.file_path.suffix = suffix
+        stat = self.mock_path_stat(self.file_path)
+        stat.st_size = FileSizeLimit.FILESIZE_UPLOAD + 1
+        part_paths = [Path(f"part_{i}{suffix}") for i in range(num_parts)]
+
+        async def send_document(*_args: Any, **_kwargs: Any) -> Message:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return self.telegram_message
+
+        self.telegram_bot.send_document.side_effect = send_document
+
+        with patch(f"pdf_bot.telegram_internal.telegram_service.{split_func}") as split_file:
+            split_file.return_value = part_paths
+
+            actual = await self.sut.send_file(
+                self.telegram_update, self.telegram_context, self.file_path, TaskType.merge_pdf
+            )
+
+            assert actual is None
+            split_file.assert_called_once()
+            assert split_file.call_args.args[0] == self.file_path
+
+        sent_paths = [x.args[1] for x in self.telegram_bot.send_document.call_args_list]
+        assert sent_paths == part_paths
+        assert max_running == TelegramService.UPLOAD_CONCURRENCY
+        self.analytics_service.send_event.assert_called_once_with(
+            self.telegram_update,
+            self.telegram_context,
+            TaskType.merge_pdf,
+            EventAction.complete,
+        )
+
+    @pytest.mark.asyncio
+    async def test_send_file_split_error(self) -> None:
+        self.telegram_update.callback_query = None
+        self.file_path.suffix = ".pdf"
+        stat = self.mock_path_stat(self.file_path)
+        stat.st_size = FileSizeLimit.FILESIZE_UPLOAD + 1
+
+        with patch("pdf_bot.telegram_internal.telegram_service.split_pdf") as split_pdf:
+            split_pdf.side_effect = FileSplitError("name", FileSizeLimit.FILESIZE_UPLOAD)
+
+            actual = await self.sut.send_file(
+                self.telegram_update, self.telegram_context, self.file_path, TaskType.merge_pdf
+            )
+
+        assert actual is None
+        self.telegram_bot.send_message.assert_called_once()
+        self.telegram_bot.send_document.assert_not_called()
+        self.analytics_service.send_event.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_send_file_too_large(self) -> None:
         stat = self.mock_path_stat(self.file_path)
@@ -469,6 +637,158 @@ class TestTelegramService(LanguageServiceTestMixin, TelegramTestMixin):
         self.telegram_bot.send_photo.assert_not_called()
         self.analytics_service.send_event.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_send_file_returns_message(self) -> None:
+        stat = self.mock_path_stat(self.file_path)
+        stat.st_size = FileSizeLimit.FILESIZE_UPLOAD
+        self.telegram_bot.send_document.return_value = self.telegram_message
+
+        actual = await self.sut.send_file(
+            self.telegram_update, self.telegram_context, self.file_path, TaskType.merge_pdf
+        )
+
+        assert actual == self.telegram_message
+
+    @pytest.mark.asyncio
+    async def test_get_file_unique_id(self) -> None:
+        self.telegram_file.file_unique_id = self.TELEGRAM_FILE_UNIQUE_ID
+        self.telegram_bot.get_file.return_value = self.telegram_file
+
+        actual_a = await self.sut.get_file_unique_id(self.TELEGRAM_FILE_ID)
+        actual_b = await self.sut.get_file_unique_id(self.TELEGRAM_FILE_ID)
+
+        assert actual_a == actual_b == self.TELEGRAM_FILE_UNIQUE_ID
+        self.telegram_bot.get_file.assert_called_once_with(self.TELEGRAM_FILE_ID)
+
+    @pytest.mark.asyncio
+    async def test_get_file_unique_id_after_download(self) -> None:
+        self.telegram_file.file_unique_id = self.TELEGRAM_FILE_UNIQUE_ID
+        self.telegram_bot.get_file.return_value = self.telegram_file
+
+        async with self.sut.download_pdf_file(self.TELEGRAM_FILE_ID):
+            pass
+        actual = await self.sut.get_file_unique_id(self.TELEGRAM_FILE_ID)
+
+        assert actual == self.TELEGRAM_FILE_UNIQUE_ID
+        self.telegram_bot.get_file.assert_called_once_with(self.TELEGRAM_FILE_ID)
+
+    @pytest.mark.asyncio
+    async def test_download_pdf_file_known_unique_id_cached(self) -> None:
+        @asynccontextmanager
+        async def get_or_download(
+            key: str, _download: Callable[[Path], Awaitable[Any]], suffix: str = ""
+        ) -> AsyncGenerator[Path, None]:
+            yield self._get_cache_path(key, suffix)
+
+        self.telegram_file.file_unique_id = self.TELEGRAM_FILE_UNIQUE_ID
+        self.telegram_bot.get_file.return_value = self.telegram_file
+        await self.sut.get_file_unique_id(self.TELEGRAM_FILE_ID)
+        self.download_cache_service.get_or_download.side_effect = get_or_download
+
+        async with self.sut.download_pdf_file(self.TELEGRAM_FILE_ID) as actual:
+            assert actual == self._get_cache_path(self.TELEGRAM_FILE_UNIQUE_ID, ".pdf")
+
+        self.telegram_bot.get_file.assert_called_once_with(self.TELEGRAM_FILE_ID)
+        self.telegram_file.download_to_drive.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_download_pdf_file_known_unique_id_not_cached(self) -> None:
+        self.telegram_file.file_unique_id = self.TELEGRAM_FILE_UNIQUE_ID
+        self.telegram_bot.get_file.return_value = self.telegram_file
+        await self.sut.get_file_unique_id(self.TELEGRAM_FILE_ID)
+
+        async with self.sut.download_pdf_file(self.TELEGRAM_FILE_ID) as actual:
+            assert actual == self._get_cache_path(self.TELEGRAM_FILE_UNIQUE_ID, ".pdf")
+
+        assert self.telegram_bot.get_file.call_count == 2
+        self.telegram_file.download_to_drive.assert_called_once_with(actual)
+
+    @pytest.mark.asyncio
+    async def test_send_cached_result_not_found(self) -> None:
+        actual = await self.sut.send_cached_result(
+            self.telegram_update, self.telegram_context, self.RESULT_KEY, TaskType.merge_pdf
+        )
+
+        assert actual is False
+        self.result_cache_service.get.assert_called_once_with(self.RESULT_KEY)
+        self.telegram_bot.send_document.assert_not_called()
+        self.analytics_service.send_event.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("is_photo", [True, False])
+    async def test_send_cached_result(self, is_photo: bool) -> None:
+        self.telegram_update.callback_query = None
+        self.result_cache_service.get.return_value = CachedResult(
+            self.TELEGRAM_FILE_ID, is_photo=is_photo, message=self.TELEGRAM_TEXT
+        )
+
+        actual = await self.sut.send_cached_result(
+            self.telegram_update, self.telegram_context, self.RESULT_KEY, TaskType.merge_pdf
+        )
+
+        assert actual is True
+        send_method = self.telegram_bot.send_photo if is_photo else self.telegram_bot.send_document
+        send_method.assert_called_once()
+        assert send_method.call_args.args == (self.TELEGRAM_CHAT_ID, self.TELEGRAM_FILE_ID)
+        self.telegram_bot.send_message.assert_called_once_with(
+            self.TELEGRAM_CHAT_ID, self.TELEGRAM_TEXT
+        )
+        self.analytics_service.send_event.assert_called_once_with(
+            self.telegram_update, self.telegram_context, TaskType.merge_pdf, EventAction.complete
+        )
+
+    @pytest.mark.asyncio
+    async def test_send_cached_result_message_before_file(self) -> None:
+        self.telegram_update.callback_query = None
+        self.result_cache_service.get.return_value = CachedResult(
+            self.TELEGRAM_FILE_ID, message=self.TELEGRAM_TEXT
+        )
+        manager = Mock()
+        manager.attach_mock(self.telegram_bot.send_message, "send_message")
+        manager.attach_mock(self.telegram_bot.send_document, "send_document")
+
+        await self.sut.send_cached_result(
+            self.telegram_update, self.telegram_context, self.RESULT_KEY, TaskType.merge_pdf
+        )
+
+        assert [x[0] for x in manager.mock_calls] == ["send_message", "send_document"]
+
+    @pytest.mark.asyncio
+    async def test_send_cached_result_invalid_file_id(self) -> None:
+        self.result_cache_service.get.return_value = CachedResult(self.TELEGRAM_FILE_ID)
+        self.telegram_bot.send_document.side_effect = BadRequest("error")
+
+        actual = await self.sut.send_cached_result(
+            self.telegram_update, self.telegram_context, self.RESULT_KEY, TaskType.merge_pdf
+        )
+
+        assert actual is False
+        self.result_cache_service.delete.assert_called_once_with(self.RESULT_KEY)
+        self.analytics_service.send_event.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_result_document(self) -> None:
+        self.telegram_message.photo = ()
+        await self.sut.cache_result(self.RESULT_KEY, self.telegram_message, self.TELEGRAM_TEXT)
+        self.result_cache_service.set.assert_called_once_with(
+            self.RESULT_KEY, CachedResult(self.TELEGRAM_DOCUMENT_ID, message=self.TELEGRAM_TEXT)
+        )
+
+    @pytest.mark.asyncio
+    async def test_cache_result_photo(self) -> None:
+        self.telegram_message.photo = (self.telegram_photo_size,)
+        await self.sut.cache_result(self.RESULT_KEY, self.telegram_message)
+        self.result_cache_service.set.assert_called_once_with(
+            self.RESULT_KEY, CachedResult(self.TELEGRAM_PHOTO_SIZE_ID, is_photo=True)
+        )
+
+    @pytest.mark.asyncio
+    async def test_cache_result_without_file(self) -> None:
+        self.telegram_message.photo = ()
+        self.telegram_message.document = None
+        await self.sut.cache_result(self.RESULT_KEY, self.telegram_message)
+        self.result_cache_service.set.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_send_file_names(self) -> None:
         file_data_list = [FileData("a", "a"), FileData("b")]
@@ -498,3 +818,15 @@ class TestTelegramService(LanguageServiceTestMixin, TelegramTestMixin):
         self.telegram_bot.send_message.assert_called_once_with(
             self.TELEGRAM_CHAT_ID, self.TELEGRAM_TEXT
         )
+
+    @staticmethod
+    def _get_cache_path(key: str, suffix: str) -> Path:
+        return Path(f"cache/{key}{suffix}")
+
+    @asynccontextmanager
+    async def _get_or_download(
+        self, key: str, download: Callable[[Path], Awaitable[Any]], suffix: str = ""
+    ) -> AsyncGenerator[Path, None]:
+        path = self._get_cache_path(key, suffix)
+        await download(path)
+        yield path
@@ -1,49 +1,178 @@
-from unittest.mock import MagicMock
+import asyncio
+import json
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, _Call, call
+from urllib.parse import urlparse
 
+import pytest
+from requests import ConnectionError as RequestsConnectionError
 from requests import Response, Session
 
 from pdf_bot.pdf import FontData
+from pdf_bot.settings import Settings
 from pdf_bot.text import TextRepository
 
 
 class TestTextRepository:
-    FONT_FAMILY = "font_family"
-    FONT_URL = "font_url"
+    FONT_FAMILY = "Font Family"
+    FONT_URL = "https://fonts.example.com/font_family.ttf"
+    FONT_CONTENT = b"font"
     GOOGLE_FONTS_TOKEN = "google_fonts_token"
+    CATALOG_URL = "https://www.googleapis.com/webfonts/v1/webfonts"
+    TTL = 60
 
     def setup_method(self) -> None:
-        self.response = MagicMock(spec=Response)
-        self.response.json.return_value = {
-            "items": [{"family": self.FONT_FAMILY, "files": {"regular": self.FONT_URL}}]
+        self.temp_dir = TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name)
+
+        self.catalog_response = MagicMock(spec=Response)
+        self.catalog_response.json.return_value = {
+            "items": [
+                {"family": self.FONT_FAMILY, "files": {"regular": self.FONT_URL}},
+                {"family": "Bold Only", "files": {"700": self.FONT_URL}},
+            ]
         }
+        self.font_response = MagicMock(spec=Response)
+        self.font_response.content = self.FONT_CONTENT
 
         self.session = MagicMock(spec=Session)
-        self.session.get.return_value = self.response
+        self.session.get.side_effect = self._get
 
-        self.sut = TextRepository(self.session, self.GOOGLE_FONTS_TOKEN)
+        self.sut = self._create_sut()
 
-    def test_get_font(self) -> None:
-        actual = self.sut.get_font(self.FONT_FAMILY)
+    def teardown_method(self) -> None:
+        self.temp_dir.cleanup()
 
-        assert actual == FontData(self.FONT_FAMILY, self.FONT_URL)
-        self._assert_api_call()
+    @pytest.mark.asyncio
+    async def test_get_font(self) -> None:
+        actual = await self.sut.get_font(self.FONT_FAMILY.upper())
+
+        assert actual is not None
+        assert actual.font_family == self.FONT_FAMILY
+        assert Path(urlparse(actual.font_url).path).read_bytes() == self.FONT_CONTENT
+        assert self.session.get.call_args_list == [
+            self._catalog_call(),
+            call(self.FONT_URL, timeout=30),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_font_cached(self) -> None:
+        expected = await self.sut.get_font(self.FONT_FAMILY)
+        actual = await self.sut.get_font(self.FONT_FAMILY)
 
-    def test_get_font_no_regular_font(self) -> None:
-        self.response.json.return_value = {"items": [{"family": self.FONT_FAMILY, "files": {}}]}
+        assert actual == expected
+        assert self.session.get.call_count == 2
 
-        actual = self.sut.get_font(self.FONT_FAMILY)
+    @pytest.mark.asyncio
+    async def test_get_font_no_regular_font(self) -> None:
+        actual = await self.sut.get_font("bold only")
 
         assert actual is None
-        self._assert_api_call()
+        assert self.session.get.call_args_list == [self._catalog_call()]
 
-    def test_get_font_unknown_font(self) -> None:
-        actual = self.sut.get_font("clearly_unknown_font")
+    @pytest.mark.asyncio
+    async def test_get_font_unknown_font(self) -> None:
+        actual = await self.sut.get_font("clearly_unknown_font")
 
         assert actual is None
-        self._assert_api_call()
+        assert self.session.get.call_args_list == [self._catalog_call()]
+
+    @pytest.mark.asyncio
+    async def test_get_font_concurrent(self) -> None:
+        await asyncio.gather(*[self.sut.get_font("clearly_unknown_font") for _ in range(5)])
+        assert self.session.get.call_args_list == [self._catalog_call()]
+
+    @pytest.mark.asyncio
+    async def test_get_font_catalog_error(self) -> None:
+        self.session.get.side_effect = RequestsConnectionError
+
+        with pytest.raises(RequestsConnectionError):
+            await self.sut.get_font(self.FONT_FAMILY)
+
+    @pytest.mark.asyncio
+    async def test_get_font_font_file_error(self) -> None:
+        self.font_response.raise_for_status.side_effect = RequestsConnectionError
+
+        actual = await self.sut.get_font(self.FONT_FAMILY)
+
+        assert actual == FontData(self.FONT_FAMILY, self.FONT_URL)
+
+    @pytest.mark.asyncio
+    async def test_get_font_from_disk(self) -> None:
+        await self.sut.get_font(self.FONT_FAMILY)
+        self.session.get.reset_mock()
+
+        sut = self._create_sut()
+        actual = await sut.get_font(self.FONT_FAMILY)
+
+        assert actual is not None
+        assert actual.font_url.startswith("file://")
+        self.session.get.assert_not_called()
 
-    def _assert_api_call(self) -> None:
-        self.session.get.assert_called_with(
-            "https://www.googleapis.com/webfonts/v1/webfonts",
-            params={"key": self.GOOGLE_FONTS_TOKEN},
+    @pytest.mark.asyncio
+    async def test_get_font_from_disk_invalid_catalog(self) -> None:
+        await self.sut.get_font(self.FONT_FAMILY)
+        catalog_path = self.cache_dir / "catalog.json"
+        data = json.loads(catalog_path.read_text())
+        del data["fetched_at"]
+        catalog_path.write_text(json.dumps(data))
+        self.session.get.reset_mock()
+
+        # The cached catalog is treated as stale and fetched again
+        sut = self._create_sut()
+        actual = await sut.get_font(self.FONT_FAMILY)
+
+        assert actual is not None
+        assert self.session.get.call_args_list[0] == self._catalog_call()
+
+    @pytest.mark.asyncio
+    async def test_get_font_refresh_in_background(self) -> None:
+        await self.sut.get_font(self.FONT_FAMILY)
+        self.catalog_response.json.return_value = {"items": []}
+        self.sut._refresh_at = time.time()  # noqa: SLF001
+
+        # The stale catalog is still served while it's being refreshed
+        assert await self.sut.get_font(self.FONT_FAMILY) is not None
+        await self._wait_for_refresh()
+
+        assert await self.sut.get_font(self.FONT_FAMILY) is None
+
+    @pytest.mark.asyncio
+    async def test_get_font_refresh_error(self) -> None:
+        await self.sut.get_font(self.FONT_FAMILY)
+        self.catalog_response.raise_for_status.side_effect = RequestsConnectionError
+        self.sut._refresh_at = time.time()  # noqa: SLF001
+
+        await self.sut.get_font(self.FONT_FAMILY)
+        await self._wait_for_refresh()
+
+        assert await self.sut.get_font(self.FONT_FAMILY) is not None
+        assert self.sut._refresh_at > time.time()  # noqa: SLF001
+
+    def test_init_with_dict(self) -> None:
+        settings = Settings(google_fonts_catalog_ttl=self.TTL)
+        sut = TextRepository(self.session, settings.model_dump())
+        assert sut.catalog_ttl == self.TTL
+
+    def _create_sut(self) -> TextRepository:
+        settings = Settings(
+            google_fonts_token=self.GOOGLE_FONTS_TOKEN,
+            google_fonts_cache_dir=self.cache_dir,
+            google_fonts_catalog_ttl=self.TTL,
         )
+        return TextRepository(self.session, settings)
+
+    def _get(self, url: str, **_kwargs: object) -> Response:
+        if url == self.CATALOG_URL:
+            return self.catalog_response
+        return self.font_response
+
+    def _catalog_call(self) -> _Call:
+        return call(self.CATALOG_URL, params={"key": self.GOOGLE_FONTS_TOKEN}, timeout=30)
+
+    async def _wait_for_refresh(self) -> None:
+        task = self.sut._refresh_task  # noqa: SLF001
+        if task is not None:
+            await task
@@ -7,14 +7,24 @@ from weasyprint.css.utils import InvalidValues
 from weasyprint.urls import URLFetchingError
 
 from pdf_bot.analytics import TaskType
+from pdf_bot.executor import WorkerPool
 from pdf_bot.io import IOService
+from pdf_bot.job_scheduler import JobTimeoutError
 from pdf_bot.telegram_internal import TelegramGetUserDataError, TelegramUpdateUserDataError
 from pdf_bot.webpage import WebpageService
+from tests.executor import ExecutorServiceTestMixin
+from tests.job_scheduler import JobSchedulerTestMixin
 from tests.language import LanguageServiceTestMixin
 from tests.telegram_internal import TelegramServiceTestMixin, TelegramTestMixin
 
 
-class TestWebpageService(LanguageServiceTestMixin, TelegramServiceTestMixin, TelegramTestMixin):
+class TestWebpageService(
+    ExecutorServiceTestMixin,
+    JobSchedulerTestMixin,
+    LanguageServiceTestMixin,
+    TelegramServiceTestMixin,
+    TelegramTestMixin,
+):
     URL = "https://example.com"
     HOSTNAME = "example.com"
     URL_HASH = hashlib.sha256(URL.encode("utf-8")).hexdigest()
@@ -30,7 +40,15 @@ class TestWebpageService(LanguageServiceTestMixin, TelegramServiceTestMixin, Tel
         self.telegram_service.user_data_contains.return_value = False
 
         self.language_service = self.mock_language_service()
-        self.sut = WebpageService(self.io_service, self.language_service, self.telegram_service)
+        self.executor_service = self.mock_executor_service()
+        self.job_scheduler = self.mock_job_scheduler()
+        self.sut = WebpageService(
+            self.io_service,
+            self.language_service,
+            self.telegram_service,
+            self.executor_service,
+            self.job_scheduler,
+        )
 
         self.html = MagicMock(spec=HTML)
         self.html_cls_patcher = patch(
@@ -107,6 +125,17 @@ class TestWebpageService(LanguageServiceTestMixin, TelegramServiceTestMixin, Tel
         self.telegram_service.send_file.assert_not_called()
         assert self.telegram_update.effective_message.reply_text.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_url_to_pdf_timeout(self) -> None:
+        self.job_scheduler.time_budget.return_value.__aexit__.side_effect = JobTimeoutError
+
+        await self.sut.url_to_pdf(self.telegram_update, self.telegram_context)
+
+        self._assert_url_to_pdf_calls()
+        self.job_scheduler.time_budget.assert_called_once_with(TaskType.url_to_pdf)
+        self.telegram_service.send_file.assert_not_called()
+        assert self.telegram_update.effective_message.reply_text.call_count == 2
+
     def _assert_url_to_pdf_calls(self) -> None:
         self.telegram_service.user_data_contains.assert_called_once_with(
             self.telegram_context, self.URL_HASH
@@ -115,7 +144,9 @@ class TestWebpageService(LanguageServiceTestMixin, TelegramServiceTestMixin, Tel
             self.telegram_context, self.URL_HASH, None
         )
         self.io_service.create_temp_pdf_file.assert_called_once_with(self.HOSTNAME)
+        self.html_cls.assert_called_once_with(url=self.URL)
         self.html.write_pdf.assert_called_once_with(self.file_path)
+        assert self.executor_service.run_killable.call_args.args[0] == WorkerPool.heavy
 
         self.telegram_service.get_user_data.assert_called_once_with(
             self.telegram_context, self.URL_HASH